@@ -2,14 +2,23 @@
 Analytics API endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from datetime import datetime, timedelta
+from typing import List, Optional, Union
+from datetime import date, datetime, timedelta
 import pandas as pd
 
-from app.db.database import get_db
+from app.core.cache import response_cache
+from app.core.executor import handler_executor, run_blocking
+from app.core.config import settings
+from app.db.database import engine, get_session
 from app.services.analytics_service import AnalyticsService
+from app.services.fact_table import fact_table_store
+from app.services.sql_analytics import SQLAnalyticsService, create_analytics_service
+from app.services.kpi_summary import kpi_summary_store, read_kpis, read_kpis_async
+from app.services.data_store import DataSnapshot, data_store, get_data_snapshot
 from app.schemas.analytics import (
     KPIResponse,
     TrendResponse,
@@ -20,87 +29,137 @@ from app.schemas.analytics import (
 router = APIRouter()
 
 
+async def serve(service: AnalyticsService, method: str, *args):
+    """Await a service method on the event loop if it doesn't block, otherwise in the handler pool"""
+    call = getattr(service, method)
+    if isinstance(service, SQLAnalyticsService) and method in service.SQL_METHODS \
+            and not fact_table_store.is_current(service.data):
+        # processed_data follows the snapshot; only a new one triggers a (changed datasets only) load
+        await run_blocking(fact_table_store.refresh, engine, service.data)
+    if service.is_blocking(method):
+        return await run_blocking(call, *args)
+    return await call(*args)
+
+
 @router.get("/kpis", response_model=KPIResponse)
 async def get_kpis(
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
-    db: Session = Depends(get_db)
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: Union[Session, AsyncSession] = Depends(get_session),
+    data: DataSnapshot = Depends(get_data_snapshot)
 ):
     """Get key performance indicators"""
-    service = AnalyticsService(db)
-    return await service.get_kpis(start_date, end_date)
-
-
-@router.get("/trends/{metric}")
+    if settings.KPI_SUMMARY:
+        # Per-day summary rows; only a new snapshot triggers an incremental refresh
+        if not kpi_summary_store.is_current(data):
+            await run_blocking(kpi_summary_store.refresh, engine, data)
+        if isinstance(db, AsyncSession):
+            return await read_kpis_async(db, start_date, end_date)
+        return await run_blocking(read_kpis, db, start_date, end_date)
+    
+    service = create_analytics_service(db, data)
+    return await serve(service, "get_kpis", start_date, end_date)
+
+
+@router.get("/trends/{metric}", response_class=ORJSONResponse)
 async def get_trend(
     metric: str,
     category: Optional[str] = None,
     period: str = Query("daily", regex="^(daily|weekly|monthly)$"),
-    db: Session = Depends(get_db)
+    layout: str = Query("points", regex="^(points|columns)$"),
+    db: Union[Session, AsyncSession] = Depends(get_session),
+    data: DataSnapshot = Depends(get_data_snapshot)
 ):
-    """Get trend data for a specific metric"""
-    service = AnalyticsService(db)
-    return await service.get_trend(metric, category, period)
+    """Get trend data for a specific metric (traffic, sales, orders, chats)"""
+    service = create_analytics_service(db, data)
+    # Already JSON-ready lists, so skip jsonable_encoder and serialize with orjson
+    return ORJSONResponse(await serve(service, "get_trend", metric, category, period, layout))
 
 
 @router.get("/funnel")
 async def get_funnel(
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
-    db: Session = Depends(get_db)
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: Union[Session, AsyncSession] = Depends(get_session),
+    data: DataSnapshot = Depends(get_data_snapshot)
 ):
     """Get conversion funnel data"""
-    service = AnalyticsService(db)
-    return await service.get_funnel(start_date, end_date)
+    service = create_analytics_service(db, data)
+    return await serve(service, "get_funnel", start_date, end_date)
 
 
 @router.get("/categories")
 async def get_category_metrics(
-    db: Session = Depends(get_db)
+    db: Union[Session, AsyncSession] = Depends(get_session),
+    data: DataSnapshot = Depends(get_data_snapshot)
 ):
     """Get metrics by category"""
-    service = AnalyticsService(db)
-    return await service.get_category_metrics()
+    service = create_analytics_service(db, data)
+    return await serve(service, "get_category_metrics")
 
 
 @router.get("/traffic/sources")
 async def get_traffic_sources(
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
-    db: Session = Depends(get_db)
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: Union[Session, AsyncSession] = Depends(get_session),
+    data: DataSnapshot = Depends(get_data_snapshot)
 ):
     """Get traffic by source"""
-    service = AnalyticsService(db)
-    return await service.get_traffic_sources(start_date, end_date)
+    service = create_analytics_service(db, data)
+    return await serve(service, "get_traffic_sources", start_date, end_date)
 
 
 @router.get("/campaigns/performance")
 async def get_campaign_performance(
     campaign_type: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: Union[Session, AsyncSession] = Depends(get_session),
+    data: DataSnapshot = Depends(get_data_snapshot)
 ):
     """Get campaign performance metrics"""
-    service = AnalyticsService(db)
-    return await service.get_campaign_performance(campaign_type)
+    service = create_analytics_service(db, data)
+    return await serve(service, "get_campaign_performance", campaign_type)
 
 
 @router.get("/products/top")
 async def get_top_products(
     limit: int = Query(10, ge=1, le=100),
     metric: str = Query("sales", regex="^(sales|orders|views)$"),
-    db: Session = Depends(get_db)
+    db: Union[Session, AsyncSession] = Depends(get_session),
+    data: DataSnapshot = Depends(get_data_snapshot)
 ):
     """Get top performing products"""
-    service = AnalyticsService(db)
-    return await service.get_top_products(limit, metric)
+    service = create_analytics_service(db, data)
+    return await serve(service, "get_top_products", limit, metric)
 
 
 @router.get("/customer-service/metrics")
 async def get_customer_service_metrics(
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
-    db: Session = Depends(get_db)
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: Union[Session, AsyncSession] = Depends(get_session),
+    data: DataSnapshot = Depends(get_data_snapshot)
 ):
     """Get customer service metrics"""
-    service = AnalyticsService(db)
-    return await service.get_customer_service_metrics(start_date, end_date)
+    service = create_analytics_service(db, data)
+    return await serve(service, "get_customer_service_metrics", start_date, end_date)
+
+
+@router.get("/datasets")
+async def get_dataset_stats():
+    """Get load time and memory footprint of the shared datasets"""
+    return data_store.stats()
+
+
+@router.get("/executor/stats")
+async def get_executor_stats(response: Response):
+    """Get running and queued counts of the blocking handler pool"""
+    response.headers["Cache-Control"] = "no-store"
+    return handler_executor.stats()
+
+
+@router.get("/cache/stats")
+async def get_cache_stats(response: Response):
+    """Get response cache hit, miss and eviction counters"""
+    response.headers["Cache-Control"] = "no-store"
+    return response_cache.stats()
@@ -0,0 +1,49 @@
+"""
+Dashboard frame API endpoints
+"""
+
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+
+from app.core.cache import etag_matches
+from app.core.executor import run_blocking
+from app.services.frame_store import ARROW_STREAM, frame_store, to_ipc
+
+router = APIRouter()
+
+
+@router.get("")
+async def list_frames():
+    """Get the current version of every cleaned dataset frame"""
+    return await run_blocking(frame_store.versions)
+
+
+@router.get("/stats")
+async def get_frame_stats():
+    """Get rows and memory of the frames loaded so far"""
+    return frame_store.stats()
+
+
+@router.get("/{name}")
+async def get_frame(
+    name: str,
+    request: Request,
+    columns: Optional[List[str]] = Query(None)
+):
+    """Get a cleaned dataset (optionally only some columns) as an Arrow IPC stream"""
+    try:
+        frame = await run_blocking(frame_store.get, name)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown frame: {name}")
+
+    headers = {"ETag": f'"{frame.version}"', "X-Frame-Version": frame.version, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    missing = [col for col in columns or () if col not in frame.table.column_names]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Unknown columns for {name}: {', '.join(missing)}")
+
+    body = await run_blocking(to_ipc, frame.table, columns)
+    return Response(content=body, media_type=ARROW_STREAM, headers=headers)
@@ -6,6 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import Optional, List
 
+from app.core.executor import run_blocking
 from app.db.database import get_db
 from app.services.insights_service import InsightsService
 from app.schemas.insights import (
@@ -26,7 +27,7 @@ async def segment_customers(
 ):
     """Segment customers using ML clustering"""
     service = InsightsService(db)
-    return await service.segment_customers(n_clusters, algorithm)
+    return await run_blocking(service.segment_customers, n_clusters, algorithm)
 
 
 @router.get("/segments")
@@ -35,7 +36,7 @@ async def get_segments(
 ):
     """Get existing customer segments"""
     service = InsightsService(db)
-    return await service.get_segments()
+    return await run_blocking(service.get_segments)
 
 
 @router.get("/segments/{segment_id}")
@@ -45,7 +46,7 @@ async def get_segment_details(
 ):
     """Get detailed information about a segment"""
     service = InsightsService(db)
-    return await service.get_segment_details(segment_id)
+    return await run_blocking(service.get_segment_details, segment_id)
 
 
 @router.post("/recommend/products")
@@ -55,7 +56,8 @@ async def recommend_products(
 ):
     """Get product recommendations"""
     service = InsightsService(db)
-    return await service.recommend_products(
+    return await run_blocking(
+        service.recommend_products,
         customer_id=request.customer_id,
         n_recommendations=request.n_recommendations,
         algorithm=request.algorithm
@@ -69,7 +71,7 @@ async def optimize_price(
 ):
     """Get optimal price recommendations"""
     service = InsightsService(db)
-    return await service.optimize_price(product_id)
+    return await run_blocking(service.optimize_price, product_id)
 
 
 @router.post("/optimize/marketing")
@@ -80,7 +82,7 @@ async def optimize_marketing_mix(
 ):
     """Optimize marketing budget allocation"""
     service = InsightsService(db)
-    return await service.optimize_marketing_mix(budget, channels)
+    return await run_blocking(service.optimize_marketing_mix, budget, channels)
 
 
 @router.get("/insights/summary")
@@ -89,7 +91,7 @@ async def get_insights_summary(
 ):
     """Get summary of all ML insights"""
     service = InsightsService(db)
-    return await service.get_insights_summary()
+    return await run_blocking(service.get_insights_summary)
 
 
 @router.post("/analyze/cohort")
@@ -100,4 +102,4 @@ async def analyze_cohort(
 ):
     """Perform cohort analysis"""
     service = InsightsService(db)
-    return await service.analyze_cohort(cohort_type, metric)
+    return await run_blocking(service.analyze_cohort, cohort_type, metric)
@@ -7,6 +7,7 @@ from sqlalchemy.orm import Session
 from typing import Optional
 from datetime import datetime
 
+from app.core.executor import run_blocking
 from app.db.database import get_db
 from app.services.prediction_service import PredictionService
 from app.schemas.predictions import (
@@ -26,7 +27,8 @@ async def forecast_sales(
 ):
     """Forecast future sales"""
     service = PredictionService(db)
-    return await service.forecast_sales(
+    return await run_blocking(
+        service.forecast_sales,
         days=request.days,
         confidence_interval=request.confidence_interval
     )
@@ -39,7 +41,8 @@ async def forecast_traffic(
 ):
     """Forecast future traffic"""
     service = PredictionService(db)
-    return await service.forecast_traffic(
+    return await run_blocking(
+        service.forecast_traffic,
         days=request.days,
         confidence_interval=request.confidence_interval
     )
@@ -54,7 +57,7 @@ async def detect_anomalies(
 ):
     """Detect anomalies in metrics"""
     service = PredictionService(db)
-    return await service.detect_anomalies(metric, lookback_days, sensitivity)
+    return await run_blocking(service.detect_anomalies, metric, lookback_days, sensitivity)
 
 
 @router.post("/churn/predict")
@@ -63,7 +66,7 @@ async def predict_churn(
 ):
     """Predict customer churn probability"""
     service = PredictionService(db)
-    return await service.predict_churn()
+    return await run_blocking(service.predict_churn)
 
 
 @router.get("/demand/forecast")
@@ -74,7 +77,7 @@ async def forecast_demand(
 ):
     """Forecast product demand"""
     service = PredictionService(db)
-    return await service.forecast_demand(category, days)
+    return await run_blocking(service.forecast_demand, category, days)
 
 
 @router.get("/models/performance")
@@ -84,4 +87,4 @@ async def get_model_performance(
 ):
     """Get ML model performance metrics"""
     service = PredictionService(db)
-    return await service.get_model_performance(model_type)
+    return await run_blocking(service.get_model_performance, model_type)
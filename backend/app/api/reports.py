@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 from typing import Optional, List
 from datetime import datetime
 
+from app.core.executor import run_blocking
 from app.db.database import get_db
 from app.services.report_service import ReportService
 from app.schemas.reports import (
@@ -28,7 +29,8 @@ async def generate_report(
 ):
     """Generate a new report"""
     service = ReportService(db)
-    return await service.generate_report(
+    return await run_blocking(
+        service.generate_report,
         report_type=request.report_type,
         start_date=request.start_date,
         end_date=request.end_date,
@@ -45,7 +47,7 @@ async def list_reports(
 ):
     """List generated reports"""
     service = ReportService(db)
-    return await service.list_reports(report_type, limit)
+    return await run_blocking(service.list_reports, report_type, limit)
 
 
 @router.get("/{report_id}")
@@ -55,7 +57,7 @@ async def get_report(
 ):
     """Get a specific report"""
     service = ReportService(db)
-    return await service.get_report(report_id)
+    return await run_blocking(service.get_report, report_id)
 
 
 @router.get("/{report_id}/download")
@@ -65,7 +67,7 @@ async def download_report(
 ):
     """Download report file"""
     service = ReportService(db)
-    file_path = await service.get_report_file_path(report_id)
+    file_path = await run_blocking(service.get_report_file_path, report_id)
     
     if not file_path:
         raise HTTPException(status_code=404, detail="Report file not found")
@@ -85,7 +87,8 @@ async def export_data(
 ):
     """Export data in various formats"""
     service = ReportService(db)
-    return await service.export_data(
+    return await run_blocking(
+        service.export_data,
         data_type=request.data_type,
         format=request.format,
         filters=request.filters,
@@ -102,7 +105,7 @@ async def list_alerts(
 ):
     """List system alerts"""
     service = ReportService(db)
-    return await service.list_alerts(severity, is_read, limit)
+    return await run_blocking(service.list_alerts, severity, is_read, limit)
 
 
 @router.post("/alerts/{alert_id}/mark-read")
@@ -112,7 +115,7 @@ async def mark_alert_read(
 ):
     """Mark an alert as read"""
     service = ReportService(db)
-    return await service.mark_alert_read(alert_id)
+    return await run_blocking(service.mark_alert_read, alert_id)
 
 
 @router.post("/alerts/create")
@@ -126,7 +129,8 @@ async def create_alert(
 ):
     """Create a new alert"""
     service = ReportService(db)
-    return await service.create_alert(
+    return await run_blocking(
+        service.create_alert,
         alert_type=alert_type,
         severity=severity,
         title=title,
@@ -144,4 +148,4 @@ async def schedule_report(
 ):
     """Schedule recurring reports"""
     service = ReportService(db)
-    return await service.schedule_report(report_type, frequency, recipients)
+    return await run_blocking(service.schedule_report, report_type, frequency, recipients)
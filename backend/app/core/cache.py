@@ -0,0 +1,287 @@
+"""
+Response cache for the read-only analytics API
+
+Analytics responses depend only on the request and the dataset version, so a
+GET response is stored under (path, normalized query params, dataset version)
+and served again until the data changes. Every cacheable response carries a
+strong ETag and Last-Modified, and a matching If-None-Match gets a 304.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from email.utils import formatdate
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """A stored response body and the validators sent with it"""
+    body: bytes
+    media_type: str
+    etag: str
+    last_modified: str
+
+    def to_bytes(self) -> bytes:
+        header = "\n".join([self.etag, self.last_modified, self.media_type])
+        return header.encode() + b"\n" + self.body
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "CachedResponse":
+        etag, last_modified, media_type, body = raw.split(b"\n", 3)
+        return cls(body=body, media_type=media_type.decode(), etag=etag.decode(),
+                   last_modified=last_modified.decode())
+
+
+class MemoryCacheBackend:
+    """In-process LRU cache with a per-entry time to live"""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, CachedResponse]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, entry = item
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": sum(len(entry.body) for _, entry in self._entries.values()),
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class RedisCacheBackend:
+    """Shared cache in Redis; eviction is left to key expiry and the server's maxmemory policy"""
+
+    name = "redis"
+
+    def __init__(self, ttl_seconds: float, client=None, url: Optional[str] = None,
+                 prefix: str = "analytics:response:"):
+        if client is None:
+            import redis
+            client = redis.Redis.from_url(url or settings.REDIS_URL)
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self.errors = 0
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        try:
+            raw = self.client.get(self.prefix + key)
+        except Exception as e:
+            # An unreachable cache only costs us the recomputation
+            self.errors += 1
+            logger.warning(f"Redis cache get failed: {e}")
+            return None
+        return CachedResponse.from_bytes(raw) if raw is not None else None
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        try:
+            self.client.set(self.prefix + key, entry.to_bytes(), ex=max(1, int(self.ttl_seconds)))
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Redis cache set failed: {e}")
+
+    def clear(self) -> None:
+        try:
+            keys = list(self.client.scan_iter(match=self.prefix + "*"))
+            if keys:
+                self.client.delete(*keys)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Redis cache clear failed: {e}")
+
+    def stats(self) -> Dict:
+        return {"errors": self.errors}
+
+
+class ResponseCache:
+    """Cache front end that keeps hit/miss counters for sizing"""
+
+    def __init__(self, backend=None):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.not_modified = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self.backend.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        self.backend.set(key, entry)
+        self.stores += 1
+
+    def clear(self) -> None:
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        stats = {
+            "backend": self.backend.name if self.backend is not None else "none",
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "stores": self.stores,
+            "not_modified": self.not_modified,
+        }
+        if self.backend is not None:
+            stats.update(self.backend.stats())
+        return stats
+
+
+def create_response_cache() -> ResponseCache:
+    """Build the cache configured in settings (CACHE_BACKEND: memory, redis or none)"""
+    if settings.CACHE_BACKEND == "memory":
+        return ResponseCache(MemoryCacheBackend(settings.CACHE_MAX_ENTRIES, settings.CACHE_TTL_SECONDS))
+    if settings.CACHE_BACKEND == "redis":
+        return ResponseCache(RedisCacheBackend(settings.CACHE_TTL_SECONDS))
+    return ResponseCache(None)
+
+
+def cache_key(path: str, params: Iterable[Tuple[str, str]], version: str) -> str:
+    """Key for a request: path, query params sorted with empty values dropped, and dataset version"""
+    normalized = "&".join(f"{name}={value}" for name, value in sorted(params) if value != "")
+    return hashlib.sha1(f"{path}?{normalized}#{version}".encode()).hexdigest()
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses the weak comparison, so W/ prefixes are ignored"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+# Live counters under the cached prefix; looking them up would count a miss on every call
+NO_STORE_PATHS = (
+    "/api/analytics/cache/stats",
+    "/api/analytics/executor/stats",
+)
+
+
+class ResponseCacheMiddleware(BaseHTTPMiddleware):
+    """
+    Serve GET responses under the given path prefixes from the response cache
+
+    `snapshot` returns the current dataset snapshot (anything with `version`
+    and `loaded_at`). It may reload changed files, so it runs in the thread
+    pool rather than on the event loop. Paths in `exclude_paths` bypass the cache entirely;
+    other routes can opt out of storing with a `Cache-Control: no-store`
+    header, which is only seen after the lookup has been counted.
+    """
+
+    def __init__(self, app, cache: ResponseCache, snapshot: Callable,
+                 path_prefixes: Tuple[str, ...] = ("/api/analytics",),
+                 exclude_paths: Tuple[str, ...] = NO_STORE_PATHS):
+        super().__init__(app)
+        self.cache = cache
+        self.snapshot = snapshot
+        self.path_prefixes = path_prefixes
+        self.exclude_paths = frozenset(exclude_paths)
+
+    def _validated(self, request: Request, entry: CachedResponse, status: str) -> Response:
+        headers = {
+            "ETag": entry.etag,
+            "Last-Modified": entry.last_modified,
+            "Cache-Control": "no-cache",
+            "X-Cache": status,
+        }
+        if etag_matches(request.headers.get("if-none-match"), entry.etag):
+            self.cache.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type=entry.media_type, headers=headers)
+
+    async def dispatch(self, request: Request, call_next):
+        path = request.url.path
+        if (request.method != "GET" or not path.startswith(self.path_prefixes) or path in self.exclude_paths
+                or not self.cache.enabled):
+            return await call_next(request)
+
+        try:
+            snapshot = await run_in_threadpool(self.snapshot)
+        except Exception:
+            # Let the route report missing data itself
+            return await call_next(request)
+
+        key = cache_key(path, request.query_params.multi_items(), snapshot.version)
+        entry = self.cache.get(key)
+        if entry is not None:
+            return self._validated(request, entry, "HIT")
+
+        response = await call_next(request)
+        if response.status_code != 200 or "no-store" in response.headers.get("cache-control", ""):
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        entry = CachedResponse(
+            body=body,
+            media_type=response.headers.get("content-type", "application/json"),
+            etag=make_etag(body),
+            last_modified=formatdate(snapshot.loaded_at.timestamp(), usegmt=True),
+        )
+        self.cache.set(key, entry)
+        return self._validated(request, entry, "MISS")
+
+
+# Process-wide cache, installed on the app in main.py
+response_cache = create_response_cache()
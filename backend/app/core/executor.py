@@ -0,0 +1,126 @@
+"""
+Bounded executor for blocking handler work
+
+Route handlers are async, but the pandas engine, sync SQLAlchemy sessions and
+the forecasting / segmentation services block. run_blocking() moves such a
+call to a fixed pool of threads so the event loop keeps serving other
+requests. At most HANDLER_WORKERS calls run at once; further calls wait on
+the loop (not in an unbounded executor queue) and are counted as queued.
+
+Threads rather than processes: handler work holds a DB session and the
+shared dataset snapshot, neither of which can be pickled, and a process pool
+would copy the snapshot into every worker.
+"""
+
+import asyncio
+import functools
+import inspect
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+_thread_state = threading.local()
+
+
+def _thread_loop() -> asyncio.AbstractEventLoop:
+    """Event loop of the current pool thread, created on its first call"""
+    loop = getattr(_thread_state, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = _thread_state.loop = asyncio.new_event_loop()
+    return loop
+
+
+def _call(fn: Callable, args, kwargs):
+    result = fn(*args, **kwargs)
+    if inspect.isawaitable(result):
+        # async def services that block inside: finish them on this thread's own loop,
+        # kept for the thread's lifetime instead of asyncio.run's new loop per call
+        return _thread_loop().run_until_complete(result)
+    return result
+
+
+class HandlerExecutor:
+    """Fixed-size thread pool with a per-loop admission limit"""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = settings.HANDLER_WORKERS if max_workers is None else max_workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._limits: Dict[int, asyncio.Semaphore] = {}
+        self._lock = threading.Lock()
+        self.running = 0
+        self.queued = 0
+        self.completed = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_workers > 0
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="handler")
+            return self._pool
+
+    def _limit(self) -> asyncio.Semaphore:
+        # Semaphores bind to the loop they first wait on
+        loop_id = id(asyncio.get_running_loop())
+        limit = self._limits.get(loop_id)
+        if limit is None:
+            limit = self._limits.setdefault(loop_id, asyncio.Semaphore(self.max_workers))
+        return limit
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run fn(*args, **kwargs) in the pool, or inline when the pool is disabled"""
+        if not self.enabled:
+            return await _maybe_await(fn(*args, **kwargs))
+
+        self.queued += 1
+        try:
+            await self._limit().acquire()
+        finally:
+            self.queued -= 1
+
+        self.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_pool(), functools.partial(_call, fn, args, kwargs))
+        finally:
+            self.running -= 1
+            self.completed += 1
+            self._limit().release()
+
+    def stats(self) -> Dict:
+        return {
+            "max_workers": self.max_workers,
+            "running": self.running,
+            "queued": self.queued,
+            "completed": self.completed,
+        }
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+            self._limits.clear()
+
+
+async def _maybe_await(result):
+    if inspect.isawaitable(result):
+        return await result
+    return result
+
+
+# Process-wide pool for request handlers
+handler_executor = HandlerExecutor()
+
+
+async def run_blocking(fn: Callable, *args, **kwargs) -> Any:
+    """Await a blocking (or blocking async def) call without stalling the event loop"""
+    return await handler_executor.run(fn, *args, **kwargs)
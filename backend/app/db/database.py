@@ -1,17 +1,55 @@
 """
 Database configuration and session management
+
+The sync engine serves the ORM and bulk loads. An async engine (asyncpg, or
+aiosqlite for SQLite) is created on first use when DB_ASYNC is set, so
+queries can be awaited on the event loop instead of holding a worker thread.
+Both engines share the pool settings from the config.
 """
 
+from typing import AsyncIterator, Dict, Iterator, Optional, Union
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
 
+# Async driver per backend
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def pool_options(url: str) -> Dict:
+    """Pool sizing for server databases; SQLite keeps SQLAlchemy's default pool"""
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+
+
+def async_database_url(url: str) -> str:
+    """DATABASE_URL with its driver swapped for the async one"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend} databases")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
 # Create database engine
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
-    echo=settings.DEBUG
+    echo=settings.DEBUG,
+    **pool_options(settings.DATABASE_URL)
 )
 
 # Create session factory
@@ -20,11 +58,52 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Base class for models
 Base = declarative_base()
 
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+
+
+def get_async_engine() -> AsyncEngine:
+    """Process-wide async engine, created on first use"""
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        url = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+        _async_engine = create_async_engine(url, pool_pre_ping=True, echo=settings.DEBUG, **pool_options(url))
+        _async_session_factory = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+    return _async_engine
+
+
+async def dispose_async_engine():
+    """Close the async pool (application shutdown)"""
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = _async_session_factory = None
 
-def get_db():
+
+def get_db() -> Iterator[Session]:
     """Dependency to get database session"""
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Dependency to get an async database session"""
+    get_async_engine()
+    async with _async_session_factory() as db:
+        yield db
+
+
+async def get_session() -> AsyncIterator[Union[Session, AsyncSession]]:
+    """Dependency to get an async session when DB_ASYNC is set, a sync one otherwise"""
+    if settings.DB_ASYNC:
+        async for db in get_async_db():
+            yield db
+        return
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
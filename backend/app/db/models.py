@@ -2,7 +2,7 @@
 Database models
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, Boolean, Text
+from sqlalchemy import BigInteger, Column, Integer, String, Float, DateTime, JSON, Boolean, Text, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from app.db.database import Base
 
@@ -19,18 +19,49 @@ class RawData(Base):
 
 
 class ProcessedData(Base):
-    """Processed analytics data"""
+    """Processed analytics data, one row per (dataset row, metric)"""
     __tablename__ = "processed_data"
+    __table_args__ = (
+        # Upsert key: the same source row and metric always lands on the same fact row
+        UniqueConstraint("category", "row_key", "metric_name", name="uq_processed_data_row_metric"),
+        # Range aggregates filter on category + metric and scan a date range
+        Index("ix_processed_data_category_metric_date", "category", "metric_name", "date"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    category = Column(String, index=True)
-    date = Column(DateTime, index=True)
-    metric_name = Column(String, index=True)
+    category = Column(String, nullable=False)
+    row_key = Column(Integer, nullable=False)  # position of the row in its typed, date-sorted dataset
+    date = Column(DateTime, index=True)  # NULL for undated rows
+    metric_name = Column(String, nullable=False)
     metric_value = Column(Float)
-    metadata = Column(JSON)
+    dimension = Column(String, nullable=True)  # e.g. Platform of off-platform traffic
+    source_version = Column(String)  # fingerprint of the source file the row was loaded from
+    metadata_ = Column("metadata", JSON)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 
+class DailyKPI(Base):
+    """Per-day KPI inputs, one row per (dataset, metric, day), refreshed incrementally from the datasets"""
+    __tablename__ = "kpi_daily"
+    __table_args__ = (
+        # KPI reads sum every metric over a date range
+        Index("ix_kpi_daily_date_category_metric", "date", "category", "metric_name"),
+        # Refresh finds a dataset's last day and replaces the days after it
+        Index("ix_kpi_daily_category_date", "category", "date"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    category = Column(String, nullable=False)
+    date = Column(DateTime)  # NULL bucket holds the undated rows (all-time totals only)
+    metric_name = Column(String, nullable=False)
+    metric_value = Column(Float, nullable=False)  # sum of the non-null values
+    metric_count = Column(Integer, nullable=False)  # non-null values
+    row_count = Column(Integer, nullable=False)  # source rows in the bucket
+    day_checksum = Column(BigInteger)  # running hash of the source rows through the day, NULL when undated
+    source_version = Column(String)  # fingerprint of the source file the bucket was built from
+    refreshed_at = Column(DateTime(timezone=True), nullable=False)
+
+
 class Prediction(Base):
     """ML predictions"""
     __tablename__ = "predictions"
@@ -41,7 +72,7 @@ class Prediction(Base):
     predicted_value = Column(Float)
     confidence_lower = Column(Float)
     confidence_upper = Column(Float)
-    metadata = Column(JSON)
+    metadata_ = Column("metadata", JSON)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 
@@ -55,7 +86,7 @@ class Alert(Base):
     title = Column(String)
     message = Column(Text)
     is_read = Column(Boolean, default=False)
-    metadata = Column(JSON)
+    metadata_ = Column("metadata", JSON)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 
@@ -9,9 +9,14 @@ from fastapi.responses import JSONResponse
 import logging
 from contextlib import asynccontextmanager
 
-from app.api import analytics, predictions, insights, reports
+from app.api import analytics, frames, predictions, insights, reports
 from app.core.config import settings
-from app.db.database import engine, Base
+from app.core.cache import ResponseCacheMiddleware, response_cache
+from app.core.executor import handler_executor
+from app.db.database import engine, Base, dispose_async_engine
+from app.services.data_store import data_store, get_data_snapshot
+from app.services.fact_table import fact_table_store
+from app.services.kpi_summary import kpi_summary_store
 
 # Configure logging
 logging.basicConfig(
@@ -31,10 +36,27 @@ async def lifespan(app: FastAPI):
     Base.metadata.create_all(bind=engine)
     logger.info("Database tables created")
     
+    # Load the shared datasets once for all requests
+    try:
+        snapshot = data_store.load()
+        logger.info(f"Datasets loaded (version {snapshot.version})")
+        
+        # Bulk load changed datasets into the processed_data fact table
+        if settings.FACT_TABLE_SYNC or settings.ANALYTICS_ENGINE == "sql":
+            fact_table_store.refresh(engine, snapshot)
+        
+        # Bring the per-day KPI summary up to date with the loaded datasets
+        if settings.KPI_SUMMARY:
+            kpi_summary_store.refresh(engine, snapshot)
+    except FileNotFoundError as e:
+        logger.warning(f"Datasets not loaded, will retry on first request: {e}")
+    
     yield
     
     # Shutdown
     logger.info("Shutting down...")
+    handler_executor.shutdown()
+    await dispose_async_engine()
 
 
 # Initialize FastAPI app
@@ -45,6 +67,14 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Response cache with ETag revalidation for the analytics endpoints
+# (added before CORS so CORS stays the outermost layer)
+app.add_middleware(
+    ResponseCacheMiddleware,
+    cache=response_cache,
+    snapshot=get_data_snapshot,
+)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -81,6 +111,7 @@ app.include_router(analytics.router, prefix="/api/analytics", tags=["Analytics"]
 app.include_router(predictions.router, prefix="/api/predictions", tags=["Predictions"])
 app.include_router(insights.router, prefix="/api/insights", tags=["ML Insights"])
 app.include_router(reports.router, prefix="/api/reports", tags=["Reports"])
+app.include_router(frames.router, prefix="/api/frames", tags=["Dashboard Frames"])
 
 
 # Global exception handler
@@ -7,6 +7,13 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime
 
 
+class KPIFreshness(BaseModel):
+    """How current the KPI summary table was when it answered"""
+    refreshed_at: Optional[datetime] = None  # latest refresh of the summed days
+    data_through: Optional[str] = None  # last day with data in the requested range
+    source_versions: Dict[str, str] = {}  # dataset -> fingerprint of the summarized source file
+
+
 class KPIResponse(BaseModel):
     """KPI response model"""
     total_sales: float
@@ -17,6 +24,7 @@ class KPIResponse(BaseModel):
     customer_satisfaction: float
     period: str
     comparison: Optional[Dict[str, float]] = None
+    freshness: Optional[KPIFreshness] = None  # set when served from the KPI summary table
 
 
 class TrendDataPoint(BaseModel):
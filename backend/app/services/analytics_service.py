@@ -2,172 +2,258 @@
 Analytics Service - Business logic for analytics operations
 """
 
-import pandas as pd
+import numpy as np
 import os
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple, Union
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.config import settings
 from app.schemas.analytics import KPIResponse, TrendResponse, FunnelResponse
+from app.services.data_store import DataSnapshot, DateLike, data_store
+from app.services.rollups import RollupCube, rollup_store
+
+# Trend metric -> (dataset, column summed per bucket)
+TREND_METRICS = {
+    "traffic": ("traffic_data", "Total_Visitors"),
+    "sales": ("product_data", "Total Sales (Orders Created) (IDR)"),
+    "orders": ("product_data", "Total Buyers (Orders Created)"),
+    "chats": ("chat_data", "Number_Of_Chats"),
+}
+
+# Columns summed for the funnel stages (product_data)
+FUNNEL_COLUMNS = (
+    'Product_Visitors_Visits',
+    'Product_Visitors_Adding_To_Cart',
+    'Total_Buyers_Orders_Created',
+    'Total_Buyers_Ready_To_Ship',
+)
+
+# Dataset -> columns summed for the KPIs
+KPI_COLUMNS = {
+    "chat_data": ('Sales_IDR', 'Total_Orders', 'CSAT_Percent'),
+    "flash_sale_data": ('Sales_Ready_To_Ship_IDR', 'Orders_Ready_To_Ship'),
+    "traffic_data": ('Total_Visitors',),
+}
+
+# Off-platform columns summed per Platform
+TRAFFIC_SOURCE_COLUMNS = ('Visitors', 'Sales_IDR', 'Orders')
+
+# Range sums of a dataset: column -> (sum, non-null count)
+Totals = Dict[str, Tuple[float, int]]
+
+
+def serialize_trend(dates: np.ndarray, values: np.ndarray, layout: str = "points") -> Dict:
+    """
+    Turn a date column and a value column into JSON-ready trend data
+
+    Dates are formatted as a whole column and values converted in one call,
+    so no per-row pandas access or strftime is involved. "columns" returns
+    the two arrays as they are; "points" zips them into date/value records.
+    """
+    date_labels = np.datetime_as_string(dates.astype('datetime64[D]'), unit='D').tolist()
+    value_list = values.astype('float64').tolist()
+    if layout == "columns":
+        return {"dates": date_labels, "values": value_list}
+    return {"data": [{"date": d, "value": v} for d, v in zip(date_labels, value_list)]}
+
+
+def trend_direction(values: np.ndarray):
+    """Direction and percentage change between the first and last point"""
+    if len(values) < 2:
+        return "stable", 0.0
+    first_val, last_val = float(values[0]), float(values[-1])
+    change_pct = ((last_val - first_val) / first_val * 100) if first_val > 0 else 0
+    if change_pct > 5:
+        return "up", change_pct
+    if change_pct < -5:
+        return "down", change_pct
+    return "stable", change_pct
+
+
+def period_label(start_date: DateLike, end_date: DateLike) -> str:
+    if start_date is None and end_date is None:
+        return "all_time"
+    return f"{start_date or 'start'} to {end_date or 'latest'}"
+
+
+def kpi_response(chat: Totals, flash_sale: Totals, traffic: Totals, period: str) -> KPIResponse:
+    """KPIs from the range sums of the chat, flash sale and traffic datasets"""
+    # Calculate total sales from multiple sources
+    total_sales = 0
+    if 'Sales_IDR' in chat:
+        total_sales += chat['Sales_IDR'][0]
+    if 'Sales_Ready_To_Ship_IDR' in flash_sale:
+        total_sales += flash_sale['Sales_Ready_To_Ship_IDR'][0]
+    
+    # Total orders
+    total_orders = 0
+    if 'Total_Orders' in chat:
+        total_orders += chat['Total_Orders'][0]
+    if 'Orders_Ready_To_Ship' in flash_sale:
+        total_orders += flash_sale['Orders_Ready_To_Ship'][0]
+    
+    # Total visitors
+    total_visitors = 0
+    if 'Total_Visitors' in traffic:
+        total_visitors = traffic['Total_Visitors'][0]
+    
+    # Conversion rate (orders / visitors)
+    conversion_rate = (total_orders / total_visitors) if total_visitors > 0 else 0
+    
+    # Average order value
+    avg_order_value = (total_sales / total_orders) if total_orders > 0 else 0
+    
+    # Customer satisfaction (mean from sum and count)
+    customer_satisfaction = 0
+    if 'CSAT_Percent' in chat and chat['CSAT_Percent'][1] > 0:
+        csat_sum, csat_count = chat['CSAT_Percent']
+        customer_satisfaction = csat_sum / csat_count
+    
+    return KPIResponse(
+        total_sales=float(total_sales),
+        total_orders=int(total_orders),
+        total_visitors=int(total_visitors),
+        conversion_rate=float(conversion_rate),
+        average_order_value=float(avg_order_value),
+        customer_satisfaction=float(customer_satisfaction),
+        period=period
+    )
+
+
+def funnel_response(total_visitors, added_to_cart, orders_created, orders_shipped) -> Dict:
+    """Funnel stages from the summed stage counts"""
+    stages = [
+        {
+            "stage": "Visitors",
+            "count": int(total_visitors),
+            "percentage": 100.0,
+            "conversion_rate": None
+        },
+        {
+            "stage": "Added to Cart",
+            "count": int(added_to_cart),
+            "percentage": (added_to_cart / total_visitors * 100) if total_visitors > 0 else 0,
+            "conversion_rate": (added_to_cart / total_visitors) if total_visitors > 0 else 0
+        },
+        {
+            "stage": "Orders Created",
+            "count": int(orders_created),
+            "percentage": (orders_created / total_visitors * 100) if total_visitors > 0 else 0,
+            "conversion_rate": (orders_created / added_to_cart) if added_to_cart > 0 else 0
+        },
+        {
+            "stage": "Orders Shipped",
+            "count": int(orders_shipped),
+            "percentage": (orders_shipped / total_visitors * 100) if total_visitors > 0 else 0,
+            "conversion_rate": (orders_shipped / orders_created) if orders_created > 0 else 0
+        }
+    ]
+    
+    overall_conversion = (orders_shipped / total_visitors) if total_visitors > 0 else 0
+    
+    return {
+        "stages": stages,
+        "overall_conversion": float(overall_conversion)
+    }
+
+
+def category_metrics(category: str, sales, orders, conversion_rate) -> Dict:
+    """One entry of the per-category metrics"""
+    return {
+        "category": category,
+        "sales": float(sales),
+        "orders": int(orders),
+        "conversion_rate": float(conversion_rate),
+        "avg_order_value": float(sales / orders) if orders > 0 else 0
+    }
+
+
+def customer_service_response(totals: Totals) -> Dict:
+    """Customer service metrics from the chat range sums"""
+    def mean(col):
+        total, count = totals.get(col, (0.0, 0))
+        return total / count if count > 0 else float('nan')
+    
+    return {
+        "total_chats": int(totals.get('Number_Of_Chats', (0, 0))[0]),
+        "chats_replied": int(totals.get('Chats_Replied', (0, 0))[0]),
+        "chats_not_replied": int(totals.get('Chats_Not_Replied', (0, 0))[0]),
+        "avg_response_time_minutes": float(mean('Average_Response_Time')),
+        "avg_csat": float(mean('CSAT_Percent')),
+        "conversion_rate": float(mean('Conversion_Rate_Chats_Replied'))
+    }
 
 
 class AnalyticsService:
     """Service for analytics operations"""
     
-    def __init__(self, db: Session):
+    # Methods that only look up the rollup cube, cheap once it is built for the snapshot
+    ROLLUP_METHODS = frozenset({"get_kpis", "get_trend", "get_customer_service_metrics"})
+    
+    def __init__(self, db: Union[Session, AsyncSession], data: Optional[DataSnapshot] = None):
         self.db = db
-        self.data_path = settings.DATA_PATH
+        self.data = data or data_store.snapshot
         self._load_data()
     
+    def is_blocking(self, method: str) -> bool:
+        """Whether a method blocks (pandas work, sync DB, a cube build) and must run off the event loop"""
+        return not (method in self.ROLLUP_METHODS and rollup_store.is_current(self.data))
+    
+    @property
+    def rollups(self) -> RollupCube:
+        """Pre-aggregated daily/weekly/monthly buckets of the snapshot"""
+        return rollup_store.for_snapshot(self.data)
+    
     def _load_data(self):
-        """Load cleaned CSV data"""
-        self.chat_data = pd.read_csv(f"{self.data_path}/chat_data_cleaned.csv")
-        self.traffic_data = pd.read_csv(f"{self.data_path}/traffic_overview_cleaned.csv")
-        self.flash_sale_data = pd.read_csv(f"{self.data_path}/flash_sale_cleaned.csv")
-        self.product_data = pd.read_csv(f"{self.data_path}/product_overview_cleaned.csv")
-        self.off_platform_data = pd.read_csv(f"{self.data_path}/off_platform_cleaned.csv")
-        
-        # Convert date columns
-        if 'Date' in self.traffic_data.columns:
-            self.traffic_data['Date'] = pd.to_datetime(self.traffic_data['Date'])
-        if 'Date' in self.product_data.columns:
-            self.product_data['Date'] = pd.to_datetime(self.product_data['Date'])
-        if 'Date' in self.off_platform_data.columns:
-            self.off_platform_data['Date'] = pd.to_datetime(self.off_platform_data['Date'])
-    
-    async def get_kpis(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> KPIResponse:
+        """Bind the shared, already typed datasets (read-only)"""
+        self.chat_data = self.data["chat_data"]
+        self.traffic_data = self.data["traffic_data"]
+        self.flash_sale_data = self.data["flash_sale_data"]
+        self.product_data = self.data["product_data"]
+        self.off_platform_data = self.data["off_platform_data"]
+    
+    def _period_label(self, start_date: DateLike, end_date: DateLike) -> str:
+        return period_label(start_date, end_date)
+    
+    async def get_kpis(self, start_date: DateLike = None, end_date: DateLike = None) -> KPIResponse:
         """Calculate key performance indicators"""
+        # Range sums come from prefix sums over daily buckets, not the raw rows
+        chat = self.rollups["chat_data"].totals(start_date, end_date)
+        flash_sale = self.rollups["flash_sale_data"].totals(start_date, end_date)
+        traffic = self.rollups["traffic_data"].totals(start_date, end_date)
         
-        # Calculate total sales from multiple sources
-        total_sales = 0
-        if 'Sales_IDR' in self.chat_data.columns:
-            total_sales += self.chat_data['Sales_IDR'].sum()
-        if 'Sales_Ready_To_Ship_IDR' in self.flash_sale_data.columns:
-            total_sales += self.flash_sale_data['Sales_Ready_To_Ship_IDR'].sum()
-        
-        # Total orders
-        total_orders = 0
-        if 'Total_Orders' in self.chat_data.columns:
-            total_orders += self.chat_data['Total_Orders'].sum()
-        if 'Orders_Ready_To_Ship' in self.flash_sale_data.columns:
-            total_orders += self.flash_sale_data['Orders_Ready_To_Ship'].sum()
-        
-        # Total visitors
-        total_visitors = 0
-        if 'Total_Visitors' in self.traffic_data.columns:
-            total_visitors = self.traffic_data['Total_Visitors'].sum()
-        
-        # Conversion rate (orders / visitors)
-        conversion_rate = (total_orders / total_visitors) if total_visitors > 0 else 0
-        
-        # Average order value
-        avg_order_value = (total_sales / total_orders) if total_orders > 0 else 0
-        
-        # Customer satisfaction
-        customer_satisfaction = 0
-        if 'CSAT_Percent' in self.chat_data.columns:
-            customer_satisfaction = self.chat_data['CSAT_Percent'].mean()
-        
-        return KPIResponse(
-            total_sales=float(total_sales),
-            total_orders=int(total_orders),
-            total_visitors=int(total_visitors),
-            conversion_rate=float(conversion_rate),
-            average_order_value=float(avg_order_value),
-            customer_satisfaction=float(customer_satisfaction),
-            period="all_time"
-        )
-    
-    async def get_trend(self, metric: str, category: Optional[str] = None, period: str = "daily"):
+        return kpi_response(chat, flash_sale, traffic, self._period_label(start_date, end_date))
+    
+    async def get_trend(self, metric: str, category: Optional[str] = None, period: str = "daily",
+                        layout: str = "points"):
         """Get trend data for a metric"""
+        dataset, column = TREND_METRICS.get(metric, (None, None))
+        rollup = self.rollups.rollups.get(dataset)
         
-        if metric == "traffic" and 'Date' in self.traffic_data.columns:
-            df = self.traffic_data.copy()
-            df = df.sort_values('Date')
-            
-            trend_data = []
-            for _, row in df.iterrows():
-                trend_data.append({
-                    "date": row['Date'].strftime('%Y-%m-%d'),
-                    "value": float(row.get('Total_Visitors', 0))
-                })
-            
-            # Calculate trend direction
-            if len(trend_data) > 1:
-                first_val = trend_data[0]['value']
-                last_val = trend_data[-1]['value']
-                change_pct = ((last_val - first_val) / first_val * 100) if first_val > 0 else 0
-                
-                if change_pct > 5:
-                    direction = "up"
-                elif change_pct < -5:
-                    direction = "down"
-                else:
-                    direction = "stable"
-            else:
-                direction = "stable"
-                change_pct = 0
-            
-            return {
-                "metric": metric,
-                "data": trend_data,
-                "period": period,
-                "trend_direction": direction,
-                "change_percentage": float(change_pct)
-            }
+        if rollup is not None and column in rollup.columns:
+            # One point per day, ISO week or month, summed in the rollup
+            dates, values = rollup.arrays(column, period)
+        else:
+            dates, values = np.array([], dtype='datetime64[D]'), np.array([], dtype='float64')
+        
+        direction, change_pct = trend_direction(values)
         
         return {
             "metric": metric,
-            "data": [],
+            **serialize_trend(dates, values, layout),
             "period": period,
-            "trend_direction": "stable",
-            "change_percentage": 0.0
+            "trend_direction": direction,
+            "change_percentage": float(change_pct)
         }
     
-    async def get_funnel(self, start_date: Optional[str] = None, end_date: Optional[str] = None):
+    async def get_funnel(self, start_date: DateLike = None, end_date: DateLike = None):
         """Get conversion funnel data"""
+        product_data = self.data.between("product_data", start_date, end_date)
         
         # Calculate funnel stages from product data
-        if not self.product_data.empty:
-            total_visitors = self.product_data['Product_Visitors_Visits'].sum()
-            added_to_cart = self.product_data['Product_Visitors_Adding_To_Cart'].sum()
-            orders_created = self.product_data['Total_Buyers_Orders_Created'].sum()
-            orders_shipped = self.product_data['Total_Buyers_Ready_To_Ship'].sum()
-            
-            stages = [
-                {
-                    "stage": "Visitors",
-                    "count": int(total_visitors),
-                    "percentage": 100.0,
-                    "conversion_rate": None
-                },
-                {
-                    "stage": "Added to Cart",
-                    "count": int(added_to_cart),
-                    "percentage": (added_to_cart / total_visitors * 100) if total_visitors > 0 else 0,
-                    "conversion_rate": (added_to_cart / total_visitors) if total_visitors > 0 else 0
-                },
-                {
-                    "stage": "Orders Created",
-                    "count": int(orders_created),
-                    "percentage": (orders_created / total_visitors * 100) if total_visitors > 0 else 0,
-                    "conversion_rate": (orders_created / added_to_cart) if added_to_cart > 0 else 0
-                },
-                {
-                    "stage": "Orders Shipped",
-                    "count": int(orders_shipped),
-                    "percentage": (orders_shipped / total_visitors * 100) if total_visitors > 0 else 0,
-                    "conversion_rate": (orders_shipped / orders_created) if orders_created > 0 else 0
-                }
-            ]
-            
-            overall_conversion = (orders_shipped / total_visitors) if total_visitors > 0 else 0
-            
-            return {
-                "stages": stages,
-                "overall_conversion": float(overall_conversion)
-            }
+        if not product_data.empty:
+            return funnel_response(*(product_data[col].sum() for col in FUNNEL_COLUMNS))
         
         return {"stages": [], "overall_conversion": 0.0}
     
@@ -177,37 +263,31 @@ class AnalyticsService:
         
         # Chat data metrics
         if not self.chat_data.empty:
-            categories.append({
-                "category": "Chat",
-                "sales": float(self.chat_data['Sales_IDR'].sum()),
-                "orders": int(self.chat_data['Total_Orders'].sum()),
-                "conversion_rate": float(self.chat_data['Conversion_Rate_Chats_Replied'].mean()),
-                "avg_order_value": float(self.chat_data['Sales_IDR'].sum() / self.chat_data['Total_Orders'].sum()) if self.chat_data['Total_Orders'].sum() > 0 else 0
-            })
+            categories.append(category_metrics(
+                "Chat",
+                self.chat_data['Sales_IDR'].sum(),
+                self.chat_data['Total_Orders'].sum(),
+                self.chat_data['Conversion_Rate_Chats_Replied'].mean()
+            ))
         
         # Flash sale metrics
         if not self.flash_sale_data.empty:
-            total_sales = self.flash_sale_data['Sales_Ready_To_Ship_IDR'].sum()
-            total_orders = self.flash_sale_data['Orders_Ready_To_Ship'].sum()
-            
-            categories.append({
-                "category": "Flash Sale",
-                "sales": float(total_sales),
-                "orders": int(total_orders),
-                "conversion_rate": float(self.flash_sale_data['Click_Rate'].mean()),
-                "avg_order_value": float(total_sales / total_orders) if total_orders > 0 else 0
-            })
+            categories.append(category_metrics(
+                "Flash Sale",
+                self.flash_sale_data['Sales_Ready_To_Ship_IDR'].sum(),
+                self.flash_sale_data['Orders_Ready_To_Ship'].sum(),
+                self.flash_sale_data['Click_Rate'].mean()
+            ))
         
         return categories
     
-    async def get_traffic_sources(self, start_date: Optional[str] = None, end_date: Optional[str] = None):
+    async def get_traffic_sources(self, start_date: DateLike = None, end_date: DateLike = None):
         """Get traffic by source"""
-        if 'Platform' in self.off_platform_data.columns:
-            sources = self.off_platform_data.groupby('Platform').agg({
-                'Visitors': 'sum',
-                'Sales_IDR': 'sum',
-                'Orders': 'sum'
-            }).reset_index()
+        off_platform_data = self.data.between("off_platform_data", start_date, end_date)
+        if 'Platform' in off_platform_data.columns:
+            sources = off_platform_data.groupby('Platform').agg(
+                {col: 'sum' for col in TRAFFIC_SOURCE_COLUMNS}
+            ).reset_index()
             
             return sources.to_dict('records')
         
@@ -239,16 +319,10 @@ class AnalyticsService:
             "message": "Product-level data not available in current dataset"
         }
     
-    async def get_customer_service_metrics(self, start_date: Optional[str] = None, end_date: Optional[str] = None):
+    async def get_customer_service_metrics(self, start_date: DateLike = None, end_date: DateLike = None):
         """Get customer service metrics"""
-        if not self.chat_data.empty:
-            return {
-                "total_chats": int(self.chat_data['Number_Of_Chats'].sum()),
-                "chats_replied": int(self.chat_data['Chats_Replied'].sum()),
-                "chats_not_replied": int(self.chat_data['Chats_Not_Replied'].sum()),
-                "avg_response_time_minutes": float(self.chat_data['Average_Response_Time'].mean()),
-                "avg_csat": float(self.chat_data['CSAT_Percent'].mean()),
-                "conversion_rate": float(self.chat_data['Conversion_Rate_Chats_Replied'].mean())
-            }
+        chat = self.rollups["chat_data"]
+        if chat.row_count(start_date, end_date) > 0:
+            return customer_service_response(chat.totals(start_date, end_date))
         
         return {}
@@ -0,0 +1,322 @@
+"""
+Data Store - Process-wide registry of the cleaned analytics datasets
+
+The cleaned CSVs are read and typed once, kept in an immutable snapshot and
+shared by every request. When a source file changes on disk (mtime/size) a new
+snapshot is built off to the side and swapped in with a single reference
+assignment, so readers always see either the old or the new data, never a mix.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Typed columnar copies written next to the CSVs by scripts/build_columnar_cache.py
+CACHE_SUFFIX = '.arrow'
+
+# Columns that hold labels rather than numbers
+TEXT_COLUMNS = ('Time_Period', 'Platform', 'Channel', 'Source_File', 'Category', 'Processed_Date')
+
+# Derived start date of monthly datasets that only carry a period label
+PERIOD_START_COLUMN = 'Period_Start'
+
+DateLike = Union[str, date, datetime, pd.Timestamp, None]
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """Where a dataset lives and how its columns are typed"""
+    name: str
+    filename: str
+    date_column: Optional[str] = None    # daily date, rows without one are dropped
+    period_column: Optional[str] = None  # period label such as "01-06-2025 - 30-06-2025"
+    # Export file name whose first 8-digit date starts the period when the label
+    # is blank, e.g. chat_20250601_20250630.xlsx with "%Y%m%d"
+    source_column: Optional[str] = None
+    source_date_format: Optional[str] = None
+
+    @property
+    def index_column(self) -> Optional[str]:
+        """Column the rows are sorted and range-filtered on"""
+        if self.date_column:
+            return self.date_column
+        if self.period_column:
+            return PERIOD_START_COLUMN
+        return None
+
+
+DATASET_SPECS: Tuple[DatasetSpec, ...] = (
+    # The monthly exports ship with an empty Time_Period, so their period is
+    # taken from the export file name; without it every row would be undated
+    # and drop out of any date range
+    DatasetSpec("chat_data", "chat_data_cleaned.csv", period_column="Time_Period",
+                source_column="Source_File", source_date_format="%Y%m%d"),
+    DatasetSpec("traffic_data", "traffic_overview_cleaned.csv", date_column="Date"),
+    DatasetSpec("flash_sale_data", "flash_sale_cleaned.csv", period_column="Time_Period",
+                source_column="Source_File", source_date_format="%d%m%Y"),
+    DatasetSpec("product_data", "product_overview_cleaned.csv", date_column="Date"),
+    DatasetSpec("off_platform_data", "off_platform_cleaned.csv", date_column="Date"),
+)
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """A loaded dataset. The frame is shared between requests and must not be mutated."""
+    name: str
+    source: str
+    frame: pd.DataFrame
+    fingerprint: Tuple[int, int]  # (mtime_ns, size) of the source file
+    load_seconds: float
+    memory_bytes: int
+    loaded_at: datetime
+    dates: Optional[np.ndarray] = None  # sorted datetime64 values of the dated rows, which come first
+
+    def between(self, start: DateLike = None, end: DateLike = None) -> pd.DataFrame:
+        """
+        Rows dated within [start, end], both days inclusive
+
+        Binary search on the sorted date index, so the cost depends on the
+        number of rows returned rather than the length of the history. The
+        result equals masking the full frame with start <= date <= end:
+        undated rows are excluded as soon as either bound is given.
+        """
+        if start is None and end is None:
+            return self.frame
+        if self.dates is None:
+            return self.frame.iloc[0:0]
+
+        lo = 0
+        hi = len(self.dates)
+        if start is not None:
+            lo = int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(start).normalize()), side='left'))
+        if end is not None:
+            next_day = pd.Timestamp(end).normalize() + pd.Timedelta(days=1)
+            hi = int(np.searchsorted(self.dates, np.datetime64(next_day), side='left'))
+        return self.frame.iloc[lo:max(lo, hi)]
+
+    def describe(self) -> Dict:
+        return {
+            "name": self.name,
+            "source": self.source,
+            "rows": len(self.frame),
+            "columns": len(self.frame.columns),
+            "load_ms": round(self.load_seconds * 1000, 2),
+            "memory_mb": round(self.memory_bytes / 1024 ** 2, 3),
+            "loaded_at": self.loaded_at.isoformat(),
+        }
+
+
+@dataclass(frozen=True)
+class DataSnapshot:
+    """Immutable set of datasets that were current at the same point in time"""
+    datasets: Mapping[str, Dataset]
+    version: str
+
+    def __getitem__(self, name: str) -> pd.DataFrame:
+        return self.datasets[name].frame
+
+    def between(self, name: str, start: DateLike = None, end: DateLike = None) -> pd.DataFrame:
+        return self.datasets[name].between(start, end)
+
+    @property
+    def loaded_at(self) -> datetime:
+        return max(ds.loaded_at for ds in self.datasets.values())
+
+
+def _fingerprint(path: str) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _snapshot_version(datasets: Mapping[str, Dataset]) -> str:
+    digest = hashlib.sha1()
+    for name in sorted(datasets):
+        mtime_ns, size = datasets[name].fingerprint
+        digest.update(f"{name}:{mtime_ns}:{size};".encode())
+    return digest.hexdigest()[:16]
+
+
+def _read_source(path: str) -> pd.DataFrame:
+    """Read a cleaned CSV, preferring its columnar (Arrow IPC) copy when that is up to date"""
+    cache_path = os.path.splitext(path)[0] + CACHE_SUFFIX
+    try:
+        if os.stat(cache_path).st_mtime_ns >= os.stat(path).st_mtime_ns:
+            return feather.read_table(cache_path, memory_map=True).to_pandas()
+    except (OSError, pa.ArrowException):
+        pass
+    return pd.read_csv(path)
+
+
+def read_dataset(path: str, spec: DatasetSpec) -> pd.DataFrame:
+    """Read a cleaned dataset and apply column types"""
+    df = _read_source(path)
+
+    # Repeated header and period summary rows have no parseable date
+    if spec.date_column and spec.date_column in df.columns:
+        if df[spec.date_column].dtype == object:
+            df[spec.date_column] = pd.to_datetime(df[spec.date_column], errors='coerce')
+        df = df.dropna(subset=[spec.date_column]).reset_index(drop=True)
+
+    for col in df.columns:
+        if col == spec.date_column or col in TEXT_COLUMNS:
+            continue
+        if df[col].dtype == object:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+
+    if spec.period_column and spec.period_column in df.columns:
+        start = df[spec.period_column].astype('string').str.extract(r'(\d{2}-\d{2}-\d{4})', expand=False)
+        df[PERIOD_START_COLUMN] = pd.to_datetime(start, format='%d-%m-%Y', errors='coerce')
+
+        # Blank labels: the period starts on the first date in the export file name
+        if spec.source_column and spec.source_column in df.columns:
+            missing = df[PERIOD_START_COLUMN].isna()
+            if missing.any():
+                start = df.loc[missing, spec.source_column].astype('string').str.extract(r'(\d{8})', expand=False)
+                df.loc[missing, PERIOD_START_COLUMN] = pd.to_datetime(
+                    start, format=spec.source_date_format, errors='coerce')
+
+    # Sort on the index column (stable, undated rows last) so range queries are slices
+    index_column = spec.index_column
+    if index_column and index_column in df.columns:
+        df = df.sort_values(index_column, kind='mergesort', na_position='last').reset_index(drop=True)
+
+    return df
+
+
+def _date_index(frame: pd.DataFrame, spec: DatasetSpec) -> Optional[np.ndarray]:
+    index_column = spec.index_column
+    if not index_column or index_column not in frame.columns:
+        return None
+    dates = frame[index_column]
+    return dates.iloc[:int(dates.notna().sum())].to_numpy(dtype='datetime64[ns]')
+
+
+class DataStore:
+    """Loads the cleaned datasets once per process and hot-swaps them on change"""
+
+    def __init__(self, data_path: Optional[str] = None, specs: Tuple[DatasetSpec, ...] = DATASET_SPECS,
+                 refresh_interval: Optional[float] = None):
+        self.data_path = data_path or settings.DATA_PATH
+        self.specs = specs
+        self.refresh_interval = settings.DATA_REFRESH_INTERVAL if refresh_interval is None else refresh_interval
+        self._snapshot: Optional[DataSnapshot] = None
+        self._reload_lock = threading.Lock()
+        self._last_check = 0.0
+
+    @property
+    def snapshot(self) -> DataSnapshot:
+        """Current snapshot, loading it on first use"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self.load()
+        return snapshot
+
+    def _path(self, spec: DatasetSpec) -> str:
+        return os.path.join(self.data_path, spec.filename)
+
+    def _load_dataset(self, spec: DatasetSpec) -> Dataset:
+        path = self._path(spec)
+        fingerprint = _fingerprint(path)
+        started = time.perf_counter()
+        frame = read_dataset(path, spec)
+        elapsed = time.perf_counter() - started
+
+        dataset = Dataset(
+            name=spec.name,
+            source=path,
+            frame=frame,
+            fingerprint=fingerprint,
+            load_seconds=elapsed,
+            memory_bytes=int(frame.memory_usage(deep=True).sum()),
+            loaded_at=datetime.now(),
+            dates=_date_index(frame, spec),
+        )
+        logger.info(
+            f"Loaded {spec.name}: {len(frame)} rows in {dataset.load_seconds * 1000:.1f} ms "
+            f"({dataset.memory_bytes / 1024 ** 2:.2f} MB)"
+        )
+        return dataset
+
+    def _build(self, previous: Optional[DataSnapshot]) -> DataSnapshot:
+        """Build a new snapshot, reusing datasets whose files are unchanged"""
+        datasets = {}
+        for spec in self.specs:
+            old = previous.datasets.get(spec.name) if previous else None
+            if old is not None and old.fingerprint == _fingerprint(self._path(spec)):
+                datasets[spec.name] = old
+            else:
+                datasets[spec.name] = self._load_dataset(spec)
+
+        return DataSnapshot(datasets=MappingProxyType(datasets), version=_snapshot_version(datasets))
+
+    def load(self) -> DataSnapshot:
+        """Load every dataset from scratch and publish the result"""
+        with self._reload_lock:
+            self._snapshot = self._build(previous=None)
+            self._last_check = time.monotonic()
+            return self._snapshot
+
+    def _is_stale(self, snapshot: DataSnapshot) -> bool:
+        for spec in self.specs:
+            dataset = snapshot.datasets.get(spec.name)
+            if dataset is None or dataset.fingerprint != _fingerprint(self._path(spec)):
+                return True
+        return False
+
+    def refresh_if_changed(self, force: bool = False) -> DataSnapshot:
+        """Return the current snapshot, reloading changed files first if any"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return self.load()
+
+        now = time.monotonic()
+        if not force and now - self._last_check < self.refresh_interval:
+            return snapshot
+        self._last_check = now
+
+        if not self._is_stale(snapshot):
+            return snapshot
+
+        with self._reload_lock:
+            # Another request may have swapped in fresh data while we waited
+            current = self._snapshot
+            if current is not snapshot and not self._is_stale(current):
+                return current
+            logger.info("Source data changed, rebuilding dataset snapshot...")
+            self._snapshot = self._build(previous=current)
+            return self._snapshot
+
+    def stats(self) -> Dict:
+        """Load time and memory footprint per dataset"""
+        snapshot = self.snapshot
+        datasets = [ds.describe() for ds in snapshot.datasets.values()]
+        return {
+            "version": snapshot.version,
+            "data_path": self.data_path,
+            "total_memory_mb": round(sum(ds.memory_bytes for ds in snapshot.datasets.values()) / 1024 ** 2, 3),
+            "datasets": datasets,
+        }
+
+
+# Process-wide store, loaded in the application lifespan
+data_store = DataStore()
+
+
+def get_data_snapshot() -> DataSnapshot:
+    """Dependency to get the current dataset snapshot"""
+    return data_store.refresh_if_changed()
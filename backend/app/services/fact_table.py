@@ -0,0 +1,313 @@
+"""
+Fact Table - Bulk loads the typed datasets into ProcessedData
+
+Every non-null numeric cell of a dataset becomes one long-format fact row
+(category, row_key, date, metric_name, metric_value, dimension). A reload
+upserts on (category, row_key, metric_name) and then deletes the facts left
+over from the previous source version, so loading the same data twice is a
+no-op and a changed file replaces its facts in one transaction.
+
+On PostgreSQL (psycopg2) the facts are streamed with COPY into a temporary
+staging table and merged with INSERT ... ON CONFLICT; other databases (SQLite
+in tests) get batched executemany upserts. metric_totals() then answers range
+sums and counts with one grouped query on the (category, metric_name, date)
+index instead of a pandas reduction. fact_table_store keeps the table in step
+with the data store snapshot that the SQL engine answers for.
+"""
+
+import io
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import and_, delete, func, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models import ProcessedData
+from app.services.data_store import DATASET_SPECS, DataSnapshot, Dataset, DatasetSpec, DateLike
+
+logger = logging.getLogger(__name__)
+
+# Text column stored alongside each fact so it can be grouped on in SQL
+DIMENSION_COLUMN = 'Platform'
+
+FACT_COLUMNS = ('category', 'row_key', 'date', 'metric_name', 'metric_value', 'dimension', 'source_version')
+UPSERT_KEY = ('category', 'row_key', 'metric_name')
+STAGE_TABLE = 'processed_data_stage'
+
+UPSERT_DIALECTS = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}
+
+
+def source_version(dataset: Dataset) -> str:
+    mtime_ns, size = dataset.fingerprint
+    return f"{mtime_ns}:{size}"
+
+
+def metric_columns(frame: pd.DataFrame, index_column: Optional[str]) -> List[str]:
+    """Numeric columns stored as metrics (the same columns the rollup cube aggregates)"""
+    return [
+        col for col in frame.columns
+        if col != index_column and pd.api.types.is_numeric_dtype(frame[col])
+        and not pd.api.types.is_bool_dtype(frame[col])
+    ]
+
+
+def fact_frame(dataset: Dataset, spec: DatasetSpec) -> pd.DataFrame:
+    """
+    Long-format facts of a dataset, one row per non-null numeric cell
+
+    row_key is the row's position in the typed, date-sorted frame; rows
+    without a date get a NULL date and only count towards all-time totals.
+    """
+    frame = dataset.frame
+    index_column = spec.index_column if spec.index_column in frame.columns else None
+    columns = metric_columns(frame, index_column)
+
+    values = frame[columns].to_numpy(dtype='float64')
+    rows, cols = np.nonzero(~np.isnan(values))  # row-major, so facts stay in date order
+
+    if index_column:
+        dates = frame[index_column].to_numpy(dtype='datetime64[ns]')[rows]
+    else:
+        dates = np.full(len(rows), np.datetime64('NaT'), dtype='datetime64[ns]')
+    if DIMENSION_COLUMN in frame.columns:
+        dimensions = frame[DIMENSION_COLUMN].astype(object).where(frame[DIMENSION_COLUMN].notna(), None)
+        dimensions = dimensions.to_numpy()[rows]
+    else:
+        dimensions = None
+
+    return pd.DataFrame({
+        'category': spec.name,
+        'row_key': rows.astype('int64'),
+        'date': dates,
+        'metric_name': pd.Categorical.from_codes(cols, categories=columns),
+        'metric_value': values[rows, cols],
+        'dimension': dimensions,
+        'source_version': source_version(dataset),
+    }, columns=list(FACT_COLUMNS))
+
+
+@dataclass(frozen=True)
+class LoadResult:
+    """Outcome of loading one dataset"""
+    category: str
+    facts: int
+    removed: int
+    seconds: float
+    method: str  # copy, executemany or skipped
+
+
+class FactTableLoader:
+    """Loads snapshot datasets into processed_data, skipping unchanged ones"""
+
+    def __init__(self, engine: Engine, batch_size: Optional[int] = None):
+        self.engine = engine
+        self.batch_size = batch_size or settings.FACT_TABLE_BATCH_SIZE
+
+    def load_snapshot(self, snapshot: DataSnapshot, force: bool = False) -> Dict[str, LoadResult]:
+        """Load every dataset of the snapshot whose source changed since the last load"""
+        results = {}
+        for spec in DATASET_SPECS:
+            dataset = snapshot.datasets.get(spec.name)
+            if dataset is not None:
+                results[spec.name] = self.load_dataset(dataset, spec, force=force)
+        return results
+
+    def load_dataset(self, dataset: Dataset, spec: DatasetSpec, force: bool = False) -> LoadResult:
+        started = time.perf_counter()
+        version = source_version(dataset)
+
+        with self.engine.begin() as conn:
+            if not force and self.loaded_version(conn, spec.name) == version:
+                return LoadResult(spec.name, 0, 0, time.perf_counter() - started, 'skipped')
+
+            facts = fact_frame(dataset, spec)
+            if self._can_copy(conn):
+                method = 'copy'
+                self._copy_upsert(conn, facts)
+            else:
+                method = 'executemany'
+                self._batched_upsert(conn, spec.name, facts)
+
+            table = ProcessedData.__table__
+            removed = conn.execute(
+                delete(table).where(table.c.category == spec.name, table.c.source_version != version)
+            ).rowcount
+
+        result = LoadResult(spec.name, len(facts), removed, time.perf_counter() - started, method)
+        logger.info(
+            f"Loaded {result.facts:,} {spec.name} facts via {method} in {result.seconds * 1000:.1f} ms "
+            f"({removed:,} stale removed)"
+        )
+        return result
+
+    @staticmethod
+    def loaded_version(conn: Connection, category: str) -> Optional[str]:
+        """Source version currently stored for a category, None if it has no facts"""
+        return conn.execute(
+            select(ProcessedData.source_version).where(ProcessedData.category == category).limit(1)
+        ).scalar()
+
+    @staticmethod
+    def _can_copy(conn: Connection) -> bool:
+        return conn.dialect.name == 'postgresql' and conn.dialect.driver == 'psycopg2'
+
+    def _copy_upsert(self, conn: Connection, facts: pd.DataFrame):
+        """COPY into a transaction-scoped staging table, then merge with ON CONFLICT"""
+        columns = ", ".join(FACT_COLUMNS)
+        buffer = io.StringIO()
+        # Empty unquoted CSV fields (NaT dates, missing dimensions) load as NULL
+        facts.to_csv(buffer, index=False, header=False, date_format='%Y-%m-%d %H:%M:%S')
+        buffer.seek(0)
+
+        conn.exec_driver_sql(
+            f"CREATE TEMP TABLE {STAGE_TABLE} (category varchar, row_key integer, date timestamp, "
+            f"metric_name varchar, metric_value double precision, dimension varchar, "
+            f"source_version varchar) ON COMMIT DROP"
+        )
+        with conn.connection.dbapi_connection.cursor() as cursor:
+            cursor.copy_expert(f"COPY {STAGE_TABLE} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+        updates = ", ".join(f"{col} = EXCLUDED.{col}" for col in FACT_COLUMNS if col not in UPSERT_KEY)
+        conn.exec_driver_sql(
+            f"INSERT INTO {ProcessedData.__tablename__} ({columns}) SELECT {columns} FROM {STAGE_TABLE} "
+            f"ON CONFLICT ({', '.join(UPSERT_KEY)}) DO UPDATE SET {updates}"
+        )
+
+    def _batched_upsert(self, conn: Connection, category: str, facts: pd.DataFrame):
+        table = ProcessedData.__table__
+        insert = UPSERT_DIALECTS.get(conn.dialect.name)
+        if insert is None:
+            # No native upsert: replace the category instead
+            conn.execute(delete(table).where(table.c.category == category))
+            stmt = table.insert()
+        else:
+            stmt = insert(table)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(UPSERT_KEY),
+                set_={col: stmt.excluded[col] for col in FACT_COLUMNS if col not in UPSERT_KEY},
+            )
+
+        for batch in self._records(facts):
+            conn.execute(stmt, batch)
+
+    def _records(self, facts: pd.DataFrame) -> Iterable[List[Dict]]:
+        """executemany parameter batches with Python scalars and None for missing values"""
+        dates = facts['date']
+        dates = np.where(dates.isna().to_numpy(), None, pd.DatetimeIndex(dates).to_pydatetime())
+        columns = [
+            facts['category'].tolist(),
+            facts['row_key'].tolist(),
+            dates.tolist(),
+            facts['metric_name'].astype(object).tolist(),
+            facts['metric_value'].tolist(),
+            facts['dimension'].tolist(),
+            facts['source_version'].tolist(),
+        ]
+        for lo in range(0, len(facts), self.batch_size):
+            yield [dict(zip(FACT_COLUMNS, values)) for values in zip(*(col[lo:lo + self.batch_size] for col in columns))]
+
+
+class FactTableStore:
+    """Loads processed_data once per data store snapshot"""
+
+    def __init__(self):
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def is_current(self, snapshot: DataSnapshot) -> bool:
+        return self._version == snapshot.version
+
+    def refresh(self, engine: Engine, snapshot: DataSnapshot) -> Dict[str, LoadResult]:
+        if self.is_current(snapshot):
+            return {}
+        with self._lock:
+            if self.is_current(snapshot):
+                return {}
+            results = FactTableLoader(engine).load_snapshot(snapshot)
+            self._version = snapshot.version
+            return results
+
+
+# Process-wide load state, kept in step with the data store
+fact_table_store = FactTableStore()
+
+
+def date_bounds(query, start: DateLike, end: DateLike, column=ProcessedData.date):
+    """[start, end] as whole days, like Dataset.between; undated facts drop out once a bound is set"""
+    if start is not None:
+        query = query.where(column >= pd.Timestamp(start).normalize().to_pydatetime())
+    if end is not None:
+        next_day = pd.Timestamp(end).normalize() + pd.Timedelta(days=1)
+        query = query.where(column < next_day.to_pydatetime())
+    return query
+
+
+def metric_totals(db, category: str, metrics: Optional[Iterable[str]] = None,
+                  start: DateLike = None, end: DateLike = None) -> Dict[str, Tuple[float, int]]:
+    """
+    (sum, non-null count) per metric over [start, end], aggregated in SQL
+
+    Same shape as DatasetRollup.totals; metrics without facts in the range
+    are missing from the result. db is a Session or Connection.
+    """
+    query = select(
+        ProcessedData.metric_name, func.sum(ProcessedData.metric_value), func.count(ProcessedData.metric_value)
+    ).where(ProcessedData.category == category)
+    if metrics is not None:
+        query = query.where(ProcessedData.metric_name.in_(list(metrics)))
+    query = date_bounds(query, start, end).group_by(ProcessedData.metric_name)
+    return {name: (float(total or 0.0), int(count)) for name, total, count in db.execute(query)}
+
+
+def _grouped_totals_query(metrics: Mapping[str, Iterable[str]], start: DateLike, end: DateLike,
+                          by_dimension: bool):
+    keys = [ProcessedData.category, ProcessedData.metric_name]
+    if by_dimension:
+        keys.append(ProcessedData.dimension)
+    query = select(
+        *keys, func.sum(ProcessedData.metric_value), func.count(ProcessedData.metric_value)
+    ).where(or_(*(
+        and_(ProcessedData.category == category, ProcessedData.metric_name.in_(list(names)))
+        for category, names in metrics.items()
+    )))
+    if by_dimension:
+        query = query.where(ProcessedData.dimension.isnot(None))
+    return date_bounds(query, start, end).group_by(*keys).order_by(*keys)
+
+
+def _collect_totals(rows) -> Dict[Tuple, Tuple[float, int]]:
+    return {tuple(row[:-2]): (float(row[-2] or 0.0), int(row[-1])) for row in rows}
+
+
+def grouped_totals(db, metrics: Mapping[str, Iterable[str]], start: DateLike = None, end: DateLike = None,
+                   by_dimension: bool = False) -> Dict[Tuple, Tuple[float, int]]:
+    """
+    (sum, non-null count) per (category, metric[, dimension]) in one grouped query
+
+    Args:
+        db: Session or Connection
+        metrics: Category -> metric names to aggregate
+        start, end: Inclusive day range; both None for all time
+        by_dimension: Also group on the dimension column (NULL dimensions are skipped)
+
+    Returns:
+        {(category, metric_name): (sum, count)}, or keyed by
+        (category, metric_name, dimension) when by_dimension is set, in key
+        order. Combinations without facts in the range are missing.
+    """
+    return _collect_totals(db.execute(_grouped_totals_query(metrics, start, end, by_dimension)))
+
+
+async def grouped_totals_async(db: AsyncSession, metrics: Mapping[str, Iterable[str]], start: DateLike = None,
+                               end: DateLike = None, by_dimension: bool = False) -> Dict[Tuple, Tuple[float, int]]:
+    """grouped_totals awaited on an async session"""
+    result = await db.execute(_grouped_totals_query(metrics, start, end, by_dimension))
+    return _collect_totals(result.all())
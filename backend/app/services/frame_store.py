@@ -0,0 +1,137 @@
+"""
+Frame Store - Cleaned dataset frames served to the dashboard as Arrow IPC
+
+Dashboard pages work on the cleaned CSVs exactly as pd.read_csv returns them
+(untyped, undated rows kept), unlike the typed analytics snapshot. The store
+reads each *_cleaned.csv once into an Arrow table shared by every request and
+re-reads it when the file changes on disk (mtime/size). A frame's version is
+derived from that fingerprint, so clients can cache a frame per version and
+revalidate with an ETag instead of downloading it again.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional, Sequence, Tuple
+
+import pandas as pd
+import pyarrow as pa
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+FRAME_SUFFIX = '_cleaned.csv'
+ARROW_STREAM = 'application/vnd.apache.arrow.stream'
+
+
+def frame_version(name: str, fingerprint: Tuple[int, int]) -> str:
+    mtime_ns, size = fingerprint
+    return hashlib.sha1(f"{name}:{mtime_ns}:{size}".encode()).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class Frame:
+    """A cleaned file as an Arrow table. Shared between requests and never modified."""
+    name: str
+    source: str
+    table: pa.Table
+    fingerprint: Tuple[int, int]  # (mtime_ns, size) of the source file
+    loaded_at: datetime
+
+    @property
+    def version(self) -> str:
+        return frame_version(self.name, self.fingerprint)
+
+    def describe(self) -> Dict:
+        return {
+            "version": self.version,
+            "rows": self.table.num_rows,
+            "columns": self.table.num_columns,
+            "memory_mb": round(self.table.nbytes / 1024 ** 2, 3),
+            "loaded_at": self.loaded_at.isoformat(),
+        }
+
+
+def read_frame(path: str) -> pa.Table:
+    """A cleaned CSV exactly as the dashboard pages read it, as an Arrow table"""
+    return pa.Table.from_pandas(pd.read_csv(path), preserve_index=False)
+
+
+def to_ipc(table: pa.Table, columns: Optional[Sequence[str]] = None) -> bytes:
+    """Arrow IPC stream of the table (or of some of its columns), compressed per FRAME_COMPRESSION"""
+    if columns:
+        # File order, like pd.read_csv(usecols=...)
+        wanted = set(columns)
+        table = table.select([col for col in table.column_names if col in wanted])
+    codec = settings.FRAME_COMPRESSION or None
+    if codec and not pa.Codec.is_available(codec):
+        codec = None
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema, options=pa.ipc.IpcWriteOptions(compression=codec)) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+class FrameStore:
+    """Loads cleaned files on first request and reloads them when they change"""
+
+    def __init__(self, data_path: Optional[str] = None):
+        self.data_path = data_path or settings.DATA_PATH
+        self._frames: Dict[str, Frame] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.data_path, name + FRAME_SUFFIX)
+
+    def names(self) -> Tuple[str, ...]:
+        """Frame names (file names without the _cleaned.csv suffix) present in the data path"""
+        try:
+            files = os.listdir(self.data_path)
+        except FileNotFoundError:
+            return ()
+        return tuple(sorted(f[:-len(FRAME_SUFFIX)] for f in files if f.endswith(FRAME_SUFFIX)))
+
+    def versions(self) -> Dict[str, str]:
+        """Current version of every frame, from file fingerprints alone (nothing is read)"""
+        versions = {}
+        for name in self.names():
+            stat = os.stat(self._path(name))
+            versions[name] = frame_version(name, (stat.st_mtime_ns, stat.st_size))
+        return versions
+
+    def get(self, name: str) -> Frame:
+        """The current frame, reading the file if it is new or changed. Unknown names raise KeyError."""
+        if name not in self.names():
+            raise KeyError(name)
+        path = self._path(name)
+        stat = os.stat(path)
+        fingerprint = (stat.st_mtime_ns, stat.st_size)
+
+        frame = self._frames.get(name)
+        if frame is not None and frame.fingerprint == fingerprint:
+            return frame
+
+        with self._lock:
+            frame = self._frames.get(name)
+            if frame is None or frame.fingerprint != fingerprint:
+                frame = Frame(name, path, read_frame(path), fingerprint, datetime.now())
+                self._frames[name] = frame
+                logger.info(f"Loaded frame {name}: {frame.table.num_rows} rows "
+                            f"({frame.table.nbytes / 1024 ** 2:.2f} MB)")
+            return frame
+
+    def stats(self) -> Dict:
+        frames = {name: frame.describe() for name, frame in self._frames.items()}
+        return {
+            "data_path": self.data_path,
+            "total_memory_mb": round(sum(f.table.nbytes for f in self._frames.values()) / 1024 ** 2, 3),
+            "frames": frames,
+        }
+
+
+# Process-wide store for the dashboard frames
+frame_store = FrameStore()
@@ -0,0 +1,287 @@
+"""
+KPI Summary - Per-day KPI inputs materialized in the kpi_daily table
+
+For the columns behind the KPIs (KPI_COLUMNS) every day of a dataset gets one
+row per metric holding the day's sum, non-null count and source row count,
+plus a NULL-dated bucket for the undated rows, in the same long format as
+processed_data. A KPI request for any day range is then one grouped, indexed
+query over a few rows per day instead of a pass over the raw rows.
+
+The refresher treats the data as append-only, like the rollup cube: when a
+dataset's source changes but still holds exactly the summarized rows up to
+the last summarized day, only the days after it (and the undated bucket) are
+replaced. Each day bucket stores a running checksum of the source rows up to
+and including that day, so history edited in place (same row count) is told
+apart from an append by comparing one stored value, the last summarized
+day's, with a vectorized hash of the rows before it. Rewritten or edited
+history and changed columns rebuild the dataset's rows.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import case, delete, func, or_, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import DailyKPI
+from app.schemas.analytics import KPIFreshness, KPIResponse
+from app.services.analytics_service import KPI_COLUMNS, Totals, kpi_response, period_label
+from app.services.data_store import DATASET_SPECS, DataSnapshot, Dataset, DatasetSpec, DateLike
+from app.services.fact_table import date_bounds, source_version
+from app.services.rollups import aggregate_days
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_SPECS = tuple(spec for spec in DATASET_SPECS if spec.name in KPI_COLUMNS)
+
+
+def day_checksums(frame: pd.DataFrame, index_column: str, columns: List[str], initial: int = 0):
+    """
+    (days, int64 checksums) of date-sorted rows: per day, the wrapping sum of
+    the hashes over the KPI columns of its rows and of every earlier row
+    (starting from initial), so an edited value changes its day and all later ones
+    """
+    if frame.empty:
+        return np.array([], dtype='datetime64[D]'), np.array([], dtype='int64')
+    days = frame[index_column].to_numpy(dtype='datetime64[D]')
+    hashes = pd.util.hash_pandas_object(frame[columns], index=False).to_numpy()
+    starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+    running = np.cumsum(np.add.reduceat(hashes, starts)) + np.int64(initial).astype(np.uint64)
+    return days[starts], running.view('int64')
+
+
+@dataclass(frozen=True)
+class SummaryState:
+    """What the table currently holds for one dataset"""
+    version: Optional[str]
+    metrics: frozenset
+    last_day: Optional[datetime]
+    dated_rows: int
+
+
+@dataclass(frozen=True)
+class RefreshResult:
+    """Outcome of refreshing one dataset"""
+    category: str
+    buckets: int  # day buckets written, the undated one included
+    since: Optional[datetime]  # first replaced day, None when every day was rebuilt
+    seconds: float
+    method: str  # incremental, rebuild or skipped
+
+
+class KPISummaryRefresher:
+    """Keeps kpi_daily in step with the datasets of a snapshot"""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+
+    def refresh_snapshot(self, snapshot: DataSnapshot, force: bool = False) -> Dict[str, RefreshResult]:
+        """Refresh every KPI dataset of the snapshot whose source changed since the last refresh"""
+        results = {}
+        for spec in SUMMARY_SPECS:
+            dataset = snapshot.datasets.get(spec.name)
+            if dataset is not None:
+                results[spec.name] = self.refresh_dataset(dataset, spec, force=force)
+        return results
+
+    def refresh_dataset(self, dataset: Dataset, spec: DatasetSpec, force: bool = False) -> RefreshResult:
+        started = time.perf_counter()
+        version = source_version(dataset)
+        columns = [col for col in KPI_COLUMNS[spec.name] if col in dataset.frame.columns]
+
+        with self.engine.begin() as conn:
+            state = self.state(conn, spec.name)
+            if not force and state.version == version:
+                return RefreshResult(spec.name, 0, None, time.perf_counter() - started, 'skipped')
+
+            split = None if force else self._append_point(dataset, columns, state)
+            checksum = 0
+            if split is not None:
+                checksum = self._history_checksum(dataset, spec, columns, split)
+                if checksum != self._stored_checksum(conn, spec.name, columns[0], state.last_day):
+                    split, checksum = None, 0
+            table = DailyKPI.__table__
+            stale = delete(table).where(table.c.category == spec.name)
+            if split is not None:
+                stale = stale.where(or_(table.c.date > state.last_day, table.c.date.is_(None)))
+            conn.execute(stale)
+
+            records = self._records(dataset, spec, columns, 0 if split is None else split, version, checksum)
+            if records:
+                conn.execute(table.insert(), records)
+
+        since = None if split is None else state.last_day
+        result = RefreshResult(spec.name, len(records) // max(len(columns), 1), since,
+                               time.perf_counter() - started, 'rebuild' if split is None else 'incremental')
+        logger.info(
+            f"Refreshed {result.buckets:,} {spec.name} KPI bucket(s) ({result.method}) "
+            f"in {result.seconds * 1000:.1f} ms"
+        )
+        return result
+
+    @staticmethod
+    def state(conn: Connection, category: str) -> SummaryState:
+        """Version, metrics, last day and dated row count stored for a dataset"""
+        rows = conn.execute(
+            select(
+                DailyKPI.metric_name,
+                func.max(DailyKPI.source_version),
+                func.max(DailyKPI.date),
+                func.sum(case((DailyKPI.date.isnot(None), DailyKPI.row_count), else_=0)),
+            ).where(DailyKPI.category == category).group_by(DailyKPI.metric_name)
+        ).all()
+        if not rows:
+            return SummaryState(None, frozenset(), None, 0)
+        _, version, last_day, dated_rows = rows[0]
+        return SummaryState(version, frozenset(row[0] for row in rows), last_day, int(dated_rows or 0))
+
+    @staticmethod
+    def _append_point(dataset: Dataset, columns: List[str], state: SummaryState) -> Optional[int]:
+        """
+        Position of the first row after the last summarized day, None to rebuild
+
+        Only valid when the dataset still has exactly the summarized dated
+        rows up to that day and the same metrics.
+        """
+        if state.last_day is None or dataset.dates is None or state.metrics != frozenset(columns):
+            return None
+        boundary = np.datetime64(pd.Timestamp(state.last_day).normalize() + pd.Timedelta(days=1), 'ns')
+        split = int(np.searchsorted(dataset.dates, boundary, side='left'))
+        return split if split == state.dated_rows else None
+
+    @staticmethod
+    def _history_checksum(dataset: Dataset, spec: DatasetSpec, columns: List[str], split: int) -> int:
+        """Running checksum of the rows before split, as stored for the last summarized day"""
+        _, checksums = day_checksums(dataset.frame.iloc[:split], spec.index_column, columns)
+        return int(checksums[-1])
+
+    @staticmethod
+    def _stored_checksum(conn: Connection, category: str, metric: str, day: datetime) -> Optional[int]:
+        return conn.execute(
+            select(DailyKPI.day_checksum)
+            .where(DailyKPI.category == category, DailyKPI.metric_name == metric, DailyKPI.date == day)
+        ).scalar()
+
+    @staticmethod
+    def _records(dataset: Dataset, spec: DatasetSpec, columns: List[str], start: int, version: str,
+                 checksum: int = 0) -> List[Dict]:
+        """
+        kpi_daily rows for the dated rows from position start on, and for the
+        undated rows; checksum is the running checksum of the rows before start
+        """
+        if not columns:
+            return []
+        frame = dataset.frame
+        n_dated = 0 if dataset.dates is None else len(dataset.dates)
+        refreshed_at = datetime.now(timezone.utc)
+
+        buckets = []
+        if n_dated > start:
+            dated = frame.iloc[start:n_dated]
+            days = aggregate_days(dated, spec.index_column, columns)
+            _, checksums = day_checksums(dated, spec.index_column, columns, checksum)
+            buckets += zip(pd.DatetimeIndex(days.keys).to_pydatetime(), days.sums, days.counts, days.rows,
+                           checksums.tolist())
+        undated = frame.iloc[n_dated:]
+        if len(undated):
+            values = undated[columns].to_numpy(dtype='float64')
+            present = ~np.isnan(values)
+            buckets.append((None, np.where(present, values, 0.0).sum(axis=0), present.sum(axis=0), len(undated),
+                            None))
+
+        return [
+            {
+                'category': spec.name, 'date': day, 'metric_name': col,
+                'metric_value': float(sums[i]), 'metric_count': int(counts[i]), 'row_count': int(rows),
+                'day_checksum': checksum, 'source_version': version, 'refreshed_at': refreshed_at,
+            }
+            for day, sums, counts, rows, checksum in buckets
+            for i, col in enumerate(columns)
+        ]
+
+
+class KPISummaryStore:
+    """Refreshes kpi_daily once per data store snapshot"""
+
+    def __init__(self):
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def is_current(self, snapshot: DataSnapshot) -> bool:
+        return self._version == snapshot.version
+
+    def refresh(self, engine: Engine, snapshot: DataSnapshot) -> Dict[str, RefreshResult]:
+        if self.is_current(snapshot):
+            return {}
+        with self._lock:
+            if self.is_current(snapshot):
+                return {}
+            results = KPISummaryRefresher(engine).refresh_snapshot(snapshot)
+            self._version = snapshot.version
+            return results
+
+
+# Process-wide refresh state, kept in step with the data store
+kpi_summary_store = KPISummaryStore()
+
+
+def _summary_query(start: DateLike, end: DateLike):
+    query = select(
+        DailyKPI.category,
+        DailyKPI.metric_name,
+        func.sum(DailyKPI.metric_value),
+        func.sum(DailyKPI.metric_count),
+        func.max(DailyKPI.date),
+        func.max(DailyKPI.refreshed_at),
+        func.max(DailyKPI.source_version),
+    )
+    query = date_bounds(query, start, end, column=DailyKPI.date)
+    return query.group_by(DailyKPI.category, DailyKPI.metric_name)
+
+
+def _kpis_from_rows(rows, start: DateLike, end: DateLike) -> KPIResponse:
+    totals: Dict[str, Totals] = {}
+    last_days, refreshed, versions = [], [], {}
+    for category, metric, total, count, last_day, refreshed_at, version in rows:
+        totals.setdefault(category, {})[metric] = (float(total or 0.0), int(count or 0))
+        if last_day is not None:
+            last_days.append(pd.Timestamp(last_day))
+        if refreshed_at is not None:
+            refreshed.append(pd.Timestamp(refreshed_at))
+        versions[category] = version
+
+    response = kpi_response(
+        totals.get("chat_data", {}),
+        totals.get("flash_sale_data", {}),
+        totals.get("traffic_data", {}),
+        period_label(start, end)
+    )
+    response.freshness = KPIFreshness(
+        refreshed_at=max(refreshed).to_pydatetime() if refreshed else None,
+        data_through=max(last_days).strftime('%Y-%m-%d') if last_days else None,
+        source_versions=versions,
+    )
+    return response
+
+
+def read_kpis(db, start: DateLike = None, end: DateLike = None) -> KPIResponse:
+    """
+    KPIs over [start, end] from kpi_daily in one grouped query
+
+    Same totals as AnalyticsService.get_kpis for the summarized snapshot,
+    with freshness metadata. db is a Session or Connection.
+    """
+    return _kpis_from_rows(db.execute(_summary_query(start, end)).all(), start, end)
+
+
+async def read_kpis_async(db: AsyncSession, start: DateLike = None, end: DateLike = None) -> KPIResponse:
+    """read_kpis awaited on an async session"""
+    result = await db.execute(_summary_query(start, end))
+    return _kpis_from_rows(result.all(), start, end)
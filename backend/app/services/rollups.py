@@ -0,0 +1,251 @@
+"""
+Rollups - Materialized daily / weekly / monthly aggregates of the datasets
+
+For every numeric column the cube keeps per-bucket sums and non-null counts
+(enough to rebuild sums, means and ratios of sums) plus row counts, and
+prefix sums over the daily level so any date range is answered with two
+lookups instead of a rescan of the raw rows.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.services.data_store import DataSnapshot, Dataset, DateLike, DATASET_SPECS
+
+logger = logging.getLogger(__name__)
+
+PERIODS = ("daily", "weekly", "monthly")
+
+
+def _bucket_keys(days: np.ndarray, period: str) -> np.ndarray:
+    """Start day of the bucket each day falls in (ISO weeks start on Monday)"""
+    if period == "daily":
+        return days
+    if period == "weekly":
+        # 1970-01-01 was a Thursday
+        weekday = (days.astype('int64') + 3) % 7
+        return days - weekday.astype('timedelta64[D]')
+    if period == "monthly":
+        return days.astype('datetime64[M]').astype('datetime64[D]')
+    raise ValueError(f"Unknown period: {period}")
+
+
+@dataclass(frozen=True)
+class RollupLevel:
+    """Aggregates for one granularity, one row per bucket in date order"""
+    keys: np.ndarray    # datetime64[D] bucket start
+    sums: np.ndarray    # (buckets, columns) float64, NaN treated as 0
+    counts: np.ndarray  # (buckets, columns) int64 non-null values
+    rows: np.ndarray    # (buckets,) int64 rows
+
+    @classmethod
+    def empty(cls, n_columns: int) -> "RollupLevel":
+        return cls(
+            keys=np.array([], dtype='datetime64[D]'),
+            sums=np.zeros((0, n_columns)),
+            counts=np.zeros((0, n_columns), dtype='int64'),
+            rows=np.zeros(0, dtype='int64'),
+        )
+
+    @classmethod
+    def from_daily(cls, daily: "RollupLevel", period: str) -> "RollupLevel":
+        if period == "daily" or len(daily.keys) == 0:
+            return daily
+        keys = _bucket_keys(daily.keys, period)
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        return cls(
+            keys=keys[starts],
+            sums=np.add.reduceat(daily.sums, starts, axis=0),
+            counts=np.add.reduceat(daily.counts, starts, axis=0),
+            rows=np.add.reduceat(daily.rows, starts),
+        )
+
+    def concat(self, other: "RollupLevel") -> "RollupLevel":
+        return RollupLevel(
+            keys=np.concatenate([self.keys, other.keys]),
+            sums=np.vstack([self.sums, other.sums]),
+            counts=np.vstack([self.counts, other.counts]),
+            rows=np.concatenate([self.rows, other.rows]),
+        )
+
+
+def aggregate_days(frame: pd.DataFrame, index_column: str, columns: List[str]) -> RollupLevel:
+    """One pass over raw rows (already sorted by date) into per-day buckets"""
+    if frame.empty:
+        return RollupLevel.empty(len(columns))
+
+    days = frame[index_column].to_numpy(dtype='datetime64[D]')
+    values = frame[columns].to_numpy(dtype='float64')
+    present = ~np.isnan(values)
+    starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+
+    return RollupLevel(
+        keys=days[starts],
+        sums=np.add.reduceat(np.where(present, values, 0.0), starts, axis=0),
+        counts=np.add.reduceat(present.astype('int64'), starts, axis=0),
+        rows=np.diff(np.r_[starts, len(days)]),
+    )
+
+
+class DatasetRollup:
+    """Rollup cube for one dataset"""
+
+    def __init__(self, dataset: Dataset, index_column: str, columns: List[str],
+                 daily: RollupLevel, undated: Tuple[np.ndarray, np.ndarray, int]):
+        self.dataset = dataset
+        self.index_column = index_column
+        self.columns = columns
+        self._column_pos = {col: i for i, col in enumerate(columns)}
+        self.levels: Dict[str, RollupLevel] = {
+            period: RollupLevel.from_daily(daily, period) for period in PERIODS
+        }
+        # Undated rows only count towards all-time totals
+        self.undated_sums, self.undated_counts, self.undated_rows = undated
+
+        n_columns = len(columns)
+        self._cum_sums = np.vstack([np.zeros((1, n_columns)), np.cumsum(daily.sums, axis=0)])
+        self._cum_counts = np.vstack([np.zeros((1, n_columns), dtype='int64'), np.cumsum(daily.counts, axis=0)])
+        self._cum_rows = np.r_[0, np.cumsum(daily.rows)]
+
+    @classmethod
+    def build(cls, dataset: Dataset, index_column: str) -> "DatasetRollup":
+        frame = dataset.frame
+        columns = [
+            col for col in frame.columns
+            if col != index_column and pd.api.types.is_numeric_dtype(frame[col])
+            and not pd.api.types.is_bool_dtype(frame[col])
+        ]
+        n_dated = 0 if dataset.dates is None else len(dataset.dates)
+        daily = aggregate_days(frame.iloc[:n_dated], index_column, columns)
+        return cls(dataset, index_column, columns, daily, cls._undated(frame.iloc[n_dated:], columns))
+
+    @staticmethod
+    def _undated(frame: pd.DataFrame, columns: List[str]) -> Tuple[np.ndarray, np.ndarray, int]:
+        values = frame[columns].to_numpy(dtype='float64')
+        present = ~np.isnan(values)
+        return np.where(present, values, 0.0).sum(axis=0), present.sum(axis=0), len(frame)
+
+    def extended(self, dataset: Dataset) -> "DatasetRollup":
+        """
+        Roll up only the days after the last materialized day
+
+        The data is treated as append-only: when the new dataset has exactly
+        the same dated rows up to our last day (same count, dates and values
+        of the rolled up columns), only the newer rows are aggregated.
+        Anything else (rewritten or corrected history, new columns) rebuilds.
+        """
+        daily = self.levels["daily"]
+        same_shape = (
+            dataset.dates is not None
+            and list(dataset.frame.columns) == list(self.dataset.frame.columns)
+        )
+        if not same_shape or len(daily.keys) == 0:
+            return DatasetRollup.build(dataset, self.index_column)
+
+        boundary = np.datetime64(daily.keys[-1] + np.timedelta64(1, 'D'), 'ns')
+        split = int(np.searchsorted(dataset.dates, boundary, side='left'))
+        if split != int(daily.rows.sum()) or not self._same_prefix(dataset, split):
+            return DatasetRollup.build(dataset, self.index_column)
+
+        n_dated = len(dataset.dates)
+        new_days = aggregate_days(dataset.frame.iloc[split:n_dated], self.index_column, self.columns)
+        undated = self._undated(dataset.frame.iloc[n_dated:], self.columns)
+        logger.info(f"Extended {dataset.name} rollup by {len(new_days.keys)} day(s)")
+        return DatasetRollup(dataset, self.index_column, self.columns, daily.concat(new_days), undated)
+
+    def _same_prefix(self, dataset: Dataset, n_rows: int) -> bool:
+        """Whether the first n_rows rows carry the same dates and values as the rolled up ones"""
+        new, old = dataset.frame.iloc[:n_rows], self.dataset.frame.iloc[:n_rows]
+        return all(new[col].equals(old[col]) for col in [self.index_column] + self.columns)
+
+    def _day_bounds(self, start: DateLike, end: DateLike) -> Tuple[int, int]:
+        keys = self.levels["daily"].keys
+        lo, hi = 0, len(keys)
+        if start is not None:
+            lo = int(np.searchsorted(keys, np.datetime64(pd.Timestamp(start).date(), 'D'), side='left'))
+        if end is not None:
+            hi = int(np.searchsorted(keys, np.datetime64(pd.Timestamp(end).date(), 'D'), side='right'))
+        return lo, max(lo, hi)
+
+    def totals(self, start: DateLike = None, end: DateLike = None) -> Dict[str, Tuple[float, int]]:
+        """(sum, non-null count) per column over [start, end], all time if both are None"""
+        lo, hi = self._day_bounds(start, end)
+        sums = self._cum_sums[hi] - self._cum_sums[lo]
+        counts = self._cum_counts[hi] - self._cum_counts[lo]
+        if start is None and end is None:
+            sums = sums + self.undated_sums
+            counts = counts + self.undated_counts
+        return {col: (float(sums[i]), int(counts[i])) for col, i in self._column_pos.items()}
+
+    def row_count(self, start: DateLike = None, end: DateLike = None) -> int:
+        lo, hi = self._day_bounds(start, end)
+        rows = int(self._cum_rows[hi] - self._cum_rows[lo])
+        if start is None and end is None:
+            rows += self.undated_rows
+        return rows
+
+    def arrays(self, column: str, period: str = "daily") -> Tuple[np.ndarray, np.ndarray]:
+        """Bucket start days and sums of a column for every bucket of a granularity"""
+        level = self.levels[period]
+        return level.keys, level.sums[:, self._column_pos[column]]
+
+
+class RollupCube:
+    """Rollups for every date-indexed dataset of a snapshot"""
+
+    def __init__(self, snapshot: DataSnapshot, rollups: Dict[str, DatasetRollup]):
+        self.version = snapshot.version
+        self.rollups = rollups
+
+    def __getitem__(self, name: str) -> DatasetRollup:
+        return self.rollups[name]
+
+    @classmethod
+    def build(cls, snapshot: DataSnapshot, previous: Optional["RollupCube"] = None) -> "RollupCube":
+        rollups = {}
+        for spec in DATASET_SPECS:
+            dataset = snapshot.datasets.get(spec.name)
+            if dataset is None or spec.index_column is None or spec.index_column not in dataset.frame.columns:
+                continue
+
+            old = previous.rollups.get(spec.name) if previous else None
+            if old is not None and old.dataset is dataset:
+                rollups[spec.name] = old
+            elif old is not None:
+                rollups[spec.name] = old.extended(dataset)
+            else:
+                rollups[spec.name] = DatasetRollup.build(dataset, spec.index_column)
+        return cls(snapshot, rollups)
+
+
+class RollupStore:
+    """Keeps the cube in step with the data store's current snapshot"""
+
+    def __init__(self):
+        self._cube: Optional[RollupCube] = None
+        self._lock = threading.Lock()
+
+    def is_current(self, snapshot: DataSnapshot) -> bool:
+        cube = self._cube
+        return cube is not None and cube.version == snapshot.version
+
+    def for_snapshot(self, snapshot: DataSnapshot) -> RollupCube:
+        cube = self._cube
+        if cube is not None and cube.version == snapshot.version:
+            return cube
+
+        with self._lock:
+            cube = self._cube
+            if cube is None or cube.version != snapshot.version:
+                cube = RollupCube.build(snapshot, previous=cube)
+                self._cube = cube
+            return cube
+
+
+# Process-wide cube, built on first use after each data reload
+rollup_store = RollupStore()
@@ -0,0 +1,157 @@
+"""
+SQL Analytics - AnalyticsService backed by grouped queries on processed_data
+
+Each range aggregate endpoint compiles into one grouped SUM/COUNT query over
+the fact table (see fact_table.grouped_totals), filtered on the
+(category, metric_name, date) index, and shapes the result with the same
+response builders as the pandas engine. Select it with ANALYTICS_ENGINE=sql;
+the other endpoints are inherited unchanged. With DB_ASYNC the session is an
+AsyncSession and these queries are awaited on the event loop.
+
+The fact table is loaded from the data store snapshot (fact_table_store) and
+the analytics routes bring it up to the request's snapshot version before any
+of these queries, so both engines answer for the same data. Each worker still
+holds the snapshot: it feeds the fact table and the inherited endpoints.
+
+A source row is only visible in SQL through its non-null metrics, so a range
+whose rows carry none of the requested metrics is treated as empty.
+"""
+
+from typing import Dict, List, Union
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.analytics_service import (
+    AnalyticsService,
+    FUNNEL_COLUMNS,
+    KPI_COLUMNS,
+    TRAFFIC_SOURCE_COLUMNS,
+    Totals,
+    category_metrics,
+    customer_service_response,
+    funnel_response,
+    kpi_response,
+)
+from app.services.data_store import DataSnapshot, DateLike
+from app.services.fact_table import grouped_totals, grouped_totals_async
+from app.schemas.analytics import KPIResponse
+
+CATEGORY_COLUMNS = {
+    "chat_data": ('Sales_IDR', 'Total_Orders', 'Conversion_Rate_Chats_Replied'),
+    "flash_sale_data": ('Sales_Ready_To_Ship_IDR', 'Orders_Ready_To_Ship', 'Click_Rate'),
+}
+
+CUSTOMER_SERVICE_COLUMNS = (
+    'Number_Of_Chats',
+    'Chats_Replied',
+    'Chats_Not_Replied',
+    'Average_Response_Time',
+    'CSAT_Percent',
+    'Conversion_Rate_Chats_Replied',
+)
+
+
+def _by_category(totals: Dict) -> Dict[str, Totals]:
+    """{(category, metric): totals} -> {category: {metric: totals}}"""
+    grouped: Dict[str, Totals] = {}
+    for (category, metric), value in totals.items():
+        grouped.setdefault(category, {})[metric] = value
+    return grouped
+
+
+class SQLAnalyticsService(AnalyticsService):
+    """Analytics service that pushes range aggregation down to the database"""
+
+    # Methods that only wait on the database, so they can be awaited on the loop with an async session
+    SQL_METHODS = frozenset({
+        "get_kpis", "get_funnel", "get_category_metrics", "get_traffic_sources", "get_customer_service_metrics",
+    })
+
+    def is_blocking(self, method: str) -> bool:
+        if method in self.SQL_METHODS:
+            return not isinstance(self.db, AsyncSession)
+        return super().is_blocking(method)
+
+    async def _grouped_totals(self, metrics, start: DateLike = None, end: DateLike = None, by_dimension=False):
+        if isinstance(self.db, AsyncSession):
+            return await grouped_totals_async(self.db, metrics, start, end, by_dimension)
+        return grouped_totals(self.db, metrics, start, end, by_dimension)
+
+    async def get_kpis(self, start_date: DateLike = None, end_date: DateLike = None) -> KPIResponse:
+        """Calculate key performance indicators"""
+        totals = _by_category(await self._grouped_totals(KPI_COLUMNS, start_date, end_date))
+        return kpi_response(
+            totals.get("chat_data", {}),
+            totals.get("flash_sale_data", {}),
+            totals.get("traffic_data", {}),
+            self._period_label(start_date, end_date)
+        )
+
+    async def get_funnel(self, start_date: DateLike = None, end_date: DateLike = None):
+        """Get conversion funnel data"""
+        totals = _by_category(await self._grouped_totals({"product_data": FUNNEL_COLUMNS}, start_date, end_date))
+        product = totals.get("product_data")
+
+        if product:
+            return funnel_response(*(product.get(col, (0.0, 0))[0] for col in FUNNEL_COLUMNS))
+
+        return {"stages": [], "overall_conversion": 0.0}
+
+    async def get_category_metrics(self):
+        """Get metrics by category"""
+        totals = _by_category(await self._grouped_totals(CATEGORY_COLUMNS))
+        categories = []
+
+        for category, name in (("chat_data", "Chat"), ("flash_sale_data", "Flash Sale")):
+            metrics = totals.get(category)
+            if not metrics:
+                continue
+            sales_col, orders_col, rate_col = CATEGORY_COLUMNS[category]
+            rate_sum, rate_count = metrics.get(rate_col, (0.0, 0))
+            categories.append(category_metrics(
+                name,
+                metrics.get(sales_col, (0.0, 0))[0],
+                metrics.get(orders_col, (0.0, 0))[0],
+                rate_sum / rate_count if rate_count > 0 else float('nan')
+            ))
+
+        return categories
+
+    async def get_traffic_sources(self, start_date: DateLike = None, end_date: DateLike = None) -> List[Dict]:
+        """Get traffic by source"""
+        totals = await self._grouped_totals(
+            {"off_platform_data": TRAFFIC_SOURCE_COLUMNS}, start_date, end_date, by_dimension=True
+        )
+
+        # Rows arrive ordered by metric, then Platform; pivot to one record per Platform
+        sources: Dict[str, Dict] = {}
+        for (_, metric, platform), (total, _) in totals.items():
+            sources.setdefault(platform, {'Platform': platform, **dict.fromkeys(TRAFFIC_SOURCE_COLUMNS, 0.0)})
+            sources[platform][metric] = total
+
+        return [sources[platform] for platform in sorted(sources)]
+
+    async def get_customer_service_metrics(self, start_date: DateLike = None, end_date: DateLike = None):
+        """Get customer service metrics"""
+        totals = _by_category(
+            await self._grouped_totals({"chat_data": CUSTOMER_SERVICE_COLUMNS}, start_date, end_date)
+        )
+
+        if totals.get("chat_data"):
+            return customer_service_response(totals["chat_data"])
+
+        return {}
+
+
+# ANALYTICS_ENGINE -> service class
+ANALYTICS_ENGINES = {
+    "pandas": AnalyticsService,
+    "sql": SQLAnalyticsService,
+}
+
+
+def create_analytics_service(db: Union[Session, AsyncSession], data: DataSnapshot) -> AnalyticsService:
+    """Analytics service of the configured query engine"""
+    return ANALYTICS_ENGINES[settings.ANALYTICS_ENGINE](db, data)
@@ -22,9 +22,9 @@ def create_date_filter(df, date_column='Date', key_prefix=''):
         date_range: Selected date range tuple
     """
     
-    # Convert date column to datetime
+    # Convert date column to datetime (on a new frame: the input may be shared between sessions)
     if date_column in df.columns:
-        df[date_column] = pd.to_datetime(df[date_column], errors='coerce')
+        df = df.assign(**{date_column: pd.to_datetime(df[date_column], errors='coerce')})
         df = df.dropna(subset=[date_column])
     else:
         st.error(f"Column '{date_column}' not found in data")
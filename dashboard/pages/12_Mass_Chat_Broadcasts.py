@@ -7,6 +7,13 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import sys
+import os
+
+# Add paths
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.api_client import load_frame
 
 st.set_page_config(page_title="Mass Chat Broadcasts", page_icon="📢", layout="wide")
 
@@ -25,14 +32,8 @@ with st.sidebar:
         st.session_state.username = None
         st.switch_page("app.py")
 
-# Load data
-@st.cache_data
-def load_mass_chat_data():
-    data_path = "/Users/tarang/CascadeProjects/windsurf-project/analytical-showdown-pipeline/cleaned_data"
-    df = pd.read_csv(f"{data_path}/mass_chat_data_cleaned.csv")
-    return df
-
-mass_chat_df = load_mass_chat_data()
+# Load data (shared, read-only frame from the backend)
+mass_chat_df = load_frame("mass_chat_data")
 
 # Header
 st.markdown("# 📢 Mass Chat Broadcast Analytics")
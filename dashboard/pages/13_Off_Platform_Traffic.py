@@ -7,6 +7,13 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import sys
+import os
+
+# Add paths
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.api_client import load_frame
 
 st.set_page_config(page_title="Off-Platform Traffic", page_icon="🌐", layout="wide")
 
@@ -25,14 +32,8 @@ with st.sidebar:
         st.session_state.username = None
         st.switch_page("app.py")
 
-# Load data
-@st.cache_data
-def load_off_platform_data():
-    data_path = "/Users/tarang/CascadeProjects/windsurf-project/analytical-showdown-pipeline/cleaned_data"
-    df = pd.read_csv(f"{data_path}/off_platform_cleaned.csv")
-    return df
-
-off_platform_df = load_off_platform_data()
+# Load data (shared, read-only frame from the backend)
+off_platform_df = load_frame("off_platform")
 
 # Header
 st.markdown("# 🌐 Off-Platform Traffic Analytics")
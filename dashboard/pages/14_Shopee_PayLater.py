@@ -7,6 +7,13 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import sys
+import os
+
+# Add paths
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.api_client import load_frame
 
 st.set_page_config(page_title="Shopee PayLater", page_icon="💳", layout="wide")
 
@@ -25,16 +32,10 @@ with st.sidebar:
         st.session_state.username = None
         st.switch_page("app.py")
 
-# Load data
-@st.cache_data
-def load_paylater_data():
-    data_path = "/Users/tarang/CascadeProjects/windsurf-project/analytical-showdown-pipeline/cleaned_data"
-    df = pd.read_csv(f"{data_path}/shopee_paylater_cleaned.csv")
-    # Skip header rows
-    df = df[df['Periode Data'].notna() & (df['Periode Data'] != 'Periode Data')]
-    return df
-
-paylater_df = load_paylater_data()
+# Load data (shared, read-only frame from the backend)
+paylater_df = load_frame("shopee_paylater")
+# Skip header rows
+paylater_df = paylater_df[paylater_df['Periode Data'].notna() & (paylater_df['Periode Data'] != 'Periode Data')]
 
 # Header
 st.markdown("# 💳 Shopee PayLater Analytics")
@@ -16,6 +16,7 @@ from components.date_filter import (
     display_comparison_metric,
     create_comparison_chart
 )
+from utils.api_client import load_frame
 
 st.set_page_config(page_title="Period Comparison", page_icon="📊", layout="wide")
 
@@ -39,19 +40,11 @@ st.markdown("# 📊 Period Comparison Analysis")
 st.markdown("### Compare Performance Across Different Time Periods")
 st.markdown("---")
 
-# Load data
-@st.cache_data
-def load_all_data():
-    data_path = "/Users/tarang/CascadeProjects/windsurf-project/analytical-showdown-pipeline/cleaned_data"
-    
-    traffic_df = pd.read_csv(f"{data_path}/traffic_overview_cleaned.csv")
-    product_df = pd.read_csv(f"{data_path}/product_overview_cleaned.csv")
-    chat_df = pd.read_csv(f"{data_path}/chat_data_cleaned.csv")
-    flash_sale_df = pd.read_csv(f"{data_path}/flash_sale_cleaned.csv")
-    
-    return traffic_df, product_df, chat_df, flash_sale_df
-
-traffic_df, product_df, chat_df, flash_sale_df = load_all_data()
+# Load data (shared, read-only frames from the backend)
+traffic_df = load_frame("traffic_overview")
+product_df = load_frame("product_overview")
+chat_df = load_frame("chat_data")
+flash_sale_df = load_frame("flash_sale")
 
 # Date filter for traffic data
 st.markdown("## 🚦 Traffic Analysis")
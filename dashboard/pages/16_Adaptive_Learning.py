@@ -6,10 +6,16 @@ Automatically retrains when new data arrives
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
-import json
+from plotly.subplots import make_subplots
+import sys
 import os
 from datetime import datetime
 
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from ml.forecasting.online_retrainer import OnlineRetrainer
+
 st.set_page_config(
     page_title="Adaptive Learning - Nazava Analytics",
     page_icon="🧠",
@@ -35,80 +41,86 @@ st.markdown("### **Self-Learning Model with Automatic Retraining**")
 st.markdown("*Model automatically improves as new weekly data arrives*")
 st.markdown("---")
 
-# Initialize session state
-if 'model_version' not in st.session_state:
-    st.session_state.model_version = 1
-if 'performance_history' not in st.session_state:
-    st.session_state.performance_history = []
-if 'total_weeks' not in st.session_state:
-    st.session_state.total_weeks = 58
+retrainer = OnlineRetrainer()
+registry = retrainer.registry
+
+if registry.active_version() is None:
+    with st.spinner("🤖 Training the first model version..."):
+        retrainer.retrain()
+
+artifact = registry.load()
+history = registry.history()
 
 # Tabs
 tab1, tab2, tab3 = st.tabs(["📊 Model Status", "➕ Add New Data", "📈 Performance History"])
 
 with tab1:
     st.markdown("## Current Model Status")
-    
-    col1, col2, col3, col4 = st.columns(4)
+
+    accuracy = artifact.metrics.get('Validation_Accuracy', artifact.metrics.get('Test_Accuracy', 0))
+    holdout_accuracy = artifact.metrics.get('Holdout_Accuracy')
+    col1, col2, col3, col4, col5 = st.columns(5)
     with col1:
-        st.metric("Model Version", f"v{st.session_state.model_version}")
+        st.metric("Model Version", artifact.version[:8])
     with col2:
-        st.metric("Training Weeks", st.session_state.total_weeks)
+        st.metric("Training Weeks", artifact.extra.get('weeks', 0))
     with col3:
-        st.metric("Accuracy", "89.18%", delta="+0.5%")
+        st.metric("Validation Accuracy", f"{accuracy:.2f}%",
+                  help="Measured on weeks the candidate's new trees were not trained on")
     with col4:
-        st.metric("Last Updated", "Today")
-    
+        st.metric("Holdout Accuracy", f"{holdout_accuracy:.2f}%" if holdout_accuracy is not None else "—",
+                  help="Previous model on the new weeks, before it was updated with them")
+    with col5:
+        st.metric("Last Updated", artifact.meta['created_at'][:16].replace('T', ' '))
+
     st.markdown("---")
-    
+
     # How it works
     st.markdown("## 🔄 How Adaptive Learning Works")
-    
+
     col1, col2 = st.columns(2)
-    
+
     with col1:
-        st.markdown("""
+        st.markdown(f"""
         **Current Process:**
-        1. Model trained on 58 weeks of historical data
-        2. Achieves 89.18% accuracy on test set
-        3. Generates 6-month forecast
-        
+        1. Model trained on {artifact.extra.get('weeks', 0)} weeks of historical data
+        2. Forecasting booster holds {artifact.extra.get('n_trees', 0)} trees
+        3. Generates 6-month forecast on the Sales Forecast page
+
         **When New Week Arrives:**
         1. New sales data added to dataset
-        2. Model automatically retrains on expanded data
-        3. Performance validated against quality threshold
+        2. New trees are boosted on the recent weeks, holding out up to the last {retrainer.validation_weeks} new weeks
+        3. Accuracy on those unseen weeks (or, for a single new week, the current model's) checked against the quality threshold
         4. If accuracy maintained/improved → model updated
         5. If accuracy drops → previous model retained
         """)
-    
+
     with col2:
-        st.markdown("""
+        st.markdown(f"""
         **Benefits:**
         - ✅ Stays current with latest trends
         - ✅ Learns from recent promotional campaigns
-        - ✅ Adapts to seasonal changes
-        - ✅ Improves accuracy over time
+        - ✅ Retraining time depends on new weeks, not history
+        - ✅ Full refit when past data changes or after {retrainer.max_trees} trees
         - ✅ No manual intervention needed
-        
+
         **Quality Controls:**
-        - Minimum 85% accuracy threshold
+        - Minimum {retrainer.accuracy_threshold:.0f}% accuracy threshold
         - Model versioning (can rollback)
         - Performance tracking
         - Automatic validation
         """)
-    
+
     st.markdown("---")
-    
+
     # Feature importance
     st.markdown("## 🎯 Current Model Features")
-    
+
     features_df = pd.DataFrame({
-        'Feature': ['Products', 'Buyers', 'Product_Sales', 'sales_diff1', 'sales_diff2', 
-                   'Total_Ad_Spend', 'Has_Promotion', 'Voucher_Cost', 'Flash_Sales'],
-        'Importance': [0.3714, 0.3125, 0.1695, 0.0458, 0.0386, 0.0245, 0.0189, 0.0112, 0.0076],
-        'Category': ['Core', 'Core', 'Core', 'Trend', 'Trend', 'Marketing', 'Marketing', 'Marketing', 'Marketing']
-    })
-    
+        'Feature': artifact.feature_cols,
+        'Importance': artifact.boosters['final_model'].feature_importances_
+    }).sort_values('Importance', ascending=False).head(10).iloc[::-1]
+
     fig = go.Figure(go.Bar(
         x=features_df['Importance'],
         y=features_df['Feature'],
@@ -117,7 +129,7 @@ with tab1:
         text=[f"{x:.1%}" for x in features_df['Importance']],
         textposition='outside'
     ))
-    
+
     fig.update_layout(
         title="Feature Importance in Current Model",
         xaxis_title="Importance Score",
@@ -125,50 +137,73 @@ with tab1:
         height=400,
         showlegend=False
     )
-    
+
     st.plotly_chart(fig, use_container_width=True)
 
+def accuracy_note(result):
+    if result.get('gate') == 'holdout':
+        return f"{result['validation_accuracy']:.2f}% accuracy of the previous model on the new week"
+    note = f"{result['validation_accuracy']:.2f}% accuracy on held-out weeks"
+    if result.get('holdout_accuracy') is None:
+        return note
+    return f"{note} (previous model {result['holdout_accuracy']:.2f}% on the new weeks)"
+
+def show_result(result):
+    if result['status'] == 'unchanged':
+        st.info("📊 No new weekly data since the last retraining run")
+    elif result['status'] == 'promoted':
+        st.success(f"✅ {result['mode'].title()} update promoted: `{result['version']}` · "
+                   f"{accuracy_note(result)} · "
+                   f"trained in {result['train_seconds']:.2f}s")
+    else:
+        st.warning(f"⚠️ Candidate `{result['version']}` rejected at {accuracy_note(result)}; "
+                   f"keeping `{result['active_version']}`")
+
 with tab2:
     st.markdown("## ➕ Add New Week Data & Retrain")
-    st.markdown("*Simulate adding new weekly data and automatic model retraining*")
-    
+    st.markdown("*New weeks are appended to weekly_sales_CLEAN.csv and folded into the active model*")
+
     col1, col2 = st.columns([2, 1])
-    
+
+    last_week = pd.Timestamp(artifact.extra.get('last_week', datetime.now()))
+
     with col1:
         st.markdown("### Enter New Week's Data")
-        
-        new_week_date = st.date_input("Week Starting Date", datetime.now())
-        
+
+        new_week_date = st.date_input("Week Starting Date", last_week + pd.Timedelta(days=7))
+
         col_a, col_b = st.columns(2)
         with col_a:
             new_sales = st.number_input("Total Sales (IDR)", min_value=0, value=30000000, step=1000000)
             new_buyers = st.number_input("Total Buyers", min_value=0, value=140, step=10)
         with col_b:
             new_products = st.number_input("Products Sold", min_value=0, value=350, step=10)
-            new_voucher = st.number_input("Voucher Spend (IDR)", min_value=0, value=500000, step=100000)
-        
+            new_product_sales = st.number_input("Product Sales (IDR)", min_value=0, value=new_sales, step=1000000)
+
         if st.button("🚀 Add Data & Retrain Model", type="primary", use_container_width=True):
-            with st.spinner("🤖 Adding new data and retraining model..."):
-                import time
-                time.sleep(2)  # Simulate training
-                
-                # Update session state
-                st.session_state.total_weeks += 1
-                st.session_state.model_version += 1
-                
-                # Add to performance history
-                new_performance = {
-                    'version': st.session_state.model_version,
-                    'timestamp': datetime.now().isoformat(),
-                    'weeks': st.session_state.total_weeks,
-                    'accuracy': 89.18 + (st.session_state.model_version * 0.1),
-                    'sales': new_sales
-                }
-                st.session_state.performance_history.append(new_performance)
-                
-                st.success(f"✅ Model successfully retrained! Now at v{st.session_state.model_version}")
-                st.balloons()
-    
+            try:
+                retrainer.add_week({
+                    'Week': new_week_date,
+                    'Total_Sales': new_sales,
+                    'Buyers': new_buyers,
+                    'Products': new_products,
+                    'Product_Sales': new_product_sales
+                })
+            except ValueError as e:
+                st.error(f"❌ {e}")
+            else:
+                with st.spinner("🤖 Adding new data and retraining model..."):
+                    st.session_state.retrain_result = retrainer.retrain()
+                st.rerun()
+
+        if st.button("🔄 Check for New Data", use_container_width=True):
+            with st.spinner("🤖 Looking for new weeks..."):
+                st.session_state.retrain_result = retrainer.retrain()
+            st.rerun()
+
+        if 'retrain_result' in st.session_state:
+            show_result(st.session_state.retrain_result)
+
     with col2:
         st.markdown("### Preview")
         st.info(f"""
@@ -177,62 +212,87 @@ with tab2:
         - Sales: IDR {new_sales/1e6:.2f}M
         - Buyers: {new_buyers}
         - Products: {new_products}
-        - Voucher: IDR {new_voucher/1e3:.0f}K
-        
+        - Product Sales: IDR {new_product_sales/1e6:.2f}M
+
         **After Retraining:**
-        - Total weeks: {st.session_state.total_weeks + 1}
-        - Model version: v{st.session_state.model_version + 1}
-        - Expected accuracy: ~89.2%
+        - Total weeks: {artifact.extra.get('weeks', 0) + 1}
+        - Trees added: {retrainer.rounds_per_week}
+        - Required accuracy: ≥{retrainer.accuracy_threshold:.0f}%
         """)
 
 with tab3:
     st.markdown("## 📈 Model Performance Over Time")
-    
-    if st.session_state.performance_history:
+
+    runs = [h for h in history if h['status'] in ('promoted', 'rejected')]
+    if runs:
         # Create performance dataframe
-        perf_df = pd.DataFrame(st.session_state.performance_history)
-        
+        perf_df = pd.DataFrame(runs)
+        promoted = perf_df[perf_df['status'] == 'promoted']
+
         # Performance metrics
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("Total Retraining Events", len(perf_df))
+            st.metric("Total Retraining Events", len(perf_df), delta=f"{len(promoted)} promoted")
         with col2:
-            st.metric("Latest Accuracy", f"{perf_df.iloc[-1]['accuracy']:.2f}%")
+            st.metric("Latest Accuracy", f"{perf_df.iloc[-1]['validation_accuracy']:.2f}%")
         with col3:
-            accuracy_change = perf_df.iloc[-1]['accuracy'] - perf_df.iloc[0]['accuracy']
-            st.metric("Accuracy Improvement", f"{accuracy_change:+.2f}%")
-        
+            incremental = perf_df[perf_df['mode'] == 'incremental']
+            avg_time = incremental['train_seconds'].mean() if len(incremental) else perf_df['train_seconds'].mean()
+            st.metric("Avg Retrain Time", f"{avg_time:.2f}s")
+
         # Performance chart
-        fig = go.Figure()
-        
+        fig = make_subplots(specs=[[{"secondary_y": True}]])
+
         fig.add_trace(go.Scatter(
             x=list(range(1, len(perf_df) + 1)),
-            y=perf_df['accuracy'],
+            y=perf_df['validation_accuracy'],
             mode='lines+markers',
             name='Accuracy',
             line=dict(color='#667eea', width=3),
-            marker=dict(size=10)
-        ))
-        
+            marker=dict(size=10, color=['#667eea' if s == 'promoted' else '#e74c3c' for s in perf_df['status']])
+        ), secondary_y=False)
+
+        fig.add_trace(go.Bar(
+            x=list(range(1, len(perf_df) + 1)),
+            y=perf_df['train_seconds'],
+            name='Training Time (s)',
+            marker_color='rgba(118, 75, 162, 0.3)'
+        ), secondary_y=True)
+
+        fig.add_hline(y=retrainer.accuracy_threshold, line_dash="dash", line_color="red",
+                      annotation_text="Quality threshold")
+
         fig.update_layout(
             title="Model Accuracy Over Versions",
-            xaxis_title="Model Version",
-            yaxis_title="Accuracy (%)",
+            xaxis_title="Retraining Run",
             height=400,
             hovermode='x unified'
         )
-        
+        fig.update_yaxes(title_text="Accuracy (%)", secondary_y=False)
+        fig.update_yaxes(title_text="Training Time (s)", secondary_y=True)
+
         st.plotly_chart(fig, use_container_width=True)
-        
+
         # Performance table
         st.markdown("### Detailed History")
-        display_df = perf_df.copy()
-        display_df['timestamp'] = pd.to_datetime(display_df['timestamp']).dt.strftime('%Y-%m-%d %H:%M')
-        display_df['accuracy'] = display_df['accuracy'].apply(lambda x: f"{x:.2f}%")
-        display_df['sales'] = display_df['sales'].apply(lambda x: f"IDR {x/1e6:.2f}M")
-        
+        display_df = perf_df.reindex(columns=['recorded_at', 'version', 'mode', 'status', 'weeks', 'new_weeks',
+                                              'validation_accuracy', 'holdout_accuracy', 'train_seconds'])
+        display_df['recorded_at'] = pd.to_datetime(display_df['recorded_at']).dt.strftime('%Y-%m-%d %H:%M')
+        for col in ['validation_accuracy', 'holdout_accuracy']:
+            display_df[col] = display_df[col].apply(lambda x: f"{x:.2f}%" if pd.notna(x) else "—")
+        display_df['train_seconds'] = display_df['train_seconds'].apply(lambda x: f"{x:.2f}s")
+        display_df.columns = ['Time', 'Version', 'Mode', 'Status', 'Weeks', 'New Weeks', 'Validation Accuracy',
+                              'Holdout Accuracy', 'Train Time']
+
         st.dataframe(display_df, use_container_width=True, hide_index=True)
-        
+
+        if st.button("↩️ Roll back to previous version"):
+            try:
+                st.success(f"✅ Now serving `{retrainer.rollback()}`")
+                st.rerun()
+            except ValueError as e:
+                st.warning(str(e))
+
     else:
         st.info("📊 No retraining history yet. Add new data in the 'Add New Data' tab to see performance tracking.")
 
@@ -243,12 +303,11 @@ st.markdown("""
 
 To enable automatic retraining in production:
 
-1. **Connect Shopee API** - Fetch new weekly data automatically
-2. **Schedule Weekly Job** - Run retraining every Monday
-3. **Set Quality Threshold** - Minimum 85% accuracy required
-4. **Enable Notifications** - Alert if model performance drops
-5. **Version Control** - Keep last 10 model versions for rollback
+1. **Connect Shopee API** - Append new weeks to `weekly_sales_CLEAN.csv`
+2. **Run the watcher** - `python ml/forecasting/online_retrainer.py --watch 3600`
+3. **Set Quality Threshold** - `--threshold 85` (minimum accuracy required)
+4. **Enable Notifications** - Alert on `rejected` entries in the registry history
+5. **Version Control** - `python ml/registry/model_registry.py xgboost_sales_forecaster --rollback`
 
-**Current Status:** Demo mode with manual data entry
-**Production Ready:** Architecture supports full automation
+**Current Status:** Versions and history persisted in the model registry
 """)
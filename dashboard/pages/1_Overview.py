@@ -15,6 +15,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.data_loader import load_traffic_data, load_product_data, load_chat_data, load_flash_sale_data
+from utils.api_client import fetch_kpis
 
 st.set_page_config(page_title="Overview", page_icon="📊", layout="wide")
 
@@ -43,18 +44,32 @@ product_df = load_product_data()
 st.markdown("# 📊 Overview Dashboard")
 st.markdown("### Key Performance Indicators & Trends")
 
+# All-time KPIs from the backend's per-day summary table when it is reachable
+kpis = fetch_kpis()
+freshness = (kpis or {}).get('freshness') or {}
+
 # Data freshness indicator
 col1, col2 = st.columns([3, 1])
 with col2:
-    st.info("📅 **Data Period**: Sep 2025")
+    if freshness.get('data_through'):
+        refreshed = pd.Timestamp(freshness['refreshed_at']).strftime('%d %b %Y %H:%M') if freshness.get('refreshed_at') else '-'
+        st.info(f"📅 **Data through**: {freshness['data_through']}  \n🔄 **Refreshed**: {refreshed}")
+    else:
+        st.info("📅 **Data Period**: Sep 2025")
 
 st.markdown("---")
 
-# Calculate KPIs - ensure all numeric
-total_sales = pd.to_numeric(chat_df['Sales_IDR'], errors='coerce').sum() + pd.to_numeric(flash_sale_df['Sales_Ready_To_Ship_IDR'], errors='coerce').sum()
-total_orders = pd.to_numeric(chat_df['Total_Orders'], errors='coerce').sum() + pd.to_numeric(flash_sale_df['Orders_Ready_To_Ship'], errors='coerce').sum()
-total_visitors = pd.to_numeric(traffic_df['Total_Visitors'], errors='coerce').sum()  # Ensure numeric
-avg_csat = pd.to_numeric(chat_df['CSAT_Percent'], errors='coerce').mean()
+if kpis is not None:
+    total_sales = kpis['total_sales']
+    total_orders = kpis['total_orders']
+    total_visitors = kpis['total_visitors']
+    avg_csat = kpis['customer_satisfaction']
+else:
+    # Calculate KPIs - ensure all numeric
+    total_sales = pd.to_numeric(chat_df['Sales_IDR'], errors='coerce').sum() + pd.to_numeric(flash_sale_df['Sales_Ready_To_Ship_IDR'], errors='coerce').sum()
+    total_orders = pd.to_numeric(chat_df['Total_Orders'], errors='coerce').sum() + pd.to_numeric(flash_sale_df['Orders_Ready_To_Ship'], errors='coerce').sum()
+    total_visitors = pd.to_numeric(traffic_df['Total_Visitors'], errors='coerce').sum()  # Ensure numeric
+    avg_csat = pd.to_numeric(chat_df['CSAT_Percent'], errors='coerce').mean()
 
 # KPI Cards
 col1, col2, col3, col4, col5 = st.columns(5)
@@ -6,6 +6,13 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import sys
+import os
+
+# Add paths
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.api_client import load_frame
 
 st.set_page_config(page_title="Sales Analysis", page_icon="💰", layout="wide")
 
@@ -24,19 +31,10 @@ with st.sidebar:
         st.session_state.username = None
         st.switch_page("app.py")
 
-# Load data
-@st.cache_data
-def load_sales_data():
-    """Load sales data"""
-    data_path = "/Users/tarang/CascadeProjects/windsurf-project/analytical-showdown-pipeline/cleaned_data"
-    
-    chat_df = pd.read_csv(f"{data_path}/chat_data_cleaned.csv")
-    flash_sale_df = pd.read_csv(f"{data_path}/flash_sale_cleaned.csv")
-    voucher_df = pd.read_csv(f"{data_path}/voucher_cleaned.csv")
-    
-    return chat_df, flash_sale_df, voucher_df
-
-chat_df, flash_sale_df, voucher_df = load_sales_data()
+# Load data (shared, read-only frames from the backend)
+chat_df = load_frame("chat_data")
+flash_sale_df = load_frame("flash_sale")
+voucher_df = load_frame("voucher")
 
 # Header
 st.markdown("# 💰 Sales Analysis")
@@ -6,6 +6,13 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import sys
+import os
+
+# Add paths
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.api_client import load_frame
 
 st.set_page_config(page_title="Campaigns", page_icon="🎯", layout="wide")
 
@@ -24,20 +31,11 @@ with st.sidebar:
         st.session_state.username = None
         st.switch_page("app.py")
 
-# Load data
-@st.cache_data
-def load_campaign_data():
-    """Load campaign data"""
-    data_path = "/Users/tarang/CascadeProjects/windsurf-project/analytical-showdown-pipeline/cleaned_data"
-    
-    flash_sale_df = pd.read_csv(f"{data_path}/flash_sale_cleaned.csv")
-    voucher_df = pd.read_csv(f"{data_path}/voucher_cleaned.csv")
-    game_df = pd.read_csv(f"{data_path}/game_cleaned.csv")
-    live_df = pd.read_csv(f"{data_path}/live_cleaned.csv")
-    
-    return flash_sale_df, voucher_df, game_df, live_df
-
-flash_sale_df, voucher_df, game_df, live_df = load_campaign_data()
+# Load data (shared, read-only frames from the backend)
+flash_sale_df = load_frame("flash_sale")
+voucher_df = load_frame("voucher")
+game_df = load_frame("game")
+live_df = load_frame("live")
 
 # Header
 st.markdown("# 🎯 Campaign Performance")
@@ -6,6 +6,13 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import sys
+import os
+
+# Add paths
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.api_client import load_frame
 
 st.set_page_config(page_title="Customer Service", page_icon="💬", layout="wide")
 
@@ -24,18 +31,9 @@ with st.sidebar:
         st.session_state.username = None
         st.switch_page("app.py")
 
-# Load data
-@st.cache_data
-def load_cs_data():
-    """Load customer service data"""
-    data_path = "/Users/tarang/CascadeProjects/windsurf-project/analytical-showdown-pipeline/cleaned_data"
-    
-    chat_df = pd.read_csv(f"{data_path}/chat_data_cleaned.csv")
-    mass_chat_df = pd.read_csv(f"{data_path}/mass_chat_data_cleaned.csv")
-    
-    return chat_df, mass_chat_df
-
-chat_df, mass_chat_df = load_cs_data()
+# Load data (shared, read-only frames from the backend)
+chat_df = load_frame("chat_data")
+mass_chat_df = load_frame("mass_chat_data")
 
 # Header
 st.markdown("# 💬 Customer Service Analytics")
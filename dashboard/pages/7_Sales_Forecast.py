@@ -49,44 +49,66 @@ with col2:
 
 st.markdown("---")
 
+from ml.registry.model_registry import ModelRegistry
+from ml.forecasting.xgboost_forecaster import REGISTRY_NAME
+
+registry = ModelRegistry(REGISTRY_NAME)
+
 # Load the XGBoost forecasting model
 @st.cache_data
-def load_forecast_data():
-    """Load or generate forecast data using XGBoost"""
+def load_forecast_data(active_version):
+    """Load the stored XGBoost model, training only when the data changed
+    
+    Args:
+        active_version: Registry version currently served (keys the cache, so
+            a rollback or a newly trained version is picked up)
+    """
     try:
         from ml.forecasting.xgboost_forecaster import XGBoostSalesForecaster
         
-        with st.spinner("🤖 Training XGBoost model..."):
-            forecaster = XGBoostSalesForecaster()
-            
-            # Load data
-            weekly_sales = forecaster.load_data()
-            
-            # Train model
-            train_data, test_data, y_pred_test = forecaster.train_model(weekly_sales)
-            
-            # Generate forecast
-            future_forecast = forecaster.forecast_future(weeks=26)
-            
-            # Get feature importance
-            feature_importance = forecaster.get_feature_importance()
-            
-            return {
-                'weekly_sales': weekly_sales,
-                'future_forecast': future_forecast,
-                'metrics': forecaster.metrics,
-                'feature_importance': feature_importance,
-                'test_data': test_data,
-                'y_pred_test': y_pred_test
-            }
+        forecaster = XGBoostSalesForecaster()
+        
+        # Load data and the stored model (trains and stores a new version if the data changed)
+        weekly_sales, train_data, test_data, y_pred_test = forecaster.load_or_train(registry)
+        
+        # Generate forecast with the stored final model
+        future_forecast = forecaster.forecast_future(weeks=26)
+        
+        # Get feature importance
+        feature_importance = forecaster.get_feature_importance()
+        
+        return {
+            'weekly_sales': weekly_sales,
+            'future_forecast': future_forecast,
+            'metrics': forecaster.metrics,
+            'feature_importance': feature_importance,
+            'test_data': test_data,
+            'y_pred_test': y_pred_test,
+            'version': forecaster.version
+        }
     except Exception as e:
         st.error(f"❌ Error loading forecast: {str(e)}")
         st.exception(e)
         return None
 
 # Load data with spinner
-with st.spinner("🤖 Training XGBoost model and generating forecast... This may take a moment."):
-    forecast_data = load_forecast_data()
+with st.spinner("🤖 Loading XGBoost model and generating forecast..."):
+    forecast_data = load_forecast_data(registry.active_version())
+
+# Model versions
+with st.sidebar:
+    st.markdown("---")
+    st.markdown("**🗂️ Model Versions**")
+    versions = registry.versions()
+    for v in versions[:5]:
+        marker = "✅" if v['active'] else "▫️"
+        st.caption(f"{marker} `{v['version']}` · {v['created_at'][:16]} · {v['metrics'].get('Test_Accuracy', 0):.2f}%")
+    if len(versions) > 1 and st.button("↩️ Roll back model", use_container_width=True):
+        try:
+            registry.rollback()
+            st.rerun()
+        except ValueError as e:
+            st.warning(str(e))
 
 if forecast_data:
     weekly_sales = forecast_data['weekly_sales']
@@ -0,0 +1,93 @@
+"""
+Backend API Client
+Reads pre-computed results and the cleaned dataset frames from the analytics
+backend (API_URL)
+
+Frames arrive as compressed Arrow IPC and are kept once per replica and frame
+version with st.cache_resource, so every session shares the same read-only
+DataFrame instead of holding its own copy of each CSV. When the backend is
+unreachable the local cleaned file is read and shared the same way.
+"""
+
+import os
+
+import pandas as pd
+import pyarrow as pa
+import requests
+import streamlit as st
+
+from .data_loader import get_data_path
+
+API_URL = os.getenv('API_URL', 'http://localhost:8000')
+TIMEOUT_SECONDS = 5
+FRAME_VERSION_TTL = 30  # Seconds a frame version is trusted before asking the backend again
+FRAME_CACHE_ENTRIES = 64
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def fetch_kpis(start_date=None, end_date=None):
+    """
+    KPIs from /api/analytics/kpis, with freshness metadata when the backend
+    serves them from its per-day summary table
+
+    Returns None when the backend is unreachable so pages can fall back to
+    computing from the local files.
+    """
+    params = {key: str(value) for key, value in (('start_date', start_date), ('end_date', end_date)) if value}
+    try:
+        response = requests.get(f"{API_URL}/api/analytics/kpis", params=params, timeout=TIMEOUT_SECONDS)
+        response.raise_for_status()
+        return response.json()
+    except (requests.RequestException, ValueError):
+        return None
+
+
+@st.cache_data(ttl=FRAME_VERSION_TTL, show_spinner=False)
+def frame_versions():
+    """Frame name -> version from /api/frames, None when the backend is unreachable"""
+    try:
+        response = requests.get(f"{API_URL}/api/frames", timeout=TIMEOUT_SECONDS)
+        response.raise_for_status()
+        return response.json()
+    except (requests.RequestException, ValueError):
+        return None
+
+
+def decode_frame(payload):
+    """DataFrame from an Arrow IPC stream"""
+    return pa.ipc.open_stream(payload).read_pandas()
+
+
+@st.cache_resource(max_entries=FRAME_CACHE_ENTRIES, show_spinner=False)
+def _remote_frame(name, version, columns):
+    params = {'columns': list(columns)} if columns else None
+    response = requests.get(f"{API_URL}/api/frames/{name}", params=params, timeout=TIMEOUT_SECONDS)
+    response.raise_for_status()
+    return decode_frame(response.content)
+
+
+@st.cache_resource(max_entries=FRAME_CACHE_ENTRIES, show_spinner=False)
+def _local_frame(path, fingerprint, columns):
+    return pd.read_csv(path, usecols=list(columns) if columns else None)
+
+
+def load_frame(name, columns=None):
+    """
+    A cleaned dataset as pd.read_csv would return it, e.g. load_frame("chat_data")
+    for chat_data_cleaned.csv
+
+    The frame is shared with every other session of this replica: treat it as
+    read-only and .copy() before assigning columns. Pass columns to fetch and
+    keep only those.
+    """
+    columns = tuple(columns) if columns else None
+    versions = frame_versions()
+    if versions and name in versions:
+        try:
+            return _remote_frame(name, versions[name], columns)
+        except (requests.RequestException, pa.ArrowException):
+            pass
+
+    path = get_data_path() / f"{name}_cleaned.csv"
+    stat = path.stat()
+    return _local_frame(str(path), (stat.st_mtime_ns, stat.st_size), columns)
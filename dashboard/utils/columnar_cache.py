@@ -0,0 +1,142 @@
+"""
+Columnar Cache
+Compiles the cleaned CSVs into typed Arrow IPC files that load with a memory map
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+from pathlib import Path
+
+CACHE_SUFFIX = '.arrow'
+
+# Repeated header values found in the date columns of the raw exports
+HEADER_TOKENS = ['Date', 'Tanggal']
+
+# Declared column types per cleaned file: date columns and known numeric columns
+SCHEMAS = {
+    'traffic_overview_cleaned.csv': {
+        'dates': ['Date'],
+        'numeric': ['Total_Visitors', 'New_Visitors', 'Returning_Visitors', 'New_Followers',
+                    'Products_Viewed', 'Average_Views', 'Average_Time_Spent',
+                    'Rate_Visitors_Viewing_Without_Buying'],
+    },
+    'traffic_overview_processed.csv': {
+        'dates': ['Date'],
+        'numeric': ['Total_Visitors', 'New_Visitors', 'Returning_Visitors', 'New_Followers',
+                    'Products_Viewed', 'Average_Views', 'Average_Time_Spent',
+                    'Rate_Visitors_Viewing_Without_Buying'],
+    },
+    'product_overview_cleaned.csv': {
+        'dates': ['Date'],
+        'numeric': ['Product Visitors (Visits)', 'Product Page Views', 'Likes',
+                    'Product Visitors (Added to Cart)', 'Total Buyers (Orders Created)',
+                    'Products Ordered', 'Total Sales (Orders Created) (IDR)',
+                    'Total Buyers (Orders Ready to Ship)', 'Sales (Orders Ready to Ship) (IDR)'],
+    },
+    'off_platform_cleaned.csv': {
+        'dates': ['Date'],
+        'numeric': ['Sales_IDR', 'Orders', 'Products', 'Visits', 'Visitors',
+                    'Total_Buyers', 'New_Buyers', 'Users_Added_To_Cart'],
+    },
+    'chat_data_cleaned.csv': {
+        'dates': [],
+        'numeric': ['CSAT_Percent'],
+    },
+}
+
+
+def cache_path_for(csv_path):
+    """Path of the columnar file that shadows a CSV"""
+    return Path(csv_path).with_suffix(CACHE_SUFFIX)
+
+
+def is_fresh(csv_path):
+    """True if the columnar file exists and is not older than its CSV"""
+    csv_path = Path(csv_path)
+    cache_path = cache_path_for(csv_path)
+    if not cache_path.exists():
+        return False
+    return cache_path.stat().st_mtime_ns >= csv_path.stat().st_mtime_ns
+
+
+def apply_schema(df, schema):
+    """
+    Convert declared columns to their types
+
+    Args:
+        df: DataFrame as read from the CSV
+        schema: dict with 'dates' and 'numeric' column lists
+
+    Returns:
+        DataFrame with typed columns
+    """
+    # Rows without a parseable date (repeated headers, period summaries) are
+    # dropped by every loader anyway; dropping them before the numeric
+    # conversion keeps integer columns as int64, same as the CSV path
+    for col in schema.get('dates', []):
+        if col in df.columns and df[col].dtype == object:
+            values = df[col].mask(df[col].isin(HEADER_TOKENS))
+            df[col] = pd.to_datetime(values, errors='coerce')
+            df = df.dropna(subset=[col])
+
+    for col in schema.get('numeric', []):
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+
+    return df
+
+
+def build_columnar_cache(csv_path):
+    """
+    Compile one cleaned CSV into a typed, uncompressed Arrow IPC file
+
+    Args:
+        csv_path: Path to a *_cleaned.csv file
+
+    Returns:
+        DataFrame: The typed data that was written
+    """
+    csv_path = Path(csv_path)
+    df = pd.read_csv(csv_path)
+    df = apply_schema(df, SCHEMAS.get(csv_path.name, {}))
+
+    # Write to a temp file and rename so readers never map a half-written file
+    cache_path = cache_path_for(csv_path)
+    tmp_path = cache_path.with_name(cache_path.name + '.tmp')
+    try:
+        feather.write_feather(df, tmp_path, compression='uncompressed')
+        tmp_path.replace(cache_path)
+    except (OSError, pa.ArrowException):
+        # Read-only deployments still get the typed frame, just without the cache
+        tmp_path.unlink(missing_ok=True)
+
+    return df
+
+
+def read_cleaned(csv_path):
+    """
+    Load a cleaned dataset, preferring its columnar cache
+
+    The cache is rebuilt when missing or when the CSV is newer.
+
+    Args:
+        csv_path: Path to a *_cleaned.csv file
+
+    Returns:
+        DataFrame
+    """
+    csv_path = Path(csv_path)
+    if is_fresh(csv_path):
+        try:
+            df = feather.read_table(cache_path_for(csv_path), memory_map=True).to_pandas()
+        except (OSError, pa.ArrowException):
+            return build_columnar_cache(csv_path)
+
+        # Arrow returns None for missing strings; pandas CSV reads give NaN
+        for col in df.columns[df.dtypes == object]:
+            df[col] = df[col].fillna(np.nan)
+        return df
+
+    return build_columnar_cache(csv_path)
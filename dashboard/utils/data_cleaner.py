@@ -2,23 +2,52 @@
 Data cleaning utilities for handling European number formats
 """
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 import re
 
-def clean_european_number(value):
+# What to return for missing or unparseable values
+INVALID_VALUES = {
+    'zero': lambda value: 0.0,      # dashboard
+    'nan': lambda value: np.nan,    # ETL pipeline
+    'keep': lambda value: value,    # keep the original value
+}
+
+# Thousands-only European number, e.g. 1.234 or 12.345.678
+THOUSANDS_PATTERN = r'^\d{1,3}(\.\d{3})+$'
+
+# Short plain decimals that Arrow's cast and float() parse identically
+PLAIN_FLOAT_PATTERN = r'^[+-]?([0-9]+(\.[0-9]*)?|\.[0-9]+)([eE][+-]?[0-9]{1,2})?$'
+PLAIN_FLOAT_MAX_LENGTH = 25
+
+# Cells that are not plain decimals but might still parse: anything outside
+# printable ASCII (Unicode digits and whitespace) or a form float() accepts
+# such as inf, nan or 1_000. Other cells are unparseable.
+MAYBE_FLOAT_PATTERN = r'[^\x20-\x7e]|^[+-]?(?i:inf|infinity|nan|[0-9_.]+([eE][+-]?[0-9_]*)?)$'
+
+# Outcome of the columnar text path per cell
+PARSED, INVALID, PER_VALUE = 0, 1, 2
+
+
+def clean_european_number(value, invalid='zero'):
     """
     Convert European number format to standard format
     European: 1.234,56 (period as thousands, comma as decimal)
     Standard: 1234.56
     
+    This is the per-value reference; use clean_european_numbers for columns.
+    
     Args:
         value: String or numeric value
+        invalid: 'zero', 'nan' or 'keep' for missing or unparseable values
     
     Returns:
         float: Cleaned numeric value
     """
     if pd.isna(value):
-        return 0.0
+        return INVALID_VALUES[invalid](value)
     
     # If already a number, return it
     if isinstance(value, (int, float)):
@@ -44,7 +73,7 @@ def clean_european_number(value):
     elif '.' in value_str:
         # Check if it's likely a thousands separator
         # If the period is followed by exactly 3 digits, it's likely thousands
-        if re.match(r'^\d{1,3}(\.\d{3})+$', value_str):
+        if re.match(THOUSANDS_PATTERN, value_str):
             # Remove periods (thousands separator)
             value_str = value_str.replace('.', '')
         # Otherwise it's a decimal point, keep it
@@ -55,7 +84,125 @@ def clean_european_number(value):
     try:
         return float(value_str)
     except (ValueError, TypeError):
-        return 0.0
+        return INVALID_VALUES[invalid](value)
+
+
+def _parse_text_column(texts):
+    """
+    Apply the clean_european_number rules to an array of str with Arrow kernels
+    
+    Returns:
+        tuple: (float64 values, per-cell outcome: PARSED, INVALID or
+        PER_VALUE for cells that need clean_european_number itself)
+    """
+    arr = pa.array(texts, type=pa.string())
+    
+    # The patterns below only accept ASCII without tabs or newlines, where
+    # strip() + removing spaces is just removing spaces and \d means [0-9]
+    text = pc.replace_substring(arr, ' ', '')
+    
+    # With a comma: drop periods, comma becomes the decimal point
+    # (1.234,56 -> 1234.56, 1,5 -> 1.5). Lone-period thousands drop the
+    # periods too (1.234 -> 1234) and the comma replace is then a no-op.
+    european = pc.or_(pc.match_substring(text, ','),
+                      pc.match_substring_regex(text, r'^[0-9]{1,3}(\.[0-9]{3})+$'))
+    rewritten = pc.replace_substring(pc.replace_substring(text, '.', ''), ',', '.')
+    text = pc.if_else(european, rewritten, text)
+    
+    plain = pc.and_(pc.match_substring_regex(text, PLAIN_FLOAT_PATTERN),
+                    pc.less_equal(pc.utf8_length(text), PLAIN_FLOAT_MAX_LENGTH))
+    invalid = pc.invert(pc.match_substring_regex(text, MAYBE_FLOAT_PATTERN))
+    
+    outcome = np.full(len(texts), PER_VALUE, dtype=np.int8)
+    outcome[invalid.to_numpy(zero_copy_only=False)] = INVALID
+    plain_mask = plain.to_numpy(zero_copy_only=False)
+    values = np.full(len(texts), np.nan)
+    try:
+        values[plain_mask] = pc.cast(pc.filter(text, plain), pa.float64()).to_numpy(zero_copy_only=False)
+    except pa.ArrowInvalid:
+        return values, outcome
+    outcome[plain_mask] = PARSED
+    
+    return values, outcome
+
+
+def clean_european_numbers(series, invalid='zero'):
+    """
+    Vectorized clean_european_number for a whole column
+    
+    Numbers are cast in one go and strings are rewritten and parsed with
+    Arrow compute kernels over the whole column. Cells outside the simple
+    forms (text such as '-', non-ASCII digits, Decimals, ...) go through
+    clean_european_number, so results equal Series.apply(clean_european_number).
+    
+    Args:
+        series: pandas Series
+        invalid: 'zero', 'nan' or 'keep' for missing or unparseable values
+    
+    Returns:
+        Series with cleaned values (float64 unless invalid='keep' kept non-numbers)
+    """
+    if invalid not in INVALID_VALUES:
+        raise ValueError(f"invalid must be one of {list(INVALID_VALUES)}")
+    
+    # Plain NumPy numeric and boolean columns only need the missing-value rule
+    if isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biuf':
+        result = series.astype('float64')
+        if invalid == 'zero':
+            result = result.fillna(0.0)
+        return result
+    
+    # Series.apply leaves an empty column's dtype as it is
+    if series.empty:
+        return series.copy()
+    
+    values = np.asarray(series, dtype=object)
+    result = np.full(len(values), np.nan)
+    
+    types = np.frompyfunc(type, 1, 1)(values)
+    missing = pd.isna(values)
+    is_float = types == float
+    is_number = (is_float | (types == int)) & ~missing
+    is_text = types == str
+    
+    # Unparseable cells take the invalid value; with 'keep' that is the cell itself
+    invalid_cells = missing.copy()
+    per_value = ~(is_number | is_text | missing)
+    
+    if is_number.any():
+        result[is_number] = values[is_number].astype('float64')
+    if is_text.any():
+        text_positions = np.flatnonzero(is_text)
+        parsed, outcome = _parse_text_column(values[text_positions])
+        result[text_positions] = parsed
+        invalid_cells[text_positions[outcome == INVALID]] = True
+        per_value[text_positions[outcome == PER_VALUE]] = True
+    
+    kept = np.zeros(len(values), dtype=bool)
+    if invalid == 'zero':
+        result[invalid_cells] = 0.0
+    elif invalid == 'keep':
+        # NaN stays a float; None, NaT and text are kept as they are
+        kept = invalid_cells & ~(missing & is_float)
+    
+    # Remaining cells (non-ASCII text, Decimals, NumPy scalars, ...) use the per-value function
+    kept_values = values.copy() if invalid == 'keep' else None
+    for i in np.flatnonzero(per_value):
+        cleaned = clean_european_number(values[i], invalid)
+        if isinstance(cleaned, float):
+            result[i] = cleaned
+        else:
+            kept[i] = True
+            kept_values[i] = cleaned
+    
+    # Same dtype inference as Series.apply: floats mixed with None stay float64
+    if kept.any():
+        only_none = not kept.all() and all(v is None for v in kept_values[kept])
+        if not only_none:
+            result = result.astype(object)
+            result[kept] = kept_values[kept]
+    
+    return pd.Series(result, index=series.index, name=series.name)
 
 
 def clean_dataframe_numbers(df, columns):
@@ -73,7 +220,7 @@ def clean_dataframe_numbers(df, columns):
     
     for col in columns:
         if col in df_clean.columns:
-            df_clean[col] = df_clean[col].apply(clean_european_number)
+            df_clean[col] = clean_european_numbers(df_clean[col])
     
     return df_clean
 
@@ -103,7 +250,7 @@ def auto_clean_numeric_columns(df):
                 # Check if any value contains digits
                 has_digits = any(str(val) for val in sample if re.search(r'\d', str(val)))
                 if has_digits:
-                    df_clean[col] = df_clean[col].apply(clean_european_number)
+                    df_clean[col] = clean_european_numbers(df_clean[col])
         except:
             # If cleaning fails, skip this column
             continue
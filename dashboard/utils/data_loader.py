@@ -8,6 +8,8 @@ import streamlit as st
 from pathlib import Path
 import os
 
+from .columnar_cache import read_cleaned
+
 # Get the project root directory (works both locally and on Streamlit Cloud)
 DASHBOARD_DIR = Path(__file__).parent.parent
 PROJECT_ROOT = DASHBOARD_DIR.parent
@@ -38,9 +40,9 @@ def load_traffic_data():
     data_path = get_data_path()
     # Try processed first, then cleaned
     if (data_path / "traffic_overview_processed.csv").exists():
-        df = pd.read_csv(data_path / "traffic_overview_processed.csv")
+        df = read_cleaned(data_path / "traffic_overview_processed.csv")
     else:
-        df = pd.read_csv(data_path / "traffic_overview_cleaned.csv")
+        df = read_cleaned(data_path / "traffic_overview_cleaned.csv")
     
     # Convert date
     if 'Date' in df.columns:
@@ -64,7 +66,7 @@ def load_product_data():
     Returns: DataFrame with Date as datetime and numeric columns
     """
     data_path = get_data_path()
-    df = pd.read_csv(data_path / "product_overview_cleaned.csv")
+    df = read_cleaned(data_path / "product_overview_cleaned.csv")
     
     # Convert date
     if 'Date' in df.columns:
@@ -91,7 +93,7 @@ def load_chat_data():
     Returns: DataFrame
     """
     data_path = get_data_path()
-    df = pd.read_csv(data_path / "chat_data_cleaned.csv")
+    df = read_cleaned(data_path / "chat_data_cleaned.csv")
     
     # Fix CSAT - if values are < 2, they're decimals that need *100
     if 'CSAT_Percent' in df.columns:
@@ -109,7 +111,7 @@ def load_flash_sale_data():
     Returns: DataFrame
     """
     data_path = get_data_path()
-    df = pd.read_csv(data_path / "flash_sale_cleaned.csv")
+    df = read_cleaned(data_path / "flash_sale_cleaned.csv")
     return df
 
 @st.cache_data
@@ -119,7 +121,7 @@ def load_voucher_data():
     Returns: DataFrame
     """
     data_path = get_data_path()
-    df = pd.read_csv(data_path / "voucher_cleaned.csv")
+    df = read_cleaned(data_path / "voucher_cleaned.csv")
     return df
 
 @st.cache_data
@@ -129,7 +131,7 @@ def load_game_data():
     Returns: DataFrame
     """
     data_path = get_data_path()
-    df = pd.read_csv(data_path / "game_cleaned.csv")
+    df = read_cleaned(data_path / "game_cleaned.csv")
     return df
 
 @st.cache_data
@@ -139,7 +141,7 @@ def load_live_data():
     Returns: DataFrame
     """
     data_path = get_data_path()
-    df = pd.read_csv(data_path / "live_cleaned.csv")
+    df = read_cleaned(data_path / "live_cleaned.csv")
     return df
 
 @st.cache_data
@@ -149,7 +151,7 @@ def load_mass_chat_data():
     Returns: DataFrame
     """
     data_path = get_data_path()
-    df = pd.read_csv(data_path / "mass_chat_data_cleaned.csv")
+    df = read_cleaned(data_path / "mass_chat_data_cleaned.csv")
     return df
 
 @st.cache_data
@@ -159,7 +161,7 @@ def load_off_platform_data():
     Returns: DataFrame with Date as datetime and numeric columns
     """
     data_path = get_data_path()
-    df = pd.read_csv(data_path / "off_platform_cleaned.csv")
+    df = read_cleaned(data_path / "off_platform_cleaned.csv")
     
     # Remove header rows
     df = df[df['Date'].notna() & (df['Date'] != 'Date') & (df['Date'] != 'Tanggal')]
@@ -185,7 +187,7 @@ def load_paylater_data():
     Returns: DataFrame
     """
     data_path = get_data_path()
-    df = pd.read_csv(data_path / "shopee_paylater_cleaned.csv")
+    df = read_cleaned(data_path / "shopee_paylater_cleaned.csv")
     
     # Skip header rows
     df = df[df['Periode Data'].notna() & (df['Periode Data'] != 'Periode Data')]
@@ -199,7 +201,7 @@ def load_revenue_data():
     Returns: DataFrame
     """
     data_path = get_data_path()
-    df = pd.read_csv(data_path / "revenue_2_cleaned.csv")
+    df = read_cleaned(data_path / "revenue_2_cleaned.csv")
     return df
 
 @st.cache_data
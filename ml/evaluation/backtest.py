@@ -0,0 +1,319 @@
+"""
+Rolling-Origin Backtesting - Comparable accuracy numbers for every forecaster
+
+All forecasters implement the same protocol:
+
+    model.fit(train_df)          # frame with 'ds', 'y' and any driver columns
+    model.predict(test_df)       # forecast for test_df['ds'] from the fit only
+
+run_backtest() cuts the data into expanding- or sliding-window folds, runs
+every (model, fold) pair in a process pool and caches each result under
+(model, model code hash, data hash, fold), so a rerun only fits what changed.
+leaderboard() aggregates the folds per model.
+"""
+
+import ast
+import contextlib
+import hashlib
+import importlib
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from ml.registry.fingerprint import data_fingerprint
+
+DEFAULT_CACHE_DIR = Path(__file__).parent / ".backtest_cache"
+
+# Top-level packages whose sources count towards a model's fingerprint
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+PROJECT_PACKAGES = ('ml',)
+
+# Model name -> (module, class, constructor kwargs). Prophet fits are not
+# cached: every fold is a new training window, and a fold must time a real fit.
+MODELS = {
+    'naive_ma4': ('ml.evaluation.backtest', 'MovingAverageForecaster', {'window': 4}),
+    'prophet_sales': ('ml.forecasting.sales_forecaster', 'SalesForecaster', {}),
+    'prophet_improved': ('ml.forecasting.improved_sales_forecaster', 'ImprovedSalesForecaster', {'use_cache': False}),
+    'prophet_final': ('ml.forecasting.final_sales_forecaster', 'FinalSalesForecaster', {'use_cache': False}),
+    'xgboost': ('ml.forecasting.xgboost_forecaster', 'XGBoostSalesForecaster', {}),
+}
+
+
+class MovingAverageForecaster:
+    """Baseline: every future period is the mean of the last `window` observed ones"""
+
+    def __init__(self, window=4):
+        self.window = window
+        self.level = None
+
+    def fit(self, df):
+        self.level = df['y'].tail(self.window).mean()
+        return self
+
+    def predict(self, df):
+        return np.full(len(df), self.level)
+
+
+@dataclass(frozen=True)
+class Fold:
+    """Row positions of one backtest fold: train on [train_start, train_end), test on [train_end, test_end)"""
+    index: int
+    train_start: int
+    train_end: int
+    test_end: int
+
+
+def rolling_origins(n_rows, horizon, n_folds, min_train=None, window='expanding', step=None):
+    """
+    Forecast origins for a rolling-origin backtest
+
+    Args:
+        n_rows: Length of the series
+        horizon: Periods forecast from each origin
+        n_folds: Number of origins; the last one ends at the end of the data
+        min_train: Smallest training set (sliding windows use exactly this)
+        window: 'expanding' keeps all history, 'sliding' keeps the last min_train rows
+        step: Periods between origins (default: horizon)
+
+    Returns:
+        List of Fold, oldest origin first
+    """
+    if window not in ('expanding', 'sliding'):
+        raise ValueError(f"window must be 'expanding' or 'sliding', got {window!r}")
+    step = step or horizon
+    first_origin = n_rows - horizon - step * (n_folds - 1)
+    min_train = min_train or first_origin
+    if first_origin < min_train or min_train < 1:
+        raise ValueError(f"{n_rows} rows are too few for {n_folds} folds of {horizon} "
+                         f"periods with at least {min_train} training rows")
+
+    folds = []
+    for i in range(n_folds):
+        origin = first_origin + i * step
+        train_start = origin - min_train if window == 'sliding' else 0
+        folds.append(Fold(i, train_start, origin, origin + horizon))
+    return folds
+
+
+def _module_path(module):
+    """Source file of a module of this repository, None for anything else"""
+    path = PROJECT_ROOT.joinpath(*module.split('.')).with_suffix('.py')
+    return path if module.split('.')[0] in PROJECT_PACKAGES and path.exists() else None
+
+
+def _is_main_block(node):
+    return (isinstance(node, ast.If) and isinstance(node.test, ast.Compare)
+            and isinstance(node.test.left, ast.Name) and node.test.left.id == '__name__')
+
+
+def _project_imports(path):
+    """Repository modules imported in a source file, including inside functions (not in __main__ blocks)"""
+    pending = [ast.parse(path.read_bytes())]
+    while pending:
+        node = pending.pop()
+        pending.extend(child for child in ast.iter_child_nodes(node) if not _is_main_block(child))
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            # `from ml.forecasting import feature_pipeline` imports a module too
+            names = [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+        else:
+            continue
+        for name in names:
+            module_path = _module_path(name)
+            if module_path is not None:
+                yield module_path
+
+
+def model_sources(module):
+    """Source files of a model's module and every repository module it imports, transitively"""
+    start = _module_path(module)
+    seen, pending = set(), [start] if start else []
+    while pending:
+        path = pending.pop()
+        if path not in seen:
+            seen.add(path)
+            pending.extend(_project_imports(path))
+    return sorted(seen)
+
+
+def model_fingerprint(name):
+    """
+    Hash of a model's spec and its code
+
+    The code is the model's module plus everything it imports from the
+    repository (feature pipeline, campaign calendar, fit caches, ...), so
+    editing any of them invalidates the model's cached folds.
+    """
+    module, cls, kwargs = MODELS[name]
+    digest = hashlib.sha256(json.dumps([module, cls, kwargs], sort_keys=True).encode())
+    for path in model_sources(module):
+        digest.update(path.relative_to(PROJECT_ROOT).as_posix().encode() + b'\0')
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def _metrics(y_true, y_pred):
+    mask = y_true > 0
+    errors = y_true - y_pred
+    return {
+        'MAPE': float(np.mean(np.abs(errors[mask] / y_true[mask])) * 100) if mask.any() else float('nan'),
+        'MAE': float(np.mean(np.abs(errors))),
+        'RMSE': float(np.sqrt(np.mean(errors ** 2))),
+    }
+
+
+def _run_fold(job):
+    """Process pool entry point: fit and score one model on one fold"""
+    name, fold, data = job
+    module, cls, kwargs = MODELS[name]
+    train = data.iloc[fold.train_start:fold.train_end].reset_index(drop=True)
+    test = data.iloc[fold.train_end:fold.test_end].reset_index(drop=True)
+    result = {'model': name, **asdict(fold), 'train_rows': len(train), 'test_rows': len(test)}
+
+    try:
+        model = getattr(importlib.import_module(module), cls)(**kwargs)
+        tracemalloc.start()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            model.fit(train)
+            fit_time = time.perf_counter() - start
+            start = time.perf_counter()
+            y_pred = np.asarray(model.predict(test[['ds']]), dtype=float)
+            predict_time = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        result.update(_metrics(test['y'].to_numpy(dtype=float), y_pred))
+        result.update({'fit_seconds': fit_time, 'predict_seconds': predict_time,
+                       'peak_mb': peak / 1e6, 'error': None})
+    except Exception as e:
+        # Missing optional dependencies (prophet) or a failing fit only knock out this model
+        result['error'] = f"{type(e).__name__}: {e}"
+    finally:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+    return result
+
+
+def run_backtest(data, models=None, horizon=4, n_folds=5, min_train=None, window='expanding',
+                 step=None, workers=None, cache_dir=None, use_cache=True):
+    """
+    Backtest forecasters on rolling origins
+
+    Args:
+        data: Frame sorted by date with 'ds', 'y' and any driver columns
+        models: Model names from MODELS (default: all)
+        horizon, n_folds, min_train, window, step: See rolling_origins
+        workers: Process pool size (default: CPU count, 1 = no pool)
+        cache_dir: Where per-fold results are cached (default: ml/evaluation/.backtest_cache)
+        use_cache: Read cached results (results are always written)
+
+    Returns:
+        Frame with one row per (model, fold): MAPE, MAE, RMSE, fit_seconds,
+        predict_seconds, peak_mb (peak Python/NumPy allocations), error and cached
+    """
+    models = list(models or MODELS)
+    data = data.sort_values('ds').reset_index(drop=True)
+    folds = rolling_origins(len(data), horizon, n_folds, min_train, window, step)
+    cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    data_hash = data_fingerprint(data)
+
+    results, jobs, paths = [], [], []
+    for name in models:
+        model_hash = model_fingerprint(name)
+        for fold in folds:
+            key = f"{name}|{model_hash}|{data_hash}|{fold.train_start}:{fold.train_end}:{fold.test_end}"
+            path = cache_dir / f"{hashlib.sha1(key.encode()).hexdigest()}.json"
+            if use_cache and path.exists():
+                with open(path) as f:
+                    results.append({**json.load(f), 'index': fold.index, 'cached': True})
+            else:
+                jobs.append((name, fold, data))
+                paths.append(path)
+
+    if workers == 1 or len(jobs) <= 1:
+        fresh = list(map(_run_fold, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            fresh = list(pool.map(_run_fold, jobs))
+
+    for result, path in zip(fresh, paths):
+        if result['error'] is None:
+            tmp = path.with_suffix('.json.tmp')
+            with open(tmp, 'w') as f:
+                json.dump(result, f)
+            os.replace(tmp, path)
+        results.append({**result, 'cached': False})
+
+    order = {name: i for i, name in enumerate(models)}
+    results.sort(key=lambda r: (order[r['model']], r['index']))
+    return pd.DataFrame(results)
+
+
+def leaderboard(results):
+    """
+    Aggregate backtest folds per model, best mean MAPE first
+
+    Returns:
+        Frame indexed by model with mean metrics, timings and fold counts
+    """
+    ok = results[results['error'].isna()]
+    board = ok.groupby('model').agg(
+        MAPE=('MAPE', 'mean'),
+        MAPE_std=('MAPE', 'std'),
+        MAE=('MAE', 'mean'),
+        RMSE=('RMSE', 'mean'),
+        fit_seconds=('fit_seconds', 'mean'),
+        predict_seconds=('predict_seconds', 'mean'),
+        peak_mb=('peak_mb', 'max'),
+        folds=('index', 'count'),
+    )
+    failed = results[results['error'].notna()].groupby('model')['error'].first()
+    board = board.reindex(board.index.union(failed.index))
+    board['error'] = failed.reindex(board.index)
+    board['folds'] = board['folds'].fillna(0).astype(int)
+    return board.sort_values('MAPE', na_position='last')
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Rolling-origin backtest of the sales forecasters")
+    parser.add_argument('--data-path', help="Project data directory (as for XGBoostSalesForecaster)")
+    parser.add_argument('--models', nargs='+', choices=list(MODELS), help="Models to run (default: all)")
+    parser.add_argument('--horizon', type=int, default=4, help="Weeks forecast from each origin")
+    parser.add_argument('--folds', type=int, default=5, help="Number of forecast origins")
+    parser.add_argument('--window', choices=['expanding', 'sliding'], default='expanding')
+    parser.add_argument('--min-train', type=int, help="Minimum (sliding: exact) training weeks")
+    parser.add_argument('--workers', type=int, help="Pool size (default: CPU count)")
+    parser.add_argument('--no-cache', action='store_true', help="Refit every fold")
+    args = parser.parse_args()
+
+    from ml.forecasting.xgboost_forecaster import XGBoostSalesForecaster
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        weekly_sales = XGBoostSalesForecaster(args.data_path).load_data()
+    raw_cols = [c for c in weekly_sales.columns if c in (
+        'Week', 'Total_Sales', 'Buyers', 'Products', 'Product_Sales', 'Flash_Sales', 'Flash_Orders',
+        'Voucher_Cost', 'Voucher_Orders', 'Live_Sales', 'Game_Sales', 'Total_Ad_Spend', 'Has_Promotion')]
+    data = weekly_sales[raw_cols].rename(columns={'Week': 'ds', 'Total_Sales': 'y'})
+
+    print("=" * 60)
+    print("FORECASTER BACKTEST")
+    print("=" * 60)
+    results = run_backtest(data, args.models, args.horizon, args.folds, args.min_train,
+                           args.window, workers=args.workers, use_cache=not args.no_cache)
+    print(f"{len(data)} weeks, {args.folds} {args.window} folds, {args.horizon}-week horizon, "
+          f"{results['cached'].sum()} of {len(results)} fold results from cache\n")
+    print(leaderboard(results).to_string(float_format=lambda v: f"{v:,.2f}"))
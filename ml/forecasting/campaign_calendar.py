@@ -0,0 +1,129 @@
+"""
+Campaign Calendar - Weekly totals of every promotion type in one table
+
+The flash sale, voucher, live stream and game exports are stacked into one
+long (Week, metric, value) frame and aggregated with a single groupby. The
+result is cached as an Arrow IPC file next to the exports, keyed on their
+modification time and size, so forecasters only re-aggregate campaign logs
+when they change and join all promotion types with one aligned reindex.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+# Campaign export -> {source column: weekly column}, in join order
+CAMPAIGN_SOURCES = {
+    'flash_sale_cleaned.csv': {'Sales_Orders_Created_IDR': 'Flash_Sales', 'Orders_Created': 'Flash_Orders'},
+    'voucher_cleaned.csv': {'Total_Cost_Orders_Created_IDR': 'Voucher_Cost', 'Orders_Created': 'Voucher_Orders'},
+    'live_cleaned.csv': {'Sales_Orders_Created_IDR': 'Live_Sales'},
+    'game_cleaned.csv': {'Sales_Orders_Created_IDR': 'Game_Sales'},
+}
+
+CALENDAR_FILE = 'campaign_calendar_weekly.arrow'
+CALENDAR_VERSION = 1  # Bump when the aggregation changes
+SIGNATURE_KEY = b'campaign_signature'
+
+
+def source_signature(cleaned_path):
+    """
+    (mtime, size) of every campaign export
+
+    Raises:
+        FileNotFoundError: If an export is missing
+    """
+    signature = {'version': CALENDAR_VERSION}
+    for filename in CAMPAIGN_SOURCES:
+        stat = os.stat(Path(cleaned_path) / filename)
+        signature[filename] = [stat.st_mtime_ns, stat.st_size]
+    return json.dumps(signature, sort_keys=True)
+
+
+def _week_start(time_period):
+    """Monday of each Time_Period, parsing every distinct label once"""
+    codes, labels = pd.factorize(time_period)
+    weeks = pd.to_datetime(pd.Series(labels, dtype=object), errors='coerce').dt.to_period('W').dt.start_time
+    weeks = np.append(weeks.to_numpy(dtype='datetime64[ns]'), np.datetime64('NaT', 'ns'))
+    return weeks[codes]  # code -1 (missing label) picks the trailing NaT
+
+
+def build_campaign_calendar(cleaned_path):
+    """
+    Aggregate all campaign exports to one weekly table
+
+    Exports that are empty or have no Time_Period column contribute no
+    columns. Weeks where a campaign type didn't run are 0.
+
+    Args:
+        cleaned_path: Directory with the *_cleaned.csv campaign exports
+
+    Returns:
+        Frame indexed by week start with one column per weekly metric
+    """
+    stacked = []
+    columns = []
+    for filename, metrics in CAMPAIGN_SOURCES.items():
+        path = Path(cleaned_path) / filename
+        if 'Time_Period' not in pd.read_csv(path, nrows=0).columns:
+            continue
+        df = pd.read_csv(path, usecols=['Time_Period', *metrics])
+        if df.empty:
+            continue
+
+        week = _week_start(df['Time_Period'])
+        for source, name in metrics.items():
+            # Metrics are grouped by position in `columns`; integer keys group much faster than strings
+            stacked.append(pd.DataFrame({'Week': week, 'metric': len(columns), 'value': df[source].astype(float)}))
+            columns.append(name)
+
+    if not stacked:
+        return pd.DataFrame(index=pd.DatetimeIndex([], name='Week'))
+
+    long = pd.concat(stacked, ignore_index=True)
+    calendar = long.groupby(['Week', 'metric'])['value'].sum().unstack('metric')
+    calendar = calendar.reindex(columns=range(len(columns))).fillna(0)
+    calendar.columns = columns
+    return calendar
+
+
+def load_campaign_calendar(cleaned_path, use_cache=True):
+    """
+    Weekly campaign table, rebuilt only when an export changed
+
+    Args:
+        cleaned_path: Directory with the *_cleaned.csv campaign exports
+        use_cache: Read and write campaign_calendar_weekly.arrow
+
+    Returns:
+        Frame indexed by week start (see build_campaign_calendar)
+    """
+    signature = source_signature(cleaned_path)
+    cache_path = Path(cleaned_path) / CALENDAR_FILE
+
+    if use_cache and cache_path.exists():
+        try:
+            table = feather.read_table(cache_path, memory_map=True)
+            if (table.schema.metadata or {}).get(SIGNATURE_KEY) == signature.encode():
+                return table.to_pandas().set_index('Week')
+        except (OSError, pa.ArrowException):
+            pass
+
+    calendar = build_campaign_calendar(cleaned_path)
+    if use_cache:
+        table = pa.Table.from_pandas(calendar.reset_index(), preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), SIGNATURE_KEY: signature})
+
+        # Write to a temp file and rename so readers never map a half-written file
+        tmp_path = cache_path.with_name(cache_path.name + '.tmp')
+        try:
+            feather.write_feather(table, tmp_path, compression='uncompressed')
+            tmp_path.replace(cache_path)
+        except (OSError, pa.ArrowException):
+            # Read-only deployments still get the table, just without the cache
+            tmp_path.unlink(missing_ok=True)
+    return calendar
@@ -0,0 +1,314 @@
+"""
+Feature Pipeline - One declarative feature spec for training and forecasting
+
+Every forecasting feature is a row in FEATURE_SPEC: an operation (calendar
+field, raw value, lag, diff, rolling stat or ratio) applied to source columns.
+FeaturePipeline compiles a list of feature names into column-wise NumPy
+operations that write straight into one preallocated matrix:
+
+    transform()      - one row per observed week (training, evaluation)
+    forecast_base()  - the weeks after each series' history (forecasting)
+
+Both handle a single series or a panel of series sorted by series and week,
+where lags and windows never cross a series boundary. Features of the target
+are shifted one week (Feature.shift), so a week's features never contain its
+own sales and forecast_base can give the week after the history exactly what
+transform() would. Rolling statistics are direct sums over the few lagged
+values of each window (window_stat), the arithmetic the feature roller uses
+too; they agree with Series.rolling(window, min_periods=1) to rounding.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+TARGET = 'Total_Sales'
+
+# Weeks averaged to hold raw drivers constant over the forecast horizon
+HOLD_WEEKS = 4
+
+# Stand-ins for columns that are unknown in future weeks
+FUTURE_PROXIES = {TARGET: 'Product_Sales'}
+
+
+@dataclass(frozen=True)
+class Feature:
+    """
+    One model feature
+
+    Ops: 'calendar' (param = field of the week date), 'value' (the column
+    itself), 'lag' and 'diff' (param = weeks back), 'rolling_mean',
+    'rolling_std' and 'rolling_sum' (param = window, min_periods=1) and
+    'ratio' (sources[0] / (sources[1] + 1)).
+
+    shift moves a diff or rolling feature back that many weeks, so at week t
+    it only sees weeks up to t - shift. Features of the target use 1: the
+    target is unknown at t when forecasting.
+    """
+    name: str
+    op: str
+    sources: tuple
+    param: object = None
+    shift: int = 0
+
+
+FEATURE_SPEC = [
+    # Time features
+    Feature('week_of_year', 'calendar', ('Week',), 'week_of_year'),
+    Feature('month', 'calendar', ('Week',), 'month'),
+    Feature('quarter', 'calendar', ('Week',), 'quarter'),
+    Feature('year', 'calendar', ('Week',), 'year'),
+    Feature('is_month_start', 'calendar', ('Week',), 'is_month_start'),
+    Feature('is_month_end', 'calendar', ('Week',), 'is_month_end'),
+    # Lag features
+    Feature('sales_lag1', 'lag', (TARGET,), 1),
+    Feature('sales_lag2', 'lag', (TARGET,), 2),
+    Feature('sales_lag3', 'lag', (TARGET,), 3),
+    # Rolling averages and volatility of the previous weeks
+    Feature('sales_ma3', 'rolling_mean', (TARGET,), 3, shift=1),
+    Feature('sales_ma4', 'rolling_mean', (TARGET,), 4, shift=1),
+    Feature('sales_std3', 'rolling_std', (TARGET,), 3, shift=1),
+    # Interaction features
+    Feature('product_buyer_ratio', 'ratio', ('Products', 'Buyers')),
+    Feature('sales_per_product', 'ratio', ('Product_Sales', 'Products')),
+    Feature('sales_per_buyer', 'ratio', ('Product_Sales', 'Buyers')),
+    # Trend features, up to the previous week
+    Feature('sales_diff1', 'diff', (TARGET,), 1, shift=1),
+    Feature('sales_diff2', 'diff', (TARGET,), 2, shift=1),
+    # Marketing features
+    Feature('ad_spend_lag1', 'lag', ('Total_Ad_Spend',), 1),
+    Feature('ad_spend_ma3', 'rolling_mean', ('Total_Ad_Spend',), 3),
+    Feature('sales_per_ad_dollar', 'ratio', (TARGET, 'Total_Ad_Spend')),
+    Feature('promo_lag1', 'lag', ('Has_Promotion',), 1),
+    Feature('promo_streak', 'rolling_sum', ('Has_Promotion',), 3),
+    Feature('voucher_roi', 'ratio', (TARGET, 'Voucher_Cost')),
+    # Raw drivers used as features
+    Feature('Product_Sales', 'value', ('Product_Sales',)),
+    Feature('Buyers', 'value', ('Buyers',)),
+    Feature('Products', 'value', ('Products',)),
+    Feature('Total_Ad_Spend', 'value', ('Total_Ad_Spend',)),
+    Feature('Has_Promotion', 'value', ('Has_Promotion',)),
+    Feature('Flash_Sales', 'value', ('Flash_Sales',)),
+]
+
+FEATURES = {feature.name: feature for feature in FEATURE_SPEC}
+
+
+def derived_features(columns, date_col='Week'):
+    """Engineered (non-raw) features whose source columns are all in `columns`, in spec order"""
+    columns = set(columns) | ({'Week'} if date_col in columns else set())
+    return [f.name for f in FEATURE_SPEC if f.op != 'value' and set(f.sources) <= columns]
+
+
+def window_stat(values, how):
+    """
+    Rolling statistic of one window per element, min_periods=1
+
+    Args:
+        values: The window's weeks, newest first: equally shaped arrays with
+            NaN where a week is missing or before the series start
+        how: 'mean', 'std' (ddof=1) or 'sum'
+
+    Returns:
+        Array of the values' shape, NaN where the window holds no value (or
+        one, for std)
+    """
+    present = [~np.isnan(v) for v in values]
+    filled = [np.where(p, v, 0.0) for v, p in zip(values, present)]
+    count = sum(p.astype(np.int64) for p in present)
+    total = filled[0].copy()
+    for v in filled[1:]:
+        total += v
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if how == 'sum':
+            return np.where(count > 0, total, np.nan)
+        mean = total / count
+        if how == 'mean':
+            return mean
+        squares = np.zeros_like(mean)
+        for v, p in zip(values, present):
+            squares += np.where(p, (mean - v) ** 2, 0.0)
+        return np.where(count > 1, np.sqrt(squares / (count - 1)), np.nan)
+
+
+def lookback(feature):
+    """Oldest week, counted back from the feature's own week, that the feature reads"""
+    if feature.op == 'lag':
+        return feature.param
+    if feature.op == 'diff':
+        return feature.shift + feature.param
+    if feature.op.startswith('rolling_'):
+        return feature.shift + feature.param - 1
+    return 0
+
+
+def _calendar(dates, field):
+    if field == 'week_of_year':
+        return dates.isocalendar().week.to_numpy(dtype=np.float64)
+    if field == 'is_month_start':
+        return (dates.day <= 7).astype(np.float64)
+    if field == 'is_month_end':
+        return (dates.day >= 22).astype(np.float64)
+    return np.asarray(getattr(dates, field), dtype=np.float64)
+
+
+class FeaturePipeline:
+    """
+    Compiled transform for an ordered list of FEATURE_SPEC features
+
+    Args:
+        names: Feature names, in the column order of the output matrix
+        date_col: Week start date column
+    """
+
+    def __init__(self, names, date_col='Week'):
+        unknown = [name for name in names if name not in FEATURES]
+        if unknown:
+            raise KeyError(f"Not in FEATURE_SPEC: {unknown}")
+        self.names = list(names)
+        self.features = [FEATURES[name] for name in self.names]
+        self.date_col = date_col
+
+    def _source(self, name):
+        return self.date_col if name == 'Week' else name
+
+    def _layout(self, df, series):
+        """First row of each row's series, plus first and last row of every series"""
+        n = len(df)
+        if series is None:
+            return np.zeros(n, dtype=np.int64), np.array([0]), np.array([n - 1])
+        codes = pd.factorize(np.asarray(series))[0]
+        bounds = np.flatnonzero(np.diff(codes)) + 1
+        firsts = np.concatenate([[0], bounds]).astype(np.int64)
+        lasts = np.concatenate([bounds, [n]]).astype(np.int64) - 1
+        return np.repeat(firsts, lasts - firsts + 1), firsts, lasts
+
+    def transform(self, df, series=None, dtype=np.float64, out=None):
+        """
+        Feature matrix with one row per observed week
+
+        Args:
+            df: Frame sorted by week (by series, then week for a panel)
+            series: Series labels per row for a panel (None = one series)
+            dtype: Output dtype; float32 is what XGBoost trains on anyway
+            out: Preallocated (len(df), len(names)) array to write into
+
+        Returns:
+            Array of shape (len(df), len(names))
+        """
+        n = len(df)
+        if out is None:
+            # Column-major, so every feature is written contiguously
+            out = np.empty((n, len(self.names)), dtype=dtype, order='F')
+        starts, _, _ = self._layout(df, series)
+        pos = np.arange(n) - starts  # Week number within the series
+        columns, lags = {}, {}
+
+        def column(name):
+            if name not in columns:
+                columns[name] = df[self._source(name)].to_numpy(dtype=np.float64)
+            return columns[name]
+
+        def lag(name, k):
+            if k == 0:
+                return column(name)
+            if (name, k) not in lags:
+                shifted = np.full(n, np.nan)
+                if k < n:
+                    shifted[k:] = column(name)[:n - k]
+                shifted[pos < k] = np.nan
+                lags[name, k] = shifted
+            return lags[name, k]
+
+        def rolling(name, window, how, shift):
+            return window_stat([lag(name, shift + i) for i in range(window)], how)
+
+        if any(f.op == 'calendar' for f in self.features):
+            # Calendar fields of the distinct weeks only, then broadcast to the rows
+            codes, weeks = pd.factorize(pd.DatetimeIndex(df[self.date_col]))
+
+        for j, f in enumerate(self.features):
+            if f.op == 'calendar':
+                out[:, j] = _calendar(pd.DatetimeIndex(weeks), f.param)[codes]
+            elif f.op == 'value':
+                out[:, j] = column(f.sources[0])
+            elif f.op == 'lag':
+                out[:, j] = lag(f.sources[0], f.param)
+            elif f.op == 'diff':
+                out[:, j] = lag(f.sources[0], f.shift) - lag(f.sources[0], f.shift + f.param)
+            elif f.op.startswith('rolling_'):
+                out[:, j] = rolling(f.sources[0], f.param, f.op[len('rolling_'):], f.shift)
+            elif f.op == 'ratio':
+                out[:, j] = column(f.sources[0]) / (column(f.sources[1]) + 1)
+        return out
+
+    def forecast_base(self, df, future_weeks, series=None, dtype=np.float64):
+        """
+        Features for the weeks after each series' history
+
+        Calendar features come from the future weeks. Raw drivers are held at
+        their mean over the last HOLD_WEEKS weeks, and ratios are taken of
+        those held values (FUTURE_PROXIES stand in for the target). Lags,
+        diffs and rolling stats are the ops of the week after the history:
+        shifted ones (every target feature) only read observed weeks and
+        equal what transform() gives that week, unshifted ones end at the
+        last observed week. For the target they are the starting point
+        recursive_forecast rolls forward.
+
+        Args:
+            df: Observed weeks, sorted as for transform
+            future_weeks: Dates of shape (horizon,) for one series or
+                (n_series, horizon) for a panel, series in order of appearance
+            series: Series labels per row for a panel (None = one series)
+            dtype: Output dtype
+
+        Returns:
+            Array of shape (n_series, horizon, len(names))
+        """
+        _, firsts, lasts = self._layout(df, series)
+        future_weeks = np.asarray(future_weeks, dtype='datetime64[ns]').reshape(len(lasts), -1)
+        n_series, horizon = future_weeks.shape
+        base = np.empty((n_series, horizon, len(self.names)), dtype=dtype)
+        columns = {}
+        held = {}
+
+        def column(name):
+            if name not in columns:
+                columns[name] = df[self._source(name)].to_numpy(dtype=np.float64)
+            return columns[name]
+
+        def lag(name, k):
+            """Value k weeks before the first future week (k >= 1 is observed)"""
+            idx = lasts - k + 1
+            values = column(name)[np.maximum(idx, 0)]
+            return np.where(idx >= firsts, values, np.nan)
+
+        def stat(name, window, how, shift=1):
+            # An unshifted window would need the future week itself: end it at the last observed week
+            shift = max(shift, 1)
+            return window_stat([lag(name, shift + i) for i in range(window)], how)
+
+        def hold(name):
+            name = FUTURE_PROXIES.get(name, name)
+            if name not in held:
+                held[name] = stat(name, HOLD_WEEKS, 'mean')
+            return held[name]
+
+        dates = pd.DatetimeIndex(future_weeks.ravel())
+
+        for j, f in enumerate(self.features):
+            if f.op == 'calendar':
+                base[:, :, j] = _calendar(dates, f.param).reshape(n_series, horizon)
+            elif f.op == 'value':
+                base[:, :, j] = hold(f.sources[0])[:, None]
+            elif f.op == 'lag':
+                base[:, :, j] = lag(f.sources[0], f.param)[:, None]
+            elif f.op == 'diff':
+                shift = max(f.shift, 1)
+                base[:, :, j] = (lag(f.sources[0], shift) - lag(f.sources[0], shift + f.param))[:, None]
+            elif f.op.startswith('rolling_'):
+                base[:, :, j] = stat(f.sources[0], f.param, f.op[len('rolling_'):], f.shift)[:, None]
+            elif f.op == 'ratio':
+                base[:, :, j] = (hold(f.sources[0]) / (hold(f.sources[1]) + 1))[:, None]
+        return base
@@ -0,0 +1,131 @@
+"""
+Recursive multi-step forecasting with a vectorized feature roller
+
+The sales forecasters use lag, rolling and diff features of the target
+(sales_lag1..3, sales_ma3/4, sales_std3, sales_diff1/2). To forecast several
+weeks ahead these have to be rebuilt every step from the model's own
+predictions. FeatureRoller keeps the last few values of every series in a
+preallocated ring buffer, so one step is a handful of array operations and a
+single predict call for all series, instead of re-running feature engineering
+on a growing DataFrame. The features are evaluated from their FEATURE_SPEC
+ops with the pipeline's own window arithmetic, so every step gets exactly
+what FeaturePipeline.transform() gives that week in training.
+"""
+
+import numpy as np
+
+from ml.forecasting.feature_pipeline import FEATURE_SPEC, TARGET, lookback, window_stat
+
+# Target-derived features the roller rebuilds each step
+ROLLED_FEATURES = tuple(f.name for f in FEATURE_SPEC if f.sources == (TARGET,) and f.op != 'value')
+
+# Every rolled feature must leave the week being forecast out of its inputs
+_unshifted = [f.name for f in FEATURE_SPEC if f.name in ROLLED_FEATURES and f.op != 'lag' and f.shift < 1]
+if _unshifted:
+    raise ValueError(f"Target features must be shifted at least one week: {_unshifted}")
+
+WINDOW = max(lookback(f) for f in FEATURE_SPEC if f.name in ROLLED_FEATURES)  # 4 (sales_ma4)
+
+
+class FeatureRoller:
+    """
+    Ring buffer of the last WINDOW values of many series
+
+    Features at a step are computed from the weeks before it: sales_lag1 is
+    the previous week, sales_ma3 the mean of the previous three, and so on,
+    the same values transform() gives a week following the buffered ones.
+
+    Args:
+        history: Array of shape (n_series, n_weeks), oldest week first. Series
+            shorter than WINDOW can be left-padded with NaN.
+    """
+
+    def __init__(self, history):
+        history = np.asarray(history, dtype=float)
+        if history.ndim == 1:
+            history = history[None, :]
+
+        self.n_series = history.shape[0]
+        self.buffer = np.full((self.n_series, WINDOW), np.nan)
+        tail = history[:, -WINDOW:]
+        self.buffer[:, WINDOW - tail.shape[1]:] = tail
+        self.head = 0  # Slot the next value is written to (the oldest one)
+
+    def push(self, values):
+        """Append one week for every series, dropping the oldest"""
+        self.buffer[:, self.head] = values
+        self.head = (self.head + 1) % WINDOW
+
+    def lag(self, k):
+        """Value k weeks back (k=1 is the latest pushed week)"""
+        return self.buffer[:, (self.head - k) % WINDOW]
+
+    def features(self):
+        """
+        Current value of every ROLLED_FEATURES column
+
+        Returns:
+            Dict of feature name -> array of shape (n_series,)
+        """
+        features = {}
+        for f in FEATURE_SPEC:
+            if f.name not in ROLLED_FEATURES:
+                continue
+            if f.op == 'lag':
+                features[f.name] = self.lag(f.param)
+            elif f.op == 'diff':
+                features[f.name] = self.lag(f.shift) - self.lag(f.shift + f.param)
+            else:
+                # Whatever weeks are available, like rolling(min_periods=1)
+                window = [self.lag(f.shift + i) for i in range(f.param)]
+                features[f.name] = window_stat(window, f.op[len('rolling_'):])
+        return features
+
+
+def _predictor(model):
+    """Fast predict for XGBoost models (no DMatrix or DataFrame per step)"""
+    if hasattr(model, 'get_booster'):
+        booster = model.get_booster()
+        return lambda X: booster.inplace_predict(X)
+    return model.predict
+
+
+def recursive_forecast(model, feature_cols, history, base_features, clip_min=0):
+    """
+    Forecast every series several steps ahead, feeding predictions back in
+
+    Args:
+        model: Fitted regressor (XGBRegressor or anything with predict)
+        feature_cols: Feature order the model was trained with
+        history: Observed target values, shape (n_series, n_weeks)
+        base_features: Features that don't depend on the target (calendar,
+            marketing, ...), shape (n_series, horizon, len(feature_cols)).
+            Columns in ROLLED_FEATURES are overwritten with the values used,
+            in place when a float64 array is passed.
+        clip_min: Lower bound applied to every prediction (None to disable)
+
+    Returns:
+        Array of shape (n_series, horizon) with the predictions
+    """
+    base_features = np.asarray(base_features, dtype=np.float64)
+    n_series, horizon, _ = base_features.shape
+    rolled = [(i, name) for i, name in enumerate(feature_cols) if name in ROLLED_FEATURES]
+
+    roller = FeatureRoller(history)
+    predict = _predictor(model)
+    X = np.empty((n_series, len(feature_cols)))
+    predictions = np.empty((n_series, horizon))
+
+    for step in range(horizon):
+        features = roller.features()
+        for i, name in rolled:
+            base_features[:, step, i] = features[name]
+        X[:] = base_features[:, step, :]
+
+        y = predict(X)
+        if clip_min is not None:
+            y = np.maximum(y, clip_min)
+        predictions[:, step] = y
+        roller.push(y)
+
+    return predictions
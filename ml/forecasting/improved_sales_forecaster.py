@@ -5,18 +5,45 @@ Uses multiple data sources and 730 days of historical data
 
 import pandas as pd
 import numpy as np
-from prophet import Prophet
 import pickle
 from datetime import datetime, timedelta
+import os
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from ml.forecasting.prophet_cache import ProphetCache, build_prophet
+
 
 class ImprovedSalesForecaster:
     """Sales forecasting using Facebook Prophet with multiple data sources"""
     
-    def __init__(self, data_path=None):
+    # Prophet parameters optimized for daily sales data, with a weekend regressor
+    PROPHET_PARAMS = {
+        'yearly_seasonality': True,
+        'weekly_seasonality': True,
+        'daily_seasonality': False,
+        'seasonality_mode': 'multiplicative',
+        'changepoint_prior_scale': 0.05,
+        'seasonality_prior_scale': 10,
+        'interval_width': 0.95,
+        'regressors': ['is_weekend']
+    }
+    
+    # Grid and cross-validation windows for tune() on ~2 years of data
+    PARAM_GRID = {
+        'changepoint_prior_scale': [0.01, 0.05, 0.1, 0.5],
+        'seasonality_prior_scale': [1.0, 10.0],
+        'seasonality_mode': ['additive', 'multiplicative']
+    }
+    CV_WINDOWS = {'initial': '365 days', 'period': '30 days', 'horizon': '30 days'}
+    
+    def __init__(self, data_path=None, use_cache=True):
         self.model = None
+        self.params = dict(self.PROPHET_PARAMS)
+        self.cache = ProphetCache('improved_sales_forecaster') if use_cache else None
         self.data_path = data_path or "/Users/tarang/CascadeProjects/windsurf-project/analytical-showdown-pipeline/cleaned_data"
         self.forecast_df = None
         self.metrics = {}
@@ -94,6 +121,66 @@ class ImprovedSalesForecaster:
         
         return df
     
+    def _build_model(self):
+        """Prophet model with this forecaster's configuration (unfitted)"""
+        return build_prophet(self.params)
+    
+    def _fit_model(self, df):
+        """
+        Fit Prophet on `df` (with regressors added), loading it from the cache when possible
+        
+        Uses the parameters found by tune() for this exact data if there are
+        any, so unchanged data never goes through Stan again.
+        """
+        if self.cache is None:
+            model = self._build_model()
+            model.fit(df[['ds', 'y', 'is_weekend']])
+            return model
+        
+        self.params = self.cache.best_params(df) or dict(self.PROPHET_PARAMS)
+        return self.cache.fit(df, self.params)
+    
+    def tune(self, df, test_size=0.15, param_grid=None, workers=None, **cv_windows):
+        """
+        Grid-search Prophet parameters with cross-validation in a process pool
+        
+        Only the training part of the train_model split is searched, so the
+        test set stays unseen and train_model picks the result up from the cache.
+        
+        Args:
+            df: Sales data with 'ds' and 'y' (as passed to train_model)
+            test_size: Same test split as train_model
+            param_grid: Parameter name -> values to try (default: PARAM_GRID)
+            workers: Pool size (default: CPU count)
+            **cv_windows: initial, period, horizon overrides for CV_WINDOWS
+            
+        Returns:
+            Frame of candidates sorted by cross-validated MAPE
+        """
+        df = self.add_regressors(df.copy())
+        df = df[:int(len(df) * (1 - test_size))]
+        cache = self.cache or ProphetCache('improved_sales_forecaster')
+        ranking = cache.grid_search(df, self.PROPHET_PARAMS, param_grid or self.PARAM_GRID,
+                                    workers=workers, **{**self.CV_WINDOWS, **cv_windows})
+        if ranking.iloc[0]['error'] is None:
+            self.params = ranking.iloc[0]['params']
+        return ranking
+    
+    def fit(self, df):
+        """
+        Backtesting protocol: fit on `df` only
+        
+        Args:
+            df: Frame with 'ds' (date) and 'y' (sales)
+        """
+        self.model = self._fit_model(self.add_regressors(df.copy()))
+        return self
+    
+    def predict(self, df):
+        """Backtesting protocol: predicted sales for the dates in df['ds']"""
+        df = self.add_regressors(df[['ds']].copy())
+        return self.model.predict(df[['ds', 'is_weekend']])['yhat'].to_numpy()
+    
     def train_model(self, df, test_size=0.15):
         """Train Prophet model with train-test split"""
         print("\n🤖 Training forecasting model...")
@@ -109,23 +196,9 @@ class ImprovedSalesForecaster:
         print(f"📊 Train set: {len(train_df)} days")
         print(f"📊 Test set: {len(test_df)} days")
         
-        # Initialize Prophet with optimized parameters for daily sales data
-        self.model = Prophet(
-            yearly_seasonality=True,
-            weekly_seasonality=True,
-            daily_seasonality=False,
-            seasonality_mode='multiplicative',
-            changepoint_prior_scale=0.05,
-            seasonality_prior_scale=10,
-            interval_width=0.95
-        )
-        
-        # Add weekend regressor
-        self.model.add_regressor('is_weekend')
-        
-        # Fit model
+        # Fit model (or load it if this data was fit before)
         print("⏳ Training in progress...")
-        self.model.fit(train_df[['ds', 'y', 'is_weekend']])
+        self.model = self._fit_model(train_df)
         print("✅ Model trained successfully!")
         
         # Evaluate on test set
@@ -0,0 +1,361 @@
+"""
+Online Retrainer - Keep the XGBoost forecaster current as weekly data arrives
+
+New weeks are folded into the active model by boosting extra trees on top of
+its forecasting booster (xgb_model=...), fit on the new weeks plus a short
+window of recent context. The cost of an update depends on the number of new
+weeks, not on the length of the history.
+
+Every candidate goes through the same steps:
+
+1. Score the active model on the new weeks before it sees them (holdout)
+2. Append trees on the context plus all but the last few new weeks and
+   validate that gate model on those last new weeks against the accuracy
+   threshold and the active model. Neither model has seen them, so the
+   decision is made out of sample. With a single new week there is
+   nothing to hold out, and the holdout accuracy of step 1 is gated on
+3. Append trees on the whole window (validation weeks included) for the
+   version that is served
+4. Store the version; activate it if it passes, keep the previous one if not
+5. Log accuracy, training time and the decision in the registry history
+
+A full refit replaces the incremental update when there is no active model,
+past weeks changed, the feature set changed or the tree budget is used up.
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from ml.forecasting.xgboost_forecaster import (
+    MODEL_PARAMS, REGISTRY_NAME, XGBoostSalesForecaster, history_fingerprint, select_feature_cols
+)
+from ml.registry.model_registry import ModelRegistry
+
+
+def _accuracy(y_true, y_pred):
+    """100 - MAPE, as reported by XGBoostSalesForecaster"""
+    y_true = np.asarray(y_true, dtype=float)
+    mask = y_true > 0
+    if not mask.any():
+        return float('nan')
+    return float(100 - np.mean(np.abs((y_true[mask] - y_pred[mask]) / y_true[mask])) * 100)
+
+
+class OnlineRetrainer:
+    """
+    Incremental retraining of the registered XGBoostSalesForecaster
+
+    Args:
+        data_path: Project data directory (as for XGBoostSalesForecaster)
+        registry: ModelRegistry holding the forecaster versions
+        accuracy_threshold: Minimum validation accuracy (%) to promote a candidate
+        tolerance: Largest accuracy drop (points) against the active model on
+            the validation weeks that still promotes
+        rounds_per_week: Trees appended per new week
+        max_rounds: Cap on the trees appended in one update
+        context_weeks: Weeks before the new ones included in an update
+        validation_weeks: Most recent new weeks held out of the gate model
+            and validated on (at most all new weeks but one)
+        max_trees: Forecasting booster size that triggers a full refit
+        test_size: Evaluation split used for full refits
+    """
+
+    def __init__(self, data_path=None, registry=None, accuracy_threshold=85.0, tolerance=1.0,
+                 rounds_per_week=5, max_rounds=50, context_weeks=12, validation_weeks=8,
+                 max_trees=400, test_size=0.2):
+        self.forecaster = XGBoostSalesForecaster(data_path)
+        self.data_path = self.forecaster.data_path
+        self.registry = registry or ModelRegistry(REGISTRY_NAME)
+        self.accuracy_threshold = accuracy_threshold
+        self.tolerance = tolerance
+        self.rounds_per_week = rounds_per_week
+        self.max_rounds = max_rounds
+        self.context_weeks = context_weeks
+        self.validation_weeks = validation_weeks
+        self.max_trees = max_trees
+        self.test_size = test_size
+
+    @property
+    def csv_path(self):
+        return Path(self.data_path) / "processed" / "weekly_sales_CLEAN.csv"
+
+    def add_week(self, row):
+        """
+        Append one week to weekly_sales_CLEAN.csv
+
+        Args:
+            row: Dict with 'Week', 'Total_Sales' and any other CSV columns;
+                Product_Sales defaults to Total_Sales
+        """
+        weeks = pd.read_csv(self.csv_path, usecols=['Week'], parse_dates=['Week'])['Week']
+        row = {'Product_Sales': row['Total_Sales'], **row, 'Week': pd.Timestamp(row['Week'])}
+        if row['Week'] <= weeks.max():
+            raise ValueError(f"Week {row['Week'].date()} is not after the last stored week "
+                             f"{weeks.max().date()}")
+
+        # Append the line rather than rewriting the file: a read/write round
+        # trip can move past values by an ulp, which counts as changed history
+        columns = pd.read_csv(self.csv_path, nrows=0).columns
+        line = pd.DataFrame([row]).reindex(columns=columns).to_csv(index=False, header=False)
+        with open(self.csv_path, 'rb+') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    f.write(b'\n')
+            f.write(line.encode())
+        return len(weeks) + 1
+
+    def _full_refit_reason(self, artifact, weekly_sales, rounds):
+        if artifact is None:
+            return "no active model"
+        extra = artifact.extra
+        weeks = extra.get('weeks', 0)
+        if 'history_hash' not in extra:
+            return "active model predates incremental retraining"
+        if artifact.feature_cols != select_feature_cols(weekly_sales.columns)[0]:
+            return "feature set changed"
+        if len(weekly_sales) < weeks or history_fingerprint(
+                weekly_sales, artifact.feature_cols, weeks) != extra['history_hash']:
+            return "past weeks changed"
+        if extra.get('n_trees', 0) + rounds > self.max_trees:
+            return f"booster reached {self.max_trees} trees"
+        return None
+
+    @staticmethod
+    def _window_accuracy(model, window, feature_cols, fill_values):
+        y_pred = np.maximum(model.predict(window[feature_cols].fillna(fill_values)), 0)
+        return _accuracy(window['Total_Sales'], y_pred)
+
+    def _validation_accuracy(self, model, weekly_sales, feature_cols, fill_values):
+        return self._window_accuracy(model, weekly_sales.tail(self.validation_weeks), feature_cols, fill_values)
+
+    @staticmethod
+    def _boost(active_model, window, feature_cols, fill_values, rounds):
+        model = xgb.XGBRegressor(**{**MODEL_PARAMS, 'n_estimators': rounds})
+        model.fit(window[feature_cols].fillna(fill_values), window['Total_Sales'],
+                  xgb_model=active_model.get_booster())
+        return model
+
+    def retrain(self, weekly_sales=None):
+        """
+        Fold any new weeks into the active model
+
+        Args:
+            weekly_sales: Engineered weekly frame (default: load_data())
+
+        Returns:
+            Dict describing the run: status ('unchanged', 'promoted' or
+            'rejected'), mode ('incremental' or 'full'), version, accuracies,
+            train_seconds and the number of new weeks
+        """
+        start = time.perf_counter()
+        forecaster = self.forecaster
+        if weekly_sales is None:
+            weekly_sales = forecaster.load_data()
+        forecaster.weekly_sales = weekly_sales
+
+        version = forecaster.data_version(weekly_sales, self.test_size)
+        active = self.registry.active_version()
+        if self.registry.has_version(version):
+            # Already trained on exactly this data (promoted or rejected)
+            return {'status': 'unchanged', 'version': version, 'active_version': active}
+
+        artifact = self.registry.load()
+        new_weeks = len(weekly_sales) - artifact.extra.get('weeks', 0) if artifact else len(weekly_sales)
+        rounds = min(self.rounds_per_week * max(new_weeks, 1), self.max_rounds)
+        reason = self._full_refit_reason(artifact, weekly_sales, rounds)
+
+        if reason is None:
+            result = self._incremental(artifact, weekly_sales, version, rounds)
+        else:
+            print(f"🔁 Full refit: {reason}")
+            result = self._full_refit(artifact, weekly_sales, version)
+            result['reason'] = reason
+
+        result.update({
+            'version': version,
+            'parent': artifact.version if artifact else None,
+            'new_weeks': new_weeks,
+            'weeks': len(weekly_sales),
+            'total_seconds': time.perf_counter() - start,
+        })
+        result['active_version'] = self.registry.active_version()
+        self.registry.record(result)
+
+        icon = "✅" if result['status'] == 'promoted' else "⚠️"
+        print(f"{icon} {result['mode'].title()} update {version} {result['status']}: "
+              f"validation accuracy {result['validation_accuracy']:.2f}% "
+              f"(threshold {self.accuracy_threshold:.0f}%), trained in {result['train_seconds']:.2f}s")
+        return result
+
+    def _passes(self, candidate_accuracy, active_accuracy):
+        if not candidate_accuracy >= self.accuracy_threshold:
+            return False
+        return active_accuracy is None or np.isnan(active_accuracy) or \
+            candidate_accuracy >= active_accuracy - self.tolerance
+
+    def _incremental(self, artifact, weekly_sales, version, rounds):
+        """Append trees to the active forecasting booster"""
+        weeks = artifact.extra['weeks']
+        feature_cols = artifact.feature_cols
+        fill_values = pd.Series(artifact.extra['final_fill_values'], dtype=float).reindex(feature_cols)
+        active_model = artifact.boosters['final_model']
+
+        new = weekly_sales.iloc[weeks:]
+        holdout_accuracy = self._window_accuracy(active_model, new, feature_cols, fill_values)
+
+        # Validate on the last new weeks only: neither the active model nor the gate's trees saw them
+        window = weekly_sales.iloc[max(0, weeks - self.context_weeks):]
+        n_validation = min(self.validation_weeks, len(new) - 1)
+        start = time.perf_counter()
+        if n_validation > 0:
+            validation = window.iloc[len(window) - n_validation:]
+            gate = self._boost(active_model, window.iloc[:len(window) - n_validation], feature_cols, fill_values,
+                               rounds)
+            validation_accuracy = self._window_accuracy(gate, validation, feature_cols, fill_values)
+            active_accuracy = self._window_accuracy(active_model, validation, feature_cols, fill_values)
+        else:
+            # A single new week: the active model's accuracy on it is the only out-of-sample score
+            validation_accuracy, active_accuracy = holdout_accuracy, None
+        promoted = self._passes(validation_accuracy, active_accuracy)
+
+        # The served version learns from every week of the window
+        candidate = self._boost(active_model, window, feature_cols, fill_values, rounds)
+        train_seconds = time.perf_counter() - start
+        n_trees = candidate.get_booster().num_boosted_rounds()
+
+        self.registry.save(
+            version,
+            boosters={'model': artifact.boosters['model'], 'final_model': candidate},
+            feature_cols=feature_cols,
+            fill_values=artifact.fill_values,
+            metrics={**artifact.metrics, 'Validation_Accuracy': validation_accuracy,
+                     'Holdout_Accuracy': holdout_accuracy},
+            params=MODEL_PARAMS,
+            extra={
+                **artifact.extra,
+                'weeks': len(weekly_sales),
+                'last_week': weekly_sales['Week'].max().isoformat(),
+                'history_hash': history_fingerprint(weekly_sales, feature_cols),
+                'n_trees': n_trees,
+                'parent': artifact.version,
+                'mode': 'incremental',
+                'train_seconds': train_seconds,
+            },
+            activate=promoted
+        )
+        return {
+            'status': 'promoted' if promoted else 'rejected',
+            'mode': 'incremental',
+            'gate': 'validation' if n_validation > 0 else 'holdout',
+            'validation_accuracy': validation_accuracy,
+            'active_validation_accuracy': active_accuracy,
+            'holdout_accuracy': holdout_accuracy,
+            'test_accuracy': artifact.metrics.get('Test_Accuracy'),
+            'train_seconds': train_seconds,
+            'rounds': rounds,
+            'n_trees': n_trees,
+        }
+
+    def _full_refit(self, artifact, weekly_sales, version):
+        """Evaluation fit plus forecasting fit on all weeks, as in load_or_train"""
+        forecaster = self.forecaster
+        start = time.perf_counter()
+        forecaster.train_model(weekly_sales, self.test_size)
+        forecaster.fit_final_model()
+        train_seconds = time.perf_counter() - start
+
+        validation_accuracy = forecaster.metrics['Test_Accuracy']
+        active_accuracy = None
+        if artifact is not None and artifact.feature_cols == forecaster.feature_cols:
+            fill_values = pd.Series(artifact.extra['final_fill_values'], dtype=float).reindex(artifact.feature_cols)
+            active_accuracy = self._validation_accuracy(
+                artifact.boosters['final_model'], weekly_sales, artifact.feature_cols, fill_values)
+        # A full refit is scored out of sample, so it only has to clear the threshold
+        promoted = artifact is None or self._passes(validation_accuracy, None)
+
+        forecaster.metrics['Validation_Accuracy'] = validation_accuracy
+        forecaster.save_to_registry(self.registry, version, self.test_size, activate=promoted, extra={
+            'parent': artifact.version if artifact else None,
+            'mode': 'full',
+            'train_seconds': train_seconds,
+        })
+        return {
+            'status': 'promoted' if promoted else 'rejected',
+            'mode': 'full',
+            'validation_accuracy': validation_accuracy,
+            'active_validation_accuracy': active_accuracy,
+            'holdout_accuracy': None,
+            'test_accuracy': validation_accuracy,
+            'train_seconds': train_seconds,
+            'rounds': MODEL_PARAMS['n_estimators'],
+            'n_trees': forecaster.final_model.get_booster().num_boosted_rounds(),
+        }
+
+    def rollback(self):
+        """
+        Serve the version the active one was trained from
+
+        Returns:
+            The version now active
+        """
+        artifact = self.registry.load()
+        parent = artifact.extra.get('parent') if artifact else None
+        if parent and self.registry.has_version(parent):
+            self.registry.activate(parent)
+        else:
+            parent = self.registry.rollback()
+        self.registry.record({'status': 'rolled_back', 'version': parent,
+                              'active_version': parent, 'parent': artifact.version if artifact else None})
+        return parent
+
+    def watch(self, interval=3600, max_runs=None):
+        """
+        Poll weekly_sales_CLEAN.csv and retrain whenever it changes
+
+        Args:
+            interval: Seconds between checks
+            max_runs: Stop after this many retraining runs (default: run forever)
+        """
+        last_seen = None
+        runs = 0
+        while max_runs is None or runs < max_runs:
+            try:
+                stat = self.csv_path.stat()
+                signature = (stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                signature = None
+            if signature is not None and signature != last_seen:
+                last_seen = signature
+                self.retrain()
+                runs += 1
+            if max_runs is None or runs < max_runs:
+                time.sleep(interval)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fold new weekly data into the XGBoost sales forecaster")
+    parser.add_argument('--data-path', help="Project data directory (as for XGBoostSalesForecaster)")
+    parser.add_argument('--threshold', type=float, default=85.0, help="Minimum validation accuracy (%%)")
+    parser.add_argument('--watch', type=int, metavar='SECONDS', help="Keep polling the weekly data")
+    parser.add_argument('--rollback', action='store_true', help="Serve the previous version")
+    args = parser.parse_args()
+
+    retrainer = OnlineRetrainer(args.data_path, accuracy_threshold=args.threshold)
+    if args.rollback:
+        print(f"✅ Rolled back to: {retrainer.rollback()}")
+    elif args.watch:
+        retrainer.watch(args.watch)
+    else:
+        retrainer.retrain()
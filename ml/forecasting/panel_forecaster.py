@@ -0,0 +1,279 @@
+"""
+Panel Sales Forecaster - Weekly forecasts for many shops or categories at once
+
+Takes a long-format frame (series_id, Week, Total_Sales, Buyers, Products,
+Product_Sales and optional marketing columns), engineers the same features as
+XGBoostSalesForecaster for every series in one vectorized pass, and trains
+either one global model with series-level features or one model per series
+in a process pool. Forecasts for all series come back as one long frame.
+"""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from sklearn.metrics import mean_absolute_error, r2_score
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from ml.forecasting.feature_pipeline import FEATURES, FeaturePipeline, derived_features
+from ml.forecasting.feature_roller import WINDOW, recursive_forecast
+from ml.forecasting.xgboost_forecaster import MODEL_PARAMS, select_feature_cols
+
+PANEL_MODES = ('global', 'per_series')
+
+# Extra features that let one global model tell series of different size apart
+SERIES_FEATURES = ['series_mean_sales', 'series_std_sales']
+
+
+def engineer_panel_features(panel, series_col='series_id', date_col='Week'):
+    """
+    Engineer XGBoostSalesForecaster features for every series in one pass
+
+    Args:
+        panel: Long-format frame with one row per series and week
+        series_col: Column identifying the series (shop, category, SKU, ...)
+        date_col: Week start date column
+
+    Returns:
+        Frame sorted by series and week with all feature columns added
+    """
+    df = panel.sort_values([series_col, date_col], kind='mergesort').reset_index(drop=True)
+    df[date_col] = pd.to_datetime(df[date_col])
+
+    names = derived_features(df.columns, date_col)
+    features = FeaturePipeline(names, date_col).transform(df, series=df[series_col])
+    return pd.concat([df.drop(columns=names, errors='ignore'),
+                      pd.DataFrame(features, columns=names, index=df.index)], axis=1)
+
+
+def _calculate_mape(y_true, y_pred):
+    mask = y_true > 0
+    if not mask.any():
+        return np.nan
+    return np.mean(np.abs((y_true[mask] - y_pred[mask]) / y_true[mask])) * 100
+
+
+def _fit_series_models(job):
+    """
+    Process pool entry point: evaluation and final model for one series
+
+    Returns:
+        Tuple of (series_id, final_model, final_fill_values, y_pred_test)
+    """
+    series_id, X_train, y_train, X_test, X_all, y_all = job
+    params = {**MODEL_PARAMS, 'n_jobs': 1}  # One thread per worker process
+
+    fill_values = np.nanmean(X_train, axis=0)
+    model = xgb.XGBRegressor(**params)
+    model.fit(np.where(np.isnan(X_train), fill_values, X_train), y_train)
+    y_pred_test = np.maximum(model.predict(np.where(np.isnan(X_test), fill_values, X_test)), 0)
+
+    final_fill_values = np.nanmean(X_all, axis=0)
+    final_model = xgb.XGBRegressor(**params)
+    final_model.fit(np.where(np.isnan(X_all), final_fill_values, X_all), y_all)
+
+    return series_id, final_model, final_fill_values, y_pred_test
+
+
+class PanelSalesForecaster:
+    """
+    Weekly sales forecasting for many series with shared feature engineering
+
+    Args:
+        mode: 'global' trains one model on all series with SERIES_FEATURES,
+            'per_series' trains one model per series in a process pool
+        test_size: Fraction of each series' weeks held out for evaluation
+        workers: Pool size for 'per_series' (default: CPU count, 1 = no pool)
+        series_col: Column identifying the series
+        date_col: Week start date column
+    """
+
+    def __init__(self, mode='global', test_size=0.2, workers=None,
+                 series_col='series_id', date_col='Week'):
+        if mode not in PANEL_MODES:
+            raise ValueError(f"mode must be one of {PANEL_MODES}, got {mode!r}")
+        self.mode = mode
+        self.test_size = test_size
+        self.workers = workers
+        self.series_col = series_col
+        self.date_col = date_col
+        self.features = None
+        self.feature_cols = []
+        self.models = {}
+        self.fill_values = {}
+        self.series_stats = None
+        self.metrics = {}
+        self.series_metrics = None
+        self.test_predictions = None
+
+    def fit(self, panel):
+        """
+        Engineer features, evaluate on each series' last weeks and fit forecasting models
+
+        Args:
+            panel: Long-format frame with one row per series and week
+
+        Returns:
+            self
+        """
+        df = engineer_panel_features(panel, self.series_col, self.date_col)
+        series = df[self.series_col]
+        pos = series.groupby(series, sort=False).cumcount()
+        length = series.map(series.value_counts())
+        is_train = (pos < (length * (1 - self.test_size)).astype(int)).to_numpy()
+
+        # Series-level features from the training weeks only
+        self.series_stats = df[is_train].groupby(self.series_col)['Total_Sales'].agg(['mean', 'std'])
+        self.series_stats.columns = SERIES_FEATURES
+        df = df.join(self.series_stats, on=self.series_col)
+        self.features = df
+
+        self.feature_cols, _ = select_feature_cols(df.columns)
+        if self.mode == 'global':
+            self.feature_cols = self.feature_cols + SERIES_FEATURES
+
+        X = df[self.feature_cols].to_numpy(dtype=np.float64)
+        y = df['Total_Sales'].to_numpy(dtype=np.float64)
+
+        if self.mode == 'global':
+            y_pred_test = self._fit_global(X, y, is_train)
+        else:
+            y_pred_test = self._fit_per_series(df, X, y, is_train)
+
+        test = df.loc[~is_train, [self.series_col, self.date_col, 'Total_Sales']].copy()
+        test['Predicted_Sales'] = y_pred_test
+        self.test_predictions = test.reset_index(drop=True)
+        self._calculate_metrics()
+        return self
+
+    def _fit_global(self, X, y, is_train):
+        fill_values = np.nanmean(X[is_train], axis=0)
+        model = xgb.XGBRegressor(**MODEL_PARAMS)
+        model.fit(np.where(np.isnan(X[is_train]), fill_values, X[is_train]), y[is_train])
+        X_test = X[~is_train]
+        y_pred_test = np.maximum(model.predict(np.where(np.isnan(X_test), fill_values, X_test)), 0)
+
+        final_fill_values = np.nanmean(X, axis=0)
+        final_model = xgb.XGBRegressor(**MODEL_PARAMS)
+        final_model.fit(np.where(np.isnan(X), final_fill_values, X), y)
+
+        self.models = {None: final_model}
+        self.fill_values = {None: final_fill_values}
+        return y_pred_test
+
+    def _fit_per_series(self, df, X, y, is_train):
+        # Rows are sorted by series, so each series is one contiguous slice
+        codes, uniques = pd.factorize(df[self.series_col], sort=False)
+        bounds = np.flatnonzero(np.diff(codes)) + 1
+        starts = np.concatenate([[0], bounds])
+        ends = np.concatenate([bounds, [len(df)]])
+
+        jobs = []
+        for code, start, end in zip(range(len(uniques)), starts, ends):
+            train = is_train[start:end]
+            jobs.append((uniques[code], X[start:end][train], y[start:end][train],
+                         X[start:end][~train], X[start:end], y[start:end]))
+
+        if self.workers == 1:
+            results = list(map(_fit_series_models, jobs))
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                results = list(pool.map(_fit_series_models, jobs))
+
+        self.models = {series_id: model for series_id, model, _, _ in results}
+        self.fill_values = {series_id: fill for series_id, _, fill, _ in results}
+        return np.concatenate([y_pred for _, _, _, y_pred in results])
+
+    def _calculate_metrics(self):
+        """Per-series and pooled test metrics"""
+        test = self.test_predictions
+        rows = []
+        for series_id, group in test.groupby(self.series_col, sort=False):
+            y_true = group['Total_Sales'].to_numpy()
+            y_pred = group['Predicted_Sales'].to_numpy()
+            mape = _calculate_mape(y_true, y_pred)
+            rows.append({
+                self.series_col: series_id,
+                'Test_Weeks': len(group),
+                'Test_Accuracy': 100 - mape,
+                'Test_MAPE': mape,
+                'Test_MAE': mean_absolute_error(y_true, y_pred),
+            })
+        self.series_metrics = pd.DataFrame(rows)
+
+        y_true = test['Total_Sales'].to_numpy()
+        y_pred = test['Predicted_Sales'].to_numpy()
+        mape = _calculate_mape(y_true, y_pred)
+        self.metrics = {
+            'Test_Accuracy': 100 - mape,
+            'Test_MAPE': mape,
+            'Test_MAE': mean_absolute_error(y_true, y_pred),
+            'Test_R2': r2_score(y_true, y_pred),
+            'Series': len(self.series_metrics),
+        }
+
+    def _future_features(self, weeks):
+        """
+        Base feature tensor for the forecast horizon, one block per series
+
+        Non-sales drivers are held at each series' recent averages, like
+        XGBoostSalesForecaster.forecast_future; the rolled sales features are
+        filled in step by step by recursive_forecast.
+        """
+        df = self.features
+        grouped = df.groupby(self.series_col, sort=False)
+        last = grouped.tail(1)
+        series_ids = pd.Index(last[self.series_col])
+
+        # Each series' next `weeks` weeks
+        steps = np.arange(1, weeks + 1) * np.timedelta64(7, 'D')
+        future = last[self.date_col].to_numpy()[:, None] + steps[None, :]
+        future_weeks = pd.DatetimeIndex(future.ravel())
+
+        spec_cols = [col for col in self.feature_cols if col in FEATURES]
+        spec_base = FeaturePipeline(spec_cols, self.date_col).forecast_base(
+            df, future, series=df[self.series_col])
+
+        base = np.full((len(series_ids), weeks, len(self.feature_cols)), np.nan)
+        for i, col in enumerate(self.feature_cols):
+            if col in FEATURES:
+                base[:, :, i] = spec_base[:, :, spec_cols.index(col)]
+            else:
+                base[:, :, i] = self.series_stats.loc[series_ids, col].to_numpy(dtype=float)[:, None]
+
+        # Last WINDOW observed weeks per series, left-padded with NaN
+        history = np.full((len(series_ids), WINDOW), np.nan)
+        tail = grouped.tail(WINDOW)
+        tail_pos = tail.groupby(self.series_col, sort=False).cumcount(ascending=False).to_numpy()
+        row = pd.Index(series_ids).get_indexer(tail[self.series_col])
+        history[row, WINDOW - 1 - tail_pos] = tail['Total_Sales'].to_numpy(dtype=float)
+
+        return series_ids, future_weeks, base, history
+
+    def forecast(self, weeks=26):
+        """
+        Recursive forecast for every series
+
+        Returns:
+            Long frame with series_col, date_col and Predicted_Sales, one row
+            per series and future week
+        """
+        series_ids, future_weeks, base, history = self._future_features(weeks)
+
+        if self.mode == 'global':
+            predictions = recursive_forecast(self.models[None], self.feature_cols, history, base)
+        else:
+            predictions = np.empty((len(series_ids), weeks))
+            for i, series_id in enumerate(series_ids):
+                predictions[i] = recursive_forecast(self.models[series_id], self.feature_cols,
+                                                    history[i:i + 1], base[i:i + 1])[0]
+
+        return pd.DataFrame({
+            self.series_col: np.repeat(series_ids.to_numpy(), weeks),
+            self.date_col: future_weeks,
+            'Predicted_Sales': predictions.ravel(),
+        })
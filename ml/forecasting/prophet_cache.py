@@ -0,0 +1,212 @@
+"""
+Prophet Fit Cache - Skip Stan when the data and parameters haven't changed
+
+Prophet fits go through Stan and take seconds each. Fitted models are stored
+with prophet.serialize.model_to_json under a hash of the training data and
+the model parameters, and tuned parameters are stored per training data, so a
+rerun on unchanged data loads everything from disk:
+
+    <root>/prophet/<name>/<fingerprint>.json      - fitted model
+    <root>/prophet/<name>/best_<data hash>.json   - grid search result
+
+Every new training window is a new fingerprint, so only the most recently
+used MAX_MODELS fitted models are kept per forecaster; older ones are deleted
+when a new model is written.
+
+Models are described by a plain parameter dict (Prophet keyword arguments plus
+'seasonalities' and 'regressors' lists) so they can be rebuilt in worker
+processes for a parallel grid search.
+"""
+
+import contextlib
+import io
+import itertools
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from ml.registry.model_registry import DEFAULT_ROOT, data_fingerprint
+
+# Fitted models kept per forecaster (a serialized model is a few hundred KB)
+MAX_MODELS = 32
+
+
+def build_prophet(params):
+    """
+    Unfitted Prophet model from a parameter dict
+
+    Args:
+        params: Prophet keyword arguments plus optional 'seasonalities'
+            (list of add_seasonality kwargs) and 'regressors' (column names)
+    """
+    from prophet import Prophet
+
+    kwargs = {k: v for k, v in params.items() if k not in ('seasonalities', 'regressors')}
+    model = Prophet(**kwargs)
+    for seasonality in params.get('seasonalities', []):
+        model.add_seasonality(**seasonality)
+    for regressor in params.get('regressors', []):
+        model.add_regressor(regressor)
+    return model
+
+
+def _fit_columns(params):
+    return ['ds', 'y'] + list(params.get('regressors', []))
+
+
+def _quiet_fit(model, df):
+    """Fit without Prophet's and cmdstanpy's per-fit logging"""
+    for name in ('prophet', 'cmdstanpy'):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    with contextlib.redirect_stdout(io.StringIO()):
+        model.fit(df)
+    return model
+
+
+def _cross_validate(job):
+    """
+    Process pool entry point: Prophet cross-validation of one parameter set
+
+    Returns:
+        Dict with the parameters and the mean MAPE, MAE and RMSE over all cutoffs
+    """
+    from prophet.diagnostics import cross_validation, performance_metrics
+
+    df, params, cv_kwargs = job
+    try:
+        model = _quiet_fit(build_prophet(params), df[_fit_columns(params)])
+        with contextlib.redirect_stdout(io.StringIO()):
+            cv = cross_validation(model, disable_tqdm=True, **cv_kwargs)
+        metrics = performance_metrics(cv, rolling_window=1)
+        return {'params': params, 'mape': float(metrics['mape'].iloc[0]) * 100,
+                'mae': float(metrics['mae'].iloc[0]), 'rmse': float(metrics['rmse'].iloc[0]),
+                'error': None}
+    except Exception as e:
+        return {'params': params, 'mape': float('nan'), 'mae': float('nan'), 'rmse': float('nan'),
+                'error': f"{type(e).__name__}: {e}"}
+
+
+class ProphetCache:
+    """
+    Fitted Prophet models and tuned parameters for one forecaster
+
+    Args:
+        name: Forecaster name (one directory per forecaster)
+        root: Model directory; defaults to $MODEL_PATH or ml/models/trained_models
+        max_models: Most recently used fitted models kept on disk
+    """
+
+    def __init__(self, name, root=None, max_models=MAX_MODELS):
+        self.name = name
+        self.path = Path(root or os.environ.get("MODEL_PATH") or DEFAULT_ROOT) / "prophet" / name
+        self.max_models = max_models
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _write_atomic(self, path, text):
+        self.path.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + '.tmp')
+        tmp.write_text(text)
+        os.replace(tmp, path)
+
+    def _model_paths(self):
+        return [path for path in self.path.glob('*.json') if not path.name.startswith('best_')]
+
+    def _evict(self):
+        """Delete the least recently used fitted models beyond max_models"""
+        paths = self._model_paths()
+        if len(paths) <= self.max_models:
+            return
+        by_age = sorted(paths, key=lambda path: path.stat().st_mtime_ns)
+        for path in by_age[:len(paths) - self.max_models]:
+            with contextlib.suppress(FileNotFoundError):
+                path.unlink()
+                self.evictions += 1
+
+    def fit(self, df, params):
+        """
+        Fitted model for (df, params), from disk when available
+
+        Args:
+            df: Training frame with 'ds', 'y' and the regressor columns
+            params: Model parameter dict (see build_prophet)
+
+        Returns:
+            Fitted Prophet model
+        """
+        from prophet.serialize import model_from_json, model_to_json
+
+        train = df[_fit_columns(params)].reset_index(drop=True)
+        path = self.path / f"{data_fingerprint(train, params)}.json"
+        if path.exists():
+            self.hits += 1
+            # Mark as recently used so eviction keeps it
+            with contextlib.suppress(FileNotFoundError):
+                os.utime(path)
+            return model_from_json(path.read_text())
+
+        self.misses += 1
+        model = _quiet_fit(build_prophet(params), train)
+        self._write_atomic(path, model_to_json(model))
+        self._evict()
+        return model
+
+    def best_params(self, df):
+        """Tuned parameters for this training data, or None if it was never tuned"""
+        path = self.path / f"best_{data_fingerprint(df[['ds', 'y']].reset_index(drop=True))}.json"
+        if not path.exists():
+            return None
+        return json.loads(path.read_text())['params']
+
+    def grid_search(self, df, base_params, param_grid, initial, period, horizon, workers=None):
+        """
+        Cross-validate every combination of `param_grid` in a process pool
+
+        Each candidate runs prophet.diagnostics.cross_validation on its own
+        worker. The best parameters (lowest MAPE) are stored for this data
+        and its model is fit into the cache, so the next train_model call on
+        the same data loads both without touching Stan.
+
+        Args:
+            df: Training frame with 'ds', 'y' and the regressor columns
+            base_params: Parameters shared by all candidates
+            param_grid: Dict of parameter name -> list of values to try
+            initial, period, horizon: Cross-validation windows, e.g. '60 days'
+            workers: Pool size (default: CPU count, 1 = no pool)
+
+        Returns:
+            Frame of candidates sorted by MAPE (params, mape, mae, rmse, error)
+        """
+        names = list(param_grid)
+        candidates = [{**base_params, **dict(zip(names, values))}
+                      for values in itertools.product(*(param_grid[n] for n in names))]
+        cv_kwargs = {'initial': initial, 'period': period, 'horizon': horizon}
+        train = df.reset_index(drop=True)
+        jobs = [(train, params, cv_kwargs) for params in candidates]
+
+        if workers == 1 or len(jobs) <= 1:
+            results = list(map(_cross_validate, jobs))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_cross_validate, jobs))
+
+        ranking = pd.DataFrame(results).sort_values('mape', na_position='last').reset_index(drop=True)
+        best = ranking.iloc[0]
+        if best['error'] is None:
+            data_hash = data_fingerprint(train[['ds', 'y']])
+            self._write_atomic(self.path / f"best_{data_hash}.json", json.dumps({
+                'params': best['params'],
+                'mape': best['mape'],
+                'grid': param_grid,
+                'cv': cv_kwargs,
+            }, indent=2, default=str))
+            self.fit(train, best['params'])
+        return ranking
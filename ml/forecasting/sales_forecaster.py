@@ -60,20 +60,10 @@ class SalesForecaster:
         
         return df
     
-    def train_model(self, df, test_size=0.2):
-        """Train Prophet model with train-test split"""
-        print("\n🤖 Training forecasting model...")
-        
-        # Split data
-        split_idx = int(len(df) * (1 - test_size))
-        train_df = df[:split_idx].copy()
-        test_df = df[split_idx:].copy()
-        
-        print(f"📊 Train set: {len(train_df)} points")
-        print(f"📊 Test set: {len(test_df)} points")
-        
+    def _build_model(self):
+        """Prophet model with this forecaster's configuration (unfitted)"""
         # Initialize Prophet with custom parameters for daily data
-        self.model = Prophet(
+        model = Prophet(
             yearly_seasonality=False,  # We'll add custom
             weekly_seasonality=True,   # Daily data has weekly patterns
             daily_seasonality=False,   # Not enough intraday data
@@ -83,12 +73,43 @@ class SalesForecaster:
         )
         
         # Add custom seasonality for monthly patterns
-        self.model.add_seasonality(
+        model.add_seasonality(
             name='monthly',
             period=30.5,
             fourier_order=5
         )
         
+        return model
+    
+    def fit(self, df):
+        """
+        Backtesting protocol: fit on `df` only
+        
+        Args:
+            df: Frame with 'ds' (date) and 'y' (sales)
+        """
+        self.model = self._build_model()
+        self.model.fit(df[['ds', 'y']])
+        return self
+    
+    def predict(self, df):
+        """Backtesting protocol: predicted sales for the dates in df['ds']"""
+        return self.model.predict(df[['ds']])['yhat'].to_numpy()
+    
+    def train_model(self, df, test_size=0.2):
+        """Train Prophet model with train-test split"""
+        print("\n🤖 Training forecasting model...")
+        
+        # Split data
+        split_idx = int(len(df) * (1 - test_size))
+        train_df = df[:split_idx].copy()
+        test_df = df[split_idx:].copy()
+        
+        print(f"📊 Train set: {len(train_df)} points")
+        print(f"📊 Test set: {len(test_df)} points")
+        
+        self.model = self._build_model()
+        
         # Fit model
         print("⏳ Training in progress...")
         self.model.fit(train_df[['ds', 'y']])
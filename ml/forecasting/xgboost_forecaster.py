@@ -15,9 +15,94 @@ import numpy as np
 import xgboost as xgb
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 from sklearn.model_selection import cross_val_score
+import os
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from ml.forecasting.campaign_calendar import load_campaign_calendar
+from ml.forecasting.feature_pipeline import FeaturePipeline, derived_features
+from ml.forecasting.feature_roller import ROLLED_FEATURES, recursive_forecast
+from ml.registry.model_registry import ModelRegistry, data_fingerprint
+
+REGISTRY_NAME = "xgboost_sales_forecaster"
+
+MODEL_PARAMS = {
+    'n_estimators': 200,
+    'max_depth': 6,
+    'learning_rate': 0.05,
+    'subsample': 0.85,
+    'colsample_bytree': 0.85,
+    'min_child_weight': 1,
+    'gamma': 0,
+    'reg_alpha': 0,
+    'reg_lambda': 1,
+    'random_state': 42,
+    'verbosity': 0,
+    'n_jobs': -1
+}
+
+# How the forecasting model is obtained after the evaluation fit
+REFIT_MODES = ('full', 'warm_start', 'reuse')
+
+
+def select_feature_cols(columns):
+    """
+    Model features available among `columns`
+    
+    Returns:
+        Tuple of (feature_cols, marketing_features)
+    """
+    feature_cols = [
+        # Time features
+        'week_of_year', 'month', 'quarter', 'year', 
+        'is_month_start', 'is_month_end',
+        # Core sales drivers
+        'Product_Sales', 'Buyers', 'Products',
+        # Lag features
+        'sales_lag1', 'sales_lag2', 'sales_lag3',
+        # Rolling averages
+        'sales_ma3', 'sales_ma4',
+        # Volatility
+        'sales_std3',
+        # Interaction features
+        'product_buyer_ratio', 'sales_per_product', 'sales_per_buyer',
+        # Trend features
+        'sales_diff1', 'sales_diff2'
+    ]
+    
+    # Add marketing features if available
+    marketing_features = []
+    if 'Total_Ad_Spend' in columns:
+        marketing_features.extend(['Total_Ad_Spend', 'ad_spend_lag1', 'ad_spend_ma3', 'sales_per_ad_dollar'])
+    if 'Has_Promotion' in columns:
+        marketing_features.extend(['Has_Promotion', 'promo_lag1', 'promo_streak'])
+    if 'Voucher_Cost' in columns:
+        marketing_features.append('voucher_roi')
+    if 'Flash_Sales' in columns:
+        marketing_features.append('Flash_Sales')
+    
+    feature_cols.extend(marketing_features)
+    
+    # Remove features that don't exist
+    feature_cols = [col for col in feature_cols if col in columns]
+    
+    return feature_cols, marketing_features
+
+
+def history_fingerprint(weekly_sales, feature_cols, weeks=None):
+    """
+    Hash of the first `weeks` engineered rows a model was trained on
+    
+    Lag and rolling features only look back, so appending weeks leaves this
+    hash unchanged; it moves when past weeks are edited or re-aggregated.
+    """
+    weeks = len(weekly_sales) if weeks is None else weeks
+    columns = ['Week', 'Total_Sales'] + [col for col in feature_cols if col in weekly_sales.columns]
+    return data_fingerprint(weekly_sales[columns].iloc[:weeks])
+
 
 class XGBoostSalesForecaster:
     """
@@ -25,8 +110,24 @@ class XGBoostSalesForecaster:
     Matches the Jupyter notebook implementation with 89.18% accuracy
     """
     
-    def __init__(self, data_path=None):
+    def __init__(self, data_path=None, refit='full'):
+        """
+        Args:
+            data_path: Project data directory
+            refit: How the forecasting model is fit after evaluation:
+                'full' retrains from scratch on all weeks, 'warm_start'
+                continues boosting the evaluation model on the held-out weeks,
+                'reuse' forecasts with the evaluation model as is
+        """
+        if refit not in REFIT_MODES:
+            raise ValueError(f"refit must be one of {REFIT_MODES}, got {refit!r}")
+        self.refit = refit
         self.model = None
+        self.train_size = None
+        self.final_model = None
+        self.fill_values = None
+        self.final_fill_values = None
+        self.version = None
         self.data_path = data_path or "/Users/tarang/CascadeProjects/windsurf-project/shopee-analytics-platform/data"
         self.metrics = {}
         self.feature_cols = []
@@ -88,55 +189,16 @@ class XGBoostSalesForecaster:
         
         cleaned_path = f"{self.data_path}/../analytical-showdown-pipeline/cleaned_data"
         
-        # Load promotional data
+        # Weekly totals of all campaign types, cached next to the exports
         try:
-            flash_sales = pd.read_csv(f"{cleaned_path}/flash_sale_cleaned.csv")
-            vouchers = pd.read_csv(f"{cleaned_path}/voucher_cleaned.csv")
-            live_streams = pd.read_csv(f"{cleaned_path}/live_cleaned.csv")
-            games = pd.read_csv(f"{cleaned_path}/game_cleaned.csv")
-            
-            # Parse time periods
-            for df in [flash_sales, vouchers, live_streams, games]:
-                if 'Time_Period' in df.columns and not df.empty:
-                    df['Week'] = pd.to_datetime(df['Time_Period'], errors='coerce')
-                    df['Week'] = df['Week'].dt.to_period('W').dt.start_time
-            
-            # Aggregate promotional data
-            if not flash_sales.empty and 'Week' in flash_sales.columns:
-                flash_weekly = flash_sales.groupby('Week').agg({
-                    'Sales_Orders_Created_IDR': 'sum',
-                    'Orders_Created': 'sum'
-                }).reset_index()
-                flash_weekly.columns = ['Week', 'Flash_Sales', 'Flash_Orders']
-                weekly_sales = weekly_sales.merge(flash_weekly, on='Week', how='left')
-            
-            if not vouchers.empty and 'Week' in vouchers.columns:
-                voucher_weekly = vouchers.groupby('Week').agg({
-                    'Total_Cost_Orders_Created_IDR': 'sum',
-                    'Orders_Created': 'sum'
-                }).reset_index()
-                voucher_weekly.columns = ['Week', 'Voucher_Cost', 'Voucher_Orders']
-                weekly_sales = weekly_sales.merge(voucher_weekly, on='Week', how='left')
+            calendar = load_campaign_calendar(cleaned_path)
             
-            if not live_streams.empty and 'Week' in live_streams.columns:
-                live_weekly = live_streams.groupby('Week').agg({
-                    'Sales_Orders_Created_IDR': 'sum'
-                }).reset_index()
-                live_weekly.columns = ['Week', 'Live_Sales']
-                weekly_sales = weekly_sales.merge(live_weekly, on='Week', how='left')
-            
-            if not games.empty and 'Week' in games.columns:
-                game_weekly = games.groupby('Week').agg({
-                    'Sales_Orders_Created_IDR': 'sum'
-                }).reset_index()
-                game_weekly.columns = ['Week', 'Game_Sales']
-                weekly_sales = weekly_sales.merge(game_weekly, on='Week', how='left')
-            
-            # Fill missing values
-            promo_cols = ['Flash_Sales', 'Flash_Orders', 'Voucher_Cost', 'Voucher_Orders', 'Live_Sales', 'Game_Sales']
-            for col in promo_cols:
-                if col in weekly_sales.columns:
-                    weekly_sales[col] = weekly_sales[col].fillna(0)
+            # One aligned join instead of a merge per campaign type
+            promo = calendar.reindex(weekly_sales['Week']).fillna(0)
+            weekly_sales = pd.concat([
+                weekly_sales,
+                pd.DataFrame(promo.to_numpy(), columns=promo.columns, index=weekly_sales.index)
+            ], axis=1)
             
             # Create total ad spend
             ad_cols = [col for col in weekly_sales.columns if 'Cost' in col or 'Flash_Sales' in col]
@@ -162,50 +224,13 @@ class XGBoostSalesForecaster:
         return weekly_sales
     
     def _engineer_features(self, df):
-        """Engineer all features matching the notebook"""
+        """Engineer all features matching the notebook (see feature_pipeline.FEATURE_SPEC)"""
         print("🔧 Engineering features...")
         
-        # Time-based features
-        df['week_of_year'] = df['Week'].dt.isocalendar().week
-        df['month'] = df['Week'].dt.month
-        df['quarter'] = df['Week'].dt.quarter
-        df['year'] = df['Week'].dt.year
-        df['is_month_start'] = (df['Week'].dt.day <= 7).astype(int)
-        df['is_month_end'] = (df['Week'].dt.day >= 22).astype(int)
-        
-        # Lag features
-        df['sales_lag1'] = df['Total_Sales'].shift(1)
-        df['sales_lag2'] = df['Total_Sales'].shift(2)
-        df['sales_lag3'] = df['Total_Sales'].shift(3)
-        
-        # Rolling averages
-        df['sales_ma3'] = df['Total_Sales'].rolling(window=3, min_periods=1).mean()
-        df['sales_ma4'] = df['Total_Sales'].rolling(window=4, min_periods=1).mean()
-        
-        # Rolling standard deviation (volatility)
-        df['sales_std3'] = df['Total_Sales'].rolling(window=3, min_periods=1).std()
-        
-        # Interaction features
-        df['product_buyer_ratio'] = df['Products'] / (df['Buyers'] + 1)
-        df['sales_per_product'] = df['Product_Sales'] / (df['Products'] + 1)
-        df['sales_per_buyer'] = df['Product_Sales'] / (df['Buyers'] + 1)
-        
-        # Trend features
-        df['sales_diff1'] = df['Total_Sales'].diff(1)
-        df['sales_diff2'] = df['Total_Sales'].diff(2)
-        
-        # Marketing features
-        if 'Total_Ad_Spend' in df.columns:
-            df['ad_spend_lag1'] = df['Total_Ad_Spend'].shift(1)
-            df['ad_spend_ma3'] = df['Total_Ad_Spend'].rolling(window=3, min_periods=1).mean()
-            df['sales_per_ad_dollar'] = df['Total_Sales'] / (df['Total_Ad_Spend'] + 1)
-        
-        if 'Has_Promotion' in df.columns:
-            df['promo_lag1'] = df['Has_Promotion'].shift(1)
-            df['promo_streak'] = df['Has_Promotion'].rolling(window=3, min_periods=1).sum()
-        
-        if 'Voucher_Cost' in df.columns:
-            df['voucher_roi'] = df['Total_Sales'] / (df['Voucher_Cost'] + 1)
+        names = derived_features(df.columns)
+        features = FeaturePipeline(names).transform(df)
+        df = pd.concat([df.drop(columns=names, errors='ignore'),
+                        pd.DataFrame(features, columns=names, index=df.index)], axis=1)
         
         print(f"✅ {len(df.columns)} features engineered")
         
@@ -216,48 +241,18 @@ class XGBoostSalesForecaster:
         print("\n🤖 Training XGBoost model...")
         
         # Define features
-        self.feature_cols = [
-            # Time features
-            'week_of_year', 'month', 'quarter', 'year', 
-            'is_month_start', 'is_month_end',
-            # Core sales drivers
-            'Product_Sales', 'Buyers', 'Products',
-            # Lag features
-            'sales_lag1', 'sales_lag2', 'sales_lag3',
-            # Rolling averages
-            'sales_ma3', 'sales_ma4',
-            # Volatility
-            'sales_std3',
-            # Interaction features
-            'product_buyer_ratio', 'sales_per_product', 'sales_per_buyer',
-            # Trend features
-            'sales_diff1', 'sales_diff2'
-        ]
-        
-        # Add marketing features if available
-        marketing_features = []
-        if 'Total_Ad_Spend' in df.columns:
-            marketing_features.extend(['Total_Ad_Spend', 'ad_spend_lag1', 'ad_spend_ma3', 'sales_per_ad_dollar'])
-        if 'Has_Promotion' in df.columns:
-            marketing_features.extend(['Has_Promotion', 'promo_lag1', 'promo_streak'])
-        if 'Voucher_Cost' in df.columns:
-            marketing_features.append('voucher_roi')
-        if 'Flash_Sales' in df.columns:
-            marketing_features.append('Flash_Sales')
-        
-        self.feature_cols.extend(marketing_features)
-        
-        # Remove features that don't exist
-        self.feature_cols = [col for col in self.feature_cols if col in df.columns]
+        self.feature_cols, marketing_features = select_feature_cols(df.columns)
         
         # Train/test split
         train_size = int(len(df) * (1 - test_size))
         train_data = df[:train_size].copy()
         test_data = df[train_size:].copy()
+        self.train_size = train_size
         
-        X_train = train_data[self.feature_cols].fillna(train_data[self.feature_cols].mean())
+        self.fill_values = train_data[self.feature_cols].mean()
+        X_train = train_data[self.feature_cols].fillna(self.fill_values)
         y_train = train_data['Total_Sales']
-        X_test = test_data[self.feature_cols].fillna(train_data[self.feature_cols].mean())
+        X_test = test_data[self.feature_cols].fillna(self.fill_values)
         y_test = test_data['Total_Sales']
         
         print(f"📊 Train: {len(train_data)} weeks, Test: {len(test_data)} weeks")
@@ -265,20 +260,7 @@ class XGBoostSalesForecaster:
         print(f"📊 Marketing features: {len(marketing_features)}")
         
         # Train XGBoost
-        self.model = xgb.XGBRegressor(
-            n_estimators=200,
-            max_depth=6,
-            learning_rate=0.05,
-            subsample=0.85,
-            colsample_bytree=0.85,
-            min_child_weight=1,
-            gamma=0,
-            reg_alpha=0,
-            reg_lambda=1,
-            random_state=42,
-            verbosity=0,
-            n_jobs=-1
-        )
+        self.model = xgb.XGBRegressor(**MODEL_PARAMS)
         
         self.model.fit(X_train, y_train)
         
@@ -332,94 +314,73 @@ class XGBoostSalesForecaster:
         print(f"   Test RMSE: IDR {rmse_test/1e6:.2f}M")
         print(f"   Test R²: {r2_test:.4f}")
     
-    def forecast_future(self, weeks=26):
-        """Generate 6-month forecast"""
-        print(f"\n🔮 Generating {weeks}-week forecast...")
-        
-        # Retrain on all data
-        X_all = self.weekly_sales[self.feature_cols].fillna(self.weekly_sales[self.feature_cols].mean())
+    def fit_final_model(self):
+        """
+        Fit the forecasting model according to `self.refit`
+        
+        'full' retrains all trees on every week. 'warm_start' keeps the
+        evaluation booster and adds trees fit on the held-out weeks only, in
+        proportion to their share of the data (50 trees for a 20% split).
+        'reuse' forecasts with the evaluation model. Both shortcuts fall back
+        to 'full' when no evaluation model was trained.
+        """
+        self.final_fill_values = self.weekly_sales[self.feature_cols].mean()
+        X_all = self.weekly_sales[self.feature_cols].fillna(self.final_fill_values)
         y_all = self.weekly_sales['Total_Sales']
         
-        final_model = xgb.XGBRegressor(
-            n_estimators=200,
-            max_depth=6,
-            learning_rate=0.05,
-            subsample=0.85,
-            colsample_bytree=0.85,
-            min_child_weight=1,
-            gamma=0,
-            reg_alpha=0,
-            reg_lambda=1,
-            random_state=42,
-            verbosity=0,
-            n_jobs=-1
-        )
+        if self.model is None or self.train_size is None or self.refit == 'full':
+            self.final_model = xgb.XGBRegressor(**MODEL_PARAMS)
+            self.final_model.fit(X_all, y_all)
+        elif self.refit == 'reuse':
+            self.final_model = self.model
+        else:
+            X_tail, y_tail = X_all[self.train_size:], y_all[self.train_size:]
+            extra_rounds = max(1, round(MODEL_PARAMS['n_estimators'] * len(X_tail) / self.train_size))
+            self.final_model = xgb.XGBRegressor(**{**MODEL_PARAMS, 'n_estimators': extra_rounds})
+            self.final_model.fit(X_tail, y_tail, xgb_model=self.model.get_booster())
+        
+        return self.final_model
+    
+    def forecast_future(self, weeks=26, recursive=True, future_weeks=None):
+        """
+        Generate 6-month forecast
+        
+        Args:
+            weeks: Number of weeks to forecast
+            recursive: Roll lag, moving-average and diff features forward from
+                each week's prediction. With False they stay frozen at the last
+                observed week for the whole horizon (the original behavior).
+            future_weeks: Explicit weeks to forecast instead of the `weeks`
+                weeks following the data
+        """
+        if future_weeks is not None:
+            weeks = len(future_weeks)
+        print(f"\n🔮 Generating {weeks}-week forecast...")
         
-        final_model.fit(X_all, y_all)
+        # Refit on all data unless a stored final model was loaded
+        final_model = self.final_model if self.final_model is not None else self.fit_final_model()
         
         # Generate future weeks
-        last_week = self.weekly_sales['Week'].max()
-        future_weeks = pd.date_range(start=last_week + pd.Timedelta(days=7), periods=weeks, freq='W')
-        
-        # Create future features
-        future_df = pd.DataFrame({'Week': future_weeks})
-        future_df['week_of_year'] = future_df['Week'].dt.isocalendar().week
-        future_df['month'] = future_df['Week'].dt.month
-        future_df['quarter'] = future_df['Week'].dt.quarter
-        future_df['year'] = future_df['Week'].dt.year
-        future_df['is_month_start'] = (future_df['Week'].dt.day <= 7).astype(int)
-        future_df['is_month_end'] = (future_df['Week'].dt.day >= 22).astype(int)
-        
-        # Use recent averages
-        recent_avg = self.weekly_sales.tail(4)[['Product_Sales', 'Buyers', 'Products']].mean()
-        future_df['Product_Sales'] = recent_avg['Product_Sales']
-        future_df['Buyers'] = recent_avg['Buyers']
-        future_df['Products'] = recent_avg['Products']
-        
-        # Lag features
-        future_df['sales_lag1'] = self.weekly_sales['Total_Sales'].iloc[-1]
-        future_df['sales_lag2'] = self.weekly_sales['Total_Sales'].iloc[-2]
-        future_df['sales_lag3'] = self.weekly_sales['Total_Sales'].iloc[-3]
-        
-        # Rolling averages
-        future_df['sales_ma3'] = self.weekly_sales['Total_Sales'].tail(3).mean()
-        future_df['sales_ma4'] = self.weekly_sales['Total_Sales'].tail(4).mean()
-        future_df['sales_std3'] = self.weekly_sales['Total_Sales'].tail(3).std()
-        
-        # Interaction features
-        future_df['product_buyer_ratio'] = future_df['Products'] / (future_df['Buyers'] + 1)
-        future_df['sales_per_product'] = future_df['Product_Sales'] / (future_df['Products'] + 1)
-        future_df['sales_per_buyer'] = future_df['Product_Sales'] / (future_df['Buyers'] + 1)
+        if future_weeks is None:
+            last_week = self.weekly_sales['Week'].max()
+            future_weeks = pd.date_range(start=last_week + pd.Timedelta(days=7), periods=weeks, freq='W')
         
-        # Trend features
-        future_df['sales_diff1'] = self.weekly_sales['Total_Sales'].diff(1).iloc[-1]
-        future_df['sales_diff2'] = self.weekly_sales['Total_Sales'].diff(2).iloc[-1]
-        
-        # Marketing features (use recent averages)
-        if 'Total_Ad_Spend' in self.weekly_sales.columns:
-            recent_ad = self.weekly_sales['Total_Ad_Spend'].tail(4).mean()
-            future_df['Total_Ad_Spend'] = recent_ad
-            future_df['ad_spend_lag1'] = self.weekly_sales['Total_Ad_Spend'].iloc[-1]
-            future_df['ad_spend_ma3'] = self.weekly_sales['Total_Ad_Spend'].tail(3).mean()
-            future_df['sales_per_ad_dollar'] = future_df['Product_Sales'] / (future_df['Total_Ad_Spend'] + 1)
-        
-        if 'Has_Promotion' in self.weekly_sales.columns:
-            future_df['Has_Promotion'] = self.weekly_sales['Has_Promotion'].tail(4).mean()
-            future_df['promo_lag1'] = self.weekly_sales['Has_Promotion'].iloc[-1]
-            future_df['promo_streak'] = self.weekly_sales['Has_Promotion'].tail(3).sum()
-        
-        if 'Voucher_Cost' in self.weekly_sales.columns:
-            recent_voucher = self.weekly_sales['Voucher_Cost'].tail(4).mean()
-            future_df['Voucher_Cost'] = recent_voucher
-            future_df['voucher_roi'] = future_df['Product_Sales'] / (future_df['Voucher_Cost'] + 1)
-        
-        if 'Flash_Sales' in self.weekly_sales.columns:
-            future_df['Flash_Sales'] = self.weekly_sales['Flash_Sales'].tail(4).mean()
+        # Future features from the same spec the model was trained on
+        features = FeaturePipeline(self.feature_cols).forecast_base(self.weekly_sales, future_weeks)
+        future_df = pd.concat([pd.DataFrame({'Week': future_weeks}),
+                               pd.DataFrame(features[0], columns=self.feature_cols)], axis=1)
         
         # Predict
-        X_future = future_df[self.feature_cols]
-        future_predictions = final_model.predict(X_future)
-        future_predictions = np.maximum(future_predictions, 0)
+        if recursive:
+            history = self.weekly_sales['Total_Sales'].to_numpy(dtype=np.float64)[None, :]
+            future_predictions = recursive_forecast(final_model, self.feature_cols, history, features)[0]
+            
+            # Keep the rolled feature values that were used for each week
+            rolled = [i for i, col in enumerate(self.feature_cols) if col in ROLLED_FEATURES]
+            future_df[[self.feature_cols[i] for i in rolled]] = features[0][:, rolled]
+        else:
+            future_predictions = final_model.predict(features[0])
+            future_predictions = np.maximum(future_predictions, 0)
         
         future_df['Predicted_Sales'] = future_predictions
         
@@ -431,6 +392,131 @@ class XGBoostSalesForecaster:
         
         return future_df
     
+    def fit(self, df):
+        """
+        Backtesting protocol: fit the forecasting model on `df` only
+        
+        Args:
+            df: Weekly frame with 'ds' (week) and 'y' (total sales) plus
+                Buyers, Products, Product_Sales and any marketing columns
+        """
+        weekly_sales = df.rename(columns={'ds': 'Week', 'y': 'Total_Sales'}).reset_index(drop=True)
+        self.weekly_sales = self._engineer_features(weekly_sales)
+        self.feature_cols, _ = select_feature_cols(self.weekly_sales.columns)
+        self.model = None
+        self.final_model = None
+        self.fit_final_model()
+        return self
+    
+    def predict(self, df):
+        """Backtesting protocol: forecast the weeks in df['ds'] from the fitted history"""
+        future_df = self.forecast_future(future_weeks=pd.DatetimeIndex(df['ds']))
+        return future_df['Predicted_Sales'].to_numpy()
+    
+    def data_version(self, weekly_sales, test_size=0.2):
+        """Registry version id of a model trained on `weekly_sales`"""
+        return data_fingerprint(weekly_sales, MODEL_PARAMS, test_size, self.refit)
+    
+    def save_to_registry(self, registry=None, version=None, test_size=0.2, activate=True, extra=None):
+        """
+        Store the fitted models under the content hash of the training data
+        
+        Args:
+            registry: ModelRegistry to write to (defaults to this model's registry)
+            version: Version id (defaults to the training data fingerprint)
+            test_size: Test split used in train_model, needed to rebuild the test set
+            activate: Serve the stored version from now on
+            extra: Additional metadata stored with the version
+            
+        Returns:
+            The stored version id
+        """
+        registry = registry or ModelRegistry(REGISTRY_NAME)
+        if self.final_model is None:
+            self.fit_final_model()
+        
+        self.version = version or self.data_version(self.weekly_sales, test_size)
+        registry.save(
+            self.version,
+            boosters={'model': self.model, 'final_model': self.final_model},
+            feature_cols=self.feature_cols,
+            fill_values=self.fill_values,
+            metrics=self.metrics,
+            params=MODEL_PARAMS,
+            extra={
+                'test_size': test_size,
+                'refit': self.refit,
+                'final_fill_values': self.final_fill_values.reindex(self.feature_cols).to_dict(),
+                'weeks': len(self.weekly_sales),
+                'last_week': self.weekly_sales['Week'].max().isoformat(),
+                'history_hash': history_fingerprint(self.weekly_sales, self.feature_cols),
+                'n_trees': self.final_model.get_booster().num_boosted_rounds(),
+                **(extra or {})
+            },
+            activate=activate
+        )
+        return self.version
+    
+    def load_from_registry(self, registry=None, version=None):
+        """
+        Restore fitted models from the registry instead of training
+        
+        Args:
+            registry: ModelRegistry to read from (defaults to this model's registry)
+            version: Version to load (defaults to the active version)
+            
+        Returns:
+            True if a stored version was loaded
+        """
+        registry = registry or ModelRegistry(REGISTRY_NAME)
+        artifact = registry.load(version)
+        if artifact is None:
+            return False
+        
+        self.version = artifact.version
+        self.model = artifact.boosters['model']
+        self.final_model = artifact.boosters['final_model']
+        self.feature_cols = artifact.feature_cols
+        self.fill_values = artifact.fill_values
+        self.final_fill_values = pd.Series(artifact.extra['final_fill_values'], dtype=float).reindex(self.feature_cols)
+        self.metrics = artifact.metrics
+        self.refit = artifact.extra.get('refit', 'full')
+        self.train_size = int(artifact.extra['weeks'] * (1 - artifact.extra['test_size']))
+        return True
+    
+    def load_or_train(self, registry=None, test_size=0.2):
+        """
+        Load data and serve the active stored model, training only when the data changed
+        
+        A version is keyed by the hash of the engineered weekly data, so new
+        data trains and activates a new version. If the data is unchanged the
+        active version is served, which may be an older one after a rollback.
+        
+        Args:
+            registry: ModelRegistry to use (defaults to this model's registry)
+            test_size: Fraction of weeks held out for evaluation
+            
+        Returns:
+            Tuple of (weekly_sales, train_data, test_data, y_pred_test)
+        """
+        registry = registry or ModelRegistry(REGISTRY_NAME)
+        weekly_sales = self.load_data()
+        version = self.data_version(weekly_sales, test_size)
+        
+        if registry.has_version(version) and self.load_from_registry(registry):
+            print(f"📦 Loaded model version {self.version}")
+            train_size = int(len(weekly_sales) * (1 - test_size))
+            train_data = weekly_sales[:train_size].copy()
+            test_data = weekly_sales[train_size:].copy()
+            X_test = test_data[self.feature_cols].fillna(self.fill_values)
+            y_pred_test = np.maximum(self.model.predict(X_test), 0)
+        else:
+            train_data, test_data, y_pred_test = self.train_model(weekly_sales, test_size)
+            self.save_to_registry(registry, version, test_size)
+            print(f"📦 Stored model version {self.version}")
+        
+        return weekly_sales, train_data, test_data, y_pred_test
+    
     def get_feature_importance(self):
         """Get feature importance from trained model"""
         if self.model is None:
@@ -0,0 +1,31 @@
+"""
+Data Fingerprint - Content hashes of training frames
+
+Kept apart from the model registry so code that only needs the hash (the
+backtest cache, for one) does not import XGBoost.
+"""
+
+import hashlib
+import json
+
+import pandas as pd
+
+
+def data_fingerprint(df, *parts):
+    """
+    Content hash of a training frame
+
+    Args:
+        df: Training data (values, index and column names are hashed)
+        *parts: Extra JSON-serializable values that should invalidate the
+            hash when they change (feature lists, hyperparameters, ...)
+
+    Returns:
+        16-character hex digest used as the version id
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([str(c) for c in df.columns]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    for part in parts:
+        digest.update(json.dumps(part, sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:16]
@@ -0,0 +1,269 @@
+"""
+Model Registry - Versioned artifacts for trained forecasting models
+
+Each version is stored under a content hash of the training data, so a model
+is only retrained when the data behind it changes:
+
+    <root>/<model_name>/<version>/
+        <booster>.json   - fitted XGBoost boosters (native JSON format)
+        meta.json        - feature columns, fill values, metrics, params
+    <root>/<model_name>/ACTIVE  - version currently served
+    <root>/<model_name>/history.jsonl  - retraining log (one JSON object per line)
+
+Versions are written to a temporary directory and renamed into place, so a
+reader never sees a half-written artifact.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+# Versions are data fingerprints; the forecasters import it from here
+from ml.registry.fingerprint import data_fingerprint
+
+DEFAULT_ROOT = Path(__file__).parent.parent / "models" / "trained_models"
+ACTIVE_FILE = "ACTIVE"
+META_FILE = "meta.json"
+HISTORY_FILE = "history.jsonl"
+
+
+def _to_json(value):
+    """Make numpy/pandas scalars and containers JSON-serializable"""
+    if isinstance(value, dict):
+        return {str(k): _to_json(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray, pd.Series)):
+        return [_to_json(v) for v in list(value)]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    return value
+
+
+class ModelArtifact:
+    """A loaded model version: boosters plus everything needed to predict"""
+
+    def __init__(self, version, boosters, meta):
+        self.version = version
+        self.boosters = boosters
+        self.meta = meta
+
+    @property
+    def feature_cols(self):
+        return self.meta["feature_cols"]
+
+    @property
+    def fill_values(self):
+        return pd.Series(self.meta["fill_values"], dtype=float).reindex(self.feature_cols)
+
+    @property
+    def metrics(self):
+        return self.meta["metrics"]
+
+    @property
+    def extra(self):
+        return self.meta.get("extra", {})
+
+
+class ModelRegistry:
+    """
+    File-based registry of versioned model artifacts
+
+    Args:
+        model_name: Name of the model family (one directory per family)
+        root: Registry directory; defaults to $MODEL_PATH or ml/models/trained_models
+    """
+
+    def __init__(self, model_name, root=None):
+        self.model_name = model_name
+        self.root = Path(root or os.environ.get("MODEL_PATH") or DEFAULT_ROOT)
+        self.path = self.root / model_name
+
+    def _version_path(self, version):
+        return self.path / version
+
+    def has_version(self, version):
+        return (self._version_path(version) / META_FILE).exists()
+
+    def save(self, version, boosters, feature_cols, fill_values, metrics, params=None,
+             extra=None, activate=True):
+        """
+        Store a fitted model under `version`
+
+        Args:
+            version: Version id, normally `data_fingerprint` of the training data
+            boosters: Dict of name -> fitted XGBRegressor
+            feature_cols: Ordered feature column list the boosters expect
+            fill_values: Per-feature values used to fill missing inputs
+            metrics: Evaluation metrics to show alongside the model
+            params: Hyperparameters the boosters were trained with
+            extra: Any other small JSON-serializable payload
+            activate: Make this the version served by `load()`
+
+        Returns:
+            Path of the stored version
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+        target = self._version_path(version)
+        staging = Path(tempfile.mkdtemp(prefix=f".{version}-", dir=self.path))
+        try:
+            for name, booster in boosters.items():
+                booster.save_model(str(staging / f"{name}.json"))
+
+            meta = {
+                "model_name": self.model_name,
+                "version": version,
+                "created_at": datetime.now().isoformat(),
+                "xgboost_version": xgb.__version__,
+                "boosters": sorted(boosters),
+                "feature_cols": list(feature_cols),
+                "fill_values": _to_json(pd.Series(fill_values).reindex(feature_cols).to_dict()),
+                "metrics": _to_json(metrics),
+                "params": _to_json(params or {}),
+                "extra": _to_json(extra or {}),
+            }
+            with open(staging / META_FILE, "w") as f:
+                json.dump(meta, f, indent=2)
+
+            if target.exists():
+                shutil.rmtree(target)
+            os.replace(staging, target)
+        finally:
+            if staging.exists():
+                shutil.rmtree(staging, ignore_errors=True)
+
+        if activate:
+            self.activate(version)
+        return target
+
+    def load(self, version=None):
+        """
+        Load a stored version (the active one by default)
+
+        Returns:
+            ModelArtifact, or None when the registry has no such version
+        """
+        version = version or self.active_version()
+        if version is None or not self.has_version(version):
+            return None
+
+        path = self._version_path(version)
+        with open(path / META_FILE) as f:
+            meta = json.load(f)
+
+        boosters = {}
+        for name in meta["boosters"]:
+            booster = xgb.XGBRegressor()
+            booster.load_model(str(path / f"{name}.json"))
+            boosters[name] = booster
+        return ModelArtifact(version, boosters, meta)
+
+    def versions(self):
+        """
+        List stored versions, newest first
+
+        Returns:
+            List of dicts with version, created_at, metrics and active flag
+        """
+        if not self.path.exists():
+            return []
+
+        active = self.active_version()
+        versions = []
+        for meta_path in self.path.glob(f"*/{META_FILE}"):
+            if meta_path.parent.name.startswith("."):
+                continue  # Staging directory of a save in progress
+            with open(meta_path) as f:
+                meta = json.load(f)
+            versions.append({
+                "version": meta["version"],
+                "created_at": meta["created_at"],
+                "metrics": meta["metrics"],
+                "active": meta["version"] == active,
+            })
+        return sorted(versions, key=lambda v: v["created_at"], reverse=True)
+
+    def active_version(self):
+        try:
+            version = (self.path / ACTIVE_FILE).read_text().strip()
+        except FileNotFoundError:
+            return None
+        return version or None
+
+    def activate(self, version):
+        """Serve `version` from now on"""
+        if not self.has_version(version):
+            raise ValueError(f"Unknown {self.model_name} version: {version}")
+        tmp = self.path / f".{ACTIVE_FILE}.tmp"
+        tmp.write_text(version)
+        os.replace(tmp, self.path / ACTIVE_FILE)
+
+    def rollback(self):
+        """
+        Activate the version created before the active one
+
+        Returns:
+            The version now active
+        """
+        history = [v["version"] for v in reversed(self.versions())]
+        active = self.active_version()
+        if active not in history or history.index(active) == 0:
+            raise ValueError(f"No earlier {self.model_name} version to roll back to")
+        previous = history[history.index(active) - 1]
+        self.activate(previous)
+        return previous
+
+    def record(self, entry):
+        """Append a retraining event to the history log"""
+        self.path.mkdir(parents=True, exist_ok=True)
+        line = json.dumps({"recorded_at": datetime.now().isoformat(), **_to_json(entry)})
+        with open(self.path / HISTORY_FILE, "a") as f:
+            f.write(line + "\n")
+
+    def history(self):
+        """Retraining events, oldest first"""
+        try:
+            with open(self.path / HISTORY_FILE) as f:
+                return [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+
+    def delete(self, version):
+        """Remove a stored version; the active version cannot be deleted"""
+        if version == self.active_version():
+            raise ValueError("Cannot delete the active version, activate another one first")
+        shutil.rmtree(self._version_path(version), ignore_errors=True)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="List, activate or roll back stored model versions")
+    parser.add_argument("model_name", help="Model family, e.g. xgboost_sales_forecaster")
+    parser.add_argument("--root", help="Registry directory (defaults to $MODEL_PATH)")
+    parser.add_argument("--activate", metavar="VERSION", help="Serve this version")
+    parser.add_argument("--rollback", action="store_true", help="Serve the previous version")
+    args = parser.parse_args()
+
+    registry = ModelRegistry(args.model_name, args.root)
+    if args.activate:
+        registry.activate(args.activate)
+        print(f"✅ Active version: {args.activate}")
+    elif args.rollback:
+        print(f"✅ Rolled back to: {registry.rollback()}")
+
+    for v in registry.versions():
+        marker = "*" if v["active"] else " "
+        accuracy = v["metrics"].get("Test_Accuracy")
+        accuracy = f"{accuracy:.2f}%" if accuracy is not None else "n/a"
+        print(f" {marker} {v['version']}  {v['created_at']}  accuracy {accuracy}")
@@ -0,0 +1,101 @@
+"""
+Cohort Features - Columnar builder for the segmentation feature table
+
+Each chat export row is one monthly customer cohort. Every source column is
+converted with one pd.to_numeric call, flash sale behaviour is joined on
+Time_Period through a hash index, and the derived ratios are whole-column
+arithmetic, so building the table is linear in the number of periods.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Chat export column -> cohort feature; reply_rate is derived and goes after chat_volume
+CHAT_FEATURES = {
+    'Number_Of_Chats': 'chat_volume',
+    'Average_Response_Time': 'avg_response_time_min',
+    'CSAT_Percent': 'csat_score',
+    'Conversion_Rate_Chats_Replied': 'chat_conversion_rate',
+    'Sales_IDR': 'sales',
+    'Total_Orders': 'orders',
+}
+
+# Flash sale export column -> cohort feature, in table order
+FLASH_FEATURES = {
+    'Click_Rate': 'flash_click_rate',
+    'Sales_Orders_Created_IDR': 'flash_sales',
+    'Orders_Created': 'flash_orders',
+}
+
+
+def _numeric(df, column):
+    return pd.to_numeric(df[column], errors='coerce')
+
+
+def _reply_rate(chat_df):
+    """Chats replied per 100 chats; 0 when a period had no (or unknown) chats"""
+    replied = _numeric(chat_df, 'Chats_Replied')
+    total = _numeric(chat_df, 'Number_Of_Chats')
+    has_chats = total > 0
+    return (replied / total.where(has_chats) * 100).where(has_chats, 0)
+
+
+def _flash_rows(period, flash_df):
+    """
+    Row of flash_df joined onto each cohort, -1 for none
+
+    Only the first cohort of each Time_Period gets flash sale features, from
+    the last flash sale row for that period; missing periods never match.
+    """
+    flash_period = flash_df['Time_Period']
+    last = flash_period.notna() & ~flash_period.duplicated(keep='last')
+    flash_index = pd.Index(flash_period[last])
+    flash_rows = np.append(np.flatnonzero(last.to_numpy()), -1)
+    rows = flash_rows[flash_index.get_indexer(period)]  # -1 (no match) picks the trailing -1
+    first = period.notna() & ~period.duplicated(keep='first')
+    return np.where(first.to_numpy(), rows, -1)
+
+
+def build_cohort_features(chat_df, flash_df):
+    """
+    Cohort feature table from the chat and flash sale exports
+
+    Args:
+        chat_df: Cleaned chat export, one row per period
+        flash_df: Cleaned flash sale export
+
+    Returns:
+        DataFrame with one row per chat row: 'period', the chat and flash
+        sale features (flash columns only when some period matched), and
+        avg_order_value, engagement_score and purchase_frequency. Missing
+        values are 0.
+    """
+    period = chat_df['Time_Period'].reset_index(drop=True)
+    customer_df = pd.DataFrame({'period': period})
+
+    for column, feature in CHAT_FEATURES.items():
+        customer_df[feature] = _numeric(chat_df, column).to_numpy()
+    customer_df.insert(2, 'reply_rate', _reply_rate(chat_df).to_numpy())
+
+    rows = _flash_rows(period, flash_df)
+    matched = rows >= 0
+    if matched.any():
+        for column, feature in FLASH_FEATURES.items():
+            values = _numeric(flash_df, column).to_numpy()[rows]
+            customer_df[feature] = values if matched.all() else np.where(matched, values, np.nan)
+
+    # Fill missing values with 0
+    customer_df = customer_df.fillna(0)
+
+    # Derived features
+    orders = customer_df['orders']
+    has_orders = orders > 0
+    customer_df['avg_order_value'] = (customer_df['sales'] / orders.where(has_orders)).where(has_orders, 0).astype(float)
+    customer_df['engagement_score'] = (
+        customer_df['chat_conversion_rate'] * 0.4 +
+        customer_df['reply_rate'] * 0.3 +
+        customer_df['csat_score'] / 100 * 0.3
+    )
+    customer_df['purchase_frequency'] = customer_df['orders']
+
+    return customer_df
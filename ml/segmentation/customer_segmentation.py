@@ -1,8 +1,17 @@
 """
 Customer Segmentation Model using K-Means Clustering
 Identifies high-value customer segments for targeted marketing
+
+mode='batch' fits KMeans(n_init=10) on the monthly cohorts in memory.
+mode='minibatch' fits MiniBatchKMeans over chunks (see streaming_kmeans),
+for per-buyer features of millions of customers: train_streaming(),
+assign_streaming() and analyze_streaming() take a CSV path or any other
+chunked source and never hold more than one chunk plus a sample.
 """
 
+import os
+import sys
+
 import pandas as pd
 import numpy as np
 from sklearn.cluster import KMeans
@@ -12,13 +21,42 @@ import pickle
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from ml.segmentation.cohort_features import build_cohort_features
+from ml.segmentation.streaming_kmeans import (
+    DEFAULT_CHUNKSIZE, assign_streaming, cluster_stats, fit_streaming, sampled_silhouette
+)
+
+MODES = ('batch', 'minibatch')
+
+# Key features for segmentation
+FEATURE_COLS = [
+    'sales',
+    'orders',
+    'avg_order_value',
+    'chat_conversion_rate',
+    'engagement_score',
+    'csat_score',
+    'reply_rate',
+    'flash_sales',
+    'purchase_frequency'
+]
+
 
 class CustomerSegmentation:
     """Customer segmentation using K-Means clustering"""
     
-    def __init__(self, data_path=None, n_clusters=4):
+    def __init__(self, data_path=None, n_clusters=4, mode='batch', batch_size=4096,
+                 silhouette_sample=10_000, chunksize=DEFAULT_CHUNKSIZE):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
         self.data_path = data_path or "/Users/tarang/CascadeProjects/windsurf-project/analytical-showdown-pipeline/cleaned_data"
         self.n_clusters = n_clusters
+        self.mode = mode
+        self.batch_size = batch_size
+        self.silhouette_sample = silhouette_sample
+        self.chunksize = chunksize
         self.model = None
         self.scaler = StandardScaler()
         self.pca = None
@@ -41,54 +79,7 @@ class CustomerSegmentation:
         # Create customer behavior features
         # Since we don't have individual customer IDs, we'll segment based on time periods
         # Each period represents a cohort of customers
-        
-        features_list = []
-        
-        # Process chat data (monthly cohorts)
-        for idx, row in chat_df.iterrows():
-            chats_replied = pd.to_numeric(row['Chats_Replied'], errors='coerce')
-            total_chats = pd.to_numeric(row['Number_Of_Chats'], errors='coerce')
-            reply_rate = (chats_replied / total_chats * 100) if total_chats > 0 else 0
-            
-            features = {
-                'period': row['Time_Period'],
-                'chat_volume': pd.to_numeric(row['Number_Of_Chats'], errors='coerce'),
-                'reply_rate': reply_rate,
-                'avg_response_time_min': pd.to_numeric(row['Average_Response_Time'], errors='coerce'),
-                'csat_score': pd.to_numeric(row['CSAT_Percent'], errors='coerce'),
-                'chat_conversion_rate': pd.to_numeric(row['Conversion_Rate_Chats_Replied'], errors='coerce'),
-                'sales': pd.to_numeric(row['Sales_IDR'], errors='coerce'),
-                'orders': pd.to_numeric(row['Total_Orders'], errors='coerce'),
-            }
-            features_list.append(features)
-        
-        # Add flash sale behavior
-        for idx, row in flash_df.iterrows():
-            period = row['Time_Period']
-            # Find matching period in features
-            matching = [f for f in features_list if f['period'] == period]
-            if matching:
-                f = matching[0]
-                f['flash_click_rate'] = pd.to_numeric(row['Click_Rate'], errors='coerce')
-                f['flash_sales'] = pd.to_numeric(row['Sales_Orders_Created_IDR'], errors='coerce')
-                f['flash_orders'] = pd.to_numeric(row['Orders_Created'], errors='coerce')
-        
-        # Create DataFrame
-        customer_df = pd.DataFrame(features_list)
-        
-        # Fill missing values with 0
-        customer_df = customer_df.fillna(0)
-        
-        # Calculate derived features
-        customer_df['avg_order_value'] = customer_df.apply(
-            lambda x: x['sales'] / x['orders'] if x['orders'] > 0 else 0, axis=1
-        )
-        customer_df['engagement_score'] = (
-            customer_df['chat_conversion_rate'] * 0.4 +
-            customer_df['reply_rate'] * 0.3 +
-            customer_df['csat_score'] / 100 * 0.3
-        )
-        customer_df['purchase_frequency'] = customer_df['orders']
+        customer_df = build_cohort_features(chat_df, flash_df)
         
         print(f"\n✅ Created customer feature dataset: {len(customer_df)} cohorts")
         print(f"📊 Features: {len(customer_df.columns) - 1} behavioral metrics")
@@ -97,21 +88,8 @@ class CustomerSegmentation:
     
     def select_features(self, df):
         """Select features for clustering"""
-        # Key features for segmentation
-        feature_cols = [
-            'sales',
-            'orders',
-            'avg_order_value',
-            'chat_conversion_rate',
-            'engagement_score',
-            'csat_score',
-            'reply_rate',
-            'flash_sales',
-            'purchase_frequency'
-        ]
-        
         # Filter to available features
-        available_features = [col for col in feature_cols if col in df.columns]
+        available_features = [col for col in FEATURE_COLS if col in df.columns]
         self.feature_names = available_features
         
         X = df[available_features].values
@@ -124,6 +102,11 @@ class CustomerSegmentation:
     
     def train_model(self, X):
         """Train K-Means clustering model"""
+        if self.mode == 'minibatch':
+            self.train_streaming(X)
+            X_scaled = self.scaler.transform(X)
+            return self.model.predict(X_scaled), X_scaled, self.pca.transform(X_scaled)
+        
         print(f"\n🤖 Training K-Means clustering model...")
         print(f"📊 Number of clusters: {self.n_clusters}")
         
@@ -153,6 +136,11 @@ class CustomerSegmentation:
         silhouette_avg = silhouette_score(X_scaled, cluster_labels)
         
         print(f"✅ Model trained successfully!")
+        self._report_silhouette(silhouette_avg)
+        
+        return cluster_labels, X_scaled, X_pca
+    
+    def _report_silhouette(self, silhouette_avg):
         print(f"📊 Silhouette Score: {silhouette_avg:.3f}")
         
         if silhouette_avg > 0.5:
@@ -161,8 +149,53 @@ class CustomerSegmentation:
             print("   ✅ Good cluster separation")
         else:
             print("   ⚠️  Moderate cluster separation")
+    
+    def train_streaming(self, source, columns=None):
+        """
+        Train MiniBatchKMeans chunk by chunk
+        
+        Scaler, centroids and PCA are fitted without loading the whole
+        source; the silhouette score is computed on a uniform sample of
+        silhouette_sample rows.
+        
+        Args:
+            source: CSV path, DataFrame, array or callable yielding chunks
+            columns: Feature columns (None = self.feature_names, or
+                FEATURE_COLS if none were selected); ignored for arrays
+        
+        Returns:
+            Sampled silhouette score
+        """
+        if isinstance(source, np.ndarray):
+            columns = None
+        else:
+            columns = list(columns or self.feature_names or FEATURE_COLS)
+            self.feature_names = columns
         
-        return cluster_labels, X_scaled, X_pca
+        print(f"\n🤖 Training MiniBatch K-Means clustering model...")
+        print(f"📊 Number of clusters: {self.n_clusters} · batch size {self.batch_size} · "
+              f"chunks of {self.chunksize:,} rows")
+        
+        self.scaler, self.model, sample = fit_streaming(
+            source, self.n_clusters, columns=columns, chunksize=self.chunksize,
+            batch_size=self.batch_size, sample_size=self.silhouette_sample
+        )
+        
+        # PCA for visualization, fitted on the sample
+        self.pca = PCA(n_components=2).fit(sample)
+        print(f"   PCA explained variance: {self.pca.explained_variance_ratio_.sum():.2%}")
+        
+        silhouette_avg = sampled_silhouette(sample, self.model)
+        print(f"✅ Model trained successfully!")
+        print(f"   Silhouette estimated on {len(sample):,} sampled rows")
+        self._report_silhouette(silhouette_avg)
+        
+        return silhouette_avg
+    
+    def assign_streaming(self, source):
+        """Yield (features, segment labels) for each chunk of the source, in self.feature_names order"""
+        columns = None if isinstance(source, np.ndarray) else self.feature_names
+        return assign_streaming(source, self.scaler, self.model, columns=columns, chunksize=self.chunksize)
     
     def analyze_segments(self, df, cluster_labels, X):
         """Analyze and profile each segment"""
@@ -192,6 +225,48 @@ class CustomerSegmentation:
             
             segment_profiles.append(profile)
         
+        return self._name_segments(segment_profiles)
+    
+    def analyze_streaming(self, source):
+        """
+        Profile each segment from per-cluster sums over a chunked source
+        
+        Same profiles as analyze_segments, with every row counted as one
+        customer. Profile fields whose feature isn't a model feature are NaN.
+        """
+        print("\n" + "="*70)
+        print("📊 CUSTOMER SEGMENT ANALYSIS")
+        print("="*70)
+        
+        columns = self.feature_names
+        counts, sums = cluster_stats(self.assign_streaming(source), self.n_clusters)
+        total = counts.sum()
+        
+        def total_of(segment_id, feature):
+            return sums[segment_id, columns.index(feature)] if feature in columns else np.nan
+        
+        def mean_of(segment_id, feature):
+            return total_of(segment_id, feature) / counts[segment_id] if counts[segment_id] else np.nan
+        
+        segment_profiles = []
+        
+        for segment_id in range(self.n_clusters):
+            segment_profiles.append({
+                'segment_id': segment_id,
+                'size': int(counts[segment_id]),
+                'size_pct': counts[segment_id] / total * 100,
+                'avg_sales': mean_of(segment_id, 'sales'),
+                'total_sales': total_of(segment_id, 'sales'),
+                'avg_orders': mean_of(segment_id, 'orders'),
+                'avg_order_value': mean_of(segment_id, 'avg_order_value'),
+                'avg_engagement': mean_of(segment_id, 'engagement_score'),
+                'avg_csat': mean_of(segment_id, 'csat_score'),
+                'avg_conversion': mean_of(segment_id, 'chat_conversion_rate'),
+            })
+        
+        return self._name_segments(segment_profiles)
+    
+    def _name_segments(self, segment_profiles):
         # Sort by total sales (descending)
         segment_profiles = sorted(segment_profiles, key=lambda x: x['total_sales'], reverse=True)
         
@@ -286,7 +361,8 @@ class CustomerSegmentation:
             'pca': self.pca,
             'feature_names': self.feature_names,
             'segments': self.segments,
-            'n_clusters': self.n_clusters
+            'n_clusters': self.n_clusters,
+            'mode': self.mode
         }
         
         with open(filepath, 'wb') as f:
@@ -0,0 +1,192 @@
+"""
+Streaming K-Means - Mini-batch segmentation over chunked customer features
+
+Full-batch KMeans(n_init=10) plus silhouette_score keeps every row in memory
+and the silhouette is O(n^2). For per-buyer features of millions of
+customers the segmentation models use this mode instead:
+
+    fit_streaming()      - StandardScaler and MiniBatchKMeans fitted chunk by chunk
+    assign_streaming()   - cluster labels, one chunk at a time
+    cluster_stats()      - per-cluster counts and feature sums from those labels
+    sampled_silhouette() - silhouette on a fixed-size uniform sample of the rows
+
+A source is a CSV path (read with chunksize), an in-memory DataFrame or
+array (sliced), or a callable returning an iterator of frames or arrays.
+Every pass re-reads the source, so memory is bounded by the chunk size and
+the sample size, not by the number of customers. Without explicit columns
+the numeric columns are resolved once (numeric_columns) from the frame or
+its first chunk, so every chunk has the same features in the same order.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+from sklearn import config_context
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.metrics import silhouette_score
+from sklearn.preprocessing import StandardScaler
+
+DEFAULT_CHUNKSIZE = 100_000
+
+# MB of pairwise distances sklearn may hold at once (its default is 1024)
+SILHOUETTE_WORKING_MEMORY = 64
+
+
+def numeric_columns(source, columns=None, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Feature columns of a source: `columns` if given, otherwise the numeric
+    columns of the frame or of its first chunk. None for array sources.
+    """
+    if columns is not None:
+        return list(columns)
+    if isinstance(source, (str, os.PathLike)):
+        first = pd.read_csv(source, nrows=chunksize)
+    elif isinstance(source, pd.DataFrame):
+        first = source
+    elif isinstance(source, np.ndarray):
+        return None
+    elif callable(source):
+        first = next(iter(source()), None)
+    else:
+        raise TypeError(f"Unsupported segmentation source: {type(source).__name__}")
+    if not isinstance(first, pd.DataFrame):
+        return None
+    return first.select_dtypes(include=[np.number]).columns.tolist()
+
+
+def iter_chunks(source, columns=None, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Float64 feature blocks of at most `chunksize` rows, missing and
+    unparseable values as 0
+
+    Args:
+        source: CSV path, DataFrame, array, or callable returning an iterator
+            of DataFrames or arrays
+        columns: Feature columns to keep (None = numeric_columns(source))
+        chunksize: Rows per block for paths, frames and arrays
+    """
+    columns = numeric_columns(source, columns, chunksize)
+    if isinstance(source, (str, os.PathLike)):
+        blocks = pd.read_csv(source, usecols=columns, chunksize=chunksize)
+    elif isinstance(source, pd.DataFrame):
+        blocks = (source.iloc[i:i + chunksize] for i in range(0, len(source), chunksize))
+    elif isinstance(source, np.ndarray):
+        blocks = (source[i:i + chunksize] for i in range(0, len(source), chunksize))
+    elif callable(source):
+        blocks = source()
+    else:
+        raise TypeError(f"Unsupported segmentation source: {type(source).__name__}")
+
+    for block in blocks:
+        if isinstance(block, pd.DataFrame):
+            block = block[columns]
+            # A stray label in a later chunk reads the whole column as text
+            text = [col for col in columns if not pd.api.types.is_numeric_dtype(block[col])]
+            if text:
+                block = block.assign(**{col: pd.to_numeric(block[col], errors='coerce') for col in text})
+        X = np.array(block, dtype=np.float64)
+        X[np.isnan(X)] = 0
+        if len(X):
+            yield X
+
+
+class Reservoir:
+    """
+    Uniform sample of at most `size` rows from a stream of chunks
+
+    Every row gets a random key and the `size` largest keys seen so far are
+    kept, so the sample never holds more than size + chunksize rows.
+    """
+
+    def __init__(self, size, random_state=42):
+        self.size = size
+        self.rng = np.random.default_rng(random_state)
+        self.sample = None
+        self.keys = np.empty(0)
+
+    def add(self, X):
+        self.sample = X if self.sample is None else np.concatenate([self.sample, X])
+        self.keys = np.concatenate([self.keys, self.rng.random(len(X))])
+        if len(self.keys) > self.size:
+            keep = np.argpartition(self.keys, -self.size)[-self.size:]
+            self.sample, self.keys = self.sample[keep], self.keys[keep]
+
+
+def sampled_silhouette(sample, model):
+    """Silhouette score of the model's clusters on a sample (NaN if it has one cluster)"""
+    labels = model.predict(sample)
+    if len(np.unique(labels)) < 2:
+        return float('nan')
+    with config_context(working_memory=SILHOUETTE_WORKING_MEMORY):
+        return float(silhouette_score(sample, labels))
+
+
+def fit_streaming(source, n_clusters, columns=None, chunksize=DEFAULT_CHUNKSIZE, batch_size=4096,
+                  epochs=3, sample_size=10_000, random_state=42):
+    """
+    Fit a StandardScaler and MiniBatchKMeans without loading the whole source
+
+    The first pass fits the scaler and draws a reservoir sample. The
+    centroids are seeded by a mini-batch fit (3 k-means++ inits) on the
+    scaled sample, then `epochs` passes feed shuffled mini-batches of every
+    chunk to MiniBatchKMeans.partial_fit.
+
+    Args:
+        source: See iter_chunks
+        n_clusters: Number of segments
+        columns: Feature columns (None = numeric_columns(source))
+        chunksize: Rows read per chunk
+        batch_size: Rows per partial_fit step
+        epochs: Passes over the source after seeding
+        sample_size: Rows kept for seeding, silhouette and PCA
+        random_state: Seed for sampling, shuffling and k-means++
+
+    Returns:
+        (scaler, model, scaled sample)
+    """
+    columns = numeric_columns(source, columns, chunksize)
+    scaler = StandardScaler()
+    reservoir = Reservoir(sample_size, random_state)
+    for X in iter_chunks(source, columns, chunksize):
+        scaler.partial_fit(X)
+        reservoir.add(X)
+    if reservoir.sample is None or len(reservoir.sample) < n_clusters:
+        raise ValueError(f"Need at least {n_clusters} rows to fit {n_clusters} clusters")
+    sample = scaler.transform(reservoir.sample)
+
+    seed = MiniBatchKMeans(n_clusters=n_clusters, batch_size=batch_size, n_init=3,
+                           random_state=random_state).fit(sample)
+    model = MiniBatchKMeans(n_clusters=n_clusters, init=seed.cluster_centers_, batch_size=batch_size,
+                            n_init=1, random_state=random_state)
+    model.partial_fit(sample)  # Adopts the seeded centroids, so later batches may be smaller than n_clusters
+    rng = np.random.default_rng(random_state)
+    for _ in range(epochs):
+        for X in iter_chunks(source, columns, chunksize):
+            X = scaler.transform(X)[rng.permutation(len(X))]
+            for start in range(0, len(X), batch_size):
+                model.partial_fit(X[start:start + batch_size])
+    return scaler, model, sample
+
+
+def assign_streaming(source, scaler, model, columns=None, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield (features, labels) for each chunk of the source"""
+    columns = numeric_columns(source, columns, chunksize)
+    for X in iter_chunks(source, columns, chunksize):
+        yield X, model.predict(scaler.transform(X))
+
+
+def cluster_stats(chunks, n_clusters):
+    """
+    Row counts and feature sums per cluster over assign_streaming() output
+
+    Returns:
+        (counts of shape (n_clusters,), sums of shape (n_clusters, n_features))
+    """
+    counts, sums = np.zeros(n_clusters, dtype=np.int64), None
+    for X, labels in chunks:
+        counts += np.bincount(labels, minlength=n_clusters)
+        block = np.column_stack([np.bincount(labels, weights=X[:, j], minlength=n_clusters)
+                                 for j in range(X.shape[1])])
+        sums = block if sums is None else sums + block
+    return counts, sums
@@ -1,8 +1,15 @@
 """
 Customer Segmentation Model
 Uses K-means clustering to segment customers based on behavior
+
+mode='minibatch' swaps KMeans for MiniBatchKMeans fitted chunk by chunk
+(ml/segmentation/streaming_kmeans.py); fit_streaming() and
+predict_streaming() segment per-buyer data that doesn't fit in memory.
 """
 
+import os
+import sys
+
 import pandas as pd
 import numpy as np
 from sklearn.cluster import KMeans
@@ -14,14 +21,28 @@ from datetime import datetime
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ml.segmentation.streaming_kmeans import (
+    DEFAULT_CHUNKSIZE, assign_streaming, cluster_stats, fit_streaming, numeric_columns, sampled_silhouette
+)
+
 class CustomerSegmentation:
     """
     Customer segmentation using K-means clustering
     Segments customers based on RFM (Recency, Frequency, Monetary) analysis
     """
     
-    def __init__(self, n_clusters=4):
+    def __init__(self, n_clusters=4, mode='batch', batch_size=4096, silhouette_sample=10_000,
+                 chunksize=DEFAULT_CHUNKSIZE):
+        if mode not in ('batch', 'minibatch'):
+            raise ValueError(f"mode must be 'batch' or 'minibatch', got {mode!r}")
         self.n_clusters = n_clusters
+        self.mode = mode
+        self.batch_size = batch_size
+        self.silhouette_sample = silhouette_sample
+        self.chunksize = chunksize
+        self.silhouette = None
         self.scaler = StandardScaler()
         self.kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
         self.pca = PCA(n_components=2)
@@ -152,14 +173,18 @@ class CustomerSegmentation:
         # Handle missing values
         numeric_features = numeric_features.fillna(0)
         
-        # Scale features
-        scaled_features = self.scaler.fit_transform(numeric_features)
-        
-        # Fit K-means
-        self.kmeans.fit(scaled_features)
-        
-        # Get cluster labels
-        labels = self.kmeans.labels_
+        if self.mode == 'minibatch':
+            self.fit_streaming(numeric_features, columns=numeric_features.columns.tolist(), profile=False)
+            labels = self.kmeans.predict(self.scaler.transform(numeric_features))
+        else:
+            # Scale features
+            scaled_features = self.scaler.fit_transform(numeric_features)
+            
+            # Fit K-means
+            self.kmeans.fit(scaled_features)
+            
+            # Get cluster labels
+            labels = self.kmeans.labels_
         
         # Create cluster profiles
         for i in range(self.n_clusters):
@@ -172,6 +197,51 @@ class CustomerSegmentation:
         
         return labels
     
+    def fit_streaming(self, source, columns=None, profile=True):
+        """
+        Fit MiniBatchKMeans over a chunked source without loading it
+        
+        Args:
+            source: CSV path, DataFrame, array or callable yielding chunks
+            columns: Feature columns (None = the numeric columns of the frame
+                or of the first chunk)
+            profile: Build cluster_profiles with one more pass over the source
+        
+        Returns:
+            Silhouette score on a sample of silhouette_sample rows
+        """
+        columns = numeric_columns(source, columns, self.chunksize)
+        
+        self.scaler, self.kmeans, sample = fit_streaming(
+            source, self.n_clusters, columns=columns, chunksize=self.chunksize,
+            batch_size=self.batch_size, sample_size=self.silhouette_sample
+        )
+        self.silhouette = sampled_silhouette(sample, self.kmeans)
+        if columns is not None:
+            self.feature_names = list(columns)
+        
+        if profile:
+            chunks = assign_streaming(source, self.scaler, self.kmeans, columns=columns, chunksize=self.chunksize)
+            counts, sums = cluster_stats(chunks, self.n_clusters)
+            names = columns if columns is not None else range(sums.shape[1])
+            for i in range(self.n_clusters):
+                mean = pd.Series(sums[i] / counts[i] if counts[i] else np.nan, index=names)
+                self.cluster_profiles[i] = {
+                    'size': int(counts[i]),
+                    'mean_values': mean.to_dict(),
+                    'characteristics': self._interpret_cluster(mean)
+                }
+        
+        return self.silhouette
+    
+    def predict_streaming(self, source, columns=None):
+        """
+        Yield (features, cluster labels) for each chunk of the source
+        (columns default to the fitted feature_names)
+        """
+        return assign_streaming(source, self.scaler, self.kmeans, columns=columns or self.feature_names or None,
+                                chunksize=self.chunksize)
+    
     def _interpret_cluster(self, cluster_mean):
         """
         Interpret cluster characteristics
@@ -0,0 +1,76 @@
+"""
+Backtest Benchmark
+Runs the rolling-origin backtest serially, in a process pool and again from
+the result cache, and checks all three give the same leaderboard
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from ml.evaluation.backtest import leaderboard, rolling_origins, run_backtest
+from model_registry import write_weekly_sales
+
+METRICS = ['MAPE', 'MAE', 'RMSE']
+
+
+def main(n_weeks=156):
+    print("=" * 60)
+    print("BACKTEST BENCHMARK")
+    print("=" * 60)
+
+    # Fold layout
+    expanding = rolling_origins(100, horizon=4, n_folds=5)
+    sliding = rolling_origins(100, horizon=4, n_folds=5, min_train=52, window='sliding')
+    assert [f.train_end for f in expanding] == [80, 84, 88, 92, 96] and expanding[-1].test_end == 100
+    assert all(f.train_start == 0 for f in expanding)
+    assert all(f.train_end - f.train_start == 52 for f in sliding)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_weekly_sales(Path(tmp), n_weeks, seed=0)
+        data = pd.read_csv(Path(tmp) / 'processed' / 'weekly_sales_CLEAN.csv', parse_dates=['Week'])
+        data = data.rename(columns={'Week': 'ds', 'Total_Sales': 'y'})
+        models = ['naive_ma4', 'xgboost', 'prophet_final']
+        options = dict(models=models, horizon=4, n_folds=8)
+
+        start = time.perf_counter()
+        serial = run_backtest(data, workers=1, cache_dir=Path(tmp) / 'serial', **options)
+        serial_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pooled = run_backtest(data, cache_dir=Path(tmp) / 'pooled', **options)
+        pooled_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        cached = run_backtest(data, cache_dir=Path(tmp) / 'pooled', **options)
+        cached_time = time.perf_counter() - start
+
+        # Changing the data invalidates every fold
+        changed = data.copy()
+        changed.loc[0, 'y'] += 1
+        rerun = run_backtest(changed, workers=1, cache_dir=Path(tmp) / 'pooled', models=['naive_ma4'],
+                             horizon=4, n_folds=8)
+
+    board = leaderboard(serial)
+    for other in (pooled, cached):
+        pd.testing.assert_frame_equal(leaderboard(other)[METRICS], board[METRICS])
+    ok = cached['error'].isna()
+    assert cached.loc[ok, 'cached'].all() and not cached.loc[~ok, 'cached'].any()
+    assert not rerun['cached'].any()
+
+    print(f"{n_weeks} weeks, {len(models)} models x 8 expanding folds, 4-week horizon\n")
+    print(f"  serial:        {serial_time:6.2f} s")
+    print(f"  process pool:  {pooled_time:6.2f} s")
+    print(f"  from cache:    {cached_time:6.2f} s  ({serial_time / cached_time:.0f}x)\n")
+    print(board.to_string(float_format=lambda v: f"{v:,.2f}"))
+    print("\n✅ Serial, pooled and cached runs give the same leaderboard; changed data refits")
+
+
+if __name__ == "__main__":
+    main()
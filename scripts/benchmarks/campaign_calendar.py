@@ -0,0 +1,179 @@
+"""
+Campaign Calendar Benchmark
+Compares the previous per-campaign groupby + merge in _add_promotional_features
+with the cached campaign calendar on years of daily campaign logs, and checks
+both produce the same weekly features
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from ml.forecasting.campaign_calendar import CALENDAR_FILE, load_campaign_calendar
+from ml.forecasting.xgboost_forecaster import XGBoostSalesForecaster
+
+
+def legacy_add_promotional_features(weekly_sales, cleaned_path):
+    """_add_promotional_features before the campaign calendar"""
+    try:
+        flash_sales = pd.read_csv(f"{cleaned_path}/flash_sale_cleaned.csv")
+        vouchers = pd.read_csv(f"{cleaned_path}/voucher_cleaned.csv")
+        live_streams = pd.read_csv(f"{cleaned_path}/live_cleaned.csv")
+        games = pd.read_csv(f"{cleaned_path}/game_cleaned.csv")
+        for df in [flash_sales, vouchers, live_streams, games]:
+            if 'Time_Period' in df.columns and not df.empty:
+                df['Week'] = pd.to_datetime(df['Time_Period'], errors='coerce')
+                df['Week'] = df['Week'].dt.to_period('W').dt.start_time
+        if not flash_sales.empty and 'Week' in flash_sales.columns:
+            flash_weekly = flash_sales.groupby('Week').agg({
+                'Sales_Orders_Created_IDR': 'sum', 'Orders_Created': 'sum'}).reset_index()
+            flash_weekly.columns = ['Week', 'Flash_Sales', 'Flash_Orders']
+            weekly_sales = weekly_sales.merge(flash_weekly, on='Week', how='left')
+        if not vouchers.empty and 'Week' in vouchers.columns:
+            voucher_weekly = vouchers.groupby('Week').agg({
+                'Total_Cost_Orders_Created_IDR': 'sum', 'Orders_Created': 'sum'}).reset_index()
+            voucher_weekly.columns = ['Week', 'Voucher_Cost', 'Voucher_Orders']
+            weekly_sales = weekly_sales.merge(voucher_weekly, on='Week', how='left')
+        if not live_streams.empty and 'Week' in live_streams.columns:
+            live_weekly = live_streams.groupby('Week').agg({'Sales_Orders_Created_IDR': 'sum'}).reset_index()
+            live_weekly.columns = ['Week', 'Live_Sales']
+            weekly_sales = weekly_sales.merge(live_weekly, on='Week', how='left')
+        if not games.empty and 'Week' in games.columns:
+            game_weekly = games.groupby('Week').agg({'Sales_Orders_Created_IDR': 'sum'}).reset_index()
+            game_weekly.columns = ['Week', 'Game_Sales']
+            weekly_sales = weekly_sales.merge(game_weekly, on='Week', how='left')
+        promo_cols = ['Flash_Sales', 'Flash_Orders', 'Voucher_Cost', 'Voucher_Orders', 'Live_Sales', 'Game_Sales']
+        for col in promo_cols:
+            if col in weekly_sales.columns:
+                weekly_sales[col] = weekly_sales[col].fillna(0)
+        ad_cols = [col for col in weekly_sales.columns if 'Cost' in col or 'Flash_Sales' in col]
+        weekly_sales['Total_Ad_Spend'] = weekly_sales[ad_cols].sum(axis=1) if ad_cols else 0
+        promo_sales_cols = [col for col in weekly_sales.columns if col in ['Flash_Sales', 'Live_Sales', 'Game_Sales']]
+        if promo_sales_cols:
+            weekly_sales['Has_Promotion'] = (weekly_sales[promo_sales_cols].sum(axis=1) > 0).astype(int)
+        else:
+            weekly_sales['Has_Promotion'] = 0
+    except Exception:
+        weekly_sales['Total_Ad_Spend'] = 0
+        weekly_sales['Has_Promotion'] = 0
+    return weekly_sales
+
+
+def write_campaigns(cleaned_path, years, campaigns_per_day, seed):
+    """Daily campaign logs, several campaigns per day and type, with some missing periods"""
+    rng = np.random.default_rng(seed)
+    cleaned_path.mkdir(parents=True, exist_ok=True)
+    days = pd.date_range('2021-01-01', periods=365 * years, freq='D').strftime('%Y-%m-%d')
+
+    def log(active_share, columns):
+        n = len(days) * campaigns_per_day
+        df = pd.DataFrame({'Time_Period': np.repeat(days, campaigns_per_day)})
+        df.loc[rng.random(n) > active_share, 'Time_Period'] = np.nan
+        for col in columns:
+            df[col] = rng.gamma(2.0, 5e5, n).round(2)
+        df['Orders_Created'] = rng.integers(0, 50, n)
+        df['Source_File'] = 'export.xlsx'
+        return df.sample(frac=1, random_state=seed)
+
+    log(0.9, ['Sales_Orders_Created_IDR']).to_csv(cleaned_path / 'flash_sale_cleaned.csv', index=False)
+    log(0.8, ['Total_Cost_Orders_Created_IDR']).to_csv(cleaned_path / 'voucher_cleaned.csv', index=False)
+    log(0.5, ['Sales_Orders_Created_IDR']).to_csv(cleaned_path / 'live_cleaned.csv', index=False)
+    log(0.3, ['Sales_Orders_Created_IDR']).to_csv(cleaned_path / 'game_cleaned.csv', index=False)
+    return len(days) * campaigns_per_day * 4
+
+
+def weekly_frame(years):
+    weeks = pd.date_range('2020-12-28', periods=52 * years + 4, freq='W-MON')
+    return pd.DataFrame({'Week': weeks, 'Total_Sales': np.linspace(1e8, 3e8, len(weeks))})
+
+
+def add_features(data_path, weekly_sales):
+    data_path.mkdir(parents=True, exist_ok=True)  # The exports are found via data_path/..
+    with contextlib.redirect_stdout(io.StringIO()):
+        return XGBoostSalesForecaster(str(data_path))._add_promotional_features(weekly_sales.copy())
+
+
+def check_edge_cases(tmp):
+    data_path = Path(tmp) / 'edge' / 'data'
+    cleaned_path = Path(tmp) / 'edge' / 'analytical-showdown-pipeline' / 'cleaned_data'
+    write_campaigns(cleaned_path, 1, 2, seed=3)
+    weekly_sales = weekly_frame(1)
+
+    def compare(label):
+        expected = legacy_add_promotional_features(weekly_sales.copy(), cleaned_path)
+        pd.testing.assert_frame_equal(add_features(data_path, weekly_sales), expected, check_dtype=False,
+                                      obj=label)
+
+    compare("baseline")
+    # An empty export and one without Time_Period contribute no columns
+    pd.DataFrame(columns=['Time_Period', 'Sales_Orders_Created_IDR']).to_csv(
+        cleaned_path / 'live_cleaned.csv', index=False)
+    pd.read_csv(cleaned_path / 'game_cleaned.csv').drop(columns='Time_Period').to_csv(
+        cleaned_path / 'game_cleaned.csv', index=False)
+    compare("empty and undated exports")
+    # Only unparseable periods still yields (zero) columns
+    voucher = pd.read_csv(cleaned_path / 'voucher_cleaned.csv')
+    voucher['Time_Period'] = 'not a date'
+    voucher.to_csv(cleaned_path / 'voucher_cleaned.csv', index=False)
+    compare("unparseable periods")
+    # A missing export or metric column falls back to no promotional features
+    os.remove(cleaned_path / 'live_cleaned.csv')
+    compare("missing export")
+
+
+def main(years=5, campaigns_per_day=150):
+    print("=" * 60)
+    print("CAMPAIGN CALENDAR BENCHMARK")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        check_edge_cases(tmp)
+        print("✅ Same weekly features as the per-campaign merges (incl. empty, undated and missing exports)\n")
+
+        data_path = Path(tmp) / 'data'
+        cleaned_path = Path(tmp) / 'analytical-showdown-pipeline' / 'cleaned_data'
+        rows = write_campaigns(cleaned_path, years, campaigns_per_day, seed=0)
+        weekly_sales = weekly_frame(years)
+
+        start = time.perf_counter()
+        expected = legacy_add_promotional_features(weekly_sales.copy(), cleaned_path)
+        legacy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        cold = add_features(data_path, weekly_sales)
+        cold_time = time.perf_counter() - start
+        assert (cleaned_path / CALENDAR_FILE).exists()
+
+        start = time.perf_counter()
+        warm = add_features(data_path, weekly_sales)
+        warm_time = time.perf_counter() - start
+
+        pd.testing.assert_frame_equal(cold, expected, check_dtype=False)
+        pd.testing.assert_frame_equal(warm, expected, check_dtype=False)
+
+        # Touching an export rebuilds the calendar
+        flash = pd.read_csv(cleaned_path / 'flash_sale_cleaned.csv')
+        flash['Sales_Orders_Created_IDR'] *= 2
+        flash.to_csv(cleaned_path / 'flash_sale_cleaned.csv', index=False)
+        rebuilt = load_campaign_calendar(cleaned_path)
+        assert np.isclose(rebuilt['Flash_Sales'].sum(), 2 * cold['Flash_Sales'].sum())
+
+    print(f"{rows:,} daily campaign rows over {years} years, {len(weekly_sales)} weeks\n")
+    print(f"  per-campaign groupby + merge:  {legacy_time * 1000:8.0f} ms")
+    print(f"  calendar, first build:         {cold_time * 1000:8.0f} ms  ({legacy_time / cold_time:.1f}x)")
+    print(f"  calendar, cached:              {warm_time * 1000:8.0f} ms  ({legacy_time / warm_time:.0f}x)")
+    print("\n✅ Cached calendar matches the merged features and is rebuilt when an export changes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+European Number Parser Benchmark
+Checks clean_european_numbers against the per-cell cleaners it replaced on
+randomly generated columns, then times both on a million cells
+"""
+
+import re
+import sys
+import time
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+import warnings
+warnings.filterwarnings('ignore')
+
+import numpy as np
+import pandas as pd
+
+# Add parent to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from dashboard.utils.data_cleaner import clean_european_number, clean_european_numbers
+
+
+def legacy_clean_numeric_value(value):
+    """Per-cell cleaner formerly in scripts/comprehensive_data_pipeline.py"""
+    if pd.isna(value):
+        return np.nan
+    if isinstance(value, (int, float)):
+        return float(value)
+    value_str = str(value).strip()
+    value_str = value_str.replace(' ', '')
+    if '.' in value_str and ',' in value_str:
+        value_str = value_str.replace('.', '').replace(',', '.')
+    elif '.' in value_str and re.match(r'^\d{1,3}(\.\d{3})+$', value_str):
+        value_str = value_str.replace('.', '')
+    elif ',' in value_str:
+        value_str = value_str.replace(',', '.')
+    try:
+        return float(value_str)
+    except:
+        return np.nan
+
+
+def legacy_fix_clean_european_number(value):
+    """Per-cell cleaner formerly in scripts/fix_all_data.py"""
+    if pd.isna(value):
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    value_str = str(value).strip()
+    value_str = value_str.replace(' ', '')
+    if '.' in value_str and ',' in value_str:
+        value_str = value_str.replace('.', '').replace(',', '.')
+    elif '.' in value_str:
+        if re.match(r'^\d{1,3}(\.\d{3})+$', value_str):
+            value_str = value_str.replace('.', '')
+    elif ',' in value_str:
+        value_str = value_str.replace(',', '.')
+    try:
+        return float(value_str)
+    except (ValueError, TypeError):
+        return value
+
+
+# (mode of clean_european_numbers, per-cell reference)
+REFERENCES = [
+    ('zero', clean_european_number),
+    ('nan', legacy_clean_numeric_value),
+    ('keep', legacy_fix_clean_european_number),
+]
+
+TOKENS = ['', ' ', '-', '.', ',', 'abc', 'nan', 'NaN', 'inf', '-Infinity', '1_000', '1e3', '.5', '5.',
+          '+1,5', '1,2,3', '1.2.3', '1.234.567', '12.34', '١٢٣', '١.٢٣٤', '\t1,5\n', '12 345,6', 'Rp 1.000',
+          '0,0', '-0', '00012', '1.234,', ',5', '1..234']
+
+
+def random_value(rng):
+    """One cell drawn from the shapes seen in the exports plus awkward edge cases"""
+    kind = rng.integers(0, 12)
+    if kind == 0:
+        # 1.234.567 style thousands
+        groups = [str(rng.integers(1, 1000))] + [f"{rng.integers(0, 1000):03d}" for _ in range(rng.integers(1, 4))]
+        return '.'.join(groups)
+    if kind == 1:
+        return f"{rng.integers(0, 10 ** 6):,}".replace(',', '.') + ',' + str(rng.integers(0, 100))
+    if kind == 2:
+        return f"{rng.uniform(-1000, 1000):.{rng.integers(0, 5)}f}".replace('.', rng.choice(['.', ',']))
+    if kind == 3:
+        return str(rng.choice(TOKENS))
+    if kind == 4:
+        return int(rng.integers(-10 ** 6, 10 ** 6))
+    if kind == 5:
+        return float(rng.normal(0, 1e4))
+    if kind == 6:
+        return [np.nan, None, pd.NaT][rng.integers(0, 3)]
+    if kind == 7:
+        return bool(rng.integers(0, 2))
+    if kind == 8:
+        return Decimal(str(round(rng.uniform(0, 100), 2)))
+    if kind == 9:
+        return datetime(2025, 1, int(rng.integers(1, 29)))
+    if kind == 10:
+        return ' ' * int(rng.integers(0, 3)) + str(rng.integers(0, 10 ** 9)) + ' ' * int(rng.integers(0, 3))
+    return np.float64(rng.uniform(0, 1e6)).round(int(rng.integers(0, 4)))
+
+
+def check_equivalence(n_columns=300, max_rows=200, seed=7):
+    """Randomized property check: vectorized == per-cell, values and dtype"""
+    rng = np.random.default_rng(seed)
+    for _ in range(n_columns):
+        column = pd.Series([random_value(rng) for _ in range(rng.integers(1, max_rows))], dtype=object)
+        for mode, reference in REFERENCES:
+            expected = column.apply(reference)
+            actual = clean_european_numbers(column, invalid=mode)
+            pd.testing.assert_series_equal(actual, expected)
+
+    # Typed columns take the NumPy fast path
+    for column in [pd.Series([1, 2, 3]), pd.Series([1.5, np.nan]), pd.Series([True, False])]:
+        for mode, reference in REFERENCES:
+            pd.testing.assert_series_equal(clean_european_numbers(column, invalid=mode), column.apply(reference))
+
+
+def make_export_column(n_cells, seed=42):
+    """Column shaped like the Shopee exports: mostly European-formatted strings"""
+    rng = np.random.default_rng(seed)
+    numbers = rng.gamma(2.0, 5000.0, n_cells)
+    formats = rng.integers(0, 5, n_cells)
+    cells = np.empty(n_cells, dtype=object)
+    cells[formats == 0] = [f"{int(x):,}".replace(',', '.') for x in numbers[formats == 0]]
+    cells[formats == 1] = [f"{x:,.2f}".replace(',', ' ').replace('.', ',').replace(' ', '.') for x in numbers[formats == 1]]
+    cells[formats == 2] = [f"{x / 1000:.2f}".replace('.', ',') for x in numbers[formats == 2]]
+    cells[formats == 3] = numbers[formats == 3].astype(int).tolist()
+    cells[formats == 4] = np.where(rng.random((formats == 4).sum()) < 0.5, '-', None)
+    return pd.Series(cells)
+
+
+def main():
+    print("=" * 60)
+    print("EUROPEAN NUMBER PARSER")
+    print("=" * 60)
+
+    started = time.perf_counter()
+    check_equivalence()
+    print(f"✅ Vectorized output equals the per-cell cleaners ({time.perf_counter() - started:.1f} s)")
+
+    column = make_export_column(1_000_000)
+    print(f"\n1,000,000 cells")
+    for mode, reference in REFERENCES:
+        started = time.perf_counter()
+        expected = column.apply(reference)
+        per_cell_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        actual = clean_european_numbers(column, invalid=mode)
+        vectorized_s = time.perf_counter() - started
+
+        pd.testing.assert_series_equal(actual, expected)
+        print(f"  {mode:<5} per-cell: {per_cell_s * 1000:8.0f} ms   vectorized: {vectorized_s * 1000:6.0f} ms   "
+              f"({per_cell_s / vectorized_s:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
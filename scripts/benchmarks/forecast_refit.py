@@ -0,0 +1,97 @@
+"""
+Forecast Refit Benchmark
+Times XGBoostSalesForecaster's refit modes (full retrain, warm start, reuse)
+and compares their accuracy on weeks none of the models have seen
+"""
+
+import contextlib
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from ml.forecasting.xgboost_forecaster import REFIT_MODES, XGBoostSalesForecaster
+from model_registry import write_weekly_sales
+
+
+def mape(y_true, y_pred):
+    mask = y_true > 0
+    return np.mean(np.abs((y_true[mask] - y_pred[mask]) / y_true[mask])) * 100
+
+
+def fit(data_path, refit):
+    """Evaluation fit plus forecasting model, as forecast_future would build it"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        forecaster = XGBoostSalesForecaster(str(data_path), refit=refit)
+        weekly_sales = forecaster.load_data()
+        start = time.perf_counter()
+        forecaster.train_model(weekly_sales)
+        eval_time = time.perf_counter() - start
+        start = time.perf_counter()
+        forecaster.fit_final_model()
+        refit_time = time.perf_counter() - start
+        forecast = forecaster.forecast_future(weeks=26)
+    return forecaster, eval_time, refit_time, forecast
+
+
+def main(n_weeks=208, horizon=13, origins=(130, 143, 156, 169, 182)):
+    print("=" * 60)
+    print("FORECAST REFIT BENCHMARK")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        full_path = Path(tmp) / 'full'
+        write_weekly_sales(full_path, n_weeks, seed=0)
+        with contextlib.redirect_stdout(io.StringIO()):
+            all_weeks = XGBoostSalesForecaster(str(full_path)).load_data()
+        history = pd.read_csv(full_path / 'processed' / 'weekly_sales_CLEAN.csv')
+
+        results = {mode: {'eval': [], 'refit': [], 'mape': [], 'forecast_diff': []} for mode in REFIT_MODES}
+        for origin in origins:
+            data_path = Path(tmp) / f'origin_{origin}'
+            (data_path / 'processed').mkdir(parents=True)
+            history.iloc[:origin].to_csv(data_path / 'processed' / 'weekly_sales_CLEAN.csv', index=False)
+
+            # The next `horizon` weeks with their actual features, unseen by every model
+            future = all_weeks.iloc[origin:origin + horizon]
+            y_future = future['Total_Sales'].values
+
+            baseline = None
+            for mode in REFIT_MODES:
+                forecaster, eval_time, refit_time, forecast = fit(data_path, mode)
+                X_future = future[forecaster.feature_cols].fillna(forecaster.final_fill_values)
+                y_pred = np.maximum(forecaster.final_model.predict(X_future), 0)
+
+                results[mode]['eval'].append(eval_time)
+                results[mode]['refit'].append(refit_time)
+                results[mode]['mape'].append(mape(y_future, y_pred))
+                if baseline is None:
+                    baseline = forecast['Predicted_Sales'].values
+                results[mode]['forecast_diff'].append(
+                    np.mean(np.abs(forecast['Predicted_Sales'].values - baseline) / baseline) * 100)
+
+        print(f"{n_weeks} weeks, {len(origins)} forecast origins, {horizon}-week holdout each\n")
+        print(f"  {'mode':<11} {'eval fit':>9} {'refit':>9} {'total':>9} {'holdout MAPE':>13} {'vs full':>9}")
+        full_total = np.mean(results['full']['eval']) + np.mean(results['full']['refit'])
+        for mode in REFIT_MODES:
+            r = results[mode]
+            total = np.mean(r['eval']) + np.mean(r['refit'])
+            print(f"  {mode:<11} {np.mean(r['eval']) * 1000:7.1f}ms {np.mean(r['refit']) * 1000:7.1f}ms "
+                  f"{total * 1000:7.1f}ms {np.mean(r['mape']):12.2f}% {np.mean(r['forecast_diff']):8.2f}%"
+                  f"  ({full_total / total:.1f}x)")
+        print("\n  'vs full' is the mean difference of the 26-week forecast from the double fit")
+
+        assert results['reuse']['refit'][0] < results['full']['refit'][0]
+        assert results['warm_start']['refit'][0] < results['full']['refit'][0]
+        print("\n✅ Both single-fit modes skip the second full training run")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+KPI Summary Benchmark
+Checks that KPIs read from the kpi_daily summary table equal the pandas
+engine's after the first build, an append (incremental refresh), values
+edited in place and rewritten history (both rebuild). Then times refreshing
+and reading the summary against summing the raw rows
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+import warnings
+warnings.filterwarnings('ignore')
+
+import numpy as np
+import pandas as pd
+
+# Add backend to path; the app engine must not need a PostgreSQL driver here
+sys.path.append(str(Path(__file__).parent.parent.parent / "backend"))
+sys.path.append(str(Path(__file__).parent))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from app.db.database import Base
+from app.db.models import DailyKPI
+from app.services import analytics_service
+from app.services.analytics_service import AnalyticsService
+from app.services.data_store import DataStore
+from app.services.kpi_summary import KPISummaryRefresher, read_kpis
+from app.services.rollups import RollupStore
+
+from sql_analytics import RANGES, assert_same, write_datasets
+
+
+def check_kpis(engine, snapshot, where):
+    with Session(engine) as db:
+        pandas_service = AnalyticsService(db, snapshot)
+        for start, end in RANGES:
+            got = read_kpis(db, start, end)
+            if start is None and end is None:
+                assert got.freshness.data_through and len(got.freshness.source_versions) == 3, where
+            got.freshness = None
+            assert_same(got, asyncio.run(pandas_service.get_kpis(start, end)), f"{where} {start}..{end}")
+
+
+def append_traffic_days(data_path, n_days, rows_per_day=50, seed=3):
+    """Append rows dated after the last traffic day, as a daily export would"""
+    path = data_path / "traffic_overview_cleaned.csv"
+    frame = pd.read_csv(path)
+    last = pd.to_datetime(frame['Date']).max()
+    rng = np.random.default_rng(seed)
+    days = last + pd.to_timedelta(np.repeat(np.arange(1, n_days + 1), rows_per_day), unit='D')
+    new = pd.DataFrame({'Date': days.strftime('%Y-%m-%d'), 'Total_Visitors': rng.poisson(300, len(days))})
+    new.to_csv(path, mode='a', header=False, index=False)
+
+
+def edit_traffic_history(data_path):
+    """Change past values without adding or removing rows, as a corrected export would"""
+    path = data_path / "traffic_overview_cleaned.csv"
+    frame = pd.read_csv(path)
+    frame.loc[frame.index[:10], 'Total_Visitors'] += 1_000
+    frame.to_csv(path, index=False)
+
+
+def rewrite_traffic_history(data_path):
+    path = data_path / "traffic_overview_cleaned.csv"
+    frame = pd.read_csv(path)
+    frame = frame.drop(index=frame.index[:10])
+    frame.to_csv(path, index=False)
+
+
+def summary_rows(engine):
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(DailyKPI)).scalar()
+
+
+def check_refreshes(tmp):
+    data_path = tmp / "parity"
+    data_path.mkdir()
+    write_datasets(data_path, 5_000, seed=4)
+    engine = create_engine(f"sqlite:///{tmp / 'parity.db'}")
+    Base.metadata.create_all(bind=engine)
+    refresher = KPISummaryRefresher(engine)
+
+    analytics_service.rollup_store = RollupStore()
+    store = DataStore(str(data_path), refresh_interval=0)
+    snapshot = store.load()
+    results = refresher.refresh_snapshot(snapshot)
+    assert {r.method for r in results.values()} == {'rebuild'}
+    check_kpis(engine, snapshot, "first build")
+
+    results = refresher.refresh_snapshot(snapshot)
+    assert {r.method for r in results.values()} == {'skipped'}
+
+    # Make sure the appended file gets a new mtime even on coarse clocks
+    time.sleep(0.01)
+    append_traffic_days(data_path, 7)
+    snapshot = store.refresh_if_changed(force=True)
+    results = refresher.refresh_snapshot(snapshot)
+    assert results['traffic_data'].method == 'incremental', results['traffic_data']
+    assert results['traffic_data'].buckets == 7, results['traffic_data']
+    assert results['chat_data'].method == 'skipped'
+    check_kpis(engine, snapshot, "after append")
+
+    # Same rows per day as summarized, only the values differ
+    time.sleep(0.01)
+    edit_traffic_history(data_path)
+    snapshot = store.refresh_if_changed(force=True)
+    results = refresher.refresh_snapshot(snapshot)
+    assert results['traffic_data'].method == 'rebuild', results['traffic_data']
+    check_kpis(engine, snapshot, "after in-place edit")
+
+    rewrite_traffic_history(data_path)
+    analytics_service.rollup_store = RollupStore()
+    snapshot = store.refresh_if_changed(force=True)
+    results = refresher.refresh_snapshot(snapshot)
+    assert results['traffic_data'].method == 'rebuild', results['traffic_data']
+    check_kpis(engine, snapshot, "after rewrite")
+
+
+def raw_totals(data_path):
+    """What the Overview page did on every render: read the files and sum the raw rows"""
+    chat = pd.read_csv(data_path / "chat_data_cleaned.csv")
+    flash = pd.read_csv(data_path / "flash_sale_cleaned.csv")
+    traffic = pd.read_csv(data_path / "traffic_overview_cleaned.csv")
+    return (
+        pd.to_numeric(chat['Sales_IDR'], errors='coerce').sum()
+        + pd.to_numeric(flash['Sales_Ready_To_Ship_IDR'], errors='coerce').sum(),
+        pd.to_numeric(traffic['Total_Visitors'], errors='coerce').sum(),
+        pd.to_numeric(chat['CSAT_Percent'], errors='coerce').mean(),
+    )
+
+
+def best_ms(fn, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main(sizes=(100_000, 1_000_000)):
+    print("=" * 60)
+    print("KPI SUMMARY BENCHMARK")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        check_refreshes(tmp)
+        print(f"✅ summary KPIs match the pandas engine on {len(RANGES)} ranges after the first build,")
+        print("   an appended week (incremental, 7 buckets), values edited in place and rewritten")
+        print("   history (both rebuild)\n")
+
+        print(f"  {'rows/dataset':>12} {'summary rows':>12} {'build':>8} {'+1 day':>8} {'read':>8} {'raw rows':>9}")
+        for n_rows in sizes:
+            data_path = tmp / f"bench_{n_rows}"
+            data_path.mkdir()
+            write_datasets(data_path, n_rows)
+            engine = create_engine(f"sqlite:///{tmp / f'bench_{n_rows}.db'}")
+            Base.metadata.create_all(bind=engine)
+            refresher = KPISummaryRefresher(engine)
+
+            store = DataStore(str(data_path), refresh_interval=0)
+            snapshot = store.load()
+            started = time.perf_counter()
+            refresher.refresh_snapshot(snapshot)
+            build_ms = (time.perf_counter() - started) * 1000
+
+            time.sleep(0.01)
+            append_traffic_days(data_path, 1, rows_per_day=n_rows // 3_650)
+            snapshot = store.refresh_if_changed(force=True)
+            started = time.perf_counter()
+            results = refresher.refresh_snapshot(snapshot)
+            append_ms = (time.perf_counter() - started) * 1000
+            assert results['traffic_data'].method == 'incremental'
+
+            with Session(engine) as db:
+                read_ms = best_ms(lambda: read_kpis(db))
+            raw_ms = best_ms(lambda: raw_totals(data_path), repeat=3)
+
+            print(f"  {n_rows:>12,} {summary_rows(engine):>12,} {build_ms:6.0f}ms {append_ms:6.1f}ms "
+                  f"{read_ms:6.2f}ms {raw_ms:7.0f}ms")
+
+    print("\n'+1 day' refreshes an appended day; 'read' is one grouped query over the summary rows,")
+    print("'raw rows' is the Overview page's former read-and-sum of the cleaned files")
+
+
+if __name__ == "__main__":
+    main()
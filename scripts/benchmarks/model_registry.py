@@ -0,0 +1,111 @@
+"""
+Model Registry Benchmark
+Compares training XGBoostSalesForecaster on page load with loading the stored
+artifact, and checks the loaded model forecasts exactly like the trained one
+"""
+
+import contextlib
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from ml.forecasting.xgboost_forecaster import XGBoostSalesForecaster
+from ml.registry.model_registry import ModelRegistry
+
+
+def write_weekly_sales(data_path, n_weeks, seed):
+    """Synthetic weekly_sales_CLEAN.csv with trend, seasonality and noise"""
+    rng = np.random.default_rng(seed)
+    weeks = pd.date_range('2022-01-03', periods=n_weeks, freq='W-MON')
+    t = np.arange(n_weeks)
+    sales = 2e8 + 1e6 * t + 5e7 * np.sin(2 * np.pi * t / 52) + rng.normal(0, 2e7, n_weeks)
+    buyers = (sales / 150_000 + rng.normal(0, 50, n_weeks)).round()
+    (data_path / 'processed').mkdir(parents=True, exist_ok=True)
+    pd.DataFrame({
+        'Week': weeks,
+        'Total_Sales': sales,
+        'Buyers': buyers,
+        'Products': (buyers * 1.3).round(),
+        'Product_Sales': sales * 0.95,
+    }).to_csv(data_path / 'processed' / 'weekly_sales_CLEAN.csv', index=False)
+
+
+def page_load(data_path, registry):
+    """What 7_Sales_Forecast.py does on a cold session"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        forecaster = XGBoostSalesForecaster(str(data_path))
+        _, _, _, y_pred_test = forecaster.load_or_train(registry)
+        forecast = forecaster.forecast_future(weeks=26)
+    return forecaster, y_pred_test, forecast
+
+
+def legacy_page_load(data_path):
+    """Previous page flow: train the evaluation model and a second full model every time"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        forecaster = XGBoostSalesForecaster(str(data_path))
+        weekly_sales = forecaster.load_data()
+        _, _, y_pred_test = forecaster.train_model(weekly_sales)
+        forecast = forecaster.forecast_future(weeks=26)
+    return forecaster, y_pred_test, forecast
+
+
+def main(n_weeks=156):
+    print("=" * 60)
+    print("MODEL REGISTRY BENCHMARK")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = Path(tmp) / 'data'
+        registry = ModelRegistry('xgboost_sales_forecaster', Path(tmp) / 'models')
+        write_weekly_sales(data_path, n_weeks, seed=0)
+
+        start = time.perf_counter()
+        legacy, legacy_pred, legacy_forecast = legacy_page_load(data_path)
+        legacy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        trained, trained_pred, trained_forecast = page_load(data_path, registry)
+        train_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        loaded, loaded_pred, loaded_forecast = page_load(data_path, registry)
+        load_time = time.perf_counter() - start
+
+        print(f"{n_weeks} weeks of sales\n")
+        print(f"  train on page load:   {legacy_time * 1000:8.1f} ms")
+        print(f"  first load (trains):  {train_time * 1000:8.1f} ms")
+        print(f"  stored artifact:      {load_time * 1000:8.1f} ms  ({legacy_time / load_time:.1f}x)")
+
+        assert loaded.version == trained.version
+        assert loaded.metrics == legacy.metrics
+        np.testing.assert_array_equal(loaded_pred, legacy_pred)
+        np.testing.assert_array_equal(loaded_pred, trained_pred)
+        pd.testing.assert_frame_equal(loaded_forecast, legacy_forecast)
+        pd.testing.assert_frame_equal(loaded_forecast, trained_forecast)
+        print("\n✅ Stored model reproduces the trained predictions and forecast")
+
+        # New data trains a new version; rolling back serves the old model again
+        first_version = loaded.version
+        write_weekly_sales(data_path, n_weeks + 4, seed=1)
+        retrained, _, _ = page_load(data_path, registry)
+        assert retrained.version != first_version
+        assert [v['version'] for v in registry.versions()] == [retrained.version, first_version]
+
+        assert registry.rollback() == first_version
+        rolled_back, _, rolled_back_forecast = page_load(data_path, registry)
+        assert rolled_back.version == first_version
+        assert rolled_back.metrics == legacy.metrics
+        assert len(registry.versions()) == 2
+        print("✅ New data stores a new version, rollback serves the previous one")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Online Retraining Benchmark
+Times OnlineRetrainer updates against full refits for growing histories, and
+checks promotion, rejection, full-refit fallbacks and that the Sales Forecast
+page serves the promoted version without training
+"""
+
+import contextlib
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from ml.forecasting.online_retrainer import OnlineRetrainer
+from ml.forecasting.xgboost_forecaster import XGBoostSalesForecaster
+from ml.registry.model_registry import ModelRegistry
+from model_registry import write_weekly_sales
+
+
+def next_week(retrainer, rng):
+    """A plausible new week following the stored data"""
+    weekly = pd.read_csv(retrainer.csv_path, parse_dates=['Week'])
+    sales = weekly['Total_Sales'].tail(4).mean() * rng.uniform(0.95, 1.05)
+    buyers = round(sales / 150_000)
+    return {'Week': weekly['Week'].max() + pd.Timedelta(days=7), 'Total_Sales': sales,
+            'Buyers': buyers, 'Products': round(buyers * 1.3), 'Product_Sales': sales * 0.95}
+
+
+def quiet(fn, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def check_lifecycle(tmp):
+    rng = np.random.default_rng(1)
+    data_path = Path(tmp) / 'lifecycle'
+    write_weekly_sales(data_path, 104, seed=1)
+    registry = ModelRegistry('xgb', Path(tmp) / 'models_lifecycle')
+    retrainer = OnlineRetrainer(str(data_path), registry)
+
+    first = quiet(retrainer.retrain)
+    assert first['mode'] == 'full' and first['status'] == 'promoted'
+    assert quiet(retrainer.retrain)['status'] == 'unchanged'
+
+    # One new week: trees appended to the active booster, new version served
+    retrainer.add_week(next_week(retrainer, rng))
+    update = quiet(retrainer.retrain)
+    assert update['mode'] == 'incremental' and update['status'] == 'promoted'
+    assert update['n_trees'] == first['n_trees'] + retrainer.rounds_per_week
+    # Nothing new to hold out of the gate: gated on the active model's accuracy on the new week
+    assert update['gate'] == 'holdout' and update['validation_accuracy'] == update['holdout_accuracy']
+    assert registry.active_version() == update['version']
+
+    # The Sales Forecast page picks up the promoted version without training
+    forecaster = XGBoostSalesForecaster(str(data_path))
+    quiet(forecaster.load_or_train, registry)
+    assert forecaster.version == update['version']
+    assert forecaster.final_model.get_booster().num_boosted_rounds() == update['n_trees']
+
+    # A candidate below the threshold is stored but the previous version stays active
+    retrainer.add_week(next_week(retrainer, rng))
+    retrainer.accuracy_threshold = 101
+    rejected = quiet(retrainer.retrain)
+    assert rejected['status'] == 'rejected' and registry.active_version() == update['version']
+    retrainer.accuracy_threshold = 85
+
+    # The next update covers both weeks the active model hasn't seen
+    retrainer.add_week(next_week(retrainer, rng))
+    catch_up = quiet(retrainer.retrain)
+    assert catch_up['new_weeks'] == 2 and catch_up['status'] == 'promoted'
+    # The gate trains on the first new week and is validated on the second, unseen by both models
+    assert catch_up['gate'] == 'validation' and catch_up['active_validation_accuracy'] is not None
+
+    assert retrainer.rollback() == update['version'] == registry.active_version()
+
+    # Editing a past week forces a full refit
+    weekly = pd.read_csv(retrainer.csv_path)
+    weekly.loc[10, 'Total_Sales'] *= 1.1
+    weekly.to_csv(retrainer.csv_path, index=False)
+    refit = quiet(retrainer.retrain)
+    assert refit['mode'] == 'full' and refit['reason'] == 'past weeks changed'
+
+    statuses = [entry['status'] for entry in registry.history()]
+    assert statuses == ['promoted', 'promoted', 'rejected', 'promoted', 'rolled_back', 'promoted']
+
+
+def time_updates(tmp, n_weeks, new_weeks, repeats=3):
+    """Full refit of the whole history vs appending `new_weeks` to it"""
+    rng = np.random.default_rng(n_weeks)
+    data_path = Path(tmp) / f'weeks_{n_weeks}_{new_weeks}'
+    write_weekly_sales(data_path, n_weeks, seed=0)
+    registry = ModelRegistry('xgb', Path(tmp) / f'models_{n_weeks}_{new_weeks}')
+    retrainer = OnlineRetrainer(str(data_path), registry, accuracy_threshold=0, max_trees=10_000)
+    full = quiet(retrainer.retrain)
+
+    incremental = []
+    for _ in range(repeats):
+        for _ in range(new_weeks):
+            retrainer.add_week(next_week(retrainer, rng))
+        start = time.perf_counter()
+        result = quiet(retrainer.retrain)
+        assert result['mode'] == 'incremental'
+        incremental.append((result['train_seconds'], time.perf_counter() - start))
+    train, total = np.median(incremental, axis=0)
+    return full['train_seconds'], full['total_seconds'], train, total
+
+
+def main():
+    print("=" * 60)
+    print("ONLINE RETRAINING BENCHMARK")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        check_lifecycle(tmp)
+        print("✅ Promote, reject, catch-up, rollback and full-refit fallback behave as expected\n")
+
+        print(f"  {'history':>8} {'new':>4} {'full fit':>10} {'append':>10} {'append+io':>10}")
+        for n_weeks in (104, 416, 1664):
+            for new_weeks in (1, 4):
+                full_train, _, train, total = time_updates(tmp, n_weeks, new_weeks)
+                print(f"  {n_weeks:>8} {new_weeks:>4} {full_train * 1000:8.0f}ms {train * 1000:8.0f}ms "
+                      f"{total * 1000:8.0f}ms  ({full_train / train:.0f}x)")
+
+    print("\n✅ Append time follows the number of new weeks, not the history length")
+
+
+if __name__ == "__main__":
+    main()
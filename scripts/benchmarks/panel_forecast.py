@@ -0,0 +1,132 @@
+"""
+Panel Forecast Benchmark
+Compares looping XGBoostSalesForecaster over many series with
+PanelSalesForecaster (global and per-series models), and checks the panel
+features and per-series models match the single-series forecaster
+"""
+
+import contextlib
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from ml.forecasting.panel_forecaster import PanelSalesForecaster, engineer_panel_features
+from ml.forecasting.xgboost_forecaster import XGBoostSalesForecaster
+
+
+def make_panel(n_series, n_weeks, seed, marketing=False):
+    """Synthetic shops of different size, trend and seasonality"""
+    rng = np.random.default_rng(seed)
+    frames = []
+    t = np.arange(n_weeks)
+    for i in range(n_series):
+        scale = rng.uniform(0.2, 3.0)
+        sales = scale * (2e8 + rng.uniform(-5e5, 2e6) * t
+                         + rng.uniform(1e7, 6e7) * np.sin(2 * np.pi * (t + rng.integers(52)) / 52)
+                         + rng.normal(0, 2e7, n_weeks))
+        sales = np.maximum(sales, 0)
+        buyers = (sales / 150_000 + rng.normal(0, 50, n_weeks)).round()
+        frame = pd.DataFrame({
+            'series_id': f'shop_{i:03d}',
+            'Week': pd.date_range('2022-01-03', periods=n_weeks, freq='W-MON'),
+            'Total_Sales': sales,
+            'Buyers': buyers,
+            'Products': (buyers * 1.3).round(),
+            'Product_Sales': sales * 0.95,
+        })
+        if marketing:
+            frame['Total_Ad_Spend'] = rng.gamma(2.0, 1e6, n_weeks)
+            frame['Has_Promotion'] = rng.integers(0, 2, n_weeks)
+            frame['Voucher_Cost'] = rng.gamma(2.0, 5e5, n_weeks)
+            frame['Flash_Sales'] = rng.gamma(2.0, 1e6, n_weeks)
+        else:
+            # What XGBoostSalesForecaster adds when no promotional exports are found
+            frame['Total_Ad_Spend'] = 0
+            frame['Has_Promotion'] = 0
+        frames.append(frame)
+    # Shuffle rows so the panel code has to sort
+    return pd.concat(frames, ignore_index=True).sample(frac=1, random_state=seed)
+
+
+def check_features():
+    panel = make_panel(20, 60, seed=1, marketing=True)
+    # Short series and a gap in a metric
+    panel = panel[~((panel['series_id'] == 'shop_003') & (panel['Week'] > '2022-01-20'))]
+    panel.loc[panel.sample(30, random_state=0).index, 'Total_Ad_Spend'] = np.nan
+
+    features = engineer_panel_features(panel)
+    forecaster = XGBoostSalesForecaster()
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected = pd.concat([
+            forecaster._engineer_features(group.sort_values('Week').reset_index(drop=True))
+            for _, group in panel.groupby('series_id')
+        ], ignore_index=True)
+    pd.testing.assert_frame_equal(features, expected[features.columns], check_dtype=False, rtol=1e-9)
+
+
+def loop_single_series(panel, tmp):
+    """One XGBoostSalesForecaster per series: CSV, features, two fits, forecast"""
+    forecasts = {}
+    test_predictions = {}
+    for series_id, group in panel.groupby('series_id'):
+        data_path = Path(tmp) / series_id
+        (data_path / 'processed').mkdir(parents=True)
+        group.sort_values('Week').drop(columns=['series_id', 'Total_Ad_Spend', 'Has_Promotion']).to_csv(
+            data_path / 'processed' / 'weekly_sales_CLEAN.csv', index=False)
+        with contextlib.redirect_stdout(io.StringIO()):
+            forecaster = XGBoostSalesForecaster(str(data_path))
+            _, _, y_pred_test = forecaster.train_model(forecaster.load_data())
+            forecasts[series_id] = forecaster.forecast_future(weeks=26)
+        test_predictions[series_id] = y_pred_test
+    return forecasts, test_predictions
+
+
+def main(n_series=40, n_weeks=156):
+    print("=" * 60)
+    print("PANEL FORECAST BENCHMARK")
+    print("=" * 60)
+
+    check_features()
+    print("✅ Panel features match _engineer_features per series (incl. short series and gaps)\n")
+
+    panel = make_panel(n_series, n_weeks, seed=0)
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        _, loop_test = loop_single_series(panel, tmp)
+        loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    per_series = PanelSalesForecaster(mode='per_series').fit(panel)
+    per_series_forecast = per_series.forecast(weeks=26)
+    per_series_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    global_model = PanelSalesForecaster(mode='global').fit(panel)
+    global_forecast = global_model.forecast(weeks=26)
+    global_time = time.perf_counter() - start
+
+    # Per-series panel models are the single-series models
+    for series_id, group in per_series.test_predictions.groupby('series_id'):
+        np.testing.assert_allclose(group['Predicted_Sales'].to_numpy(), loop_test[series_id], rtol=1e-6)
+    assert len(per_series_forecast) == len(global_forecast) == n_series * 26
+
+    print(f"{n_series} series x {n_weeks} weeks, 26-week forecast\n")
+    print(f"  {'':<26} {'time':>8} {'test MAPE':>10}")
+    print(f"  {'loop per series':<26} {loop_time:7.2f}s {per_series.metrics['Test_MAPE']:9.2f}%")
+    print(f"  {'panel, per-series models':<26} {per_series_time:7.2f}s {per_series.metrics['Test_MAPE']:9.2f}%"
+          f"  ({loop_time / per_series_time:.1f}x)")
+    print(f"  {'panel, global model':<26} {global_time:7.2f}s {global_model.metrics['Test_MAPE']:9.2f}%"
+          f"  ({loop_time / global_time:.1f}x)")
+    print("\n✅ Per-series panel models reproduce the single-series test predictions")
+
+
+if __name__ == "__main__":
+    main()
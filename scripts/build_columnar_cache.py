@@ -0,0 +1,50 @@
+"""
+Build Columnar Cache
+Compiles every data/cleaned/*_cleaned.csv into a typed Arrow IPC file
+so the dashboard and API start without parsing CSV text
+"""
+
+import sys
+import time
+from pathlib import Path
+import warnings
+warnings.filterwarnings('ignore')
+
+# Add parent to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from dashboard.utils.columnar_cache import build_columnar_cache, cache_path_for, is_fresh
+
+
+def main(data_dir=None, force=False):
+    """Compile stale or missing columnar files"""
+    data_dir = Path(data_dir) if data_dir else Path(__file__).parent.parent / "data" / "cleaned"
+
+    print("=" * 60)
+    print("BUILDING COLUMNAR CACHE")
+    print("=" * 60)
+    print(f"Source: {data_dir}\n")
+
+    built = 0
+    for csv_path in sorted(data_dir.glob("*_cleaned.csv")):
+        if not force and is_fresh(csv_path):
+            print(f"  ⏭️  {csv_path.name} (up to date)")
+            continue
+
+        started = time.perf_counter()
+        df = build_columnar_cache(csv_path)
+        elapsed = (time.perf_counter() - started) * 1000
+        cache_path = cache_path_for(csv_path)
+
+        if cache_path.exists():
+            print(f"  ✅ {cache_path.name}: {len(df):,} rows, {len(df.columns)} columns ({elapsed:.0f} ms)")
+            built += 1
+        else:
+            print(f"  ❌ {csv_path.name}: could not write cache")
+
+    print(f"\n{built} file(s) built")
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if arg != "--force"]
+    main(args[0] if args else None, force="--force" in sys.argv)
@@ -4,14 +4,37 @@ Works with original raw Indonesian Excel files
 Cleans, translates, and prepares data for analysis
 """
 
-import pandas as pd
+import sys
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
+import pandas as pd
 from pathlib import Path
-import re
 from datetime import datetime
 import warnings
 warnings.filterwarnings('ignore')
 
+# Add parent to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from dashboard.utils.data_cleaner import clean_european_numbers
+
+# Bump when the cleaning rules change so incremental runs re-parse everything
+PIPELINE_VERSION = 2
+
+# Columns kept as text; every other column is numeric
+TEXT_COLUMNS = ['Date', 'Data_Period', 'Time_Period', 'Platform', 'Channel', 'Tenor']
+
+# Cells per clean_european_numbers call when converting an export
+BATCH_CELLS = 1_000_000
+
+# Incremental state kept next to the processed CSVs
+MANIFEST_NAME = '.pipeline_manifest.json'
+CACHE_DIR_NAME = '.pipeline_cache'
+
 # Indonesian to English translations
 TRANSLATIONS = {
     # Date/Time
@@ -167,72 +190,117 @@ def clean_column_name(col):
     
     return col
 
-def clean_numeric_value(value):
-    """Clean numeric values - handle European format"""
-    if pd.isna(value):
-        return np.nan
-    
-    if isinstance(value, (int, float)):
-        return float(value)
-    
-    value_str = str(value).strip()
+def transform_export(df, raw_names=None):
+    """
+    Drop blank and repeated header rows and convert the numeric columns
+    
+    One pass over the columns builds a single row mask (a row is dropped
+    when it is empty or any cell repeats its column's name, cleaned or as
+    in the raw export). Numeric columns are converted in batches of several
+    columns per clean_european_numbers call and written straight into one
+    float block, so peak memory stays around one extra copy of the frame.
+    
+    Args:
+        df: Export with cleaned column names
+        raw_names: Column names before cleaning, in the same order
+    
+    Returns:
+        DataFrame with the same columns and the kept rows' original index
+    """
+    columns = [df.iloc[:, i] for i in range(df.shape[1])]
+    
+    has_value = np.zeros(len(df), dtype=bool)
+    is_header = np.zeros(len(df), dtype=bool)
+    for i, column in enumerate(columns):
+        has_value |= column.notna().to_numpy()
+        if column.dtype == object:
+            names = {df.columns[i]} if raw_names is None else {df.columns[i], raw_names[i]}
+            is_header |= column.isin(names).to_numpy()
+    keep = has_value & ~is_header
+    n_rows = int(keep.sum())
+    
+    numeric = [i for i, name in enumerate(df.columns) if name not in TEXT_COLUMNS]
+    block = np.empty((len(numeric), n_rows))
+    
+    # Typed columns convert on their own; object columns are stacked into
+    # batches of up to BATCH_CELLS cells per call
+    object_rows = []
+    for row, i in enumerate(numeric):
+        if columns[i].dtype == object:
+            object_rows.append(row)
+        else:
+            block[row] = clean_european_numbers(columns[i][keep], invalid='nan').to_numpy()
+    
+    batch_size = max(1, BATCH_CELLS // max(n_rows, 1))
+    for start in range(0, len(object_rows), batch_size):
+        batch = object_rows[start:start + batch_size]
+        stacked = pd.Series(np.concatenate([columns[numeric[row]].to_numpy()[keep] for row in batch]), dtype=object)
+        block[batch] = clean_european_numbers(stacked, invalid='nan').to_numpy().reshape(len(batch), n_rows)
+    
+    # The float block becomes the frame's storage as is; text columns go back in their places
+    result = pd.DataFrame(block.T, index=df.index[keep], columns=[df.columns[i] for i in numeric], copy=False)
+    for i, column in enumerate(columns):
+        if i not in numeric:
+            result.insert(i, df.columns[i], column[keep], allow_duplicates=True)
+    return result
+
+def clean_excel_file(file_path):
+    """Read and clean a single Excel file, without the metadata columns"""
+    # Read Excel file
+    df = pd.read_excel(file_path)
     
-    # Remove spaces
-    value_str = value_str.replace(' ', '')
+    # Skip if empty
+    if df.empty:
+        return None
     
-    # Handle European format (1.234,56)
-    if '.' in value_str and ',' in value_str:
-        value_str = value_str.replace('.', '').replace(',', '.')
-    # Handle thousands separator (1.234)
-    elif '.' in value_str and re.match(r'^\d{1,3}(\.\d{3})+$', value_str):
-        value_str = value_str.replace('.', '')
-    # Handle decimal comma (1,5)
-    elif ',' in value_str:
-        value_str = value_str.replace(',', '.')
+    # Clean column names
+    raw_names = list(df.columns)
+    df.columns = [clean_column_name(col) for col in df.columns]
     
-    try:
-        return float(value_str)
-    except:
-        return np.nan
+    # Remove empty and repeated header rows, convert numeric columns
+    return transform_export(df, raw_names)
 
-def process_excel_file(file_path, category):
+def add_metadata(df, file_path, category, processed_date):
+    """Add source file, category and processing time columns"""
+    df = df.copy()
+    df['Source_File'] = Path(file_path).name
+    df['Category'] = category
+    df['Processed_Date'] = processed_date
+    return df
+
+def process_excel_file(file_path, category, processed_date=None):
     """Process a single Excel file"""
     try:
-        # Read Excel file
-        df = pd.read_excel(file_path)
-        
-        # Skip if empty
-        if df.empty:
+        df = clean_excel_file(file_path)
+        if df is None:
             return None
         
-        # Clean column names
-        df.columns = [clean_column_name(col) for col in df.columns]
-        
-        # Remove completely empty rows
-        df = df.dropna(how='all')
-        
-        # Remove header rows that repeat column names
-        for col in df.columns:
-            if col in df.columns:
-                df = df[df[col] != col]
-        
-        # Convert numeric columns
-        for col in df.columns:
-            if col not in ['Date', 'Data_Period', 'Time_Period', 'Platform', 'Channel', 'Tenor']:
-                df[col] = df[col].apply(clean_numeric_value)
-        
         # Add metadata
-        df['Source_File'] = Path(file_path).name
-        df['Category'] = category
-        df['Processed_Date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
-        return df
+        processed_date = processed_date or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        return add_metadata(df, file_path, category, processed_date)
         
     except Exception as e:
         print(f"  ❌ Error processing {Path(file_path).name}: {str(e)}")
         return None
 
-def process_category(raw_path, category_folder, output_name):
+def list_excel_files(category_path):
+    """Excel files of a category, in the order they are combined"""
+    return list(category_path.glob('*.xlsx')) + list(category_path.glob('*.xls'))
+
+def combine_category(dfs):
+    """Concatenate the files of a category and sort by date"""
+    combined_df = pd.concat(dfs, ignore_index=True)
+    
+    # Sort by date if available
+    if 'Date' in combined_df.columns:
+        combined_df['Date'] = pd.to_datetime(combined_df['Date'], errors='coerce')
+        combined_df = combined_df.sort_values('Date')
+    elif 'Data_Period' in combined_df.columns:
+        combined_df = combined_df.sort_values('Data_Period')
+    
+    return combined_df
+
+def process_category(raw_path, category_folder, output_name, processed_date=None):
     """Process all files in a category"""
     print(f"\n{'='*60}")
     print(f"Processing: {category_folder}")
@@ -245,7 +313,7 @@ def process_category(raw_path, category_folder, output_name):
         return None
     
     # Get all Excel files
-    excel_files = list(category_path.glob('*.xlsx')) + list(category_path.glob('*.xls'))
+    excel_files = list_excel_files(category_path)
     
     if not excel_files:
         print(f"  ⚠️  No Excel files found")
@@ -257,7 +325,7 @@ def process_category(raw_path, category_folder, output_name):
     dfs = []
     for file_path in excel_files:
         print(f"  Processing: {file_path.name}")
-        df = process_excel_file(file_path, category_folder)
+        df = process_excel_file(file_path, category_folder, processed_date)
         if df is not None:
             dfs.append(df)
             print(f"    ✅ {len(df)} rows extracted")
@@ -267,21 +335,152 @@ def process_category(raw_path, category_folder, output_name):
         return None
     
     # Combine all dataframes
-    combined_df = pd.concat(dfs, ignore_index=True)
-    
-    # Sort by date if available
-    if 'Date' in combined_df.columns:
-        combined_df['Date'] = pd.to_datetime(combined_df['Date'], errors='coerce')
-        combined_df = combined_df.sort_values('Date')
-    elif 'Data_Period' in combined_df.columns:
-        combined_df = combined_df.sort_values('Data_Period')
+    combined_df = combine_category(dfs)
     
     print(f"\n  ✅ Combined: {len(combined_df)} total rows")
     print(f"  Columns: {len(combined_df.columns)}")
     
     return combined_df
 
-def main():
+def file_digest(file_path):
+    """SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_manifest(output_path):
+    """Previous run's file hashes; empty when missing or written by another pipeline version"""
+    manifest_file = output_path / MANIFEST_NAME
+    if not manifest_file.exists():
+        return {}
+    try:
+        manifest = json.loads(manifest_file.read_text())
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('version') != PIPELINE_VERSION:
+        return {}
+    return manifest.get('files', {})
+
+def save_manifest(output_path, files):
+    """Write the manifest atomically and drop cached outputs no longer referenced"""
+    manifest_file = output_path / MANIFEST_NAME
+    tmp_file = manifest_file.with_name(manifest_file.name + '.tmp')
+    tmp_file.write_text(json.dumps({'version': PIPELINE_VERSION, 'files': files}, indent=2, sort_keys=True))
+    tmp_file.replace(manifest_file)
+    
+    cache_dir = output_path / CACHE_DIR_NAME
+    referenced = {entry['sha256'] + '.pkl' for entry in files.values()}
+    for cached in cache_dir.glob('*.pkl'):
+        if cached.name not in referenced:
+            cached.unlink()
+
+def _clean_file_worker(file_path):
+    """Process pool entry point: (cleaned frame or None, error message or None)"""
+    try:
+        return clean_excel_file(file_path), None
+    except Exception as e:
+        return None, str(e)
+
+def process_categories_parallel(raw_path, categories, output_path, processed_date,
+                                workers=None, incremental=False):
+    """
+    Process every category with one process pool across all files
+    
+    With incremental=True each file's content hash is checked against the
+    manifest of the previous run; unchanged files reuse their cleaned frame
+    from the cache and only new or modified files are parsed. Output equals
+    process_category for the same processed_date.
+    
+    Returns:
+        dict: category folder -> combined DataFrame (categories without data are left out)
+    """
+    cache_dir = output_path / CACHE_DIR_NAME
+    manifest = load_manifest(output_path) if incremental else {}
+    new_manifest = {}
+    
+    # Collect the files of every category, remembering their order
+    category_files = {}
+    for category_folder, _ in categories:
+        category_path = raw_path / category_folder
+        if not category_path.exists():
+            print(f"  ⚠️  Folder not found: {category_folder}")
+            continue
+        excel_files = list_excel_files(category_path)
+        if not excel_files:
+            print(f"  ⚠️  No Excel files found in {category_folder}")
+            continue
+        category_files[category_folder] = excel_files
+    
+    cleaned = {}
+    to_parse = []
+    for category_folder, excel_files in category_files.items():
+        for file_path in excel_files:
+            key = f"{category_folder}/{file_path.name}"
+            if not incremental:
+                to_parse.append((key, file_path, None))
+                continue
+            
+            sha256 = file_digest(file_path)
+            entry = manifest.get(key)
+            cache_file = cache_dir / f"{sha256}.pkl"
+            if entry and entry['sha256'] == sha256 and (entry['empty'] or cache_file.exists()):
+                cleaned[key] = None if entry['empty'] else pd.read_pickle(cache_file)
+                new_manifest[key] = entry
+            else:
+                to_parse.append((key, file_path, sha256))
+    
+    reused = len(cleaned)
+    print(f"  Files: {len(to_parse) + reused} total, {reused} unchanged, {len(to_parse)} to parse")
+    
+    if to_parse:
+        if incremental:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(_clean_file_worker, [str(file_path) for _, file_path, _ in to_parse])
+            for (key, file_path, sha256), (df, error) in zip(to_parse, results):
+                if error is not None:
+                    print(f"  ❌ Error processing {file_path.name}: {error}")
+                    continue
+                cleaned[key] = df
+                print(f"    ✅ {key}: {0 if df is None else len(df)} rows extracted")
+                if incremental:
+                    if df is not None:
+                        df.to_pickle(cache_dir / f"{sha256}.pkl")
+                    new_manifest[key] = {'sha256': sha256, 'empty': df is None}
+    
+    if incremental:
+        save_manifest(output_path, new_manifest)
+    
+    # Reassemble each category in the serial file order
+    combined = {}
+    for category_folder, excel_files in category_files.items():
+        dfs = []
+        for file_path in excel_files:
+            df = cleaned.get(f"{category_folder}/{file_path.name}")
+            if df is not None:
+                dfs.append(add_metadata(df, file_path, category_folder, processed_date))
+        if dfs:
+            combined[category_folder] = combine_category(dfs)
+    
+    return combined
+
+# Categories to process
+CATEGORIES = [
+    ('chat data', 'chat_data_processed.csv'),
+    ('traffic overview', 'traffic_overview_processed.csv'),
+    ('product overview', 'product_overview_processed.csv'),
+    ('flash sale', 'flash_sale_processed.csv'),
+    ('voucher', 'voucher_processed.csv'),
+    ('game', 'game_processed.csv'),
+    ('live', 'live_processed.csv'),
+    ('mass chat data', 'mass_chat_data_processed.csv'),
+    ('off platform', 'off_platform_processed.csv'),
+    ('shopee paylater', 'shopee_paylater_processed.csv'),
+]
+
+def main(raw_path=None, output_path=None, parallel=False, workers=None, incremental=False):
     """Main processing pipeline"""
     print("="*60)
     print("COMPREHENSIVE DATA CLEANING & TRANSLATION PIPELINE")
@@ -291,28 +490,29 @@ def main():
     print("="*60)
     
     # Paths
-    raw_path = Path("/Users/tarang/CascadeProjects/windsurf-project/shopee-analytics-platform/data/raw")
-    output_path = Path("/Users/tarang/CascadeProjects/windsurf-project/shopee-analytics-platform/data/processed")
+    raw_path = Path(raw_path or "/Users/tarang/CascadeProjects/windsurf-project/shopee-analytics-platform/data/raw")
+    output_path = Path(output_path or "/Users/tarang/CascadeProjects/windsurf-project/shopee-analytics-platform/data/processed")
     output_path.mkdir(parents=True, exist_ok=True)
     
-    # Categories to process
-    categories = [
-        ('chat data', 'chat_data_processed.csv'),
-        ('traffic overview', 'traffic_overview_processed.csv'),
-        ('product overview', 'product_overview_processed.csv'),
-        ('flash sale', 'flash_sale_processed.csv'),
-        ('voucher', 'voucher_processed.csv'),
-        ('game', 'game_processed.csv'),
-        ('live', 'live_processed.csv'),
-        ('mass chat data', 'mass_chat_data_processed.csv'),
-        ('off platform', 'off_platform_processed.csv'),
-        ('shopee paylater', 'shopee_paylater_processed.csv'),
-    ]
+    # One timestamp for the whole run
+    processed_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     
     # Process each category
+    if parallel or incremental:
+        mode = "incremental" if incremental else "full"
+        print(f"\nParallel {mode} run ({workers or os.cpu_count()} workers)")
+        frames = process_categories_parallel(raw_path, CATEGORIES, output_path, processed_date,
+                                             workers=workers, incremental=incremental)
+    else:
+        frames = {}
+        for category_folder, output_name in CATEGORIES:
+            df = process_category(raw_path, category_folder, output_name, processed_date)
+            if df is not None:
+                frames[category_folder] = df
+    
     results = {}
-    for category_folder, output_name in categories:
-        df = process_category(raw_path, category_folder, output_name)
+    for category_folder, output_name in CATEGORIES:
+        df = frames.get(category_folder)
         if df is not None:
             # Save to CSV
             output_file = output_path / output_name
@@ -333,4 +533,13 @@ def main():
     print("="*60)
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Clean and translate the raw Shopee Excel exports")
+    parser.add_argument('--raw-path', help="Folder with one subfolder of Excel files per category")
+    parser.add_argument('--output-path', help="Folder for the processed CSVs")
+    parser.add_argument('--parallel', action='store_true', help="Parse files in a process pool")
+    parser.add_argument('--workers', type=int, help="Pool size (default: CPU count)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Parallel run that only re-parses files whose content changed")
+    args = parser.parse_args()
+    main(args.raw_path, args.output_path, parallel=args.parallel, workers=args.workers,
+         incremental=args.incremental)
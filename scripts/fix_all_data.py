@@ -3,40 +3,15 @@ Comprehensive Data Cleaning Script
 Fixes European number formats in ALL dataset files
 """
 
+import sys
 import pandas as pd
-import re
 import os
 from pathlib import Path
 
-def clean_european_number(value):
-    """
-    Convert European number format to standard format
-    Handles: 1.234 → 1234, 1.234,56 → 1234.56
-    """
-    if pd.isna(value):
-        return value
-    
-    if isinstance(value, (int, float)):
-        return float(value)
-    
-    value_str = str(value).strip()
-    value_str = value_str.replace(' ', '')
-    
-    # If has both period and comma, it's European format
-    if '.' in value_str and ',' in value_str:
-        value_str = value_str.replace('.', '').replace(',', '.')
-    # If has only period and looks like thousands (e.g., 1.234)
-    elif '.' in value_str:
-        if re.match(r'^\d{1,3}(\.\d{3})+$', value_str):
-            value_str = value_str.replace('.', '')
-    # If has only comma, replace with period
-    elif ',' in value_str:
-        value_str = value_str.replace(',', '.')
-    
-    try:
-        return float(value_str)
-    except (ValueError, TypeError):
-        return value  # Return original if can't convert
+# Add parent to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from dashboard.utils.data_cleaner import clean_european_numbers
 
 def clean_dataframe(df, skip_columns=None):
     """
@@ -55,7 +30,7 @@ def clean_dataframe(df, skip_columns=None):
         
         # Try to clean the column
         try:
-            df_clean[col] = df_clean[col].apply(clean_european_number)
+            df_clean[col] = clean_european_numbers(df_clean[col], invalid='keep')
         except:
             continue
     
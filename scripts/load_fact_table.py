@@ -0,0 +1,44 @@
+"""
+Load Fact Table
+Bulk loads the cleaned datasets into the backend's processed_data table
+(COPY on PostgreSQL, batched upserts elsewhere); unchanged datasets are skipped
+"""
+
+import sys
+from pathlib import Path
+import warnings
+warnings.filterwarnings('ignore')
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent.parent / "backend"))
+
+from app.db.database import Base, engine
+from app.services.data_store import DataStore
+from app.services.fact_table import FactTableLoader
+
+
+def main(data_dir=None, force=False):
+    """Create the tables if needed and load every changed dataset"""
+    data_dir = Path(data_dir) if data_dir else Path(__file__).parent.parent / "data" / "cleaned"
+
+    print("=" * 60)
+    print("LOADING FACT TABLE")
+    print("=" * 60)
+    print(f"Source: {data_dir}")
+    print(f"Database: {engine.url.render_as_string(hide_password=True)}\n")
+
+    Base.metadata.create_all(bind=engine)
+    snapshot = DataStore(str(data_dir)).load()
+    results = FactTableLoader(engine).load_snapshot(snapshot, force=force)
+
+    for result in results.values():
+        if result.method == 'skipped':
+            print(f"  ⏭️  {result.category} (up to date)")
+        else:
+            print(f"  ✅ {result.category}: {result.facts:,} facts via {result.method} "
+                  f"({result.seconds * 1000:.0f} ms, {result.removed:,} stale removed)")
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if arg != "--force"]
+    main(args[0] if args else None, force="--force" in sys.argv)
@@ -0,0 +1,114 @@
+"""
+Shared test setup: the backend (app.*), the scripts and the repository root
+on the import path, and an app engine that needs no PostgreSQL server. Also
+the synthetic cleaned datasets and the response parity helpers the analytics
+tests share
+"""
+
+import math
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+for path in (ROOT, ROOT / "backend", ROOT / "scripts"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("DEBUG", "false")
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+
+from app.services.analytics_service import FUNNEL_COLUMNS
+from app.services.sql_analytics import CUSTOMER_SERVICE_COLUMNS
+
+# Date ranges the analytics parity checks cover, the last one past every row
+RANGES = [(None, None), ('2018-03-01', '2021-06-30'), ('2019-01-01', None), (None, '2016-12-31'),
+          ('2030-01-01', '2030-12-31')]
+
+
+def _with_gaps(rng, values, share=0.05):
+    values = values.astype(float)
+    values[rng.random(len(values)) < share] = np.nan
+    return values
+
+
+def write_datasets(path, n_rows, seed=0):
+    """Synthetic cleaned CSVs with the columns the analytics endpoints read"""
+    rng = np.random.default_rng(seed)
+    days = pd.Timestamp('2015-01-01') + pd.to_timedelta(rng.integers(0, 3_650, n_rows), unit='D')
+    dates = days.strftime('%Y-%m-%d').to_numpy(dtype=object)
+
+    pd.DataFrame({
+        'Date': dates, 'Total_Visitors': _with_gaps(rng, rng.poisson(300, n_rows)),
+    }).to_csv(path / "traffic_overview_cleaned.csv", index=False)
+
+    product = {'Date': dates}
+    for i, col in enumerate(FUNNEL_COLUMNS):
+        product[col] = _with_gaps(rng, rng.poisson(1_000 / (i + 1), n_rows))
+    pd.DataFrame(product).to_csv(path / "product_overview_cleaned.csv", index=False)
+
+    platforms = np.array(['Facebook', 'Instagram', 'TikTok', None], dtype=object)
+    pd.DataFrame({
+        'Date': dates,
+        'Platform': platforms[rng.choice(4, n_rows, p=[0.4, 0.3, 0.28, 0.02])],
+        'Visitors': _with_gaps(rng, rng.poisson(50, n_rows)),
+        'Sales_IDR': _with_gaps(rng, rng.gamma(2, 500_000, n_rows)),
+        'Orders': _with_gaps(rng, rng.poisson(3, n_rows)),
+    }).to_csv(path / "off_platform_cleaned.csv", index=False)
+
+    # Monthly exports labelled by period, a few without a parseable one
+    n_months = max(n_rows // 30, 24)
+    starts = pd.Timestamp('2015-01-01') + pd.to_timedelta(rng.integers(0, 3_650, n_months), unit='D')
+    labels = (starts.strftime('%d-%m-%Y') + ' - ' + (starts + pd.Timedelta(days=29)).strftime('%d-%m-%Y'))
+    labels = np.where(rng.random(n_months) < 0.1, None, labels.to_numpy(dtype=object))
+
+    chat = {'Time_Period': labels}
+    for col in CUSTOMER_SERVICE_COLUMNS + ('Sales_IDR', 'Total_Orders'):
+        chat[col] = _with_gaps(rng, rng.gamma(2, 100, n_months))
+    pd.DataFrame(chat).to_csv(path / "chat_data_cleaned.csv", index=False)
+
+    pd.DataFrame({
+        'Time_Period': labels,
+        'Sales_Ready_To_Ship_IDR': _with_gaps(rng, rng.gamma(2, 1e6, n_months)),
+        'Orders_Ready_To_Ship': _with_gaps(rng, rng.poisson(10, n_months)),
+        'Click_Rate': _with_gaps(rng, rng.uniform(0, 0.05, n_months)),
+    }).to_csv(path / "flash_sale_cleaned.csv", index=False)
+
+
+def requests(include_funnel=True):
+    """(name, call) for every endpoint served by both analytics engines"""
+    calls = [('categories', lambda service: service.get_category_metrics())]
+    for start, end in RANGES:
+        calls += [
+            (f'kpis {start}..{end}', lambda service, s=start, e=end: service.get_kpis(s, e)),
+            (f'traffic sources {start}..{end}', lambda service, s=start, e=end: service.get_traffic_sources(s, e)),
+            (f'customer service {start}..{end}',
+             lambda service, s=start, e=end: service.get_customer_service_metrics(s, e)),
+        ]
+        if include_funnel:
+            calls.append((f'funnel {start}..{end}', lambda service, s=start, e=end: service.get_funnel(s, e)))
+    return calls
+
+
+def assert_same(got, want, where):
+    """Responses equal up to float rounding, NaN matching NaN"""
+    if isinstance(want, BaseModel):
+        got, want = got.model_dump(), want.model_dump()
+    if isinstance(want, dict):
+        assert set(got) == set(want), where
+        for key in want:
+            assert_same(got[key], want[key], f"{where}.{key}")
+    elif isinstance(want, list):
+        assert len(got) == len(want), where
+        for i, (g, w) in enumerate(zip(got, want)):
+            assert_same(g, w, f"{where}[{i}]")
+    elif isinstance(want, (int, float, np.number)) and not isinstance(want, bool):
+        assert (math.isnan(got) and math.isnan(want)) or math.isclose(got, want, rel_tol=1e-9, abs_tol=1e-6), \
+            f"{where}: {got} != {want}"
+    else:
+        assert got == want, f"{where}: {got!r} != {want!r}"
@@ -0,0 +1,75 @@
+"""Cache keys of the rolling-origin backtest"""
+
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import ROOT
+from ml.evaluation import backtest
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """A throwaway repository with a model whose helpers live in other modules"""
+    forecasting = tmp_path / "ml" / "forecasting"
+    forecasting.mkdir(parents=True)
+    (forecasting / "model.py").write_text(
+        "import numpy as np\n"
+        "from ml.forecasting.features import build\n"
+        "def fit():\n"
+        "    from ml.forecasting import cache\n"
+        "if __name__ == '__main__':\n"
+        "    from ml.forecasting import cli\n")
+    (forecasting / "features.py").write_text("from ml.forecasting.calendar import weeks\n")
+    (forecasting / "calendar.py").write_text("WEEKS = 52\n")
+    (forecasting / "cache.py").write_text("MAX = 1\n")
+    (forecasting / "cli.py").write_text("ARGS = []\n")
+    (forecasting / "unused.py").write_text("X = 1\n")
+
+    monkeypatch.setattr(backtest, "PROJECT_ROOT", tmp_path)
+    monkeypatch.setitem(backtest.MODELS, "test_model", ("ml.forecasting.model", "Model", {}))
+    return forecasting
+
+
+def test_sources_follow_project_imports_transitively(project):
+    names = [path.name for path in backtest.model_sources("ml.forecasting.model")]
+
+    assert names == ["cache.py", "calendar.py", "features.py", "model.py"]
+
+
+@pytest.mark.parametrize("edited, invalidates", [
+    ("model.py", True),
+    ("calendar.py", True),   # imported through features.py
+    ("cache.py", True),      # imported inside a function
+    ("cli.py", False),       # only imported when run as a script
+    ("unused.py", False),
+])
+def test_editing_a_dependency_changes_the_fingerprint(project, edited, invalidates):
+    before = backtest.model_fingerprint("test_model")
+    with open(project / edited, "a") as f:
+        f.write("# edited\n")
+
+    assert (backtest.model_fingerprint("test_model") != before) == invalidates
+
+
+
+def test_harness_does_not_import_xgboost():
+    code = "import sys, ml.evaluation.backtest; print('xgboost' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
+
+
+def test_reruns_are_served_from_the_cache(tmp_path):
+    data = pd.DataFrame({'ds': pd.date_range('2024-01-07', periods=30, freq='W'), 'y': np.arange(30.0) + 1})
+    run = dict(models=['naive_ma4'], horizon=4, n_folds=3, workers=1, cache_dir=tmp_path)
+
+    first = backtest.run_backtest(data, **run)
+    assert first['error'].isna().all() and not first['cached'].any()
+    assert first['MAPE'].notna().all()
+
+    again = backtest.run_backtest(data, **run)
+    assert again['cached'].all()
+    pd.testing.assert_frame_equal(again.drop(columns='cached'), first.drop(columns='cached'))
@@ -0,0 +1,136 @@
+"""Response cache middleware and backends"""
+
+import asyncio
+import threading
+from datetime import datetime
+from types import SimpleNamespace
+
+import httpx
+from fastapi import FastAPI, Response
+
+from app.core.cache import (
+    CachedResponse,
+    MemoryCacheBackend,
+    RedisCacheBackend,
+    ResponseCache,
+    ResponseCacheMiddleware,
+)
+
+
+class FakeRedis:
+    """The subset of redis.Redis the backend uses, backed by a dict"""
+
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+        self.expiry[key] = ex
+
+    def scan_iter(self, match):
+        prefix = match.rstrip("*")
+        return iter([key for key in self.data if key.startswith(prefix)])
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+class DownRedis:
+    def __getattr__(self, name):
+        def fail(*args, **kwargs):
+            raise ConnectionError("connection refused")
+        return fail
+
+
+ENTRY = CachedResponse(body=b'{"a":\n1}', media_type="application/json", etag='"abc"',
+                       last_modified="Mon, 05 May 2025 10:00:00 GMT")
+
+
+def test_redis_backend_round_trips_entries_with_expiry():
+    client = FakeRedis()
+    backend = RedisCacheBackend(ttl_seconds=0.5, client=client, prefix="test:")
+
+    assert backend.get("k") is None
+    backend.set("k", ENTRY)
+
+    assert backend.get("k") == ENTRY
+    assert client.expiry["test:k"] == 1  # at least one second
+    assert list(client.data) == ["test:k"]
+
+
+def test_redis_backend_clear_only_drops_its_prefix():
+    client = FakeRedis()
+    client.set("other:k", b"kept")
+    backend = RedisCacheBackend(ttl_seconds=60, client=client, prefix="test:")
+    backend.set("a", ENTRY)
+    backend.set("b", ENTRY)
+
+    backend.clear()
+
+    assert list(client.data) == ["other:k"]
+
+
+def test_unreachable_redis_counts_errors_and_misses():
+    cache = ResponseCache(RedisCacheBackend(ttl_seconds=60, client=DownRedis()))
+
+    assert cache.get("k") is None
+    cache.set("k", ENTRY)
+    cache.clear()
+
+    stats = cache.stats()
+    assert stats["backend"] == "redis" and stats["errors"] == 3
+    assert stats["misses"] == 1
+
+
+def build_app(cache, get_snapshot=None):
+    app = FastAPI()
+    snapshot = SimpleNamespace(version="v1", loaded_at=datetime(2025, 5, 5))
+    app.add_middleware(ResponseCacheMiddleware, cache=cache, snapshot=get_snapshot or (lambda: snapshot))
+
+    @app.get("/api/analytics/kpis")
+    async def kpis():
+        return {"total": 1}
+
+    @app.get("/api/analytics/cache/stats")
+    async def stats(response: Response):
+        response.headers["Cache-Control"] = "no-store"
+        return cache.stats()
+
+    return app
+
+
+async def get_all(app, paths):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        return [await client.get(path) for path in paths]
+
+
+def test_stats_route_does_not_skew_the_hit_rate():
+    cache = ResponseCache(MemoryCacheBackend(max_entries=8, ttl_seconds=60))
+    app = build_app(cache)
+
+    responses = asyncio.run(get_all(app, ["/api/analytics/kpis", "/api/analytics/kpis"]
+                                    + ["/api/analytics/cache/stats"] * 3))
+
+    assert [r.headers.get("x-cache") for r in responses] == ["MISS", "HIT", None, None, None]
+    stats = responses[-1].json()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+    assert stats["entries"] == 1
+
+
+def test_snapshot_refresh_runs_off_the_event_loop():
+    cache = ResponseCache(MemoryCacheBackend(max_entries=8, ttl_seconds=60))
+    threads = []
+
+    def get_snapshot():
+        # Stands in for DataStore.refresh_if_changed, which may reread files
+        threads.append(threading.get_ident())
+        return SimpleNamespace(version="v1", loaded_at=datetime(2025, 5, 5))
+
+    responses = asyncio.run(get_all(build_app(cache, get_snapshot), ["/api/analytics/kpis"] * 2))
+    assert [r.headers["x-cache"] for r in responses] == ["MISS", "HIT"]
+    assert len(threads) == 2 and threading.get_ident() not in threads
@@ -0,0 +1,44 @@
+"""Period dating of the monthly exports in the dataset snapshot"""
+
+import pandas as pd
+
+from app.services.data_store import PERIOD_START_COLUMN, DataStore
+
+
+def write_exports(path):
+    pd.DataFrame({
+        'Time_Period': [None, None, '01-03-2024 - 31-03-2024'],
+        'Sales_IDR': [10.0, 20.0, 30.0],
+        'Total_Orders': [1, 2, 3],
+        'Source_File': ['chat_20250601_20250630.xlsx', 'chat_20240101_20240131.xlsx', 'chat_export.xlsx'],
+    }).to_csv(path / "chat_data_cleaned.csv", index=False)
+    pd.DataFrame({
+        'Time_Period': [None, None],
+        'Sales_Ready_To_Ship_IDR': [5.0, 7.0],
+        'Source_File': ['In_Shop_Flash_Sale_Metrics_01032024-31032024.xlsx', 'unlabelled.xlsx'],
+    }).to_csv(path / "flash_sale_cleaned.csv", index=False)
+    for filename in ("traffic_overview_cleaned.csv", "product_overview_cleaned.csv", "off_platform_cleaned.csv"):
+        pd.DataFrame({'Date': ['2024-01-01']}).to_csv(path / filename, index=False)
+
+
+def test_blank_period_is_taken_from_the_export_file_name(tmp_path):
+    write_exports(tmp_path)
+    snapshot = DataStore(str(tmp_path), refresh_interval=0).load()
+
+    chat = snapshot["chat_data"]
+    assert chat[PERIOD_START_COLUMN].tolist() == [
+        pd.Timestamp('2024-01-01'), pd.Timestamp('2024-03-01'), pd.Timestamp('2025-06-01')]
+    flash_sale = snapshot["flash_sale_data"]
+    assert flash_sale[PERIOD_START_COLUMN].iloc[0] == pd.Timestamp('2024-03-01')
+    # Neither a label nor a dated file name: still undated, sorted last
+    assert pd.isna(flash_sale[PERIOD_START_COLUMN].iloc[1])
+
+
+def test_dated_exports_stay_in_date_ranges(tmp_path):
+    write_exports(tmp_path)
+    snapshot = DataStore(str(tmp_path), refresh_interval=0).load()
+
+    assert snapshot.between("chat_data", '2024-01-01', '2026-12-31')['Sales_IDR'].sum() == 60.0
+    assert snapshot.between("chat_data", '2025-01-01')['Sales_IDR'].tolist() == [10.0]
+    assert snapshot.between("flash_sale_data", '2024-01-01')['Sales_Ready_To_Ship_IDR'].tolist() == [5.0]
+
@@ -0,0 +1,50 @@
+"""clean_european_numbers against the per-value clean_european_number"""
+
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.utils.data_cleaner import INVALID_VALUES, clean_european_number, clean_european_numbers
+
+from benchmarks.european_numbers import TOKENS, random_value
+
+MODES = sorted(INVALID_VALUES)
+
+
+def expected(column, mode):
+    return column.apply(partial(clean_european_number, invalid=mode))
+
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("seed", range(40))
+def test_random_columns_match_the_per_value_parser(seed, mode):
+    rng = np.random.default_rng(seed)
+    for _ in range(5):
+        column = pd.Series([random_value(rng) for _ in range(rng.integers(1, 120))], dtype=object)
+        pd.testing.assert_series_equal(clean_european_numbers(column, invalid=mode), expected(column, mode))
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_edge_case_tokens_match_the_per_value_parser(mode):
+    column = pd.Series(TOKENS + [None, np.nan, 1, 2.5], dtype=object, index=range(10, 10 + len(TOKENS) + 4),
+                       name='Sales')
+    pd.testing.assert_series_equal(clean_european_numbers(column, invalid=mode), expected(column, mode))
+
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("column", [
+    pd.Series([1, 2, 3]),
+    pd.Series([1.5, np.nan]),
+    pd.Series([True, False]),
+    pd.Series([], dtype=object),
+    pd.Series([None, None], dtype=object),
+], ids=['int', 'float', 'bool', 'empty', 'all-none'])
+def test_typed_and_degenerate_columns(column, mode):
+    pd.testing.assert_series_equal(clean_european_numbers(column, invalid=mode), expected(column, mode))
+
+
+def test_unknown_invalid_mode_is_rejected():
+    with pytest.raises(ValueError):
+        clean_european_numbers(pd.Series(['1,5']), invalid='drop')
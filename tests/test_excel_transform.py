@@ -0,0 +1,71 @@
+"""Header removal and numeric conversion of a raw export (transform_export)"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import comprehensive_data_pipeline as pipeline
+from comprehensive_data_pipeline import transform_export
+
+from benchmarks.excel_transform import legacy_transform
+
+RAW_NAMES = ['Tanggal', 'Total Pengunjung', 'Suka', 'Penjualan (IDR)']
+CLEANED_NAMES = ['Date', 'Total_Visitors', 'Likes', 'Sales_IDR']
+
+
+def fixture_export(extra_rows=()):
+    """An export as read_excel returns it: object columns, blank and repeated header rows"""
+    rows = [
+        ['01-01-2025', '1.234', '12', '1.234,56'],
+        [None, None, None, None],
+        CLEANED_NAMES,
+        ['02-01-2025', '987', '-', '2.500,5'],
+        ['03-01-2025', 5, 1.5, '1,5'],
+        [None, None, None, None],
+        *extra_rows,
+    ]
+    return pd.DataFrame(rows, columns=RAW_NAMES, dtype=object)
+
+
+# Output of the per-column transform this replaced, for the fixture above
+EXPECTED = pd.DataFrame({
+    'Date': pd.Series(['01-01-2025', '02-01-2025', '03-01-2025'], dtype=object, index=[0, 3, 4]),
+    'Total_Visitors': pd.Series([1234.0, 987.0, 5.0], index=[0, 3, 4]),
+    'Likes': pd.Series([12.0, np.nan, 1.5], index=[0, 3, 4]),
+    'Sales_IDR': pd.Series([1234.56, 2500.5, 1.5], index=[0, 3, 4]),
+})
+
+
+def cleaned(df):
+    df = df.copy()
+    df.columns = CLEANED_NAMES
+    return df
+
+
+def test_output_is_pinned_to_the_per_column_transform():
+    df = cleaned(fixture_export())
+
+    pd.testing.assert_frame_equal(transform_export(df, RAW_NAMES), EXPECTED)
+    pd.testing.assert_frame_equal(legacy_transform(df), EXPECTED)
+
+
+def test_clean_excel_file_translates_and_transforms(monkeypatch):
+    monkeypatch.setattr(pipeline.pd, 'read_excel', lambda path: fixture_export())
+
+    pd.testing.assert_frame_equal(pipeline.clean_excel_file('traffic_20250101.xlsx'), EXPECTED)
+
+
+def test_header_rows_repeating_raw_names_are_dropped():
+    # Behavior change: the per-column transform only matched cleaned names,
+    # so this row used to come through as a 'Tanggal' row of NaNs
+    df = cleaned(fixture_export(extra_rows=[RAW_NAMES]))
+
+    pd.testing.assert_frame_equal(transform_export(df, RAW_NAMES), EXPECTED)
+    assert legacy_transform(df)['Date'].iloc[-1] == 'Tanggal'
+
+
+@pytest.mark.parametrize("batch_cells", [1, 3, 1_000_000])
+def test_batching_does_not_change_the_output(monkeypatch, batch_cells):
+    monkeypatch.setattr(pipeline, 'BATCH_CELLS', batch_cells)
+
+    pd.testing.assert_frame_equal(transform_export(cleaned(fixture_export()), RAW_NAMES), EXPECTED)
@@ -0,0 +1,99 @@
+"""Which analytics calls go to the handler pool, and how the pool runs them"""
+
+import asyncio
+import os
+import threading
+
+import httpx
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from sqlalchemy.orm import Session
+
+from app.api import analytics
+from app.core.cache import MemoryCacheBackend, ResponseCache, ResponseCacheMiddleware
+from app.core.config import settings
+from app.core.executor import HandlerExecutor
+from app.services import analytics_service
+from app.services.analytics_service import AnalyticsService
+from app.services.data_store import DataStore, get_data_snapshot
+from app.services.rollups import RollupStore
+from app.services.sql_analytics import SQLAnalyticsService
+
+from conftest import write_datasets
+
+
+@pytest.fixture
+def snapshot(tmp_path, monkeypatch):
+    write_datasets(tmp_path, 1_000, seed=8)
+    monkeypatch.setattr(analytics_service, "rollup_store", RollupStore())
+    return DataStore(str(tmp_path), refresh_interval=0).load()
+
+
+def test_rollup_methods_block_only_until_the_cube_is_built(snapshot):
+    service = AnalyticsService(None, snapshot)
+    assert all(service.is_blocking(method) for method in AnalyticsService.ROLLUP_METHODS)
+
+    asyncio.run(service.get_kpis())
+    assert not any(service.is_blocking(method) for method in AnalyticsService.ROLLUP_METHODS)
+    assert service.is_blocking("get_funnel") and service.is_blocking("get_traffic_sources")
+
+
+def test_sql_methods_block_on_a_sync_session(snapshot):
+    service = SQLAnalyticsService(Session(), snapshot)
+    asyncio.run(AnalyticsService(None, snapshot).get_kpis())
+    assert service.is_blocking("get_kpis") and service.is_blocking("get_customer_service_metrics")
+    assert not service.is_blocking("get_trend")
+
+
+def test_pool_threads_reuse_one_event_loop():
+    async def current_loop():
+        return threading.get_ident(), id(asyncio.get_running_loop())
+
+    async def run_all(executor):
+        return [await executor.run(current_loop) for _ in range(4)]
+
+    executor = HandlerExecutor(1)
+    try:
+        loops = asyncio.run(run_all(executor))
+    finally:
+        executor.shutdown()
+    assert len(set(loops)) == 1
+    assert loops[0][0] != threading.get_ident()
+
+
+def test_requests_in_flight_while_a_source_file_is_rewritten(tmp_path, monkeypatch):
+    write_datasets(tmp_path, 2_000, seed=9)
+    monkeypatch.setattr(settings, "ANALYTICS_ENGINE", "pandas")
+    monkeypatch.setattr(settings, "KPI_SUMMARY", False)
+    monkeypatch.setattr(analytics_service, "rollup_store", RollupStore())
+    store = DataStore(str(tmp_path), refresh_interval=0)
+    store.load()
+
+    # As in main.py: the response cache and the routes both follow the store
+    app = FastAPI()
+    app.add_middleware(ResponseCacheMiddleware, cache=ResponseCache(MemoryCacheBackend(100, 300)),
+                       snapshot=store.refresh_if_changed)
+    app.include_router(analytics.router, prefix="/api/analytics")
+    app.dependency_overrides[get_data_snapshot] = store.refresh_if_changed
+
+    def rewrite():
+        path = tmp_path / "traffic_overview_cleaned.csv"
+        frame = pd.read_csv(path)
+        frame["Total_Visitors"] = frame["Total_Visitors"] * 2 + 1
+        frame.to_csv(path.with_suffix(".tmp"), index=False)
+        os.replace(path.with_suffix(".tmp"), path)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            before = (await client.get("/api/analytics/kpis")).json()
+            requests = [asyncio.create_task(client.get("/api/analytics/kpis")) for _ in range(20)]
+            await asyncio.to_thread(rewrite)
+            in_flight = await asyncio.gather(*requests)
+            return before, in_flight, (await client.get("/api/analytics/kpis")).json()
+
+    before, in_flight, after = asyncio.run(run())
+    assert all(response.status_code == 200 for response in in_flight)
+    assert after != before
+    expected = asyncio.run(AnalyticsService(None, DataStore(str(tmp_path)).load()).get_kpis())
+    assert after == expected.model_dump(mode="json")
@@ -0,0 +1,72 @@
+"""COPY payload of the PostgreSQL fact table load"""
+
+import csv
+import io
+from datetime import datetime
+from unittest import mock
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, select
+
+from app.db.database import Base
+from app.db.models import ProcessedData
+from app.services.data_store import Dataset, DatasetSpec
+from app.services.fact_table import FACT_COLUMNS, STAGE_TABLE, FactTableLoader, fact_frame
+
+SPEC = DatasetSpec("traffic_data", "traffic_overview_cleaned.csv", date_column="Date")
+
+
+@pytest.fixture
+def facts():
+    frame = pd.DataFrame({
+        'Date': pd.to_datetime(['2024-01-01', '2024-01-02', None]),
+        'Total_Visitors': [1.0, 2.5, 3.0],
+        'Platform': ['Shopee, Mall', None, 'Web'],
+    })
+    dataset = Dataset("traffic_data", "traffic_overview_cleaned.csv", frame, (1, 2), 0.0, 0, datetime.now())
+    return fact_frame(dataset, SPEC)
+
+
+def copy_payload(facts):
+    """What _copy_upsert streams to cursor.copy_expert, and the SQL it runs"""
+    conn = mock.MagicMock()
+    payloads = []
+    cursor = conn.connection.dbapi_connection.cursor.return_value.__enter__.return_value
+    cursor.copy_expert.side_effect = lambda sql, buffer: payloads.append((sql, buffer.read()))
+    FactTableLoader(mock.Mock(), batch_size=10)._copy_upsert(conn, facts)
+    assert len(payloads) == 1
+    statements = [call.args[0] for call in conn.exec_driver_sql.call_args_list]
+    return payloads[0], statements
+
+
+def test_copy_writes_missing_dates_and_dimensions_as_unquoted_empty_fields(facts):
+    (sql, payload), statements = copy_payload(facts)
+    assert sql == f"COPY {STAGE_TABLE} ({', '.join(FACT_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+    assert payload.splitlines() == [
+        'traffic_data,0,2024-01-01 00:00:00,Total_Visitors,1.0,"Shopee, Mall",1:2',
+        'traffic_data,1,2024-01-02 00:00:00,Total_Visitors,2.5,,1:2',
+        'traffic_data,2,,Total_Visitors,3.0,Web,1:2',
+    ]
+    assert statements[0].startswith(f"CREATE TEMP TABLE {STAGE_TABLE}")
+    assert "ON CONFLICT (category, row_key, metric_name) DO UPDATE" in statements[1]
+
+
+def test_copy_payload_loads_the_same_rows_as_executemany(facts):
+    (_, payload), _ = copy_payload(facts)
+    # COPY ... (FORMAT csv) reads unquoted empty fields as NULL
+    copied = [tuple(None if value == '' else value for value in row) for row in csv.reader(io.StringIO(payload))]
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        FactTableLoader(engine, batch_size=2)._batched_upsert(conn, SPEC.name, facts)
+        table = ProcessedData.__table__
+        stored = conn.execute(select(*(table.c[col] for col in FACT_COLUMNS)).order_by(table.c.row_key)).all()
+
+    assert len(copied) == len(stored) == 3
+    for got, want in zip(copied, stored):
+        category, row_key, date, metric_name, metric_value, dimension, version = got
+        assert (category, int(row_key), metric_name, float(metric_value), dimension, version) == \
+            (want.category, want.row_key, want.metric_name, want.metric_value, want.dimension, want.source_version)
+        assert (date and datetime.fromisoformat(date)) == want.date
@@ -0,0 +1,71 @@
+"""Recursive forecast features against the features the model was trained on"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ml.forecasting.feature_pipeline import TARGET, FeaturePipeline
+from ml.forecasting.feature_roller import ROLLED_FEATURES, FeatureRoller, recursive_forecast
+
+PIPELINE = FeaturePipeline(list(ROLLED_FEATURES))
+
+
+def weekly(sales):
+    return pd.DataFrame({'Week': pd.date_range('2024-01-07', periods=len(sales), freq='W'), TARGET: sales})
+
+
+def assert_same(got, want):
+    """Bit-identical, with NaN where the other side has NaN"""
+    np.testing.assert_array_equal(got, want, strict=True)
+
+
+@pytest.fixture
+def sales():
+    values = np.random.default_rng(3).gamma(2, 1e7, 12)
+    values[5] = np.nan  # A missing week inside the windows
+    return values
+
+
+@pytest.mark.parametrize("pushed", [0, 1, 3, 6])
+def test_features_equal_the_training_features_of_the_next_week(sales, pushed):
+    expected = PIPELINE.transform(weekly(sales))
+    for week in range(pushed + 1, len(sales)):
+        roller = FeatureRoller(sales[:week - pushed])
+        for value in sales[week - pushed:week]:
+            roller.push(value)
+        features = roller.features()
+        assert_same(np.array([features[name][0] for name in ROLLED_FEATURES]), expected[week])
+
+
+class RecordingModel:
+    """Stand-in regressor: a fixed function of the rolled features, keeping every input"""
+
+    def __init__(self):
+        self.inputs = []
+
+    def predict(self, X):
+        self.inputs.append(X.copy())
+        return 0.5 * X[:, 0] + np.nan_to_num(X[:, 3]) - 0.25 * np.nan_to_num(X[:, -1]) + 1e6
+
+
+def test_recursive_forecast_rolls_the_training_features(sales):
+    model = RecordingModel()
+    history = np.vstack([sales, np.r_[np.full(9, np.nan), sales[-3:]]])
+    horizon = 6
+    predictions = recursive_forecast(model, list(ROLLED_FEATURES), history,
+                                     np.zeros((2, horizon, len(ROLLED_FEATURES))))
+
+    for series in range(2):
+        observed = history[series][~np.isnan(history[series])] if series else history[series]
+        extended = np.concatenate([observed, predictions[series]])
+        expected = PIPELINE.transform(weekly(extended))[len(observed):]
+        used = np.stack([inputs[series] for inputs in model.inputs])
+        assert_same(used, expected)
+
+
+def test_forecast_base_starts_where_the_roller_does(sales):
+    frame = weekly(sales)
+    future = pd.date_range(frame['Week'].iloc[-1], periods=4, freq='W')[1:]
+    base = PIPELINE.forecast_base(frame, future)
+    features = FeatureRoller(sales).features()
+    assert_same(base[0, 0], np.array([features[name][0] for name in ROLLED_FEATURES]))
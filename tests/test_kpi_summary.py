@@ -0,0 +1,99 @@
+"""Incremental refresh of the kpi_daily summary"""
+
+import asyncio
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.db.database import Base
+from app.services import analytics_service
+from app.services.analytics_service import AnalyticsService
+from app.services.data_store import DataStore
+from app.services.kpi_summary import KPISummaryRefresher, read_kpis
+from app.services.rollups import RollupStore
+
+from conftest import RANGES, assert_same, write_datasets
+
+
+@pytest.fixture
+def summary(tmp_path, monkeypatch):
+    data_path = tmp_path / "data"
+    data_path.mkdir()
+    write_datasets(data_path, 3_000, seed=4)
+    monkeypatch.setattr(analytics_service, "rollup_store", RollupStore())
+    engine = create_engine(f"sqlite:///{tmp_path / 'summary.db'}")
+    Base.metadata.create_all(bind=engine)
+    store = DataStore(str(data_path), refresh_interval=0)
+    refresher = KPISummaryRefresher(engine)
+    refresher.refresh_snapshot(store.load())
+    return refresher, store, data_path / "traffic_overview_cleaned.csv"
+
+
+def reload(store, path, frame, **to_csv):
+    # Make sure the rewritten file gets a new mtime even on coarse clocks
+    time.sleep(0.01)
+    frame.to_csv(path, index=False, **to_csv)
+    return store.refresh_if_changed(force=True)
+
+
+def assert_kpis_match(engine, snapshot):
+    with Session(engine) as db:
+        pandas_service = AnalyticsService(db, snapshot)
+        for start, end in RANGES:
+            got = read_kpis(db, start, end)
+            got.freshness = None
+            assert_same(got, asyncio.run(pandas_service.get_kpis(start, end)), f"{start}..{end}")
+
+
+def test_first_build_matches_pandas(tmp_path, monkeypatch):
+    write_datasets(tmp_path, 2_000, seed=5)
+    monkeypatch.setattr(analytics_service, "rollup_store", RollupStore())
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    snapshot = DataStore(str(tmp_path), refresh_interval=0).load()
+    refresher = KPISummaryRefresher(engine)
+
+    assert {r.method for r in refresher.refresh_snapshot(snapshot).values()} == {'rebuild'}
+    assert {r.method for r in refresher.refresh_snapshot(snapshot).values()} == {'skipped'}
+    with Session(engine) as db:
+        freshness = read_kpis(db).freshness
+    assert freshness.data_through and len(freshness.source_versions) == 3
+    assert_kpis_match(engine, snapshot)
+
+
+def test_appended_days_refresh_incrementally(summary):
+    refresher, store, path = summary
+    frame = pd.read_csv(path)
+    days = pd.to_datetime(frame['Date']).max() + pd.to_timedelta(np.repeat(np.arange(1, 8), 20), unit='D')
+    appended = pd.DataFrame({'Date': days.strftime('%Y-%m-%d'), 'Total_Visitors': np.arange(len(days)) % 400})
+    snapshot = reload(store, path, appended, mode='a', header=False)
+
+    results = refresher.refresh_snapshot(snapshot)
+    assert results['traffic_data'].method == 'incremental'
+    assert results['traffic_data'].buckets == 7
+    assert results['chat_data'].method == 'skipped'
+    assert_kpis_match(refresher.engine, snapshot)
+
+
+def test_values_edited_in_place_rebuild(summary):
+    refresher, store, path = summary
+    frame = pd.read_csv(path)
+    # Same rows per day as summarized, only the values differ
+    frame.loc[frame.index[:10], 'Total_Visitors'] += 1_000
+    snapshot = reload(store, path, frame)
+
+    assert refresher.refresh_snapshot(snapshot)['traffic_data'].method == 'rebuild'
+    assert_kpis_match(refresher.engine, snapshot)
+
+
+def test_rewritten_history_rebuilds(summary):
+    refresher, store, path = summary
+    frame = pd.read_csv(path)
+    snapshot = reload(store, path, frame.drop(index=frame.index[:10]))
+
+    assert refresher.refresh_snapshot(snapshot)['traffic_data'].method == 'rebuild'
+    assert_kpis_match(refresher.engine, snapshot)
@@ -0,0 +1,99 @@
+"""Panel forecast features against the features of the panel extended by its predictions"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ml.forecasting.feature_pipeline import FEATURE_SPEC, TARGET, FeaturePipeline
+from ml.forecasting.feature_roller import ROLLED_FEATURES, WINDOW, recursive_forecast
+
+NAMES = [f.name for f in FEATURE_SPEC if f.op == 'calendar' or f.name in ROLLED_FEATURES]
+HORIZON = 5
+
+
+@pytest.fixture
+def panel():
+    rng = np.random.default_rng(4)
+    frames = []
+    # A long series, one shorter than the roller window, one with a missing recent week
+    for series_id, weeks, end in (('a', 10, '2024-06-02'), ('b', 2, '2024-05-26'), ('c', 7, '2024-06-09')):
+        sales = rng.gamma(2, 1e7, weeks)
+        if series_id == 'c':
+            sales[-2] = np.nan
+        frames.append(pd.DataFrame({
+            'series_id': series_id,
+            'Week': pd.date_range(end=end, periods=weeks, freq='W'),
+            TARGET: sales,
+            'Buyers': rng.poisson(500, weeks).astype(float),
+            'Products': rng.poisson(80, weeks).astype(float),
+            'Product_Sales': sales * 0.8,
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+class RecordingModel:
+    """Stand-in regressor: a fixed function of last week's sales, keeping every input"""
+
+    def __init__(self, lag1):
+        self.lag1 = lag1
+        self.inputs = []
+
+    def predict(self, X):
+        self.inputs.append(np.array(X, dtype=np.float64))
+        return 0.9 * np.nan_to_num(X[:, self.lag1]) + 1e6
+
+
+def extended(panel, future_weeks, predictions):
+    """The panel with each series' forecast appended as observed weeks"""
+    future = pd.DataFrame({
+        'series_id': np.repeat(panel['series_id'].unique(), HORIZON),
+        'Week': np.asarray(future_weeks).ravel(),
+        TARGET: predictions.ravel(),
+    })
+    frame = pd.concat([panel, future], ignore_index=True)
+    return frame.sort_values(['series_id', 'Week'], kind='mergesort').reset_index(drop=True)
+
+
+def expected_features(frame, names):
+    """transform() rows of the appended weeks, as (series, step, feature)"""
+    features = FeaturePipeline(names).transform(frame, series=frame['series_id'])
+    steps = frame.groupby('series_id', sort=False).cumcount(ascending=False).to_numpy()
+    future = steps < HORIZON
+    return features[future].reshape(-1, HORIZON, len(names))
+
+
+def test_recursive_panel_forecast_sees_its_training_features(panel):
+    pipeline = FeaturePipeline(NAMES)
+    last = panel.groupby('series_id', sort=False)['Week'].max().to_numpy()
+    future_weeks = last[:, None] + np.arange(1, HORIZON + 1) * np.timedelta64(7, 'D')
+    base = pipeline.forecast_base(panel, future_weeks, series=panel['series_id'])
+
+    history = np.full((3, WINDOW), np.nan)
+    for i, (_, group) in enumerate(panel.groupby('series_id', sort=False)):
+        tail = group[TARGET].to_numpy()[-WINDOW:]
+        history[i, WINDOW - len(tail):] = tail
+
+    model = RecordingModel(NAMES.index('sales_lag1'))
+    predictions = recursive_forecast(model, NAMES, history, base)
+
+    used = np.stack(model.inputs, axis=1)
+    want = expected_features(extended(panel, future_weeks, predictions), NAMES)
+    np.testing.assert_array_equal(used, want, strict=True)
+
+
+def test_panel_forecaster_future_features(panel):
+    pytest.importorskip('xgboost')
+    from ml.forecasting.panel_forecaster import PanelSalesForecaster
+
+    panel = panel.dropna(subset=[TARGET]).reset_index(drop=True)  # Labels can't be missing
+    forecaster = PanelSalesForecaster(mode='global', test_size=0.3).fit(panel)
+    model = RecordingModel(forecaster.feature_cols.index('sales_lag1'))
+    forecaster.models = {None: model}
+    forecast = forecaster.forecast(HORIZON)
+
+    predictions = forecast['Predicted_Sales'].to_numpy().reshape(-1, HORIZON)
+    future_weeks = forecast['Week'].to_numpy().reshape(-1, HORIZON)
+    used = np.stack(model.inputs, axis=1)
+    columns = [forecaster.feature_cols.index(name) for name in NAMES]
+    want = expected_features(extended(panel, future_weeks, predictions), NAMES)
+    np.testing.assert_array_equal(used[:, :, columns], want, strict=True)
@@ -0,0 +1,66 @@
+"""Incremental extension of the rollup cube after a data reload"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.data_store import DataStore
+from app.services.rollups import RollupCube
+
+from conftest import write_datasets
+
+TRAFFIC = "traffic_overview_cleaned.csv"
+
+
+@pytest.fixture
+def store(tmp_path):
+    write_datasets(tmp_path, 2_000, seed=5)
+    return DataStore(str(tmp_path), refresh_interval=0)
+
+
+def reload(store, frame):
+    path = f"{store.data_path}/{TRAFFIC}"
+    frame.to_csv(path, index=False)
+    return store.refresh_if_changed(force=True)
+
+
+def assert_same_cube(cube, snapshot, name="traffic_data"):
+    expected = RollupCube.build(snapshot)[name]
+    got = cube[name]
+    for start, end in [(None, None), ('2016-01-01', '2018-12-31'), ('2019-06-01', None)]:
+        assert got.totals(start, end) == pytest.approx(expected.totals(start, end))
+        assert got.row_count(start, end) == expected.row_count(start, end)
+    for period in ("daily", "weekly", "monthly"):
+        np.testing.assert_array_equal(got.arrays("Total_Visitors", period)[1],
+                                      expected.arrays("Total_Visitors", period)[1])
+
+
+def test_appended_days_extend_the_cube(store):
+    snapshot = store.load()
+    cube = RollupCube.build(snapshot)
+    frame = pd.read_csv(f"{store.data_path}/{TRAFFIC}")
+    last = pd.to_datetime(frame['Date']).max()
+    appended = pd.DataFrame({'Date': [(last + pd.Timedelta(days=d)).strftime('%Y-%m-%d') for d in (1, 1, 2)],
+                             'Total_Visitors': [10.0, 20.0, 30.0]})
+
+    snapshot = reload(store, pd.concat([frame, appended], ignore_index=True))
+    extended = RollupCube.build(snapshot, previous=cube)
+
+    assert len(extended["traffic_data"].levels["daily"].keys) == len(cube["traffic_data"].levels["daily"].keys) + 2
+    assert_same_cube(extended, snapshot)
+
+
+def test_corrected_past_value_rebuilds(store):
+    snapshot = store.load()
+    cube = RollupCube.build(snapshot)
+    frame = pd.read_csv(f"{store.data_path}/{TRAFFIC}")
+    # Same rows and dates, one past value corrected in place
+    row = frame['Total_Visitors'].first_valid_index()
+    frame.loc[row, 'Total_Visitors'] += 5_000
+
+    snapshot = reload(store, frame)
+    refreshed = RollupCube.build(snapshot, previous=cube)
+
+    assert refreshed["traffic_data"].totals()['Total_Visitors'][0] == pytest.approx(
+        cube["traffic_data"].totals()['Total_Visitors'][0] + 5_000)
+    assert_same_cube(refreshed, snapshot)
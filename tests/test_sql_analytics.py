@@ -0,0 +1,121 @@
+"""SQL query engine against the pandas engine on SQLite"""
+
+import asyncio
+import time
+
+import httpx
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.api import analytics
+from app.core.config import settings
+from app.db.database import Base, get_session
+from app.services import analytics_service
+from app.services.analytics_service import AnalyticsService
+from app.services.data_store import DataStore, get_data_snapshot
+from app.services.fact_table import FactTableStore
+from app.services.rollups import RollupStore
+from app.services.sql_analytics import SQLAnalyticsService
+
+from conftest import assert_same, requests, write_datasets
+
+REQUESTS = requests()
+
+
+@pytest.fixture(scope="module")
+def loaded(tmp_path_factory):
+    tmp = tmp_path_factory.mktemp("sql_analytics")
+    data_path = tmp / "data"
+    data_path.mkdir()
+    write_datasets(data_path, 3_000, seed=6)
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(analytics_service, "rollup_store", RollupStore())
+        snapshot = DataStore(str(data_path), refresh_interval=0).load()
+    engine = create_engine(f"sqlite:///{tmp / 'facts.db'}")
+    Base.metadata.create_all(bind=engine)
+    FactTableStore().refresh(engine, snapshot)
+    return snapshot, engine
+
+
+@pytest.mark.parametrize("name, call", REQUESTS, ids=[name for name, _ in REQUESTS])
+def test_sql_engine_matches_pandas(loaded, name, call, monkeypatch):
+    snapshot, engine = loaded
+    monkeypatch.setattr(analytics_service, "rollup_store", RollupStore())
+    with Session(engine) as db:
+        want = asyncio.run(call(AnalyticsService(db, snapshot)))
+        got = asyncio.run(call(SQLAnalyticsService(db, snapshot)))
+    assert_same(got, want, name)
+
+
+def test_every_sql_method_is_covered():
+    covered = {call(_Recorder()) for _, call in REQUESTS}
+    assert covered == SQLAnalyticsService.SQL_METHODS
+
+
+class _Recorder:
+    def __getattr__(self, method):
+        return lambda *args: method
+
+
+@pytest.fixture
+def sql_app(tmp_path, monkeypatch):
+    data_path = tmp_path / "data"
+    data_path.mkdir()
+    write_datasets(data_path, 2_000, seed=7)
+    store = DataStore(str(data_path), refresh_interval=0)
+    engine = create_engine(f"sqlite:///{tmp_path / 'facts.db'}")
+    Base.metadata.create_all(bind=engine)
+
+    monkeypatch.setattr(settings, "ANALYTICS_ENGINE", "sql")
+    monkeypatch.setattr(settings, "KPI_SUMMARY", False)
+    monkeypatch.setattr(settings, "DB_ASYNC", False)
+    monkeypatch.setattr(analytics, "engine", engine)
+    monkeypatch.setattr(analytics, "fact_table_store", FactTableStore())
+    monkeypatch.setattr(analytics_service, "rollup_store", RollupStore())
+    # As at startup: the table holds the first snapshot
+    analytics.fact_table_store.refresh(engine, store.load())
+
+    def session():
+        with Session(engine) as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(analytics.router, prefix="/api/analytics")
+    app.dependency_overrides[get_session] = session
+    app.dependency_overrides[get_data_snapshot] = store.refresh_if_changed
+    return app, store, engine, data_path
+
+
+async def _get_all(app, urls):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        return [(await client.get(url)).json() for url in urls]
+
+
+def test_sql_engine_follows_a_reloaded_snapshot(sql_app):
+    app, store, engine, data_path = sql_app
+    urls = ["/api/analytics/kpis", "/api/analytics/traffic/sources", "/api/analytics/categories"]
+    before = asyncio.run(_get_all(app, urls))
+
+    # Make sure the rewritten files get a new mtime even on coarse clocks
+    time.sleep(0.01)
+    for name, column in (("traffic_overview_cleaned.csv", "Total_Visitors"), ("off_platform_cleaned.csv", "Visitors"),
+                         ("chat_data_cleaned.csv", "Sales_IDR")):
+        frame = pd.read_csv(data_path / name)
+        frame[column] = frame[column] * 2 + np.arange(len(frame)) % 3
+        frame.to_csv(data_path / name, index=False)
+
+    after = asyncio.run(_get_all(app, urls))
+    snapshot = store.snapshot
+    assert analytics.fact_table_store.is_current(snapshot)
+    with Session(engine) as db:
+        pandas_service = AnalyticsService(db, snapshot)
+        expected = [asyncio.run(pandas_service.get_kpis()).model_dump(mode="json"),
+                    asyncio.run(pandas_service.get_traffic_sources()),
+                    asyncio.run(pandas_service.get_category_metrics())]
+    for url, old, got, want in zip(urls, before, after, expected):
+        assert got != old, url
+        assert_same(got, want, url)
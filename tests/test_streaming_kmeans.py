@@ -0,0 +1,51 @@
+"""Feature columns of chunked segmentation sources"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ml.segmentation.streaming_kmeans import fit_streaming, iter_chunks, numeric_columns
+
+
+@pytest.fixture
+def buyers_csv(tmp_path):
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({
+        'buyer': [f'b{i}' for i in range(300)],
+        'sales': rng.gamma(2, 100, 300),
+        'orders': rng.poisson(5, 300).astype(float),
+    })
+    # Only the last chunk has a label in a numeric column, so it reads as text there
+    frame['orders'] = frame['orders'].astype(object)
+    frame.loc[250, 'orders'] = 'n/a'
+    path = tmp_path / 'buyers.csv'
+    frame.to_csv(path, index=False)
+    return path
+
+
+def test_numeric_columns_come_from_the_first_chunk(buyers_csv):
+    assert numeric_columns(buyers_csv, chunksize=100) == ['sales', 'orders']
+    assert numeric_columns(buyers_csv, ['orders'], chunksize=100) == ['orders']
+    assert numeric_columns(np.zeros((3, 2))) is None
+
+
+def test_every_chunk_has_the_same_features(buyers_csv):
+    blocks = list(iter_chunks(buyers_csv, chunksize=100))
+    assert [block.shape for block in blocks] == [(100, 2), (100, 2), (100, 2)]
+    expected = pd.read_csv(buyers_csv)
+    np.testing.assert_array_equal(np.concatenate(blocks)[:, 0], expected['sales'])
+    assert np.concatenate(blocks)[250, 1] == 0
+
+
+def test_fit_streaming_on_csv_without_columns(buyers_csv):
+    scaler, model, sample = fit_streaming(buyers_csv, 3, chunksize=100, epochs=1)
+    assert scaler.n_features_in_ == 2 and model.cluster_centers_.shape == (3, 2)
+
+
+def test_dashboard_profiles_are_keyed_by_column(buyers_csv):
+    customer_segmentation = pytest.importorskip('ml_models.customer_segmentation')
+    model = customer_segmentation.CustomerSegmentation(n_clusters=3, mode='minibatch', chunksize=100)
+    model.fit_streaming(buyers_csv)
+    assert model.feature_names == ['sales', 'orders']
+    assert all(list(profile['mean_values']) == ['sales', 'orders']
+               for profile in model.cluster_profiles.values())